@@ -69,17 +69,23 @@
 
 from .earclip_module import Point
 from .earclip_module import earclip
+from .earclip_module import triangulate_polygon
 
 from .utils import lerp
 from .utils import lerp_vec
 from .utils import rand_angle_360_deg
 from .utils import rand_angle_spread_deg
 from .utils import rand_in_circle
+from .utils import rand_in_circle_array
 from .utils import rand_in_rect
+from .utils import rand_in_rect_array
 from .utils import rand_on_circle
+from .utils import rand_on_circle_array
 from .utils import rand_on_line
 from .utils import rand_vec_magnitude
+from .utils import rand_vec_magnitude_array
 from .utils import rand_vec_spread_deg
+from .utils import rand_vec_spread_deg_array
 
 from .drawing_support import calculate_points
 from .drawing_support import get_four_byte_color
@@ -126,7 +132,6 @@
 from .draw_commands import TShape
 from .draw_commands import buffered_shapes
 from .draw_commands import Shape
-from .draw_commands import ShapeElementList
 from .draw_commands import draw_arc_filled
 from .draw_commands import draw_arc_outline
 from .draw_commands import draw_circle_filled
@@ -165,6 +170,7 @@
 from .geometry import is_point_in_polygon
 
 from .gui import DialogueBox
+from .gui import GuiRenderer
 from .gui import SubmitButton
 from .gui import TextBox
 from .gui import TextButton
@@ -172,6 +178,7 @@
 from .gui import TextLabel
 from .gui import TextStorage
 from .gui import Theme
+from .gui import WidgetList
 
 from .isometric import create_isometric_grid_lines
 from .isometric import isometric_grid_to_screen
@@ -185,6 +192,7 @@
 from .emitter import EmitInterval
 from .emitter import EmitMaintainCount
 from .emitter import Emitter
+from .emitter import EmitterGroup
 from .emitter import EmitterIntervalWithCount
 from .emitter import EmitterIntervalWithTime
 
@@ -194,8 +202,13 @@
 from .particle import FilenameOrTexture
 from .particle import EternalParticle
 from .particle import FadeParticle
+from .particle import GcPauseMonitor
+from .particle import GpuParticles
 from .particle import LifetimeParticle
 from .particle import Particle
+from .particle import ParticleArrays
+from .particle import ParticleBatch
+from .particle import ParticlePool
 from .particle import clamp
 
 from .sound import PlaysoundException
@@ -233,13 +246,23 @@
 from .read_tiled_map import read_tiled_map
 
 from .text import DEFAULT_FONT_NAMES
+from .text import BatchedText
 from .text import CreateText
 from .text import Text
+from .text import TextBatch
+from .text import TextCache
 from .text import create_text
 from .text import draw_text
 from .text import draw_text_2
+from .text import get_pending_glyph_count
+from .text import prewarm_text
 from .text import render_text
+from .text import set_async_text
 
+from .tilemap import LevelPreloader
+from .tilemap import StreamingTileLayer
+from .tilemap import TileCollisionMap
+from .tilemap import TileLayer
 from .tilemap import get_tilemap_layer
 from .tilemap import process_layer
 from .tilemap import read_tmx
@@ -249,11 +272,16 @@
 from .utils import rand_angle_360_deg
 from .utils import rand_angle_spread_deg
 from .utils import rand_in_circle
+from .utils import rand_in_circle_array
 from .utils import rand_in_rect
+from .utils import rand_in_rect_array
 from .utils import rand_on_circle
+from .utils import rand_on_circle_array
 from .utils import rand_on_line
 from .utils import rand_vec_magnitude
+from .utils import rand_vec_magnitude_array
 from .utils import rand_vec_spread_deg
+from .utils import rand_vec_spread_deg_array
 
 from .version import VERSION
 
@@ -262,6 +290,7 @@
            'AnimatedTimeSprite',
            'AnimatedWalkingSprite',
            'AnimationKeyframe',
+           'BatchedText',
            'Color',
            'CreateText',
            'DEFAULT_FONT_NAMES',
@@ -271,6 +300,7 @@
            'EmitInterval',
            'EmitMaintainCount',
            'Emitter',
+           'EmitterGroup',
            'EmitterIntervalWithCount',
            'EmitterIntervalWithTime',
            'EternalParticle',
@@ -280,7 +310,11 @@
            'FACE_UP',
            'FadeParticle',
            'FilenameOrTexture',
+           'GcPauseMonitor',
+           'GpuParticles',
            'GridLocation',
+           'GuiRenderer',
+           'LevelPreloader',
            'LifetimeParticle',
            'MOUSE_BUTTON_LEFT',
            'MOUSE_BUTTON_MIDDLE',
@@ -288,6 +322,9 @@
            'Matrix3x3',
            'NoOpenGLException',
            'Particle',
+           'ParticleArrays',
+           'ParticleBatch',
+           'ParticlePool',
            'PhysicsEnginePlatformer',
            'PhysicsEngineSimple',
            'PlaysoundException',
@@ -301,28 +338,33 @@
            'Shape',
            'Shape',
            'ShapeElementList',
-           'ShapeElementList',
            'Sound',
            'Sprite',
            'SpriteList',
            'SpriteSolidColor',
+           'StreamingTileLayer',
            'SubmitButton',
            'TShape',
            'TShape',
            'Text',
+           'TextBatch',
            'TextBox',
            'TextButton',
+           'TextCache',
            'TextDisplay',
            'TextLabel',
            'TextStorage',
            'Texture',
            'Theme',
            'Tile',
+           'TileCollisionMap',
+           'TileLayer',
            'TiledMap',
            'VERSION',
            'Vector',
            'VertexBuffer',
            'View',
+           'WidgetList',
            'Window',
            'are_polygons_intersecting',
            'buffered_shapes',
@@ -395,6 +437,7 @@
            'get_game_controllers',
            'get_image',
            'get_joysticks',
+           'get_pending_glyph_count',
            'get_pixel',
            'get_points_for_thick_line',
            'get_projection',
@@ -427,6 +470,7 @@
            'pause_milliseconds',
            'pause_seconds',
            'play_sound',
+           'prewarm_text',
            'process_layer',
            'quick_run',
            'rand_angle_360_deg',
@@ -435,16 +479,26 @@
            'rand_angle_spread_deg',
            'rand_in_circle',
            'rand_in_circle',
+           'rand_in_circle_array',
+           'rand_in_circle_array',
            'rand_in_rect',
            'rand_in_rect',
+           'rand_in_rect_array',
+           'rand_in_rect_array',
            'rand_on_circle',
            'rand_on_circle',
+           'rand_on_circle_array',
+           'rand_on_circle_array',
            'rand_on_line',
            'rand_on_line',
            'rand_vec_magnitude',
            'rand_vec_magnitude',
+           'rand_vec_magnitude_array',
+           'rand_vec_magnitude_array',
            'rand_vec_spread_deg',
            'rand_vec_spread_deg',
+           'rand_vec_spread_deg_array',
+           'rand_vec_spread_deg_array',
            'read_tiled_map',
            'read_tmx',
            'render_text',
@@ -452,11 +506,13 @@
            'run',
            'schedule',
            'screen_to_isometric_grid',
+           'set_async_text',
            'set_background_color',
            'set_viewport',
            'set_window',
            'start_render',
            'stop_sound',
+           'triangulate_polygon',
            'trim_image',
            'unschedule',
            ]
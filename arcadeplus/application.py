@@ -13,6 +13,8 @@
 from arcadeplus import get_viewport
 from arcadeplus import set_viewport
 from arcadeplus import set_window
+from arcadeplus.gui import GuiRenderer
+from arcadeplus.gui import WidgetList
 
 if TYPE_CHECKING:
     from arcadeplus import TextBox
@@ -100,10 +102,11 @@ def __init__(self, width: int = 800, height: int = 600,
         set_viewport(0, self.width - 1, 0, self.height - 1)
 
         self.current_view: Optional[View] = None
-        self.button_list: List[TextButton] = []
+        self.button_list: List[TextButton] = WidgetList()
         self.dialogue_box_list: List[DialogueBox] = []
         self.text_list: List[TextLabel] = []
-        self.textbox_list: List[TextBox] = []
+        self.textbox_list: List[TextBox] = WidgetList()
+        self.gui_renderer: Optional[GuiRenderer] = None
         self.textbox_time = 0.0
         self.key: Optional[int] = None
 
@@ -173,9 +176,7 @@ def on_mouse_press(self, x: float, y: float, button: int, modifiers: int):
         """
         try:
             if self.button_list:
-                for button_widget in self.button_list:
-                    if button_widget.active:
-                        button_widget.check_mouse_press(x, y)
+                _send_mouse_press(self.button_list, x, y, active_only=True)
         except AttributeError:
             pass
         try:
@@ -187,8 +188,7 @@ def on_mouse_press(self, x: float, y: float, button: int, modifiers: int):
             pass
         try:
             if self.textbox_list:
-                for textbox in self.textbox_list:
-                    textbox.check_mouse_press(x, y)
+                _send_mouse_press(self.textbox_list, x, y)
         except AttributeError:
             pass
 
@@ -217,9 +217,7 @@ def on_mouse_release(self, x: float, y: float, button: int,
         """
         try:
             if self.button_list:
-                for button_widget in self.button_list:
-                    if button_widget.active:
-                        button_widget.check_mouse_release(x, y)
+                _send_mouse_release(self.button_list, x, y, active_only=True)
         except AttributeError:
             pass
         try:
@@ -231,8 +229,7 @@ def on_mouse_release(self, x: float, y: float, button: int,
             pass
         try:
             if self.textbox_list:
-                for textbox in self.textbox_list:
-                    textbox.check_mouse_release(x, y)
+                _send_mouse_release(self.textbox_list, x, y)
         except AttributeError:
             pass
 
@@ -284,33 +281,7 @@ def on_draw(self):
         """
         Override this function to add your custom drawing code.
         """
-        try:
-            if self.button_list:
-                for button in self.button_list:
-                    if button.active:
-                        button.draw()
-        except AttributeError:
-            pass
-        try:
-            if self.text_list:
-                for text in self.text_list:
-                    if text.active:
-                        text.draw()
-        except AttributeError:
-            pass
-        try:
-            if self.dialogue_box_list:
-                for dialogue_box in self.dialogue_box_list:
-                    if dialogue_box.active:
-                        dialogue_box.on_draw()
-        except AttributeError:
-            pass
-        try:
-            if self.textbox_list:
-                for textbox in self.textbox_list:
-                    textbox.draw()
-        except AttributeError:
-            pass
+        _draw_gui(self, active_only=True)
 
     def on_resize(self, width: float, height: float):
         """
@@ -543,6 +514,61 @@ def open_window(width: int, height: int, window_title: str, resizable: bool = Fa
     return _window
 
 
+def _send_mouse_press(widgets: list, x: float, y: float, active_only: bool = False):
+    """
+    Send a mouse press to a widget list, using its spatial hash if it is a WidgetList.
+    A Window only sends it to active buttons, a View to every button.
+    """
+    if isinstance(widgets, WidgetList):
+        widgets.mouse_press(x, y, active_only)
+    else:
+        for widget in widgets:
+            if not active_only or getattr(widget, 'active', True):
+                widget.check_mouse_press(x, y)
+
+
+def _send_mouse_release(widgets: list, x: float, y: float, active_only: bool = False):
+    """ Send a mouse release to a widget list, using its spatial hash if it is a WidgetList. """
+    if isinstance(widgets, WidgetList):
+        widgets.mouse_release(x, y, active_only)
+    else:
+        for widget in widgets:
+            if not active_only or getattr(widget, 'active', True):
+                widget.check_mouse_release(x, y)
+
+
+def _get_gui_widgets(owner, active_only: bool) -> list:
+    """
+    The widgets of a Window or View, in the order they are drawn. A Window
+    leaves out inactive buttons and text labels, a View draws them all.
+    Dialogue boxes only draw themselves while active either way.
+    """
+    widgets = []
+    for name in ("button_list", "text_list", "dialogue_box_list", "textbox_list"):
+        # Subclasses that don't call __init__ may not have every list
+        widget_list = getattr(owner, name, None)
+        if not widget_list:
+            continue
+        if active_only and name in ("button_list", "text_list"):
+            widget_list = [widget for widget in widget_list if widget.active]
+        widgets.extend(widget_list)
+    return widgets
+
+
+def _draw_gui(owner, active_only: bool):
+    """
+    Draw the widget lists of a Window or View with its GuiRenderer,
+    which is only created once there are widgets to draw.
+    """
+    widgets = _get_gui_widgets(owner, active_only)
+    renderer = getattr(owner, "gui_renderer", None)
+    if renderer is None:
+        if not widgets:
+            return
+        renderer = owner.gui_renderer = GuiRenderer()
+    renderer.draw(widgets)
+
+
 class View:
     """
     TODO:Thoughts:
@@ -550,11 +576,12 @@ class View:
     """
     def __init__(self):
         self.window = None
-        self.button_list: List[TextButton] = []
+        self.button_list: List[TextButton] = WidgetList()
         self.dialogue_box_list: List[DialogueBox] = []
         self.text_list: List[TextLabel] = []
         self.textbox_time = 0.0
-        self.textbox_list: List[TextBox] = []
+        self.textbox_list: List[TextBox] = WidgetList()
+        self.gui_renderer: Optional[GuiRenderer] = None
         self.key = None
 
     def update(self, delta_time: float):
@@ -576,32 +603,7 @@ def on_update(self, delta_time: float):
 
     def on_draw(self):
         """Called when this view should draw"""
-        try:
-            if self.button_list:
-                for button in self.button_list:
-                    button.draw()
-        except AttributeError:
-            pass
-        try:
-            if self.text_list:
-                for text in self.text_list:
-                    text.draw()
-        except AttributeError:
-            pass
-        pass
-        try:
-            if self.dialogue_box_list:
-                for dialogue_box in self.dialogue_box_list:
-                    if dialogue_box.active:
-                        dialogue_box.on_draw()
-        except AttributeError:
-            pass
-        try:
-            if self.textbox_list:
-                for textbox in self.textbox_list:
-                    textbox.draw()
-        except AttributeError:
-            pass
+        _draw_gui(self, active_only=False)
 
     def on_show(self):
         """Called when this view is shown"""
@@ -631,8 +633,7 @@ def on_mouse_press(self, x: float, y: float, button: int, modifiers: int):
         """
         try:
             if self.button_list:
-                for button_widget in self.button_list:
-                    button_widget.check_mouse_press(x, y)
+                _send_mouse_press(self.button_list, x, y)
         except AttributeError:
             pass
         try:
@@ -645,8 +646,7 @@ def on_mouse_press(self, x: float, y: float, button: int, modifiers: int):
 
         try:
             if self.textbox_list:
-                for textbox in self.textbox_list:
-                    textbox.check_mouse_press(x, y)
+                _send_mouse_press(self.textbox_list, x, y)
         except AttributeError:
             pass
 
@@ -675,8 +675,7 @@ def on_mouse_release(self, x: float, y: float, button: int,
         """
         try:
             if self.button_list:
-                for button_widget in self.button_list:
-                    button_widget.check_mouse_release(x, y)
+                _send_mouse_release(self.button_list, x, y)
         except AttributeError:
             pass
         try:
@@ -688,8 +687,7 @@ def on_mouse_release(self, x: float, y: float, button: int,
             pass
         try:
             if self.textbox_list:
-                for textbox in self.textbox_list:
-                    textbox.check_mouse_release(x, y)
+                _send_mouse_release(self.textbox_list, x, y)
         except AttributeError:
             pass
 
@@ -8,11 +8,11 @@
 
 import math
 import itertools
-from collections import defaultdict
+from ctypes import POINTER
 import pyglet.gl as gl
 import numpy as np
 
-from typing import List, Iterable, Sequence
+from typing import Dict, List, Iterable, Optional, Sequence
 from typing import TypeVar
 from typing import Generic
 from typing import cast
@@ -24,6 +24,7 @@
 from arcadeplus import get_projection
 from arcadeplus import get_points_for_thick_line
 from arcadeplus import shader
+from arcadeplus import triangulate_polygon
 
 
 class VertexBuffer:
@@ -279,8 +280,8 @@ def create_lines_with_colors(point_list: PointList,
 def create_polygon(point_list: PointList,
                    color: Color):
     """
-    Draw a convex polygon. This will NOT draw a concave polygon.
-    Because of this, you might not want to use this function.
+    Create a filled polygon. The polygon may be convex or concave, but its
+    edges shouldn't cross each other.
 
     :param PointList point_list:
     :param color:
@@ -288,17 +289,8 @@ def create_polygon(point_list: PointList,
     :Returns Shape:
 
     """
-    # We assume points were given in order, either clockwise or counter clockwise.
-    # Polygon is assumed to be monotone.
-    # To fill the polygon, we start by one vertex, and we chain triangle strips
-    # alternating with vertices to the left and vertices to the right of the
-    # initial vertex.
-    half = len(point_list) // 2
-    interleaved = itertools.chain.from_iterable(
-        itertools.zip_longest(point_list[:half], reversed(point_list[half:]))
-    )
-    point_list = [p for p in interleaved if p is not None]
-    return create_line_generic(point_list, color, gl.GL_TRIANGLE_STRIP, 1)
+    triangle_points = triangulate_polygon(point_list)
+    return create_line_generic(triangle_points, color, gl.GL_TRIANGLES, 1)
 
 
 def create_rectangle_filled(center_x: float, center_y: float, width: float,
@@ -604,6 +596,14 @@ class ShapeElementList(Generic[TShape]):
     move and draw them as one. Do this when you want to create a more complex object
     out of simpler primitives. This also speeds rendering as all objects are drawn
     in one operation.
+
+    Shapes are grouped by their drawing mode and line width. Each group keeps all
+    of its vertices in one buffer, so adding or removing a shape only copies that
+    shape's vertices, and each group is drawn with a single multi-draw call.
+
+    Each shape can also be moved, rotated, scaled and hidden on its own with
+    ``set_shape_transform`` and ``set_shape_visible``. This only updates a small
+    table on the graphics card, the shape's vertices are left alone.
     """
     def __init__(self):
         """
@@ -619,21 +619,32 @@ def __init__(self):
         self.program = shader.program(
             vertex_shader='''
                 #version 330
-                uniform mat4 Projection;
+                layout(std140) uniform ProjectionBlock {
+                    mat4 Projection;
+                };
                 uniform vec2 Position;
                 uniform float Angle;
+                // One texel per shape: x, y, angle, scale
+                uniform samplerBuffer ShapeTransforms;
 
                 in vec2 in_vert;
                 in vec4 in_color;
+                in float in_shape;
 
                 out vec4 v_color;
-                void main() {
-                    float angle = radians(Angle);
-                    mat2 rotate = mat2(
+
+                mat2 rotation(float degrees) {
+                    float angle = radians(degrees);
+                    return mat2(
                         cos(angle), sin(angle),
                         -sin(angle), cos(angle)
                     );
-                   gl_Position = Projection * vec4(Position + (rotate * in_vert), 0.0, 1.0);
+                }
+
+                void main() {
+                    vec4 transform = texelFetch(ShapeTransforms, int(in_shape));
+                    vec2 pos = transform.xy + rotation(transform.z) * (in_vert * transform.w);
+                   gl_Position = Projection * vec4(Position + (rotation(Angle) * pos), 0.0, 1.0);
                    v_color = in_color;
                 }
             ''',
@@ -646,18 +657,31 @@ def __init__(self):
                 }
             ''',
         )
-        # Could do much better using just one vbo and glDrawElementsBaseVertex
-        self.batches = defaultdict(_Batch)
-        self.dirties = set()
+        self.batches = dict()
+
+        # Each shape gets a slot in the transform table
+        self._shape_slots = dict()
+        self._free_slots = []
+        self._slot_count = 0
+        self._transforms = np.zeros((0, 4), dtype=np.float32)
+        self._transforms_dirty = False
+        self._transform_buffer = None
+        self._transform_texture = None
 
     def append(self, item: TShape):
         """
         Add a new shape to the list.
         """
         self.shape_list.append(item)
+        slot = self._shape_slots.get(item)
+        if slot is None:
+            slot = self._allocate_slot()
+            self._shape_slots[item] = slot
+
         group = (item.mode, item.line_width)
-        self.batches[group].items.append(item)
-        self.dirties.add(group)
+        if group not in self.batches:
+            self.batches[group] = _Batch(self.program, item.mode, item.line_width)
+        self.batches[group].append(item, slot)
 
     def remove(self, item: TShape):
         """
@@ -665,60 +689,68 @@ def remove(self, item: TShape):
         """
         self.shape_list.remove(item)
         group = (item.mode, item.line_width)
-        self.batches[group].items.remove(item)
-        self.dirties.add(group)
-
-    def _refresh_shape(self, group):
-        # Create a buffer large enough to hold all the shapes buffers
-        batch = self.batches[group]
-        total_vbo_bytes = sum(s.vbo.size for s in batch.items)
-        vbo = shader.Buffer.create_with_size(total_vbo_bytes)
-        offset = 0
-        gl.glBindBuffer(gl.GL_COPY_WRITE_BUFFER, vbo.buffer_id)
-        # Copy all the shapes buffer in our own vbo
-        for shape in batch.items:
-            gl.glBindBuffer(gl.GL_COPY_READ_BUFFER, shape.vbo.buffer_id)
-            gl.glCopyBufferSubData(
-                gl.GL_COPY_READ_BUFFER,
-                gl.GL_COPY_WRITE_BUFFER,
-                gl.GLintptr(0),
-                gl.GLintptr(offset),
-                shape.vbo.size)
-            offset += shape.vbo.size
-
-        # Create an index buffer object. It should count starting from 0. We need to
-        # use a reset_idx to indicate that a new shape will start.
-        reset_idx = 2 ** 32 - 1
-        indices = []
-        counter = itertools.count()
-        for shape in batch.items:
-            indices.extend(itertools.islice(counter, shape.vao.num_vertices))
-            indices.append(reset_idx)
-        del indices[-1]
-        indices = np.array(indices)
-        ibo = shader.Buffer(indices.astype('i4').tobytes())
+        self.batches[group].remove(item)
+        if item not in self.shape_list:
+            self._free_slots.append(self._shape_slots.pop(item))
+
+    def _allocate_slot(self) -> int:
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = self._slot_count
+            self._slot_count += 1
+            if slot >= len(self._transforms):
+                transforms = np.zeros((max(64, slot * 2), 4), dtype=np.float32)
+                transforms[:len(self._transforms)] = self._transforms
+                self._transforms = transforms
+                self._transform_buffer = None
+        self._transforms[slot] = 0, 0, 0, 1
+        self._transforms_dirty = True
+        return slot
+
+    def set_shape_transform(self, shape: TShape,
+                            center_x: float = 0, center_y: float = 0,
+                            angle: float = 0, scale: float = 1):
+        """
+        Move, rotate and scale one shape in the list. The shape is scaled and
+        rotated around (0, 0), then moved, before the list's own ``center_x``,
+        ``center_y`` and ``angle`` are applied.
+
+        :param shape: Shape in this list
+        :param float center_x: Amount to move the shape on the x axis
+        :param float center_y: Amount to move the shape on the y axis
+        :param float angle: Rotation of the shape in degrees
+        :param float scale: Scale of the shape
+        """
+        self._transforms[self._shape_slots[shape]] = center_x, center_y, angle, scale
+        self._transforms_dirty = True
 
-        vao_content = [
-            shader.BufferDescription(
-                vbo,
-                '2f 4B',
-                ('in_vert', 'in_color'),
-                normalized=['in_color']
-            )
-        ]
-        vao = shader.vertex_array(self.program, vao_content, ibo)
-        with self.program:
-            self.program['Projection'] = get_projection().flatten()
-            self.program['Position'] = [self.center_x, self.center_y]
-            self.program['Angle'] = self.angle
-
-        batch.shape.vao = vao
-        batch.shape.vbo = vbo
-        batch.shape.ibo = ibo
-        batch.shape.program = self.program
-        mode, line_width = group
-        batch.shape.mode = mode
-        batch.shape.line_width = line_width
+    def set_shape_transforms(self, shapes: Sequence[TShape], transforms):
+        """
+        Set the transforms of many shapes at once.
+
+        :param shapes: Shapes in this list
+        :param transforms: Array of shape ``(len(shapes), 4)`` with the
+            center_x, center_y, angle and scale of each shape.
+        """
+        slots = [self._shape_slots[shape] for shape in shapes]
+        self._transforms[slots] = transforms
+        self._transforms_dirty = True
+
+    def get_shape_transform(self, shape: TShape):
+        """
+        Get the transform of a shape in the list.
+
+        :returns: Tuple of center_x, center_y, angle and scale
+        """
+        return tuple(float(value) for value in self._transforms[self._shape_slots[shape]])
+
+    def set_shape_visible(self, shape: TShape, visible: bool):
+        """
+        Show or hide one shape in the list.
+        """
+        group = (shape.mode, shape.line_width)
+        self.batches[group].set_visible(shape, visible)
 
     def move(self, change_x: float, change_y: float):
         """
@@ -740,15 +772,27 @@ def __iter__(self) -> Iterable[TShape]:
     def __getitem__(self, i):
         return self.shape_list[i]
 
+    def _update_transforms(self):
+        if self._transform_buffer is None:
+            self._transform_buffer = shader.Buffer(self._transforms.tobytes(), usage='dynamic')
+            self._transform_texture = shader.BufferTexture(self._transform_buffer)
+        elif self._transforms_dirty:
+            self._transform_buffer.write(self._transforms[:self._slot_count].tobytes())
+        self._transforms_dirty = False
+
     def draw(self):
         """
         Draw everything in the list.
         """
-        for group in self.dirties:
-            self._refresh_shape(group)
-        self.dirties.clear()
+        if not self.shape_list:
+            return
+
+        self._update_transforms()
+        self._transform_texture.use(0)
+        with self.program:
+            self.program['ShapeTransforms'] = 0
         for batch in self.batches.values():
-            batch.shape.draw()
+            batch.draw()
 
     def _get_center_x(self) -> float:
         """Get the center x coordinate of the ShapeElementList."""
@@ -788,6 +832,178 @@ def _set_angle(self, value: float):
 
 
 class _Batch(Generic[TShape]):
-    def __init__(self):
-        self.shape = Shape()
-        self.items = []
+    """
+    The shapes of a ShapeElementList sharing one drawing mode and line width.
+
+    The vertices of every shape are copied into one growable buffer (the arena),
+    with a second buffer holding the transform slot of the shape each vertex
+    belongs to. Removing a shape leaves a hole, in the arena and in the list of
+    shapes, so the others keep their drawing order. Both are compacted once
+    holes take up more than half of them.
+    """
+
+    # Bytes per vertex: 2 floats for the position, 4 bytes for the color
+    vertex_size = 12
+    # Bytes per vertex for the shape's slot, one float
+    slot_size = 4
+    min_capacity = 256
+
+    def __init__(self, program: shader.Program, mode: int, line_width: float):
+        self.program = program
+        self.mode = mode
+        self.line_width = line_width
+        # Removed shapes leave None until the next compaction
+        self.items: List[Optional[Shape]] = []
+        # Where each shape is in items. A shape added more than once has an index for each time.
+        self.indices: Dict[Shape, List[int]] = {}
+        self.vbo = None
+        self.slot_vbo = None
+        self.vao = None
+        # Vertices of the arena in use, including holes
+        self.capacity = 0
+        self.used = 0
+        self.wasted = 0
+        # Parallel to items, in vertices, with room to grow. Hidden shapes and holes have a count of 0.
+        self.firsts = np.zeros(0, dtype=np.int32)
+        self.lengths = np.zeros(0, dtype=np.int32)
+        self.counts = np.zeros(0, dtype=np.int32)
+        self.holes = 0
+
+    def append(self, item: TShape, slot: int):
+        length = item.vbo.size // self.vertex_size
+        self._reserve(self.used + length)
+        _copy_buffer(item.vbo, self.vbo, 0, self.used * self.vertex_size, length * self.vertex_size)
+        self.slot_vbo.write(np.full(length, slot, dtype=np.float32).tobytes(),
+                            self.used * self.slot_size)
+
+        index = len(self.items)
+        if index >= len(self.firsts):
+            self._grow_shapes(max(64, index * 2))
+        self.items.append(item)
+        self.indices.setdefault(item, []).append(index)
+        self.firsts[index] = self.used
+        self.lengths[index] = length
+        self.counts[index] = length
+        self.used += length
+
+    def remove(self, item: TShape):
+        indices = self.indices[item]
+        index = indices.pop(0)
+        if not indices:
+            del self.indices[item]
+        self.items[index] = None
+        self.wasted += int(self.lengths[index])
+        self.counts[index] = 0
+        self.holes += 1
+
+        if self.wasted * 2 > self.used or self.holes * 2 > len(self.items):
+            self._compact()
+
+    def set_visible(self, item: TShape, visible: bool):
+        for index in self.indices[item]:
+            self.counts[index] = self.lengths[index] if visible else 0
+
+    def _grow_shapes(self, size: int):
+        """ Make room for size shapes in firsts, lengths and counts. """
+        for name in ("firsts", "lengths", "counts"):
+            array = np.zeros(size, dtype=np.int32)
+            old_array = getattr(self, name)
+            array[:len(old_array)] = old_array
+            setattr(self, name, array)
+
+    def _reserve(self, length: int):
+        """ Make sure the arena can hold at least length vertices. """
+        if self.capacity >= length:
+            return
+        capacity = max(self.capacity, self.min_capacity)
+        while capacity < length:
+            capacity *= 2
+
+        vbo = shader.Buffer.create_with_size(capacity * self.vertex_size, usage='dynamic')
+        slot_vbo = shader.Buffer.create_with_size(capacity * self.slot_size, usage='dynamic')
+        if self.used:
+            _copy_buffer(self.vbo, vbo, 0, 0, self.used * self.vertex_size)
+            _copy_buffer(self.slot_vbo, slot_vbo, 0, 0, self.used * self.slot_size)
+        self.capacity = capacity
+        self._set_buffers(vbo, slot_vbo)
+
+    def _compact(self):
+        """ Copy the live shapes into a new arena, dropping the holes. """
+        vbo = shader.Buffer.create_with_size(self.capacity * self.vertex_size, usage='dynamic')
+        slot_vbo = shader.Buffer.create_with_size(self.capacity * self.slot_size, usage='dynamic')
+        offset = 0
+        count = 0
+        self.indices = {}
+        for i, item in enumerate(self.items):
+            if item is None:
+                continue
+            first = int(self.firsts[i])
+            length = int(self.lengths[i])
+            _copy_buffer(self.vbo, vbo,
+                         first * self.vertex_size, offset * self.vertex_size, length * self.vertex_size)
+            _copy_buffer(self.slot_vbo, slot_vbo,
+                         first * self.slot_size, offset * self.slot_size, length * self.slot_size)
+            # Shapes only move down, so nothing still to be read is overwritten
+            self.items[count] = item
+            self.indices.setdefault(item, []).append(count)
+            self.firsts[count] = offset
+            self.lengths[count] = length
+            self.counts[count] = self.counts[i]
+            offset += length
+            count += 1
+        del self.items[count:]
+        self.counts[count:] = 0
+        self.holes = 0
+        self.used = offset
+        self.wasted = 0
+        self._set_buffers(vbo, slot_vbo)
+
+    def _set_buffers(self, vbo: shader.Buffer, slot_vbo: shader.Buffer):
+        self.vbo = vbo
+        self.slot_vbo = slot_vbo
+        vao_content = [
+            shader.BufferDescription(
+                vbo,
+                '2f 4B',
+                ('in_vert', 'in_color'),
+                normalized=['in_color']
+            ),
+            shader.BufferDescription(
+                slot_vbo,
+                '1f',
+                ('in_shape',),
+            )
+        ]
+        self.vao = shader.vertex_array(self.program, vao_content)
+
+    def draw(self):
+        if len(self.items) == self.holes:
+            return
+
+        with self.vao:
+            gl.glLineWidth(self.line_width)
+
+            gl.glEnable(gl.GL_BLEND)
+            gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+            gl.glEnable(gl.GL_LINE_SMOOTH)
+            gl.glHint(gl.GL_LINE_SMOOTH_HINT, gl.GL_NICEST)
+            gl.glHint(gl.GL_POLYGON_SMOOTH_HINT, gl.GL_NICEST)
+
+            gl.glMultiDrawArrays(
+                self.mode,
+                self.firsts.ctypes.data_as(POINTER(gl.GLint)),
+                self.counts.ctypes.data_as(POINTER(gl.GLsizei)),
+                len(self.items))
+
+
+def _copy_buffer(source: shader.Buffer, destination: shader.Buffer,
+                 source_offset: int, destination_offset: int, size: int):
+    """ Copy bytes from one buffer to another, on the graphics card. """
+    gl.glBindBuffer(gl.GL_COPY_READ_BUFFER, source.buffer_id)
+    gl.glBindBuffer(gl.GL_COPY_WRITE_BUFFER, destination.buffer_id)
+    gl.glCopyBufferSubData(
+        gl.GL_COPY_READ_BUFFER,
+        gl.GL_COPY_WRITE_BUFFER,
+        gl.GLintptr(source_offset),
+        gl.GLintptr(destination_offset),
+        size)
@@ -13,7 +13,6 @@
 import math
 import array
 import itertools
-from collections import defaultdict
 import pyglet.gl as gl
 import numpy as np
 
@@ -27,19 +26,19 @@
 from typing import Tuple
 from typing import TYPE_CHECKING
 from typing import TypeVar
-from typing import Generic
 from typing import cast
 
 from arcadeplus import get_projection
 from arcadeplus import Color
 from arcadeplus import Point, PointList
 from arcadeplus import shader
-from arcadeplus import earclip
+from arcadeplus import triangulate_polygon
 from arcadeplus import rotate_point
 from arcadeplus import get_four_byte_color
 from arcadeplus import get_points_for_thick_line
 from arcadeplus import Texture
 from arcadeplus import get_window
+from arcadeplus.buffered_draw_commands import ShapeElementList
 
 if TYPE_CHECKING:  # import for mypy only
     from arcadeplus.arcade_types import Point
@@ -95,199 +94,210 @@ def draw(self):
 
 
 TShape = TypeVar('TShape', bound=Shape)
-class ShapeElementList(Generic[TShape]):
+
+
+_polyline_vertex_shader = '''
+    #version 330
+    layout(std140) uniform ProjectionBlock {
+        mat4 Projection;
+    };
+    uniform float LineWidth;
+
+    // per vertex: x is 0 at the segment start and 1 at its end,
+    // y is the side of the line (-1 or 1)
+    in vec2 in_vert;
+
+    // per instance: the segment, plus its neighbours for the joins
+    in vec2 in_prev;
+    in vec2 in_start;
+    in vec2 in_end;
+    in vec2 in_next;
+
+    vec2 safe_normalize(vec2 v, vec2 fallback) {
+        float len = length(v);
+        if (len < 0.00001) {
+            return fallback;
+        }
+        return v / len;
+    }
+
+    void main() {
+        vec2 direction = safe_normalize(in_end - in_start, vec2(1.0, 0.0));
+        vec2 normal = vec2(-direction.y, direction.x);
+
+        vec2 point;
+        vec2 tangent;
+        if (in_vert.x < 0.5) {
+            point = in_start;
+            tangent = safe_normalize(
+                safe_normalize(in_start - in_prev, direction) + direction, direction);
+        } else {
+            point = in_end;
+            tangent = safe_normalize(
+                direction + safe_normalize(in_next - in_end, direction), direction);
+        }
+
+        // Miter join, limited so sharp corners don't produce long spikes
+        vec2 miter = vec2(-tangent.y, tangent.x);
+        float miter_length = (LineWidth / 2.0) / max(dot(miter, normal), 0.25);
+
+        vec2 pos = point + miter * miter_length * in_vert.y;
+        gl_Position = Projection * vec4(pos, 0.0, 1.0);
+    }
+'''
+
+_polyline_fragment_shader = '''
+    #version 330
+    uniform vec4 Color;
+    out vec4 f_color;
+    void main() {
+        f_color = Color;
+    }
+'''
+
+
+def _get_polyline_segments(point_list, closed: bool = False) -> np.ndarray:
     """
-    A program can put multiple drawing primitives in a ShapeElementList, and then
-    move and draw them as one. Do this when you want to create a more complex object
-    out of simpler primitives. This also speeds rendering as all objects are drawn
-    in one operation.
+    Turn a point list or a NumPy ``(N, 2)`` array into per-segment instance
+    data for the polyline renderer. Each row is
+    ``(prev_x, prev_y, start_x, start_y, end_x, end_y, next_x, next_y)``.
+    The end points of an open line strip use themselves as neighbours.
     """
-    def __init__(self):
-        """
-        Initialize the sprite list
-        """
-        # List of sprites in the sprite list
-        self.shape_list = []
-        self.change_x = 0
-        self.change_y = 0
-        self._center_x = 0
-        self._center_y = 0
-        self._angle = 0
-        self.program = shader.program(
-            vertex_shader='''
-                #version 330
-                uniform mat4 Projection;
-                uniform vec2 Position;
-                uniform float Angle;
-
-                in vec2 in_vert;
-                in vec4 in_color;
-
-                out vec4 v_color;
-                void main() {
-                    float angle = radians(Angle);
-                    mat2 rotate = mat2(
-                        cos(angle), sin(angle),
-                        -sin(angle), cos(angle)
-                    );
-                   gl_Position = Projection * vec4(Position + (rotate * in_vert), 0.0, 1.0);
-                   v_color = in_color;
-                }
-            ''',
-            fragment_shader='''
-                #version 330
-                in vec4 v_color;
-                out vec4 f_color;
-                void main() {
-                    f_color = v_color;
-                }
-            ''',
-        )
-        # Could do much better using just one vbo and glDrawElementsBaseVertex
-        self.batches = defaultdict(_Batch)
-        self.dirties = set()
-
-    def append(self, item: TShape):
-        """
-        Add a new shape to the list.
-        """
-        self.shape_list.append(item)
-        group = (item.mode, item.line_width)
-        self.batches[group].items.append(item)
-        self.dirties.add(group)
-
-    def remove(self, item: TShape):
-        """
-        Remove a specific shape from the list.
-        """
-        self.shape_list.remove(item)
-        group = (item.mode, item.line_width)
-        self.batches[group].items.remove(item)
-        self.dirties.add(group)
-
-    def _refresh_shape(self, group):
-        # Create a buffer large enough to hold all the shapes buffers
-        batch = self.batches[group]
-        total_vbo_bytes = sum(s.vbo.size for s in batch.items)
-        vbo = shader.Buffer.create_with_size(total_vbo_bytes)
-        offset = 0
-        gl.glBindBuffer(gl.GL_COPY_WRITE_BUFFER, vbo.buffer_id)
-        # Copy all the shapes buffer in our own vbo
-        for shape in batch.items:
-            gl.glBindBuffer(gl.GL_COPY_READ_BUFFER, shape.vbo.buffer_id)
-            gl.glCopyBufferSubData(
-                gl.GL_COPY_READ_BUFFER,
-                gl.GL_COPY_WRITE_BUFFER,
-                gl.GLintptr(0),
-                gl.GLintptr(offset),
-                shape.vbo.size)
-            offset += shape.vbo.size
-
-        # Create an index buffer object. It should count starting from 0. We need to
-        # use a reset_idx to indicate that a new shape will start.
-        reset_idx = 2 ** 32 - 1
-        indices = []
-        counter = itertools.count()
-        for shape in batch.items:
-            indices.extend(itertools.islice(counter, shape.vao.num_vertices))
-            indices.append(reset_idx)
-        del indices[-1]
-        indices = np.array(indices)
-        ibo = shader.Buffer(indices.astype('i4').tobytes())
-
-        vao_content = [
-            shader.BufferDescription(
-                vbo,
-                '2f 4B',
-                ('in_vert', 'in_color'),
-                normalized=['in_color']
-            )
-        ]
-        vao = shader.vertex_array(self.program, vao_content, ibo)
-        with self.program:
-            self.program['Projection'] = get_projection().flatten()
-            self.program['Position'] = [self.center_x, self.center_y]
-            self.program['Angle'] = self.angle
-
-        batch.shape.vao = vao
-        batch.shape.vbo = vbo
-        batch.shape.ibo = ibo
-        batch.shape.program = self.program
-        mode, line_width = group
-        batch.shape.mode = mode
-        batch.shape.line_width = line_width
-
-    def move(self, change_x: float, change_y: float):
-        """
-        Move all the shapes ion the list
-        :param change_x: Amount to move on the x axis
-        :param change_y: Amount to move on the y axis
-        """
-        self.center_x += change_x
-        self.center_y += change_y
-
-    def __len__(self) -> int:
-        """ Return the length of the sprite list. """
-        return len(self.shape_list)
-
-    def __iter__(self) -> Iterable[TShape]:
-        """ Return an iterable object of sprites. """
-        return iter(self.shape_list)
-
-    def __getitem__(self, i):
-        return self.shape_list[i]
-
-    def draw(self):
-        """
-        Draw everything in the list.
-        """
-        for group in self.dirties:
-            self._refresh_shape(group)
-        self.dirties.clear()
-        for batch in self.batches.values():
-            batch.shape.draw()
+    points = np.asarray(point_list, dtype=np.float32).reshape(-1, 2)
+    if len(points) < 2:
+        return np.zeros((0, 8), dtype=np.float32)
 
-    def _get_center_x(self) -> float:
-        """Get the center x coordinate of the ShapeElementList."""
-        return self._center_x
+    if closed and len(points) > 2:
+        prev_point = points[-1]
+        next_point = points[1]
+        points = np.concatenate((points, points[:1]))
+    else:
+        prev_point = points[0]
+        next_point = points[-1]
 
-    def _set_center_x(self, value: float):
-        """Set the center x coordinate of the ShapeElementList."""
-        self._center_x = value
-        with self.program:
-            self.program['Position'] = [self._center_x, self._center_y]
+    count = len(points)
 
-    center_x = property(_get_center_x, _set_center_x)
+    padded = np.empty((count + 2, 2), dtype=np.float32)
+    padded[0] = prev_point
+    padded[1:-1] = points
+    padded[-1] = next_point
 
-    def _get_center_y(self) -> float:
-        """Get the center y coordinate of the ShapeElementList."""
-        return self._center_y
+    segments = np.empty((count - 1, 8), dtype=np.float32)
+    segments[:, 0:2] = padded[0:count - 1]
+    segments[:, 2:4] = padded[1:count]
+    segments[:, 4:6] = padded[2:count + 1]
+    segments[:, 6:8] = padded[3:count + 2]
+    return segments
 
-    def _set_center_y(self, value: float):
-        """Set the center y coordinate of the ShapeElementList."""
-        self._center_y = value
-        with self.program:
-            self.program['Position'] = [self._center_x, self._center_y]
 
-    center_y = property(_get_center_y, _set_center_y)
+def _get_line_segments(point_list) -> np.ndarray:
+    """
+    Like ``_get_polyline_segments``, but for unconnected lines made of point
+    pairs, as used by ``draw_lines``. No joins are made between the lines.
+    """
+    points = np.asarray(point_list, dtype=np.float32).reshape(-1, 2)
+    pair_count = len(points) // 2
+    starts = points[0:pair_count * 2:2]
+    ends = points[1:pair_count * 2:2]
 
-    def _get_angle(self) -> float:
-        """Get the angle of the ShapeElementList in degrees."""
-        return self._angle
+    segments = np.empty((pair_count, 8), dtype=np.float32)
+    segments[:, 0:2] = starts
+    segments[:, 2:4] = starts
+    segments[:, 4:6] = ends
+    segments[:, 6:8] = ends
+    return segments
 
-    def _set_angle(self, value: float):
-        """Set the angle of the ShapeElementList in degrees."""
-        self._angle = value
-        with self.program:
-            self.program['Angle'] = self._angle
 
-    angle = property(_get_angle, _set_angle)
+class _PolylineRenderer:
+    """
+    Draws thick polylines as instanced segment quads. The width and the miter
+    joins, limited at sharp corners, are worked out in the vertex shader, so the
+    CPU only uploads one record per segment. Line ends are cut off square at
+    the end points, with no caps.
 
+    Segment data is streamed into a small ring of buffers, so writing the next
+    frame's data doesn't have to wait on the GPU still drawing the previous one.
+    """
+    ring_size = 3
 
-class _Batch(Generic[TShape]):
     def __init__(self):
-        self.shape = Shape()
-        self.items = []
+        self.program = shader.program(
+            vertex_shader=_polyline_vertex_shader,
+            fragment_shader=_polyline_fragment_shader,
+        )
+        vertices = array.array('f', [
+            # t, side
+            0.0, -1.0,
+            0.0, 1.0,
+            1.0, -1.0,
+            1.0, 1.0,
+        ])
+        self.vbo = shader.buffer(vertices.tobytes())
+        self.slots = [None] * self.ring_size
+        self.slot_index = 0
+
+    def _get_slot(self, size: int):
+        """ Get the next buffer in the ring, growing it if it is too small. """
+        self.slot_index = (self.slot_index + 1) % self.ring_size
+        slot = self.slots[self.slot_index]
+
+        if slot is None or slot[0].size < size:
+            capacity = 1024
+            while capacity < size:
+                capacity *= 2
+            segment_buf = shader.Buffer.create_with_size(capacity, usage='stream')
+            vao_content = [
+                shader.BufferDescription(
+                    self.vbo,
+                    '2f',
+                    ['in_vert']
+                ),
+                shader.BufferDescription(
+                    segment_buf,
+                    '2f 2f 2f 2f',
+                    ('in_prev', 'in_start', 'in_end', 'in_next'),
+                    instanced=True
+                ),
+            ]
+            slot = segment_buf, shader.vertex_array(self.program, vao_content)
+            self.slots[self.slot_index] = slot
+        else:
+            slot[0].orphan()
+
+        return slot
+
+    def draw(self, segments: np.ndarray, color: Color, line_width: float):
+        """ Draw the segments created by ``_get_polyline_segments``. """
+        if len(segments) == 0:
+            return
+
+        data = segments.tobytes()
+        segment_buf, vao = self._get_slot(len(data))
+        segment_buf.write(data)
+
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+
+        with vao:
+            self.program['LineWidth'] = line_width
+            self.program['Color'] = [c / 255 for c in get_four_byte_color(color)]
+            vao.render(gl.GL_TRIANGLE_STRIP, instances=len(segments))
+
+
+_polyline_renderer = None
+
+
+def _get_polyline_renderer() -> _PolylineRenderer:
+    global _polyline_renderer
+    if _polyline_renderer is None:
+        _polyline_renderer = _PolylineRenderer()
+    return _polyline_renderer
+
+
+def _draw_segments(segments: np.ndarray, color: Color, line_width: float):
+    """ Draw polyline segments, without making the renderer when there are none to draw. """
+    if len(segments):
+        _get_polyline_renderer().draw(segments, color, line_width)
 
 
 # Internal-Use-Only functions
@@ -594,63 +604,32 @@ def draw_line_strip(point_list: PointList,
     """
     Draw a line made up of multiple points.
 
-    :param PointList point_list:
+    :param PointList point_list: List of points, or a NumPy ``(N, 2)`` array.
     :param Color color:
     :param PointList line_width:
 
     :Returns Shape:
 
     """
-    triangle_point_list: List[Point] = []
-    new_color_list: List[Color] = []
-    for i in range(1, len(point_list)):
-        start_x = point_list[i - 1][0]
-        start_y = point_list[i - 1][1]
-        end_x = point_list[i][0]
-        end_y = point_list[i][1]
-        color1 = color
-        color2 = color
-        id = f"line-{start_x}-{start_y}-{end_x}-{end_y}-{color}-{line_width}"
-        if id not in buffered_shapes.keys():
-            points = get_points_for_thick_line(start_x, start_y, end_x, end_y, line_width)
-            new_color_list += color1, color2, color1, color2
-            triangle_point_list += points[1], points[0], points[2], points[3]
-            shape = _create_triangles_filled_with_colors(triangle_point_list, new_color_list)
-            buffered_shapes[id] = shape
-        buffered_shapes[id].draw()
+    segments = _get_polyline_segments(point_list)
+    _draw_segments(segments, color, line_width)
 
 
 def draw_line_loop(point_list: PointList,
                      color: Color, line_width: float = 1):
     """
-    Create a multi-point line loop to be rendered later. This works faster than draw_line because
-    the vertexes are only loaded to the graphics card once, rather than each frame.
+    Draw a multi-point line loop. The last point is connected back to the
+    first one.
 
-    :param PointList point_list:
+    :param PointList point_list: List of points, or a NumPy ``(N, 2)`` array.
     :param Color color:
     :param float line_width:
 
     :Returns Shape:
 
     """
-    point_list = list(point_list) + [point_list[0]]
-    triangle_point_list: List[Point] = []
-    new_color_list: List[Color] = []
-    for i in range(1, len(point_list)):
-        start_x = point_list[i - 1][0]
-        start_y = point_list[i - 1][1]
-        end_x = point_list[i][0]
-        end_y = point_list[i][1]
-        color1 = color
-        color2 = color
-        id = f"line-{start_x}-{start_y}-{end_x}-{end_y}-{color}-{line_width}"
-        if id not in buffered_shapes.keys():
-            points = get_points_for_thick_line(start_x, start_y, end_x, end_y, line_width)
-            new_color_list += color1, color2, color1, color2
-            triangle_point_list += points[1], points[0], points[2], points[3]
-            shape = _create_triangles_filled_with_colors(triangle_point_list, new_color_list)
-            buffered_shapes[id] = shape
-        buffered_shapes[id].draw()
+    segments = _get_polyline_segments(point_list, closed=True)
+    _draw_segments(segments, color, line_width)
 
 
 def draw_lines(point_list: PointList,
@@ -658,53 +637,37 @@ def draw_lines(point_list: PointList,
     """
     Draw multiple lines made up of two points.
 
-    :param PointList point_list:
+    :param PointList point_list: List of point pairs, or a NumPy ``(N, 2)`` array.
     :param Color color:
     :param float line_width:
 
     :Returns Shape:
 
     """
-    for i in range(1, len(point_list), 2):
-        start_x = point_list[i-1][0]
-        start_y = point_list[i-1][1]
-        end_x = point_list[i][0]
-        end_y = point_list[i][1]
-        id = f"line-{start_x}-{start_y}-{end_x}-{end_y}-{color}-{line_width}"
-        if id not in buffered_shapes.keys():
-            points = get_points_for_thick_line(start_x, start_y, end_x, end_y, line_width)
-            color_list = [color, color, color, color]
-            triangle_point_list = points[1], points[0], points[2], points[3]
-            shape = _create_triangles_filled_with_colors(triangle_point_list, color_list)
-            buffered_shapes[id] = shape
-        buffered_shapes[id].draw()
+    segments = _get_line_segments(point_list)
+    _draw_segments(segments, color, line_width)
 
 
 def draw_polygon_filled(point_list: PointList,
                    color: Color):
     """
-    Draw a convex polygon. This will NOT draw a concave polygon.
-    Because of this, you might not want to use this function.
-
-    :param PointList point_list:
-    :param color:
-
-    :Returns Shape:
+    Draw a polygon that is filled in. The polygon may be convex or concave,
+    but its edges shouldn't cross each other.
 
+    :param PointList point_list: List of points making up the lines. Each point is
+         in a list. So it is a list of lists.
+    :param Color color: The color, specified in RGB or RGBA format.
     """
-    # We assume points were given in order, either clockwise or counter clockwise.
-    # Polygon is assumed to be monotone.
-    # To fill the polygon, we start by one vertex, and we chain triangle strips
-    # alternating with vertices to the left and vertices to the right of the
-    # initial vertex.
-    half = len(point_list) // 2
-    interleaved = itertools.chain.from_iterable(
-        itertools.zip_longest(point_list[:half], reversed(point_list[half:]))
-    )
-    point_list = [p for p in interleaved if p is not None]
-    id = f"polygon-filled-{point_list}-{color}"
+    if hasattr(point_list, 'tolist'):
+        point_list = point_list.tolist()
+    # Keyed on the points themselves. str() would summarize a long NumPy array with "...".
+    points = tuple((point[0], point[1]) for point in point_list)
+    id = ("polygon-filled", points, tuple(color))
     if id not in buffered_shapes.keys():
-        shape = _create_line_generic(point_list, color, gl.GL_TRIANGLE_STRIP, 1)
+        # The triangulation is cached separately, so the same polygon in a
+        # different color doesn't have to be triangulated again.
+        triangle_points = triangulate_polygon(points)
+        shape = _create_line_generic(triangle_points, color, gl.GL_TRIANGLES, 1)
         buffered_shapes[id] = shape
     buffered_shapes[id].draw()
 
@@ -715,29 +678,13 @@ def draw_polygon_outline(point_list: PointList,
     Draw a polygon outline. Also known as a "line loop."
 
     :param PointList point_list: List of points making up the lines. Each point is
-         in a list. So it is a list of lists.
+         in a list. So it is a list of lists. A NumPy ``(N, 2)`` array also works.
     :param Color color: color, specified in a list of 3 or 4 bytes in RGB or
          RGBA format.
     :param int line_width: Width of the line in pixels.
     """
-    point_list = list(point_list) + [point_list[0]]
-    triangle_point_list: List[Point] = []
-    new_color_list: List[Color] = []
-    for i in range(1, len(point_list)):
-        start_x = point_list[i - 1][0]
-        start_y = point_list[i - 1][1]
-        end_x = point_list[i][0]
-        end_y = point_list[i][1]
-        color1 = color
-        color2 = color
-        id = f"line-{start_x}-{start_y}-{end_x}-{end_y}-{color}-{line_width}"
-        if id not in buffered_shapes.keys():
-            points = get_points_for_thick_line(start_x, start_y, end_x, end_y, line_width)
-            new_color_list += color1, color2, color1, color2
-            triangle_point_list += points[1], points[0], points[2], points[3]
-            shape = _create_triangles_filled_with_colors(triangle_point_list, new_color_list)
-            buffered_shapes[id] = shape
-        buffered_shapes[id].draw()
+    segments = _get_polyline_segments(point_list, closed=True)
+    _draw_segments(segments, color, line_width)
 
 
 def draw_rectangle(center_x: float, center_y: float, width: float,
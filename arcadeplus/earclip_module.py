@@ -1,12 +1,24 @@
 """
+Polygon triangulation by ear clipping.
 
-from: https://github.com/linuxlewis/tripy/blob/master/tripy.py
+Originally from: https://github.com/linuxlewis/tripy/blob/master/tripy.py
+
+The polygon is kept as a doubly linked list of vertex indices, so removing an
+ear is O(1). Only reflex vertices can lie inside an ear, so those are kept in a
+uniform grid and the ear test only looks at the grid cells the candidate
+triangle overlaps.
 """
 
+import math
 from collections import namedtuple
+from collections import OrderedDict
 
 Point = namedtuple('Point', ['x', 'y'])
 
+# Maximum number of triangulations kept by triangulate_polygon
+_TRIANGULATION_CACHE_SIZE = 256
+_triangulation_cache: "OrderedDict[tuple, list]" = OrderedDict()
+
 
 def earclip(polygon):
     """
@@ -18,96 +30,198 @@ def earclip(polygon):
     Implementation Reference:
         - https://www.geometrictools.com/Documentation/TriangulationByEarClipping.pdf
     """
-    ear_vertex = []
+    xs = [float(point[0]) for point in polygon]
+    ys = [float(point[1]) for point in polygon]
     triangles = []
 
-    polygon = [Point(*point) for point in polygon]
+    point_count = len(xs)
+    if point_count < 3:
+        return triangles
+
+    # Work counter-clockwise
+    if _is_clockwise(xs, ys):
+        xs.reverse()
+        ys.reverse()
 
-    if _is_clockwise(polygon):
-        polygon.reverse()
+    prev_idx = [i - 1 for i in range(point_count)]
+    prev_idx[0] = point_count - 1
+    next_idx = [i + 1 for i in range(point_count)]
+    next_idx[-1] = 0
 
-    point_count = len(polygon)
+    grid = _ReflexGrid(xs, ys)
     for i in range(point_count):
-        prev_index = i - 1
-        prev_point = polygon[prev_index]
-        point = polygon[i]
-        next_index = (i + 1) % point_count
-        next_point = polygon[next_index]
-
-        if _is_ear(prev_point, point, next_point, polygon):
-            ear_vertex.append(point)
-
-    while ear_vertex and point_count >= 3:
-        ear = ear_vertex.pop(0)
-        i = polygon.index(ear)
-        prev_index = i - 1
-        prev_point = polygon[prev_index]
-        next_index = (i + 1) % point_count
-        next_point = polygon[next_index]
-
-        polygon.remove(ear)
-        point_count -= 1
-        triangles.append(((prev_point.x, prev_point.y), (ear.x, ear.y), (next_point.x, next_point.y)))
-        if point_count > 3:
-            prev_prev_point = polygon[prev_index - 1]
-            next_next_index = (i + 1) % point_count
-            next_next_point = polygon[next_next_index]
-
-            groups = [
-                (prev_prev_point, prev_point, next_point, polygon),
-                (prev_point, next_point, next_next_point, polygon)
-            ]
-            for group in groups:
-                p = group[1]
-                if _is_ear(*group):
-                    if p not in ear_vertex:
-                        ear_vertex.append(p)
-                elif p in ear_vertex:
-                    ear_vertex.remove(p)
+        if not _is_convex(xs, ys, prev_idx[i], i, next_idx[i]):
+            grid.add(i)
+
+    def _emit(a, b, c):
+        triangles.append(((xs[a], ys[a]), (xs[b], ys[b]), (xs[c], ys[c])))
+
+    def _remove(i):
+        a = prev_idx[i]
+        c = next_idx[i]
+        next_idx[a] = c
+        prev_idx[c] = a
+        grid.discard(i)
+        # Removing a vertex can only turn its neighbours from reflex to convex
+        for neighbour in (a, c):
+            if neighbour in grid and _is_convex(xs, ys, prev_idx[neighbour], neighbour, next_idx[neighbour]):
+                grid.discard(neighbour)
+
+    remaining = point_count
+    current = 0
+    stop = current
+    while remaining > 3:
+        a = prev_idx[current]
+        c = next_idx[current]
+
+        if _triangle_sum(xs[a], ys[a], xs[current], ys[current], xs[c], ys[c]) == 0:
+            # Collinear vertex, drop it without creating a zero-area triangle
+            _remove(current)
+            remaining -= 1
+            current = stop = c
+            continue
+
+        if _is_ear(xs, ys, a, current, c, grid):
+            _emit(a, current, c)
+            _remove(current)
+            remaining -= 1
+            current = stop = c
+            continue
+
+        current = c
+        if current == stop:
+            # We went all the way around without finding an ear. The polygon
+            # must be self-intersecting, so clip anyway to make sure we finish.
+            a = prev_idx[current]
+            c = next_idx[current]
+            _emit(a, current, c)
+            _remove(current)
+            remaining -= 1
+            current = stop = c
+
+    a = prev_idx[current]
+    c = next_idx[current]
+    if _triangle_sum(xs[a], ys[a], xs[current], ys[current], xs[c], ys[c]) != 0:
+        _emit(a, current, c)
     return triangles
 
 
-def _is_clockwise(polygon):
+def triangulate_polygon(polygon):
+    """
+    Triangulate a polygon with ``earclip``, caching the result.
+
+    Drawing the same polygon again, even with a different color, reuses the
+    triangulation instead of recomputing it. Triangulations are cached by the
+    polygon's points, and the least recently used ones are dropped first.
+
+    :param polygon: List of points, or a NumPy ``(N, 2)`` array.
+    :returns: Flat tuple of points, three per triangle, usable with ``GL_TRIANGLES``.
+        It is shared with the cache, so it can't be changed.
+    """
+    if hasattr(polygon, 'tolist'):
+        polygon = polygon.tolist()
+    key = tuple((point[0], point[1]) for point in polygon)
+
+    try:
+        point_list = _triangulation_cache[key]
+        _triangulation_cache.move_to_end(key)
+        return point_list
+    except KeyError:
+        pass
+
+    point_list = tuple(point for triangle in earclip(key) for point in triangle)
+    _triangulation_cache[key] = point_list
+    if len(_triangulation_cache) > _TRIANGULATION_CACHE_SIZE:
+        _triangulation_cache.popitem(last=False)
+    return point_list
+
+
+class _ReflexGrid:
+    """ Uniform grid holding the reflex vertices of the polygon being clipped. """
+
+    def __init__(self, xs, ys):
+        self.xs = xs
+        self.ys = ys
+        self.min_x = min(xs)
+        self.min_y = min(ys)
+        width = max(xs) - self.min_x
+        height = max(ys) - self.min_y
+        # Aim for about one vertex per cell
+        if width > 0 and height > 0:
+            self.cell_size = math.sqrt(width * height / len(xs))
+        else:
+            self.cell_size = max(width, height) / len(xs) or 1.0
+        self.cells = {}
+        self.members = set()
+
+    def _cell(self, x, y):
+        return int((x - self.min_x) / self.cell_size), int((y - self.min_y) / self.cell_size)
+
+    def __contains__(self, i):
+        return i in self.members
+
+    def add(self, i):
+        self.members.add(i)
+        self.cells.setdefault(self._cell(self.xs[i], self.ys[i]), set()).add(i)
+
+    def discard(self, i):
+        if i in self.members:
+            self.members.remove(i)
+            self.cells[self._cell(self.xs[i], self.ys[i])].discard(i)
+
+    def get_in_box(self, min_x, min_y, max_x, max_y):
+        """ Get the reflex vertices in the cells overlapping a box. """
+        if not self.members:
+            return
+        min_cell_x, min_cell_y = self._cell(min_x, min_y)
+        max_cell_x, max_cell_y = self._cell(max_x, max_y)
+        cell_count = (max_cell_x - min_cell_x + 1) * (max_cell_y - min_cell_y + 1)
+        if cell_count > len(self.members):
+            # Big box, it's cheaper to just look at every reflex vertex
+            yield from self.members
+            return
+        for cell_x in range(min_cell_x, max_cell_x + 1):
+            for cell_y in range(min_cell_y, max_cell_y + 1):
+                cell = self.cells.get((cell_x, cell_y))
+                if cell:
+                    yield from cell
+
+
+def _is_clockwise(xs, ys):
     s = 0
-    polygon_count = len(polygon)
+    polygon_count = len(xs)
     for i in range(polygon_count):
-        point = polygon[i]
-        point2 = polygon[(i + 1) % polygon_count]
-        s += (point2.x - point.x) * (point2.y + point.y)
+        j = (i + 1) % polygon_count
+        s += (xs[j] - xs[i]) * (ys[j] + ys[i])
     return s > 0
 
 
-def _is_convex(prev, point, next_point):
-    return _triangle_sum(prev.x, prev.y, point.x, point.y, next_point.x, next_point.y) < 0
+def _is_convex(xs, ys, prev, point, next_point):
+    return _triangle_sum(xs[prev], ys[prev], xs[point], ys[point], xs[next_point], ys[next_point]) > 0
 
 
-def _is_ear(p1, p2, p3, polygon):
-    ear = _contains_no_points(p1, p2, p3, polygon) and \
-          _is_convex(p1, p2, p3) and \
-          _triangle_area(p1.x, p1.y, p2.x, p2.y, p3.x, p3.y) > 0
-    return ear
+def _is_ear(xs, ys, a, b, c, grid):
+    if not _is_convex(xs, ys, a, b, c):
+        return False
 
-
-def _contains_no_points(p1, p2, p3, polygon):
-    for pn in polygon:
-        if pn in (p1, p2, p3):
+    ax, ay = xs[a], ys[a]
+    bx, by = xs[b], ys[b]
+    cx, cy = xs[c], ys[c]
+    for p in grid.get_in_box(min(ax, bx, cx), min(ay, by, cy), max(ax, bx, cx), max(ay, by, cy)):
+        if p == a or p == b or p == c:
+            continue
+        px, py = xs[p], ys[p]
+        # Duplicated points (e.g. where a polygon touches itself) don't block the ear
+        if (px == ax and py == ay) or (px == bx and py == by) or (px == cx and py == cy):
             continue
-        elif _is_point_inside(pn, p1, p2, p3):
+        # Is the point inside, or on the edge of, the triangle. Inlined since this is the hot loop.
+        if (bx - ax) * (py - ay) - (by - ay) * (px - ax) >= 0 and \
+                (cx - bx) * (py - by) - (cy - by) * (px - bx) >= 0 and \
+                (ax - cx) * (py - cy) - (ay - cy) * (px - cx) >= 0:
             return False
     return True
 
 
-def _is_point_inside(p, a, b, c):
-    area = _triangle_area(a.x, a.y, b.x, b.y, c.x, c.y)
-    area1 = _triangle_area(p.x, p.y, b.x, b.y, c.x, c.y)
-    area2 = _triangle_area(p.x, p.y, a.x, a.y, c.x, c.y)
-    area3 = _triangle_area(p.x, p.y, a.x, a.y, b.x, b.y)
-    return area == sum([area1, area2, area3])
-
-
-def _triangle_area(x1, y1, x2, y2, x3, y3):
-    return abs((x1 * (y2 - y3) + x2 * (y3 - y1) + x3 * (y1 - y2)) / 2.0)
-
-
 def _triangle_sum(x1, y1, x2, y2, x3, y3):
-    return x1 * (y3 - y2) + x2 * (y1 - y3) + x3 * (y2 - y1)
+    """ Twice the signed area of the triangle. Positive when counter-clockwise. """
+    return (x2 - x1) * (y3 - y1) - (y2 - y1) * (x3 - x1)
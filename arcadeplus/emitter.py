@@ -3,9 +3,14 @@
 over their lifetime
 """
 
+import inspect
+
+import numpy as np
+
 import arcadeplus
-from arcadeplus.particle import Particle
-from typing import Callable, cast
+from arcadeplus.particle import GpuParticles, Particle, ParticleArrays, ParticleBatch, _UPDATES_PER_SECOND, \
+    _merge_batches
+from typing import Callable, Dict, Iterator, List, Optional, Union, cast
 from arcadeplus.utils import _Vec2
 from arcadeplus.arcade_types import Point, Vector
 
@@ -100,17 +105,76 @@ def is_complete(self) -> bool:
         return self._lifetime <= 0
 
 
+class _FixedStepClock:
+    """Splits the time of each update into steps of the same length, carrying what is left over to the next
+    update. Time past max_substeps steps is dropped, so one slow frame doesn't make the next one slower too."""
+    def __init__(self, step: float, max_substeps: int):
+        self.step = step
+        self.max_substeps = max_substeps
+        self._carryover_time = 0.0
+
+    def get_steps(self, delta_time: float) -> int:
+        self._carryover_time += delta_time
+        steps = 0
+        while self._carryover_time >= self.step:
+            if steps == self.max_substeps:
+                self._carryover_time = 0.0
+                break
+            self._carryover_time -= self.step
+            steps += 1
+        return steps
+
+
+_update_takes_delta_time_cache: Dict[type, bool] = {}
+
+
+def _update_takes_delta_time(particle_type: type) -> bool:
+    """ Whether a particle class's update takes delta_time, rather than being an older ``update(self)`` """
+    try:
+        return _update_takes_delta_time_cache[particle_type]
+    except KeyError:
+        pass
+
+    try:
+        parameters = list(inspect.signature(particle_type.update).parameters.values())
+    except (TypeError, ValueError):
+        takes_delta_time = True
+    else:
+        # The first parameter is self
+        takes_delta_time = len(parameters) > 1 or any(parameter.kind == parameter.VAR_POSITIONAL
+                                                      for parameter in parameters)
+    _update_takes_delta_time_cache[particle_type] = takes_delta_time
+    return takes_delta_time
+
+
 # Emitter
 class Emitter:
-    """Emits and manages Particles over their lifetime.  The foundational class in a particle system."""
+    """Emits and manages Particles over their lifetime.  The foundational class in a particle system.
+
+    Particles are made one at a time by ``particle_factory``, as Particle sprites. For many
+    particles, give a ``batch_factory`` instead. It is called with the emitter and how many
+    particles to make, and returns a ParticleBatch. Those particles are kept in ParticleArrays,
+    which updates and draws them all at once with NumPy, but can't run a mutation_callback.
+    With ``gpu`` set, they are kept in GpuParticles instead, which updates them on the GPU and
+    only sends it the new particles. ``gravity`` is added to the velocity of batch particles
+    every update.
+
+    ``update`` advances everything by the time it is given. With a ``fixed_step``, that time is
+    run as steps of that many seconds instead, at most ``max_substeps`` of them per update.
+    """
     def __init__(
         self,
         center_xy: Point,
         emit_controller: EmitController,
-        particle_factory: Callable[["Emitter"], Particle],
+        particle_factory: Callable[["Emitter"], Particle] = None,
         change_xy: Vector = (0.0, 0.0),
         emit_done_cb: Callable[["Emitter"], None] = None,
-        reap_cb: Callable[[], None] = None
+        reap_cb: Callable[[], None] = None,
+        batch_factory: Callable[["Emitter", int], ParticleBatch] = None,
+        gpu: bool = False,
+        gravity: Vector = (0.0, 0.0),
+        fixed_step: float = None,
+        max_substeps: int = 5
     ):
         # Note Self-reference with type annotations:
         #     https://www.python.org/dev/peps/pep-0484/#the-problem-of-forward-declarations
@@ -125,7 +189,21 @@ def __init__(
         self.particle_factory = particle_factory
         self._emit_done_cb = emit_done_cb
         self._reap_cb = reap_cb
-        self._particles: arcadeplus.SpriteList = arcadeplus.SpriteList(use_spatial_hash=False)
+        if (particle_factory is None) == (batch_factory is None):
+            raise ValueError("Emitter needs either a particle_factory or a batch_factory.")
+        if batch_factory is None and (gpu or tuple(gravity) != (0.0, 0.0)):
+            raise ValueError("Only an Emitter with a batch_factory can keep particles on the GPU or have gravity.")
+        self.batch_factory = batch_factory
+        self._particles: Union[arcadeplus.SpriteList, ParticleArrays, GpuParticles]
+        if batch_factory is None:
+            self._particles = arcadeplus.SpriteList(use_spatial_hash=False)
+        else:
+            self._particles = GpuParticles() if gpu else ParticleArrays()
+            self._particles.gravity = gravity
+        self._clock = None if fixed_step is None else _FixedStepClock(fixed_step, max_substeps)
+        # Set while the emitter is in an EmitterGroup, which keeps its particles
+        self._group: Optional["EmitterGroup"] = None
+        self._group_id = 0
 
     def _emit(self):
         """Emit one particle, its initial position and velocity are relative to the position and angle of the emitter"""
@@ -140,7 +218,14 @@ def _emit(self):
         p.change_y = vel.y
         self._particles.append(p)
 
+    def _emit_batch(self, count: int):
+        """Emit count particles at once, from the batch factory"""
+        batch = self.batch_factory(self, count)
+        cast(Union[ParticleArrays, GpuParticles], self._particles).add(batch, count, (self.center_x, self.center_y), self.angle)
+
     def get_count(self):
+        if self._group is not None:
+            return self._group._get_emitter_count(self)
         return len(self._particles)
 
     def get_pos(self) -> Point:
@@ -148,20 +233,45 @@ def get_pos(self) -> Point:
         # TODO: should this be a property so a method call isn't needed?
         return self.center_x, self.center_y
 
-    def update(self):
+    def update(self, delta_time: float = 1 / 60):
+        """Advance the emitter and its particles by delta_time seconds"""
+        if self._clock is None:
+            self._step(delta_time)
+        else:
+            for _ in range(self._clock.get_steps(delta_time)):
+                self._step(self._clock.step)
+
+    def _move(self, delta_time: float):
+        updates = delta_time * _UPDATES_PER_SECOND
+        self.center_x += self.change_x * updates
+        self.center_y += self.change_y * updates
+        self.angle += self.change_angle * updates
+
+    def _step(self, delta_time: float):
         # update emitter
-        self.center_x += self.change_x
-        self.center_y += self.change_y
-        self.angle += self.change_angle
+        self._move(delta_time)
 
         # update particles
-        emit_count = self.rate_factory.how_many(1 / 60, len(self._particles))
+        emit_count = self.rate_factory.how_many(delta_time, len(self._particles))
+        if self.batch_factory is not None:
+            if emit_count > 0:
+                self._emit_batch(emit_count)
+            # Batch particles drop their dead ones as they update
+            self._particles.update(delta_time)
+            return
         for _ in range(emit_count):
             self._emit()
-        self._particles.update()
+        for particle in self._particles:
+            # Particles written before update took delta_time are updated a frame at a time, like they were
+            if _update_takes_delta_time(type(particle)):
+                particle.update(delta_time)
+            else:
+                particle.update()
         particles_to_reap = [p for p in self._particles if cast(Particle, p).can_reap()]
         for dead_particle in particles_to_reap:
             dead_particle.kill()
+            if dead_particle.pool is not None:
+                dead_particle.pool.release(dead_particle)
 
     def draw(self):
         self._particles.draw()
@@ -169,7 +279,7 @@ def draw(self):
     def can_reap(self):
         """Determine if Emitter can be deleted"""
         is_emit_complete = self.rate_factory.is_complete()
-        can_reap = is_emit_complete and len(self._particles) <= 0
+        can_reap = is_emit_complete and self.get_count() <= 0
         if is_emit_complete and self._emit_done_cb:
             self._emit_done_cb(self)
             self._emit_done_cb = None
@@ -177,3 +287,100 @@ def can_reap(self):
             self._reap_cb()
             self._reap_cb = None
         return can_reap
+
+
+class EmitterGroup:
+    """Updates and draws many emitters together.
+
+    The emitters need a ``batch_factory``. The particles of all of them are kept in one
+    ParticleArrays, or GpuParticles with ``gpu`` set, so an update moves every particle of every
+    emitter in one pass, and drawing is one draw call. Each emitter still decides how many
+    particles it emits, but the batches they make are added together in one go. ``gravity``, ``fixed_step`` and ``max_substeps`` work like they do for an
+    Emitter, and replace the emitters' own.
+
+    Emitters that can be reaped are taken out of the group when it updates. Don't update or draw
+    the emitters in a group yourself.
+    """
+    def __init__(
+        self,
+        gpu: bool = False,
+        gravity: Vector = (0.0, 0.0),
+        fixed_step: float = None,
+        max_substeps: int = 5
+    ):
+        self._emitters: List[Emitter] = []
+        self._particles: Union[ParticleArrays, GpuParticles] = GpuParticles() if gpu else ParticleArrays()
+        self._particles.gravity = gravity
+        self._clock = None if fixed_step is None else _FixedStepClock(fixed_step, max_substeps)
+        # Live particles of each emitter, by its group id
+        self._counts = np.zeros(0, dtype=np.intp)
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._emitters)
+
+    def __iter__(self) -> Iterator[Emitter]:
+        return iter(self._emitters)
+
+    def append(self, emitter: Emitter):
+        """Add an emitter to the group"""
+        if emitter.batch_factory is None:
+            raise ValueError("Only an Emitter with a batch_factory can be in an EmitterGroup.")
+        if emitter._group is not None:
+            raise ValueError("Emitter is already in an EmitterGroup.")
+        emitter._group = self
+        emitter._group_id = self._next_id
+        self._next_id += 1
+        self._emitters.append(emitter)
+
+    def remove(self, emitter: Emitter):
+        """Take an emitter out of the group. Its particles stay in the group until they die."""
+        self._emitters.remove(emitter)
+        emitter._group = None
+
+    def _get_emitter_count(self, emitter: Emitter) -> int:
+        if emitter._group_id < len(self._counts):
+            return int(self._counts[emitter._group_id])
+        return 0
+
+    def get_count(self) -> int:
+        """Number of live particles of all the emitters"""
+        return len(self._particles)
+
+    def update(self, delta_time: float = 1 / 60):
+        """Advance every emitter and every particle by delta_time seconds, then take out reaped emitters"""
+        if self._clock is None:
+            self._step(delta_time)
+        else:
+            for _ in range(self._clock.get_steps(delta_time)):
+                self._step(self._clock.step)
+
+        reaped = [emitter for emitter in self._emitters if emitter.can_reap()]
+        for emitter in reaped:
+            self.remove(emitter)
+
+    def _step(self, delta_time: float):
+        batches = []
+        counts = []
+        emitting = []
+        for emitter in self._emitters:
+            emitter._move(delta_time)
+            emit_count = emitter.rate_factory.how_many(delta_time, emitter.get_count())
+            if emit_count > 0:
+                batches.append(emitter.batch_factory(emitter, emit_count))
+                counts.append(emit_count)
+                emitting.append(emitter)
+
+        if batches:
+            batch = _merge_batches(batches, counts, self._particles._textures)
+            # Each particle starts at, and turns with, its own emitter
+            offsets = np.repeat(np.array([(emitter.center_x, emitter.center_y) for emitter in emitting],
+                                         dtype=np.float32), counts, axis=0)
+            rotations = np.repeat(np.array([emitter.angle for emitter in emitting], dtype=np.float32), counts)
+            owners = np.repeat(np.array([emitter._group_id for emitter in emitting], dtype=np.int32), counts)
+            self._particles.add(batch, sum(counts), offsets, rotations, owners)
+        self._particles.update(delta_time)
+        self._counts = self._particles.get_owner_counts(self._next_id)
+
+    def draw(self):
+        self._particles.draw()
@@ -2,13 +2,41 @@
 Convenience functions that provide a much simpler interface to Emitters and Particles.
 
 These trade away some flexibility in favor of simplicity to allow beginners to start using particle systems.
+
+With ``batch`` set, the emitters make their particles in batches, kept in ParticleArrays, with the
+``*_array`` random functions from utils. Give those a seeded ``rng`` for the same particles every run.
 """
 
 import arcadeplus
 import random
-from typing import Sequence, Type
+from typing import Callable, Sequence, Type
+
+import numpy as np
+
 from arcadeplus.arcade_types import Point
 from arcadeplus.particle import FilenameOrTexture
+from arcadeplus.utils import _get_rng
+
+
+def _make_batch_factory(
+        filenames_and_textures: Sequence[FilenameOrTexture],
+        make_velocities: Callable[[int, np.random.Generator], np.ndarray],
+        particle_lifetime_min: float,
+        particle_lifetime_max: float,
+        particle_scale: float,
+        fade_particles: bool,
+        rng: np.random.Generator):
+    """Batch factory making the same particles as the simple emitters' particle factories"""
+    def batch_factory(emitter: arcadeplus.Emitter, count: int) -> arcadeplus.ParticleBatch:
+        return arcadeplus.ParticleBatch(
+            filenames_and_textures,
+            change_xy=make_velocities(count, rng),
+            lifetime=rng.uniform(particle_lifetime_min, particle_lifetime_max, count),
+            scale=particle_scale,
+            end_alpha=0 if fade_particles else None,
+            texture_index=rng.integers(len(filenames_and_textures), size=count)
+        )
+    return batch_factory
 
 
 def make_burst_emitter(
@@ -19,8 +47,20 @@ def make_burst_emitter(
         particle_lifetime_min: float,
         particle_lifetime_max: float,
         particle_scale: float = 1.0,
-        fade_particles: bool = True):
+        fade_particles: bool = True,
+        batch: bool = False,
+        rng: np.random.Generator = None):
     """Returns an emitter that emits all of its particles at once"""
+    if batch:
+        return arcadeplus.Emitter(
+            center_xy=center_xy,
+            emit_controller=arcadeplus.EmitBurst(particle_count),
+            batch_factory=_make_batch_factory(
+                filenames_and_textures,
+                lambda count, rng: arcadeplus.rand_in_circle_array(count, (0.0, 0.0), particle_speed, rng=rng),
+                particle_lifetime_min, particle_lifetime_max, particle_scale, fade_particles, _get_rng(rng)
+            )
+        )
     particle_factory: Type[arcadeplus.LifetimeParticle] = arcadeplus.LifetimeParticle
     if fade_particles:
         particle_factory = arcadeplus.FadeParticle
@@ -45,8 +85,20 @@ def make_interval_emitter(
         particle_lifetime_min: float,
         particle_lifetime_max: float,
         particle_scale: float = 1.0,
-        fade_particles: bool = True):
+        fade_particles: bool = True,
+        batch: bool = False,
+        rng: np.random.Generator = None):
     """Returns an emitter that emits its particles at a constant rate for a given amount of time"""
+    if batch:
+        return arcadeplus.Emitter(
+            center_xy=center_xy,
+            emit_controller=arcadeplus.EmitterIntervalWithTime(emit_interval, emit_duration),
+            batch_factory=_make_batch_factory(
+                filenames_and_textures,
+                lambda count, rng: arcadeplus.rand_on_circle_array(count, (0.0, 0.0), particle_speed, rng=rng),
+                particle_lifetime_min, particle_lifetime_max, particle_scale, fade_particles, _get_rng(rng)
+            )
+        )
     particle_factory: Type[arcadeplus.LifetimeParticle] = arcadeplus.LifetimeParticle
     if fade_particles:
         particle_factory = arcadeplus.FadeParticle
@@ -145,8 +145,8 @@ def __init__(
         self.out_duration = duration2
         self.end_alpha = end_alpha
 
-    def update(self):
-        super().update()
+    def update(self, delta_time: float = 1 / 60):
+        super().update(delta_time)
         if self.lifetime_elapsed <= self.in_duration:
             u = self.lifetime_elapsed / self.in_duration
             self.alpha = clamp(arcadeplus.lerp(self.start_alpha, self.mid_alpha, u), 0, 255)
@@ -158,10 +158,10 @@ def update(self):
 class RocketEmitter(arcadeplus.Emitter):
     """Custom emitter class to add gravity to the emitter to represent gravity on the firework shell"""
 
-    def update(self):
-        super().update()
+    def update(self, delta_time: float = 1 / 60):
+        super().update(delta_time)
         # gravity
-        self.change_y += -0.05
+        self.change_y += -0.05 * delta_time * 60
 
 
 class FireworksApp(arcadeplus.Window):
@@ -642,9 +642,9 @@ def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
             self.elapsed = 0.0
 
-        def update(self):
-            super().update()
-            self.elapsed += 1 / 60
+        def update(self, delta_time: float = 1 / 60):
+            super().update(delta_time)
+            self.elapsed += delta_time
             self.center_x = sine_wave(self.elapsed, 0, SCREEN_WIDTH, SCREEN_WIDTH / 100)
             self.center_y = sine_wave(self.elapsed, 0, SCREEN_HEIGHT, SCREEN_HEIGHT / 100)
 
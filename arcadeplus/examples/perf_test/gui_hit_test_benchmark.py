@@ -0,0 +1,97 @@
+"""
+GUI hit test benchmark
+
+Times sending mouse presses and releases to 10,000 buttons laid out like an
+inventory grid, by checking every button, and by using the spatial hash of a
+WidgetList. Also times moving buttons, which updates the spatial hash.
+
+No window is opened, so this doesn't need a display.
+
+If Python and ArcadePlus are installed, this example can be run from the command line with:
+python -m arcadeplus.examples.perf_test.gui_hit_test_benchmark
+"""
+import random
+import timeit
+
+import arcadeplus
+
+GRID_SIZE = 100
+SLOT_SIZE = 32
+CLICK_COUNT = 1000
+
+
+class SlotButton(arcadeplus.TextButton):
+    """ Inventory slot, counts the clicks it gets. """
+
+    def __init__(self, center_x, center_y):
+        super().__init__(center_x, center_y, SLOT_SIZE - 2, SLOT_SIZE - 2, "")
+        self.click_count = 0
+
+    def on_press(self):
+        self.pressed = True
+
+    def on_release(self):
+        if self.pressed:
+            self.pressed = False
+            self.click_count += 1
+
+
+def make_buttons():
+    return [SlotButton(SLOT_SIZE * (column + 0.5), SLOT_SIZE * (row + 0.5))
+            for row in range(GRID_SIZE) for column in range(GRID_SIZE)]
+
+
+def click_linear(buttons, clicks):
+    """ What Window did before WidgetList, check every button. """
+    for x, y in clicks:
+        for button in buttons:
+            if button.active:
+                button.check_mouse_press(x, y)
+        for button in buttons:
+            if button.active:
+                button.check_mouse_release(x, y)
+
+
+def click_widget_list(widget_list, clicks):
+    for x, y in clicks:
+        widget_list.mouse_press(x, y)
+        widget_list.mouse_release(x, y)
+
+
+def main():
+    random.seed(1)
+    size = GRID_SIZE * SLOT_SIZE
+    clicks = [(random.uniform(0, size), random.uniform(0, size)) for _ in range(CLICK_COUNT)]
+
+    buttons = make_buttons()
+    start_time = timeit.default_timer()
+    click_linear(buttons, clicks)
+    linear_time = timeit.default_timer() - start_time
+    linear_clicks = sum(button.click_count for button in buttons)
+
+    buttons = make_buttons()
+    start_time = timeit.default_timer()
+    widget_list = arcadeplus.WidgetList(buttons, cell_size=SLOT_SIZE * 4)
+    build_time = timeit.default_timer() - start_time
+
+    start_time = timeit.default_timer()
+    click_widget_list(widget_list, clicks)
+    widget_list_time = timeit.default_timer() - start_time
+    widget_list_clicks = sum(button.click_count for button in buttons)
+
+    start_time = timeit.default_timer()
+    for button in buttons:
+        button.center_x += SLOT_SIZE
+    move_time = timeit.default_timer() - start_time
+
+    print(f"{len(buttons)} buttons, {CLICK_COUNT} clicks")
+    print(f"Check every button:  {linear_time:8.4f} s, {linear_time / CLICK_COUNT * 1e6:9.1f} us per click,"
+          f" {linear_clicks} buttons clicked")
+    print(f"WidgetList:          {widget_list_time:8.4f} s, {widget_list_time / CLICK_COUNT * 1e6:9.1f} us per click,"
+          f" {widget_list_clicks} buttons clicked")
+    print(f"Build WidgetList:    {build_time:8.4f} s")
+    print(f"Move every button:   {move_time:8.4f} s")
+
+
+if __name__ == "__main__":
+    main()
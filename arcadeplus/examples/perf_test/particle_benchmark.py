@@ -0,0 +1,161 @@
+"""
+Particle benchmark
+
+Times Emitter updates with particles made one at a time as LifetimeParticle
+sprites, made by a ParticlePool that reuses the reaped ones, and made in
+batches and kept in ParticleArrays. Each emitter
+spawns enough particles a frame to hold about the given number alive, and
+each particle lives one second. For ParticleArrays, getting the instance
+data a draw streams to the GPU is timed too. The garbage collector's pauses
+during the updates are counted, with the longest one. Then times updating many small
+emitters one by one, and together in an EmitterGroup.
+
+Then, if an OpenGL context can be made, times GpuParticles, which update on
+the GPU, waiting for the GPU to finish each update. Otherwise no window is
+opened, so this doesn't need a display.
+
+If Python and ArcadePlus are installed, this example can be run from the command line with:
+python -m arcadeplus.examples.perf_test.particle_benchmark
+"""
+import timeit
+
+import numpy as np
+import pyglet.gl as gl
+
+import arcadeplus
+
+TEXTURE = ":resources:images/pinball/pool_cue_ball.png"
+SPRITE_COUNTS = [1000, 5000]
+ARRAY_COUNTS = [1000, 5000, 50000, 500000]
+FRAME_COUNT = 120
+LIFETIME = 1.0
+GROUP_EMITTER_COUNTS = [100, 500]
+GROUP_EMITTER_PARTICLES = 100
+
+rng = np.random.default_rng(1)
+
+
+def make_sprite_emitter(live_count, pool=None):
+    make_particle = arcadeplus.LifetimeParticle if pool is None else \
+        lambda *args, **kwargs: pool.acquire(arcadeplus.LifetimeParticle, *args, **kwargs)
+    return arcadeplus.Emitter(
+        center_xy=(400, 300),
+        emit_controller=arcadeplus.EmitInterval(LIFETIME / live_count),
+        particle_factory=lambda emitter: make_particle(
+            filename_or_texture=TEXTURE,
+            change_xy=arcadeplus.rand_in_circle((0.0, 0.0), 5.0),
+            lifetime=LIFETIME,
+            scale=0.5,
+            alpha=128
+        )
+    )
+
+
+def make_array_emitter(live_count, gpu=False):
+    return arcadeplus.Emitter(
+        center_xy=(400, 300),
+        emit_controller=arcadeplus.EmitInterval(LIFETIME / live_count),
+        batch_factory=lambda emitter, count: arcadeplus.ParticleBatch(
+            TEXTURE,
+            change_xy=arcadeplus.rand_in_circle_array(count, (0.0, 0.0), 5.0, rng=rng),
+            lifetime=LIFETIME,
+            scale=0.5,
+            start_alpha=128
+        ),
+        gpu=gpu
+    )
+
+
+def time_updates(emitter, finish=False, gc_pauses=None):
+    # Fill up to the steady state first
+    for _ in range(int(LIFETIME * 60) + 1):
+        emitter.update()
+    if gc_pauses is not None:
+        gc_pauses.start()
+    start_time = timeit.default_timer()
+    for _ in range(FRAME_COUNT):
+        emitter.update()
+        if finish:
+            gl.glFinish()
+    update_time = (timeit.default_timer() - start_time) / FRAME_COUNT
+    if gc_pauses is not None:
+        gc_pauses.stop()
+    return update_time
+
+
+def make_small_emitter(index):
+    return arcadeplus.Emitter(
+        center_xy=(index % 40 * 20, index // 40 * 20),
+        emit_controller=arcadeplus.EmitInterval(LIFETIME / GROUP_EMITTER_PARTICLES),
+        batch_factory=lambda emitter, count: arcadeplus.ParticleBatch(
+            TEXTURE,
+            change_xy=rng.uniform(-1, 1, (count, 2)),
+            lifetime=LIFETIME,
+            scale=0.1
+        )
+    )
+
+
+def time_group(emitter_count):
+    emitters = [make_small_emitter(index) for index in range(emitter_count)]
+    for _ in range(int(LIFETIME * 60) + 1):
+        for emitter in emitters:
+            emitter.update()
+    start_time = timeit.default_timer()
+    for _ in range(FRAME_COUNT):
+        for emitter in emitters:
+            emitter.update()
+    one_by_one_time = (timeit.default_timer() - start_time) / FRAME_COUNT
+
+    group = arcadeplus.EmitterGroup()
+    for index in range(emitter_count):
+        group.append(make_small_emitter(index))
+    update_time = time_updates(group)
+    print(f"{emitter_count:>8} {group.get_count():>10} {one_by_one_time * 1000:15.2f} {update_time * 1000:18.2f}")
+
+
+def main():
+    print(f"{'Particles':<16} {'Live':>8} {'Update (ms)':>12} {'Instance data (ms)':>19} {'GC pauses':>10} "
+          f"{'Max GC (ms)':>12} {'Pool hits':>10}")
+    for live_count in SPRITE_COUNTS:
+        for name, pool in (("Sprites", None), ("Pooled sprites", arcadeplus.ParticlePool())):
+            emitter = make_sprite_emitter(live_count, pool)
+            gc_pauses = arcadeplus.GcPauseMonitor()
+            update_time = time_updates(emitter, gc_pauses=gc_pauses)
+            hit_rate = '-' if pool is None else f"{pool.hit_rate:.0%}"
+            print(f"{name:<16} {emitter.get_count():>8} {update_time * 1000:12.2f} {'-':>19} {gc_pauses.count:>10} "
+                  f"{gc_pauses.max_time * 1000:12.2f} {hit_rate:>10}")
+
+    for live_count in ARRAY_COUNTS:
+        emitter = make_array_emitter(live_count)
+        gc_pauses = arcadeplus.GcPauseMonitor()
+        update_time = time_updates(emitter, gc_pauses=gc_pauses)
+        particles = emitter._particles
+        start_time = timeit.default_timer()
+        for _ in range(10):
+            particles._render[particles._live()].tobytes()
+        fill_time = (timeit.default_timer() - start_time) / 10
+        print(f"{'ParticleArrays':<16} {emitter.get_count():>8} {update_time * 1000:12.2f} {fill_time * 1000:19.2f} "
+              f"{gc_pauses.count:>10} {gc_pauses.max_time * 1000:12.2f} {'-':>10}")
+
+    print()
+    print(f"{'Emitters':>8} {'Particles':>10} {'One by one (ms)':>15} {'EmitterGroup (ms)':>18}")
+    for emitter_count in GROUP_EMITTER_COUNTS:
+        time_group(emitter_count)
+
+    try:
+        window = arcadeplus.Window(200, 200, "Particle benchmark", update_rate=None, antialiasing=False)
+    except Exception as exception:
+        print(f"Skipping GpuParticles, no OpenGL context: {exception}")
+        return
+    print()
+    print(gl.gl_info.get_renderer())
+    for live_count in ARRAY_COUNTS:
+        emitter = make_array_emitter(live_count, gpu=True)
+        update_time = time_updates(emitter, finish=True)
+        print(f"{'GpuParticles':<16} {emitter.get_count():>8} {update_time * 1000:12.2f} {'-':>19}")
+    window.close()
+
+
+if __name__ == "__main__":
+    main()
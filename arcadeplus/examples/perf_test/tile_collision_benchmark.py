@@ -0,0 +1,139 @@
+"""
+Tile collision benchmark
+
+Writes a generated platformer level to a temporary .tmx file, then times
+PhysicsEnginePlatformer moving players around it, with the walls loaded as a
+SpriteList by process_layer, as a SpriteList with a spatial hash, and as a
+TileCollisionMap. Also times plain collision checks of a sprite against the
+walls.
+
+No window is opened, so this doesn't need a display.
+
+If Python and ArcadePlus are installed, this example can be run from the command line with:
+python -m arcadeplus.examples.perf_test.tile_collision_benchmark
+"""
+import os
+import random
+import tempfile
+import timeit
+
+import arcadeplus
+
+MAP_WIDTH = 400
+MAP_HEIGHT = 100
+TILE_SIZE = 64
+PLAYER_COUNT = 10
+UPDATE_COUNT = 200
+CHECK_COUNT = 2000
+
+RESOURCE_PATH = os.path.join(os.path.dirname(os.path.abspath(arcadeplus.__file__)), "resources", "images")
+PLAYER_IMAGE = ":resources:images/animated_characters/female_person/femalePerson_idle.png"
+
+
+def write_map(file_name):
+    """ Write a level with ground, walls around it, and random platforms. """
+    data = [[0] * MAP_WIDTH for _ in range(MAP_HEIGHT)]
+    for column in range(MAP_WIDTH):
+        data[0][column] = data[MAP_HEIGHT - 1][column] = 1
+    for row in range(MAP_HEIGHT):
+        data[row][0] = data[row][MAP_WIDTH - 1] = 1
+    for _ in range(MAP_WIDTH * MAP_HEIGHT // 20):
+        row = random.randrange(2, MAP_HEIGHT - 2)
+        column = random.randrange(1, MAP_WIDTH - 6)
+        for offset in range(random.randrange(1, 5)):
+            data[row][column + offset] = 2
+    rows = ",\n".join(",".join(str(gid) for gid in row) for row in data)
+
+    with open(file_name, "w") as file:
+        file.write(f'''<?xml version="1.0" encoding="UTF-8"?>
+<map version="1.2" tiledversion="1.2.5" orientation="orthogonal" renderorder="right-down" width="{MAP_WIDTH}" height="{MAP_HEIGHT}" tilewidth="{TILE_SIZE}" tileheight="{TILE_SIZE}" infinite="0" nextlayerid="2" nextobjectid="1">
+ <tileset firstgid="1" name="Walls" tilewidth="{TILE_SIZE}" tileheight="{TILE_SIZE}" tilecount="2" columns="0">
+  <grid orientation="orthogonal" width="1" height="1"/>
+  <tile id="0">
+   <image width="{TILE_SIZE}" height="{TILE_SIZE}" source="{RESOURCE_PATH}/tiles/boxCrate_double.png"/>
+  </tile>
+  <tile id="1">
+   <image width="{TILE_SIZE}" height="{TILE_SIZE}" source="{RESOURCE_PATH}/tiles/grassMid.png"/>
+  </tile>
+ </tileset>
+ <layer id="1" name="Walls" width="{MAP_WIDTH}" height="{MAP_HEIGHT}">
+  <data encoding="csv">
+{rows}
+</data>
+ </layer>
+</map>
+''')
+
+
+def make_players(walls):
+    """ One player per engine, dropped in at the same random spots for every kind of walls. """
+    random.seed(2)
+    engines = []
+    for _ in range(PLAYER_COUNT):
+        player = arcadeplus.Sprite(PLAYER_IMAGE, 0.4)
+        player.center_x = random.uniform(2, MAP_WIDTH - 2) * TILE_SIZE
+        player.center_y = random.uniform(2, MAP_HEIGHT - 2) * TILE_SIZE
+        player.change_x = random.choice((-4, 4))
+        engines.append(arcadeplus.PhysicsEnginePlatformer(player, walls))
+    return engines
+
+
+def run_engines(engines):
+    for frame in range(UPDATE_COUNT):
+        for engine in engines:
+            if frame % 40 == 0 and engine.can_jump():
+                engine.jump(12)
+            engine.update()
+
+
+def time_walls(name, walls, check):
+    engines = make_players(walls)
+    start_time = timeit.default_timer()
+    run_engines(engines)
+    update_time = timeit.default_timer() - start_time
+    updates = UPDATE_COUNT * PLAYER_COUNT
+
+    probe = arcadeplus.Sprite(PLAYER_IMAGE, 0.4)
+    random.seed(3)
+    spots = [(random.uniform(0, MAP_WIDTH * TILE_SIZE), random.uniform(0, MAP_HEIGHT * TILE_SIZE))
+             for _ in range(CHECK_COUNT)]
+    start_time = timeit.default_timer()
+    hits = 0
+    for probe.center_x, probe.center_y in spots:
+        if check(probe):
+            hits += 1
+    check_time = timeit.default_timer() - start_time
+
+    print(f"{name:<18} {update_time / updates * 1e6:12.1f} {check_time / CHECK_COUNT * 1e6:12.1f} {hits:>6}")
+
+
+def main():
+    random.seed(1)
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "level.tmx")
+        write_map(file_name)
+        tmx_map = arcadeplus.tilemap.read_tmx(file_name)
+
+        start_time = timeit.default_timer()
+        wall_list = arcadeplus.tilemap.process_layer(tmx_map, "Walls")
+        sprite_load_time = timeit.default_timer() - start_time
+
+        hashed_wall_list = arcadeplus.SpriteList(use_spatial_hash=True, is_static=True)
+        hashed_wall_list.extend(wall_list)
+
+        start_time = timeit.default_timer()
+        collision_map = arcadeplus.TileCollisionMap(tmx_map, "Walls")
+        map_load_time = timeit.default_timer() - start_time
+
+    print(f"{MAP_WIDTH} x {MAP_HEIGHT} map, {len(wall_list)} walls, {PLAYER_COUNT} players")
+    print(f"Load SpriteList: {sprite_load_time:.3f} s, load TileCollisionMap: {map_load_time:.3f} s")
+    print(f"{'Walls':<18} {'us / update':>12} {'us / check':>12} {'hits':>6}")
+    time_walls("SpriteList", wall_list,
+               lambda sprite: len(arcadeplus.check_for_collision_with_list(sprite, wall_list)) > 0)
+    time_walls("Spatial hash", hashed_wall_list,
+               lambda sprite: len(arcadeplus.check_for_collision_with_list(sprite, hashed_wall_list)) > 0)
+    time_walls("TileCollisionMap", collision_map, collision_map.collides_with_sprite)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Tile map load benchmark
+
+Writes large generated .tmx maps to a temporary directory, then times reading
+them with arcadeplus.tilemap.read_tmx, from the .tmx file and from the
+compiled map cache, and looking up the tile of every cell.
+The lookup is timed both by searching the tile sets for each cell, like
+tilemap used to, and with the map's GID lookup table. For the smaller maps,
+building the whole SpriteList with process_layer is timed too, along with
+how much of that went on finding the tile images.
+
+Then times reading whole maps, with CSV and with zlib compressed base64
+layer data, using pytiled_parser.parse_tile_map and using read_tmx. Last,
+times decoding just the layer data, with pytiled_parser's decoder and with
+the NumPy one read_tmx uses.
+
+If Python and ArcadePlus are installed, this example can be run from the command line with:
+python -m arcadeplus.examples.perf_test.tilemap_load_benchmark
+"""
+import base64
+import os
+import random
+import tempfile
+import timeit
+import zlib
+from xml.etree import ElementTree
+
+import numpy as np
+import pytiled_parser
+from pytiled_parser import xml_parser
+
+import arcadeplus
+
+MAP_SIZES = [100, 300, 1000]
+# Building sprites for every tile is slow, only do it for maps up to this size
+MAX_PROCESS_LAYER_SIZE = 300
+
+RESOURCE_PATH = os.path.join(os.path.dirname(os.path.abspath(arcadeplus.__file__)), "resources", "images")
+
+TILESETS = f'''
+ <tileset firstgid="1" name="Coins" tilewidth="64" tileheight="64" tilecount="3" columns="0">
+  <grid orientation="orthogonal" width="1" height="1"/>
+  <tile id="0">
+   <image width="64" height="64" source="{RESOURCE_PATH}/items/gold_1.png"/>
+  </tile>
+  <tile id="1">
+   <image width="64" height="64" source="{RESOURCE_PATH}/items/gold_2.png"/>
+  </tile>
+  <tile id="2">
+   <image width="64" height="64" source="{RESOURCE_PATH}/items/gold_3.png"/>
+  </tile>
+ </tileset>
+ <tileset firstgid="4" name="Numbers" tilewidth="16" tileheight="16" tilecount="6" columns="3">
+  <image source="{RESOURCE_PATH}/spritesheets/number_sheet.png" trans="ffffff" width="48" height="32"/>
+ </tileset>
+'''
+
+
+def make_gids(size):
+    return [[random.choice((0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 0x80000004)) if random.random() > 0.25 else 0
+             for _ in range(size)] for _ in range(size)]
+
+
+def write_map(file_name, size, encoding="csv"):
+    """
+    Write a size x size map, about a quarter empty, using tiles from both tile sets.
+    The layer data is CSV, or zlib compressed base64 if encoding is "base64".
+    """
+    gids = make_gids(size)
+    if encoding == "csv":
+        data_attributes = 'encoding="csv"'
+        data = ",\n".join(",".join(str(gid) for gid in row) for row in gids)
+    else:
+        data_attributes = 'encoding="base64" compression="zlib"'
+        data = base64.b64encode(zlib.compress(np.array(gids, dtype="<u4").tobytes())).decode()
+
+    with open(file_name, "w") as file:
+        file.write(f'''<?xml version="1.0" encoding="UTF-8"?>
+<map version="1.2" tiledversion="1.2.5" orientation="orthogonal" renderorder="right-down" width="{size}" height="{size}" tilewidth="16" tileheight="16" infinite="0" nextlayerid="2" nextobjectid="1">
+{TILESETS}
+ <layer id="1" name="Tiles" width="{size}" height="{size}">
+  <data {data_attributes}>
+{data}
+</data>
+ </layer>
+</map>
+''')
+
+
+def time_decoding():
+    print(f"{'Size':>6} {'Encoding':>12} {'Data (MB)':>10} {'pytiled_parser (s)':>19} {'NumPy (s)':>10}")
+    for size in MAP_SIZES:
+        gids = make_gids(size)
+        csv_text = "\n" + ",\n".join(",".join(str(gid) for gid in row) for row in gids) + "\n"
+        zlib_text = base64.b64encode(zlib.compress(np.array(gids, dtype="<u4").tobytes())).decode()
+
+        for encoding, compression, text in (("csv", None, csv_text), ("base64", "zlib", zlib_text)):
+            element = ElementTree.Element("data")
+            element.text = text
+
+            start_time = timeit.default_timer()
+            xml_parser._decode_data(element, size, encoding, compression)
+            parser_time = timeit.default_timer() - start_time
+
+            start_time = timeit.default_timer()
+            arcadeplus.tilemap._decode_data(element, size, encoding, compression)
+            numpy_time = timeit.default_timer() - start_time
+
+            name = encoding if compression is None else f"{encoding}-{compression}"
+            print(f"{size:>6} {name:>12} {len(text) / 1e6:10.2f} {parser_time:19.3f} {numpy_time:10.4f}")
+
+
+def time_reading(directory):
+    print(f"{'Size':>6} {'Encoding':>12} {'parse_tile_map (s)':>19} {'read_tmx (s)':>13}")
+    for size in MAP_SIZES:
+        for encoding in ("csv", "base64"):
+            file_name = os.path.join(directory, f"map_{size}_{encoding}.tmx")
+            write_map(file_name, size, encoding)
+
+            start_time = timeit.default_timer()
+            pytiled_parser.parse_tile_map(file_name)
+            parser_time = timeit.default_timer() - start_time
+
+            start_time = timeit.default_timer()
+            arcadeplus.tilemap.read_tmx(file_name)
+            read_time = timeit.default_timer() - start_time
+
+            name = "csv" if encoding == "csv" else "base64-zlib"
+            print(f"{size:>6} {name:>12} {parser_time:19.3f} {read_time:13.3f}")
+
+
+def main():
+    random.seed(1)
+    print(f"{'Size':>6} {'Read (s)':>10} {'Cached (s)':>11} {'Search (s)':>11} {'Table (s)':>10} "
+          f"{'process_layer (s)':>18} {'Find images (ms)':>17}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in MAP_SIZES:
+            file_name = os.path.join(directory, f"map_{size}.tmx")
+            write_map(file_name, size)
+
+            start_time = timeit.default_timer()
+            tmx_map = arcadeplus.tilemap.read_tmx(file_name)
+            read_time = timeit.default_timer() - start_time
+
+            # The first read with a cache directory writes the cache
+            cache_directory = os.path.join(directory, "cache")
+            arcadeplus.tilemap.read_tmx(file_name, cache_directory=cache_directory)
+            start_time = timeit.default_timer()
+            arcadeplus.tilemap.read_tmx(file_name, cache_directory=cache_directory)
+            cached_time = timeit.default_timer() - start_time
+
+            layer = arcadeplus.tilemap.get_tilemap_layer(tmx_map, "Tiles")
+            gids = [gid for row in layer.data.tolist() for gid in row if gid]
+
+            # Search the tile sets for every cell
+            gid_lookup = tmx_map.gid_lookup
+            start_time = timeit.default_timer()
+            for gid in gids:
+                gid_lookup._find_tile(gid)
+            search_time = timeit.default_timer() - start_time
+
+            start_time = timeit.default_timer()
+            for gid in gids:
+                gid_lookup.get_tile(gid)
+            table_time = timeit.default_timer() - start_time
+
+            if size <= MAX_PROCESS_LAYER_SIZE:
+                start_time = timeit.default_timer()
+                arcadeplus.tilemap.process_layer(tmx_map, "Tiles")
+                process_time = f"{timeit.default_timer() - start_time:18.3f}"
+                image_time = f"{tmx_map.image_paths.resolve_time * 1000:17.3f}"
+            else:
+                process_time = f"{'-':>18}"
+                image_time = f"{'-':>17}"
+
+            print(f"{size:>6} {read_time:10.3f} {cached_time:11.4f} {search_time:11.3f} {table_time:10.3f} "
+                  f"{process_time} {image_time}")
+
+        print()
+        time_reading(directory)
+
+    print()
+    time_decoding()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Polygon triangulation benchmark
+
+Times arcadeplus.earclip on large concave polygons, and how long a repeat
+call to arcadeplus.triangulate_polygon takes once the result is cached.
+
+If Python and ArcadePlus are installed, this example can be run from the command line with:
+python -m arcadeplus.examples.perf_test.triangulation_benchmark
+"""
+import math
+import random
+import timeit
+
+import arcadeplus
+
+POINT_COUNTS = [100, 1000, 10000]
+
+
+def star_polygon(point_count):
+    """ Concave polygon, every other point is pulled in towards the center. """
+    point_list = []
+    for i in range(point_count):
+        angle = 2 * math.pi * i / point_count
+        radius = 100 if i % 2 == 0 else 50
+        point_list.append((radius * math.cos(angle), radius * math.sin(angle)))
+    return point_list
+
+
+def random_polygon(point_count):
+    """ Concave polygon with a random radius at each point. """
+    point_list = []
+    for i in range(point_count):
+        angle = 2 * math.pi * i / point_count
+        radius = random.uniform(30, 100)
+        point_list.append((radius * math.cos(angle), radius * math.sin(angle)))
+    return point_list
+
+
+def comb_polygon(point_count):
+    """ Polygon with long thin teeth. A bad case, as ears overlap many reflex points. """
+    teeth = max(1, (point_count - 2) // 4)
+    top = []
+    for i in range(teeth):
+        top += [(2 * i, 10), (2 * i + 1, 10), (2 * i + 1, 1), (2 * i + 2, 1)]
+    return [(0, 0), (2 * teeth, 0)] + list(reversed(top))
+
+
+def main():
+    random.seed(1)
+    print(f"{'Polygon':<10} {'Points':>8} {'Triangles':>10} {'Earclip (s)':>12} {'Cached (s)':>12}")
+    for name, generator in (("star", star_polygon), ("random", random_polygon), ("comb", comb_polygon)):
+        for point_count in POINT_COUNTS:
+            point_list = generator(point_count)
+
+            start_time = timeit.default_timer()
+            triangles = arcadeplus.earclip(point_list)
+            earclip_time = timeit.default_timer() - start_time
+
+            arcadeplus.triangulate_polygon(point_list)
+            start_time = timeit.default_timer()
+            arcadeplus.triangulate_polygon(point_list)
+            cached_time = timeit.default_timer() - start_time
+
+            print(f"{name:<10} {len(point_list):>8} {len(triangles):>10} {earclip_time:>12.4f} {cached_time:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
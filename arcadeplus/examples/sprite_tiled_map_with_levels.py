@@ -70,6 +70,8 @@ def __init__(self):
 
         self.level = 1
         self.max_level = 2
+        # Loads the next level in the background
+        self.preloader = None
 
     def setup(self):
         """ Set up the game and initialize the variables. """
@@ -87,13 +89,22 @@ def setup(self):
         self.player_sprite.center_y = 64
         self.player_list.append(self.player_sprite)
 
+        self.preload_level(self.level)
         self.load_level(self.level)
 
         self.game_over = False
 
+    def preload_level(self, level):
+        """ Start loading a level in the background, while the current one is played. """
+        self.preloader = None
+        if level <= self.max_level:
+            self.preloader = arcadeplus.LevelPreloader(f":resources:tmx_maps/level_{level}.tmx",
+                                                       ['Platforms'], TILE_SPRITE_SCALING)
+
     def load_level(self, level):
-        # Read in the tiled map
-        my_map = arcadeplus.tilemap.read_tmx(f":resources:tmx_maps/level_{level}.tmx")
+        # Take the preloaded map, finishing it now if it isn't done yet
+        self.preloader.wait()
+        my_map = self.preloader.map_object
 
         # --- Walls ---
 
@@ -101,7 +112,7 @@ def load_level(self, level):
         self.end_of_map = my_map.map_size.width * GRID_PIXEL_SIZE
 
         # Grab the layer of items we can't move through
-        self.wall_list = arcadeplus.tilemap.process_layer(my_map, 'Platforms', TILE_SPRITE_SCALING)
+        self.wall_list = self.preloader.layers['Platforms']
 
         self.physics_engine = arcadeplus.PhysicsEnginePlatformer(self.player_sprite,
                                                              self.wall_list,
@@ -117,6 +128,9 @@ def load_level(self, level):
         self.view_left = 0
         self.view_bottom = 0
 
+        # Get the next level ready while this one is played
+        self.preload_level(level + 1)
+
     def on_draw(self):
         """
         Render the screen.
@@ -174,6 +188,10 @@ def on_key_release(self, key, modifiers):
     def on_update(self, delta_time):
         """ Movement and game logic """
 
+        # Spend a few milliseconds a frame getting the next level ready
+        if self.preloader:
+            self.preloader.update()
+
         if self.player_sprite.right >= self.end_of_map:
             if self.level < self.max_level:
                 self.level += 1
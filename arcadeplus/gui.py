@@ -1,10 +1,39 @@
-from typing import Tuple, Dict, Optional, Union
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pyglet.gl as gl
+
 import arcadeplus
+from arcadeplus import shader
 # from abc import ABC, abstractmethod
 
 
+def _bounds_property(name: str) -> property:
+    """
+    A position or size attribute of a widget. Setting it keeps the
+    WidgetLists the widget is in up to date.
+    """
+    attribute = '_' + name
+
+    def _get(self):
+        return getattr(self, attribute)
+
+    def _set(self, value):
+        setattr(self, attribute, value)
+        for widget_list, widget in getattr(self, '_bounds_watchers', ()):
+            widget_list._move(widget)
+
+    return property(_get, _set)
+
+
 class TextButton:
     """ Text-based button """
+    center_x = _bounds_property('center_x')
+    center_y = _bounds_property('center_y')
+    width = _bounds_property('width')
+    height = _bounds_property('height')
+
     def __init__(self,
                  center_x, center_y,
                  width, height,
@@ -15,6 +44,7 @@ def __init__(self,
                  shadow_color=arcadeplus.color.GRAY,
                  button_height=2,
                  theme=None):
+        self._bounds_watchers = []
         self.center_x = center_x
         self.center_y = center_y
         self.width = width
@@ -102,12 +132,48 @@ def draw(self):
                          width=self.width, align="center",
                          anchor_x="center", anchor_y="center")
 
+    def _get_gui_state(self) -> tuple:
+        if self.theme:
+            look = self.normal_texture, self.clicked_texture
+        else:
+            look = self.face_color, self.highlight_color, self.shadow_color, self.button_height
+        return (self.active, self.center_x, self.center_y, self.width, self.height, self.text,
+                self.pressed, self.font_color, self.font_size, self.font_name, look)
+
+    def _encode_gui(self, encoder: '_GuiEncoder'):
+        if self.theme:
+            texture = self.clicked_texture if self.pressed else self.normal_texture
+            encoder.add_texture(self.center_x, self.center_y, self.width, self.height, texture)
+        else:
+            encoder.add_rectangle(self.center_x, self.center_y, self.width, self.height, self.face_color)
+            left = self.center_x - self.width / 2
+            right = self.center_x + self.width / 2
+            bottom = self.center_y - self.height / 2
+            top = self.center_y + self.height / 2
+            if not self.pressed:
+                lower_color, upper_color = self.shadow_color, self.highlight_color
+            else:
+                lower_color, upper_color = self.highlight_color, self.shadow_color
+            encoder.add_line(left, bottom, right, bottom, lower_color, self.button_height)
+            encoder.add_line(right, bottom, right, top, lower_color, self.button_height)
+            encoder.add_line(left, top, right, top, upper_color, self.button_height)
+            encoder.add_line(left, bottom, left, top, upper_color, self.button_height)
+
+        encoder.add_text(self.text, self.center_x, self.center_y, self.font_color,
+                         font_size=self.font_size, font_name=self.font_name,
+                         width=self.width, align="center",
+                         anchor_x="center", anchor_y="center")
+
     def on_press(self):
         pass
 
     def on_release(self):
         pass
 
+    def _get_bounds(self) -> Tuple[float, float, float, float]:
+        return (self.center_x - self.width / 2, self.center_y - self.height / 2,
+                self.center_x + self.width / 2, self.center_y + self.height / 2)
+
     def check_mouse_press(self, x, y):
         if x > self.center_x + self.width / 2:
             return
@@ -142,14 +208,20 @@ def on_release(self):
 
 
 class DialogueBox:
+    x = _bounds_property('x')
+    y = _bounds_property('y')
+    width = _bounds_property('width')
+    height = _bounds_property('height')
+
     def __init__(self, x, y, width, height, color=None, theme=None):
+        self._bounds_watchers = []
         self.x = x
         self.y = y
         self.width = width
         self.height = height
         self.color = color
         self.active = False
-        self.button_list = []
+        self.button_list = WidgetList()
         self.text_list = []
         self.theme = theme
         if self.theme:
@@ -166,13 +238,40 @@ def on_draw(self):
             for text in self.text_list:
                 text.draw()
 
+    def _get_gui_state(self) -> tuple:
+        return (self.active, self.x, self.y, self.width, self.height, self.color,
+                self.texture if self.theme else None)
+
+    def _encode_gui(self, encoder: '_GuiEncoder'):
+        if not self.active:
+            return
+        if self.theme:
+            encoder.add_texture(self.x, self.y, self.width, self.height, self.texture)
+        else:
+            encoder.add_rectangle(self.x, self.y, self.width, self.height, self.color)
+
+    def _get_gui_children(self) -> list:
+        if not self.active:
+            return []
+        return self.button_list + self.text_list
+
+    def _get_bounds(self) -> Tuple[float, float, float, float]:
+        return (self.x - self.width / 2, self.y - self.height / 2,
+                self.x + self.width / 2, self.y + self.height / 2)
+
     def on_mouse_press(self, x, y, _button, _modifiers):
-        for button in self.button_list:
-            button.check_mouse_press(x, y)
+        if isinstance(self.button_list, WidgetList):
+            self.button_list.mouse_press(x, y)
+        else:
+            for button in self.button_list:
+                button.check_mouse_press(x, y)
 
     def on_mouse_release(self, x, y, _button, _modifiers):
-        for button in self.button_list:
-            button.check_mouse_release(x, y)
+        if isinstance(self.button_list, WidgetList):
+            self.button_list.mouse_release(x, y)
+        else:
+            for button in self.button_list:
+                button.check_mouse_release(x, y)
 
 
 class TextLabel:
@@ -205,10 +304,29 @@ def draw(self):
                          font_name=self.font_name, bold=self.bold,
                          italic=self.italic, rotation=self.rotation)
 
+    def _get_gui_state(self) -> tuple:
+        return (self.active, self.text, self.x, self.y, self.color, self.font_size,
+                self.anchor_x, self.anchor_y, self.width, self.align, self.font_name,
+                self.bold, self.italic, self.rotation)
+
+    def _encode_gui(self, encoder: '_GuiEncoder'):
+        encoder.add_text(self.text, self.x, self.y, self.color, font_size=self.font_size,
+                         anchor_x=self.anchor_x,
+                         anchor_y=self.anchor_y,
+                         width=self.width, align=self.align,
+                         font_name=self.font_name, bold=self.bold,
+                         italic=self.italic, rotation=self.rotation)
+
 
 class TextDisplay:
+    x = _bounds_property('x')
+    y = _bounds_property('y')
+    width = _bounds_property('width')
+    height = _bounds_property('height')
+
     def __init__(self, x, y, width=300, height=40, outline_color=arcadeplus.color.BLACK,
                  shadow_color=arcadeplus.color.WHITE_SMOKE, highlight_color=arcadeplus.color.WHITE, theme=None):
+        self._bounds_watchers = []
         self.x = x
         self.y = y
         self.width = width
@@ -261,6 +379,30 @@ def draw(self):
         else:
             self.texture_theme_draw()
 
+    def _get_gui_state(self) -> tuple:
+        return (self.x, self.y, self.width, self.height, self.highlighted, self.text, self.symbol,
+                self.cursor_index, self.outline_color, self.shadow_color, self.highlight_color,
+                self.texture, self.font_size, self.font_color, self.font_name)
+
+    def _encode_gui(self, encoder: '_GuiEncoder'):
+        if self.texture:
+            encoder.add_texture(self.x, self.y, self.width, self.height, self.texture)
+        else:
+            color = self.highlight_color if self.highlighted else self.shadow_color
+            encoder.add_rectangle(self.x, self.y, self.width, self.height, color)
+            encoder.add_rectangle_outline(self.x, self.y, self.width, self.height, self.outline_color, 2)
+
+        if self.highlighted:
+            text = self.text[:self.cursor_index] + self.symbol + self.text[self.cursor_index:]
+        else:
+            text = self.text
+        encoder.add_text(text, self.x - self.width / 2.1, self.y, self.font_color, font_size=self.font_size,
+                         anchor_y="center", font_name=self.font_name)
+
+    def _get_bounds(self) -> Tuple[float, float, float, float]:
+        return (self.x - self.width / 2, self.y - self.height / 2,
+                self.x + self.width / 2, self.y + self.height / 2)
+
     def on_press(self):
         self.highlighted = True
 
@@ -382,6 +524,20 @@ def __init__(self, x, y, width=300, height=40, theme=None, outline_color=arcadep
     def draw(self):
         self.text_display.draw()
 
+    def _get_gui_state(self) -> tuple:
+        return self.text_display._get_gui_state()
+
+    def _encode_gui(self, encoder: '_GuiEncoder'):
+        self.text_display._encode_gui(encoder)
+
+    @property
+    def _bounds_watchers(self) -> list:
+        # The text display holds the position and size
+        return self.text_display._bounds_watchers
+
+    def _get_bounds(self) -> Tuple[float, float, float, float]:
+        return self.text_display._get_bounds()
+
     def update(self, delta_time, key):
         if self.text_display.highlighted:
             self.text, symbol, cursor_index = self.text_storage.update(delta_time, key)
@@ -428,3 +584,684 @@ def set_font(self, font_size, font_color, font_name=('Calibri', 'Arial')):
         self.font_color = font_color
         self.font_size = font_size
         self.font_name = font_name
+
+
+class _WidgetSpatialHash:
+    """
+    Spatial hash of widget bounds, like the one SpriteList uses for sprites.
+
+    Each widget is put in every cell its bounds overlap, so finding the
+    widgets at a point only looks at the widgets in one cell.
+    """
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.contents: Dict[Tuple[int, int], List[Any]] = {}
+        # Cells each widget is in, so it can be removed after it has moved
+        self.widget_cells: Dict[int, Tuple[int, int, int, int]] = {}
+
+    def _hash(self, x: float, y: float) -> Tuple[int, int]:
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, widget):
+        left, bottom, right, top = widget._get_bounds()
+        min_i, min_j = self._hash(left, bottom)
+        max_i, max_j = self._hash(right, top)
+        self.widget_cells[id(widget)] = min_i, min_j, max_i, max_j
+        for i in range(min_i, max_i + 1):
+            for j in range(min_j, max_j + 1):
+                self.contents.setdefault((i, j), []).append(widget)
+
+    def remove(self, widget):
+        min_i, min_j, max_i, max_j = self.widget_cells.pop(id(widget))
+        for i in range(min_i, max_i + 1):
+            for j in range(min_j, max_j + 1):
+                bucket = self.contents[i, j]
+                bucket.remove(widget)
+                if not bucket:
+                    del self.contents[i, j]
+
+    def get_objects_for_point(self, x: float, y: float) -> List[Any]:
+        return self.contents.get(self._hash(x, y), [])
+
+
+class WidgetList(list):
+    """
+    A list of widgets that keeps a spatial hash of where they are, so the
+    widgets under the mouse are found without checking every widget.
+
+    It is used like a normal list. Moving or resizing a widget in the list,
+    by setting its position or size, updates the spatial hash.
+
+    ``Window`` and ``View`` keep their ``button_list`` and ``textbox_list``
+    in WidgetLists.
+
+    :param widgets: Widgets to start with.
+    :param float cell_size: Size of the spatial hash cells. Something around
+                            the size of the widgets works well.
+    """
+
+    def __init__(self, widgets: Iterable = (), cell_size: float = 128):
+        super().__init__()
+        self._spatial_hash = _WidgetSpatialHash(cell_size)
+        # How many times each widget is in the list, by id
+        self._counts: Dict[int, int] = {}
+        # Widgets that don't say where they are. Every mouse event is sent to them.
+        self._unindexed: Dict[int, Any] = {}
+        # Widgets the last mouse press was sent to
+        self._pressed_widgets: List[Any] = []
+        self.extend(widgets)
+
+    def _add(self, widget):
+        count = self._counts.get(id(widget), 0)
+        if count == 0:
+            watchers = getattr(widget, '_bounds_watchers', None)
+            if watchers is None:
+                self._unindexed[id(widget)] = widget
+            else:
+                self._spatial_hash.insert(widget)
+                watchers.append((self, widget))
+        self._counts[id(widget)] = count + 1
+
+    def _discard(self, widget):
+        count = self._counts[id(widget)] - 1
+        if count:
+            self._counts[id(widget)] = count
+            return
+        del self._counts[id(widget)]
+        if self._unindexed.pop(id(widget), None) is None:
+            self._spatial_hash.remove(widget)
+            watchers = widget._bounds_watchers
+            for i, (widget_list, _) in enumerate(watchers):
+                if widget_list is self:
+                    del watchers[i]
+                    break
+        if widget in self._pressed_widgets:
+            self._pressed_widgets.remove(widget)
+
+    def _move(self, widget):
+        self._spatial_hash.remove(widget)
+        self._spatial_hash.insert(widget)
+
+    def append(self, widget):
+        self._add(widget)
+        super().append(widget)
+
+    def extend(self, widgets: Iterable):
+        for widget in widgets:
+            self.append(widget)
+
+    def __iadd__(self, widgets: Iterable):
+        self.extend(widgets)
+        return self
+
+    def insert(self, index: int, widget):
+        self._add(widget)
+        super().insert(index, widget)
+
+    def remove(self, widget):
+        super().remove(widget)
+        self._discard(widget)
+
+    def pop(self, index: int = -1):
+        widget = super().pop(index)
+        self._discard(widget)
+        return widget
+
+    def clear(self):
+        widgets = list(self)
+        super().clear()
+        for widget in widgets:
+            self._discard(widget)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            old = self[index]
+            new = list(value)
+        else:
+            old = [self[index]]
+            new = [value]
+        for widget in new:
+            self._add(widget)
+        super().__setitem__(index, new if isinstance(index, slice) else value)
+        for widget in old:
+            self._discard(widget)
+
+    def __delitem__(self, index):
+        old = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        for widget in old:
+            self._discard(widget)
+
+    def get_widgets_at_point(self, x: float, y: float) -> List[Any]:
+        """
+        Get the widgets whose bounds contain a point, edges included.
+        Widgets that aren't ``arcadeplus.gui`` widgets are never returned.
+
+        :param float x: x position, e.g. of the mouse
+        :param float y: y position
+        """
+        result = []
+        for widget in self._spatial_hash.get_objects_for_point(x, y):
+            left, bottom, right, top = widget._get_bounds()
+            if left <= x <= right and bottom <= y <= top:
+                result.append(widget)
+        return result
+
+    def mouse_press(self, x: float, y: float, active_only: bool = False):
+        """
+        Send a mouse press to the widgets under the mouse, with
+        ``check_mouse_press``.
+
+        Widgets the previous press was sent to get this one as well, so a
+        highlighted text box sees the click outside it.
+
+        :param float x: x position of the mouse
+        :param float y: y position of the mouse
+        :param bool active_only: Leave out widgets whose ``active`` is False,
+                                 the way ``Window`` treats its buttons.
+        """
+        widgets = [widget for widget in chain(self.get_widgets_at_point(x, y), self._unindexed.values())
+                   if not active_only or getattr(widget, 'active', True)]
+        for widget in self._pressed_widgets:
+            if widget not in widgets:
+                widget.check_mouse_press(x, y)
+        for widget in widgets:
+            widget.check_mouse_press(x, y)
+        self._pressed_widgets = widgets
+
+    def mouse_release(self, x: float, y: float, active_only: bool = False):
+        """
+        Send a mouse release, with ``check_mouse_release``, to the widgets the
+        last press was sent to and the widgets under the mouse.
+
+        :param float x: x position of the mouse
+        :param float y: y position of the mouse
+        :param bool active_only: Leave out widgets under the mouse whose
+                                 ``active`` is False.
+        """
+        widgets = list(self._pressed_widgets)
+        for widget in chain(self.get_widgets_at_point(x, y), self._unindexed.values()):
+            if widget not in widgets and (not active_only or getattr(widget, 'active', True)):
+                widgets.append(widget)
+        for widget in widgets:
+            widget.check_mouse_release(x, y)
+
+
+# Widgets the GuiRenderer knows how to draw, with the method they draw themselves with.
+# Subclasses that override that method are drawn by calling it instead.
+_retained_draw_methods = {
+    TextButton: 'draw',
+    DialogueBox: 'on_draw',
+    TextLabel: 'draw',
+    TextDisplay: 'draw',
+    TextBox: 'draw',
+}
+_is_retained_cache: Dict[type, bool] = {}
+
+_gui_vertex_type = np.dtype([('vert', np.float32, 2), ('color', np.uint8, 4)])
+
+_gui_vertex_shader = '''
+    #version 330
+    layout(std140) uniform ProjectionBlock {
+        mat4 Projection;
+    };
+
+    in vec2 in_vert;
+    in vec4 in_color;
+
+    out vec4 v_color;
+
+    void main() {
+        gl_Position = Projection * vec4(in_vert, 0.0, 1.0);
+        v_color = in_color;
+    }
+'''
+
+_gui_fragment_shader = '''
+    #version 330
+    in vec4 v_color;
+
+    out vec4 f_color;
+
+    void main() {
+        f_color = v_color;
+    }
+'''
+
+_gui_program: Optional[shader.Program] = None
+
+
+def _get_gui_program() -> shader.Program:
+    global _gui_program
+    if _gui_program is None:
+        _gui_program = shader.program(
+            vertex_shader=_gui_vertex_shader,
+            fragment_shader=_gui_fragment_shader,
+        )
+    return _gui_program
+
+
+def _is_retained(widget) -> bool:
+    """ Whether the GuiRenderer can draw a widget, rather than calling its own draw method. """
+    widget_type = type(widget)
+    try:
+        return _is_retained_cache[widget_type]
+    except KeyError:
+        pass
+
+    retained = False
+    for base in widget_type.__mro__:
+        if base in _retained_draw_methods:
+            method_name = _retained_draw_methods[base]
+            retained = getattr(widget_type, method_name) is getattr(base, method_name)
+            break
+    _is_retained_cache[widget_type] = retained
+    return retained
+
+
+class _GuiEncoder:
+    """ Collects the quads, textures and text one widget is drawn with. """
+
+    def __init__(self):
+        self.quads: List[tuple] = []
+        self.textures: List[tuple] = []
+        self.texts: List[tuple] = []
+
+    def add_quad(self, points, color):
+        """ Add a quad from its four corners, in order around the quad. """
+        self.quads.append((points, color))
+
+    def add_rectangle(self, center_x, center_y, width, height, color):
+        left = center_x - width / 2
+        right = center_x + width / 2
+        bottom = center_y - height / 2
+        top = center_y + height / 2
+        self.add_quad(((left, bottom), (right, bottom), (right, top), (left, top)), color)
+
+    def add_rectangle_outline(self, center_x, center_y, width, height, color, border_width):
+        left = center_x - width / 2
+        right = center_x + width / 2
+        bottom = center_y - height / 2
+        top = center_y + height / 2
+        self.add_rectangle(center_x, bottom, width + border_width, border_width, color)
+        self.add_rectangle(center_x, top, width + border_width, border_width, color)
+        self.add_rectangle(left, center_y, border_width, height - border_width, color)
+        self.add_rectangle(right, center_y, border_width, height - border_width, color)
+
+    def add_line(self, start_x, start_y, end_x, end_y, color, line_width):
+        length = ((end_x - start_x) ** 2 + (end_y - start_y) ** 2) ** 0.5
+        if length == 0:
+            return
+        normal_x = -(end_y - start_y) / length * line_width / 2
+        normal_y = (end_x - start_x) / length * line_width / 2
+        self.add_quad(((start_x - normal_x, start_y - normal_y),
+                       (end_x - normal_x, end_y - normal_y),
+                       (end_x + normal_x, end_y + normal_y),
+                       (start_x + normal_x, start_y + normal_y)), color)
+
+    def add_texture(self, center_x, center_y, width, height, texture):
+        self.textures.append((center_x, center_y, width, height, texture))
+
+    def add_text(self, text, start_x, start_y, color, **options):
+        self.texts.append((text, start_x, start_y, color, options))
+
+    def get_layers(self) -> Tuple[bool, bool, bool]:
+        """ Whether the widget draws textures, quads and text. """
+        return bool(self.textures), bool(self.quads), bool(self.texts)
+
+    def get_bounds(self, widget) -> Optional[Tuple[float, float, float, float]]:
+        """
+        Bounds of everything the widget draws, or None if they aren't known,
+        because it has text and no bounds of its own to keep it in.
+        """
+        xs = [x for points, _ in self.quads for x, _ in points]
+        ys = [y for points, _ in self.quads for _, y in points]
+        for center_x, center_y, width, height, _ in self.textures:
+            xs += [center_x - width / 2, center_x + width / 2]
+            ys += [center_y - height / 2, center_y + height / 2]
+        get_bounds = getattr(widget, '_get_bounds', None)
+        if self.texts:
+            if get_bounds is None:
+                return None
+            left, bottom, right, top = get_bounds()
+            xs += [left, right]
+            ys += [bottom, top]
+        if not xs:
+            return None
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def get_vertices(self) -> np.ndarray:
+        """ The quads as two triangles each. """
+        vertices = np.zeros(len(self.quads) * 6, dtype=_gui_vertex_type)
+        for i, (points, color) in enumerate(self.quads):
+            a, b, c, d = points
+            vertices['vert'][i * 6:i * 6 + 6] = a, b, c, a, c, d
+            vertices['color'][i * 6:i * 6 + 6] = arcadeplus.get_four_byte_color(color)
+        return vertices
+
+
+class _GuiEntry:
+    """ What the GuiRenderer holds for one widget. """
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.state: Any = None
+        self.vertices = np.zeros(0, dtype=_gui_vertex_type)
+        # Range of the renderer's vertices this widget's quads are in
+        self.start = 0
+        self.capacity = 0
+        self.sprites: List[arcadeplus.Sprite] = []
+        self.texts: List[arcadeplus.BatchedText] = []
+        self.text_args: List[tuple] = []
+        # What the widget draws and where, which decide the run it is drawn in
+        self.layers: Tuple[bool, bool, bool] = (False, False, False)
+        self.bounds: Optional[Tuple[float, float, float, float]] = None
+        self.run: Optional[_GuiRun] = None
+
+
+def _overlaps(bounds_1, bounds_2) -> bool:
+    """ Whether two bounds overlap. Unknown bounds overlap everything. """
+    if bounds_1 is None or bounds_2 is None:
+        return True
+    left_1, bottom_1, right_1, top_1 = bounds_1
+    left_2, bottom_2, right_2, top_2 = bounds_2
+    return left_1 < right_2 and left_2 < right_1 and bottom_1 < top_2 and bottom_2 < top_1
+
+
+class _GuiRun:
+    """
+    Consecutive widgets drawn together, the textures of all of them, then
+    their quads, then their text. Or one widget that draws itself.
+
+    A widget only joins a run if that still draws it over the widgets before
+    it, so the GUI looks the same as drawing the widgets one by one.
+    """
+
+    def __init__(self, first: int = 0, widget=None):
+        self.widget = widget
+        # Range of the renderer's vertices the run's quads are in
+        self.first = first
+        self.count = 0
+        self.sprite_list = arcadeplus.SpriteList()
+        self.text_batch = arcadeplus.TextBatch()
+        # Bounds and top layer of each widget in the run
+        self._placed: List[tuple] = []
+
+    def can_add(self, entry: _GuiEntry) -> bool:
+        if self.widget is not None:
+            return False
+        layers = [layer for layer, used in enumerate(entry.layers) if used]
+        if not layers:
+            return True
+        # Anything the run draws in a higher layer than the widget's lowest would cover it
+        return not any(top > layers[0] and _overlaps(bounds, entry.bounds) for bounds, top in self._placed)
+
+    def add(self, entry: _GuiEntry):
+        layers = [layer for layer, used in enumerate(entry.layers) if used]
+        if layers:
+            self._placed.append((entry.bounds, layers[-1]))
+        self.count += len(entry.vertices)
+        for sprite in entry.sprites:
+            self.sprite_list.append(sprite)
+        entry.texts = [self.text_batch.add(text, start_x, start_y, color, **options)
+                       for text, start_x, start_y, color, options in entry.text_args]
+        entry.run = self
+
+
+class GuiRenderer:
+    """
+    Retained renderer for GUI widgets.
+
+    The quads of every widget share one vertex buffer, and consecutive
+    widgets are drawn together in runs, with their text in one TextBatch and
+    themed widgets' textures in one SpriteList, so the whole GUI takes a
+    handful of draw calls. Each frame the widgets are compared with what was
+    drawn last time, and only the ones that changed (pressed, moved, text
+    edited...) are encoded again.
+
+    A run draws its textures, then its quads, then its text. A widget that
+    would be drawn under part of an earlier widget it overlaps that way, like
+    a themed button on a plain dialogue box, starts a new run. Subclasses that
+    override how they draw are drawn by calling their own draw method, in
+    their place in the order.
+
+    ``Window`` and ``View`` use one for their widget lists. To use one directly:
+
+    Example:
+        gui_renderer = arcadeplus.GuiRenderer()
+        ...
+        def on_draw(self):
+            arcadeplus.start_render()
+            gui_renderer.draw(self.menu_buttons)
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, _GuiEntry] = {}
+        # Ids of the widgets, in the order they were last drawn
+        self._order: List[int] = []
+        self._immediate: List[Any] = []
+        self._runs: List[_GuiRun] = []
+        self._vertices = np.zeros(1536, dtype=_gui_vertex_type)
+        self._used = 0
+        self._dirty_start: Optional[int] = None
+        self._dirty_end = 0
+        self._buffer: Optional[shader.Buffer] = None
+        self._vao = None
+        # Number of times a widget has been encoded, to see how much work updates are
+        self.encode_count = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(self, widgets: Iterable):
+        """
+        Bring the buffers up to date with a list of widgets.
+
+        Widgets no longer in the list are removed, and widgets that changed
+        since the last update are encoded again.
+        """
+        order: List[Any] = []
+        immediate: List[Any] = []
+        for widget in widgets:
+            self._add_widget(widget, order, immediate)
+        self._immediate = immediate
+
+        keys = [id(widget) for widget in order]
+        relayout = keys != self._order
+        if relayout:
+            current = set(keys)
+            for key in [key for key in self._entries if key not in current]:
+                del self._entries[key]
+
+        for widget in order:
+            if not _is_retained(widget):
+                continue
+            entry = self._entries.get(id(widget))
+            if entry is None:
+                entry = self._entries[id(widget)] = _GuiEntry(widget)
+            state = widget._get_gui_state()
+            if state == entry.state:
+                continue
+            entry.state = state
+            encoder = _GuiEncoder()
+            widget._encode_gui(encoder)
+            self.encode_count += 1
+            if not self._apply(entry, encoder):
+                relayout = True
+
+        if relayout:
+            self._relayout(order)
+            self._order = keys
+
+    def _add_widget(self, widget, order: list, immediate: list):
+        order.append(widget)
+        if not _is_retained(widget):
+            immediate.append(widget)
+            return
+        get_children = getattr(widget, '_get_gui_children', None)
+        if get_children is not None:
+            for child in get_children():
+                self._add_widget(child, order, immediate)
+
+    def _apply(self, entry: _GuiEntry, encoder: _GuiEncoder) -> bool:
+        """ Write a widget's new encoding. Returns False if the buffers have to be laid out again. """
+        layers = encoder.get_layers()
+        bounds = encoder.get_bounds(entry.widget)
+        entry.vertices = encoder.get_vertices()
+        count = len(entry.vertices)
+        if (entry.run is None or layers != entry.layers or bounds != entry.bounds
+                or len(encoder.textures) != len(entry.sprites) or count > entry.capacity):
+            entry.layers = layers
+            entry.bounds = bounds
+            entry.text_args = encoder.texts
+            entry.sprites = [arcadeplus.Sprite() for _ in encoder.textures]
+            self._update_sprites(entry, encoder.textures)
+            return False
+
+        self._update_texts(entry, encoder.texts)
+        self._update_sprites(entry, encoder.textures)
+        start = entry.start
+        self._vertices[start:start + count] = entry.vertices
+        self._vertices[start + count:start + entry.capacity] = np.zeros(entry.capacity - count,
+                                                                       dtype=_gui_vertex_type)
+        self._mark_dirty(start, start + entry.capacity)
+        return True
+
+    @staticmethod
+    def _update_texts(entry: _GuiEntry, texts: List[tuple]):
+        text_batch = entry.run.text_batch
+        for i, args in enumerate(texts):
+            text, start_x, start_y, color, options = args
+            if i < len(entry.texts) and entry.text_args[i][4] == options:
+                label = entry.texts[i]
+                old_text, old_x, old_y, old_color, _ = entry.text_args[i]
+                if text != old_text:
+                    label.text = text
+                if (start_x, start_y) != (old_x, old_y):
+                    label.set_position(start_x, start_y)
+                if color != old_color:
+                    label.color = color
+                entry.text_args[i] = args
+                continue
+
+            if i < len(entry.texts):
+                text_batch.remove(entry.texts[i])
+            label = text_batch.add(text, start_x, start_y, color, **options)
+            if i < len(entry.texts):
+                entry.texts[i] = label
+                entry.text_args[i] = args
+            else:
+                entry.texts.append(label)
+                entry.text_args.append(args)
+
+        for label in entry.texts[len(texts):]:
+            text_batch.remove(label)
+        del entry.texts[len(texts):]
+        del entry.text_args[len(texts):]
+
+    @staticmethod
+    def _update_sprites(entry: _GuiEntry, textures: List[tuple]):
+        for sprite, (center_x, center_y, width, height, texture) in zip(entry.sprites, textures):
+            sprite.texture = texture
+            sprite.width = width
+            sprite.height = height
+            sprite.center_x = center_x
+            sprite.center_y = center_y
+
+    def _relayout(self, order: List[Any]):
+        """ Split the widgets into runs, with their quads in drawing order, without holes. """
+        entries = [self._entries[id(widget)] for widget in order if id(widget) in self._entries]
+        used = sum(len(entry.vertices) for entry in entries)
+        capacity = len(self._vertices)
+        while used > capacity:
+            capacity *= 2
+
+        vertices = np.zeros(capacity, dtype=_gui_vertex_type)
+        runs: List[_GuiRun] = []
+        run: Optional[_GuiRun] = None
+        start = 0
+        for widget in order:
+            entry = self._entries.get(id(widget))
+            if entry is None:
+                # Draws itself, between the runs before and after it
+                run = None
+                runs.append(_GuiRun(start, widget))
+                continue
+            if run is None or not run.can_add(entry):
+                run = _GuiRun(start)
+                runs.append(run)
+            count = len(entry.vertices)
+            vertices[start:start + count] = entry.vertices
+            entry.start = start
+            entry.capacity = count
+            start += count
+            run.add(entry)
+
+        if capacity != len(self._vertices):
+            # A new buffer will be created on the next draw
+            self._buffer = None
+        self._vertices = vertices
+        self._used = used
+        self._runs = runs
+        self._mark_dirty(0, capacity)
+
+    def _mark_dirty(self, start: int, end: int):
+        if start >= end:
+            return
+        if self._dirty_start is None:
+            self._dirty_start = start
+            self._dirty_end = end
+        else:
+            self._dirty_start = min(self._dirty_start, start)
+            self._dirty_end = max(self._dirty_end, end)
+
+    def _upload(self):
+        program = _get_gui_program()
+        if self._buffer is None:
+            self._buffer = shader.Buffer(self._vertices.tobytes(), usage='dynamic')
+            self._vao = shader.vertex_array(program, [
+                shader.BufferDescription(
+                    self._buffer,
+                    '2f 4B',
+                    ('in_vert', 'in_color'),
+                    normalized=['in_color']
+                )
+            ])
+        elif self._dirty_start is not None:
+            data = self._vertices[self._dirty_start:self._dirty_end].tobytes()
+            self._buffer.write(data, self._dirty_start * _gui_vertex_type.itemsize)
+        self._dirty_start = None
+
+    def draw(self, widgets: Optional[Iterable] = None):
+        """
+        Draw the widgets.
+
+        :param widgets: Widgets to draw. Updates the renderer with them first.
+                        If not given, draws what the last update held.
+        """
+        if widgets is not None:
+            self.update(widgets)
+
+        if self._used:
+            self._upload()
+
+        for run in self._runs:
+            if run.widget is not None:
+                if isinstance(run.widget, DialogueBox):
+                    run.widget.on_draw()
+                else:
+                    run.widget.draw()
+                continue
+
+            if len(run.sprite_list):
+                run.sprite_list.draw()
+
+            if run.count:
+                gl.glEnable(gl.GL_BLEND)
+                gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+                with self._vao:
+                    gl.glDrawArrays(gl.GL_TRIANGLES, run.first, run.count)
+
+            if len(run.text_batch):
+                run.text_batch.draw()
@@ -2,14 +2,27 @@
 Particle - Object produced by an Emitter.  Often used in large quantity to produce visual effects effects
 """
 
+import gc
+import math
+import timeit
 from arcadeplus.sprite import Sprite
 from arcadeplus.draw_commands import Texture
+from arcadeplus.texture import load_texture
+from arcadeplus import shader
 import arcadeplus.utils
 from arcadeplus.arcade_types import Point, Vector
-from typing import Union
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import PIL.Image
+import pyglet.gl as gl
 
 FilenameOrTexture = Union[str, Texture]
 
+# Velocities are in pixels per update at this many updates a second, and are
+# scaled by how many of those updates a delta_time is worth
+_UPDATES_PER_SECOND = 60
+
 
 class Particle(Sprite):
     """Sprite that is emitted from an Emitter"""
@@ -40,10 +53,54 @@ def __init__(
         self.change_angle = change_angle
         self.alpha = alpha
         self.mutation_callback = mutation_callback
+        # The ParticlePool the particle goes back to when an Emitter reaps it
+        self.pool: Optional["ParticlePool"] = None
 
-    def update(self):
-        """Advance the Particle's simulation"""
-        super().update()
+    def reset(
+            self,
+            filename_or_texture: FilenameOrTexture,
+            change_xy: Vector,
+            center_xy: Point = (0.0, 0.0),
+            angle: float = 0.0,
+            change_angle: float = 0.0,
+            scale: float = 1.0,
+            alpha: int = 255,
+            mutation_callback=None
+    ):
+        """
+        Set the particle up again as if it had just been made with these arguments,
+        so a ParticlePool can reuse it. It must not be in any sprite list.
+        Subclasses with more state need their own reset, taking the same arguments
+        as their __init__.
+        """
+        if isinstance(filename_or_texture, Texture):
+            texture = filename_or_texture
+        else:
+            texture = load_texture(filename_or_texture, 0, 0, 0, 0)
+        # Nothing is watching the sprite, so skip the property setters
+        self.textures = [texture]
+        self._texture = texture
+        self.cur_texture_index = 0
+        self._scale = scale
+        self._width = texture.width * scale
+        self._height = texture.height * scale
+        self._points = texture.hit_box_points
+        self._point_list_cache = None
+        self._collision_radius = None
+        self._position = (center_xy[0], center_xy[1])
+        self.velocity = [change_xy[0], change_xy[1]]
+        self._angle = angle
+        self.change_angle = change_angle
+        self._alpha = alpha
+        self._color = (255, 255, 255)
+        self.properties = {}
+        self.mutation_callback = mutation_callback
+
+    def update(self, delta_time: float = 1 / 60):
+        """Advance the Particle's simulation by delta_time seconds"""
+        updates = delta_time * _UPDATES_PER_SECOND
+        self.position = [self._position[0] + self.change_x * updates, self._position[1] + self.change_y * updates]
+        self.angle += self.change_angle * updates
         if self.mutation_callback:
             self.mutation_callback(self)
 
@@ -97,10 +154,28 @@ def __init__(
         self.lifetime_original = lifetime
         self.lifetime_elapsed = 0.0
 
-    def update(self):
-        """Advance the Particle's simulation"""
-        super().update()
-        self.lifetime_elapsed += 1 / 60
+    def reset(
+            self,
+            filename_or_texture: FilenameOrTexture,
+            change_xy: Vector,
+            lifetime: float,
+            center_xy: Point = (0.0, 0.0),
+            angle: float = 0,
+            change_angle: float = 0,
+            scale: float = 1.0,
+            alpha: int = 255,
+            mutation_callback=None
+    ):
+        """Set the particle up again as if it had just been made with these arguments"""
+        super().reset(filename_or_texture, change_xy, center_xy, angle, change_angle, scale, alpha,
+                      mutation_callback)
+        self.lifetime_original = lifetime
+        self.lifetime_elapsed = 0.0
+
+    def update(self, delta_time: float = 1 / 60):
+        """Advance the Particle's simulation by delta_time seconds"""
+        super().update(delta_time)
+        self.lifetime_elapsed += delta_time
 
     def can_reap(self):
         """Determine if Particle can be deleted"""
@@ -135,10 +210,900 @@ def __init__(
         self.start_alpha = start_alpha
         self.end_alpha = end_alpha
 
-    def update(self):
-        """Advance the Particle's simulation"""
-        super().update()
+    def reset(
+            self,
+            filename_or_texture: FilenameOrTexture,
+            change_xy: Vector,
+            lifetime: float,
+            center_xy: Point = (0.0, 0.0),
+            angle: float = 0,
+            change_angle: float = 0,
+            scale: float = 1.0,
+            start_alpha: int = 255,
+            end_alpha: int = 0,
+            mutation_callback=None
+    ):
+        """Set the particle up again as if it had just been made with these arguments"""
+        super().reset(filename_or_texture, change_xy, lifetime, center_xy, angle, change_angle, scale,
+                      start_alpha, mutation_callback)
+        self.start_alpha = start_alpha
+        self.end_alpha = end_alpha
+
+    def update(self, delta_time: float = 1 / 60):
+        """Advance the Particle's simulation by delta_time seconds"""
+        super().update(delta_time)
         a = arcadeplus.utils.lerp(self.start_alpha,
                               self.end_alpha,
                               self.lifetime_elapsed / self.lifetime_original)
         self.alpha = clamp(a, 0, 255)
+
+
+class ParticlePool:
+    """
+    Free list of reaped particles, to set up again with ``reset`` rather than
+    making new Sprites, which is slow and leaves garbage for the collector.
+
+    Make particles in an Emitter's ``particle_factory`` with ``acquire``. When
+    the emitter reaps them they are released back to the pool they came from.
+
+    :param max_size: Most particles kept free, of all classes together.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._free: Dict[type, List[Particle]] = {}
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self) -> int:
+        """Number of particles waiting in the pool"""
+        return self._size
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of acquired particles that were reused rather than made"""
+        acquired = self.hits + self.misses
+        return self.hits / acquired if acquired else 0.0
+
+    def acquire(self, particle_class: type, *args, **kwargs) -> Particle:
+        """
+        Get a particle of ``particle_class``, made with these arguments. A free
+        one is reset with them if there is one, otherwise a new one is made.
+        """
+        free = self._free.get(particle_class)
+        if free:
+            particle = free.pop()
+            self._size -= 1
+            particle.reset(*args, **kwargs)
+            self.hits += 1
+        else:
+            particle = particle_class(*args, **kwargs)
+            self.misses += 1
+        particle.pool = self
+        return particle
+
+    def release(self, particle: Particle):
+        """Give back a particle that has been taken out of its sprite lists"""
+        if self._size >= self.max_size:
+            return
+        self._free.setdefault(type(particle), []).append(particle)
+        self._size += 1
+
+    def clear(self):
+        """Drop the free particles and the hit counts"""
+        self._free.clear()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+
+class GcPauseMonitor:
+    """
+    Times the garbage collector's pauses while started, with ``gc.callbacks``.
+    Can be used as a context manager.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.collected = 0
+        self._start_time = 0.0
+
+    def start(self):
+        if self._callback not in gc.callbacks:
+            gc.callbacks.append(self._callback)
+
+    def stop(self):
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+    def reset(self):
+        """Zero the counts"""
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.collected = 0
+
+    def __enter__(self) -> "GcPauseMonitor":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def average_time(self) -> float:
+        """Average seconds per collection"""
+        return self.total_time / self.count if self.count else 0.0
+
+    def _callback(self, phase: str, info: Dict[str, int]):
+        if phase == "start":
+            self._start_time = timeit.default_timer()
+            return
+        pause = timeit.default_timer() - self._start_time
+        self.count += 1
+        self.total_time += pause
+        self.max_time = max(self.max_time, pause)
+        self.collected += info["collected"]
+
+
+class ParticleBatch:
+    """
+    Starting state of particles an Emitter makes in one go, for particles
+    kept in ParticleArrays rather than as Sprites.
+
+    Every value can be a NumPy array with a row per particle, or one value
+    for all of them. Like with Particle, the position is relative to the
+    emitter, and the velocity is turned by the emitter's angle.
+
+    :param textures: Texture or file name, or a sequence of them that ``texture_index`` picks from.
+    :param change_xy: Velocity, in pixels per update, shape (n, 2) or (2,).
+    :param lifetime: Seconds each particle lives. Particles without one live forever.
+    :param center_xy: Position, shape (n, 2) or (2,).
+    :param angle: Angle in degrees.
+    :param change_angle: Degrees turned per update.
+    :param scale: Scale of the texture.
+    :param start_alpha: Alpha when the particle is made.
+    :param end_alpha: Alpha the particle fades to over its lifetime, like a
+                      FadeParticle. None to keep ``start_alpha``.
+    :param texture_index: Which of ``textures`` each particle uses.
+    """
+
+    def __init__(self,
+                 textures: Union[FilenameOrTexture, Sequence[FilenameOrTexture]],
+                 change_xy,
+                 lifetime=math.inf,
+                 center_xy=(0.0, 0.0),
+                 angle=0.0,
+                 change_angle=0.0,
+                 scale=1.0,
+                 start_alpha=255,
+                 end_alpha=None,
+                 texture_index=0):
+        if isinstance(textures, (str, Texture)):
+            textures = [textures]
+        self.textures = list(textures)
+        self.change_xy = change_xy
+        self.lifetime = lifetime
+        self.center_xy = center_xy
+        self.angle = angle
+        self.change_angle = change_angle
+        self.scale = scale
+        self.start_alpha = start_alpha
+        self.end_alpha = start_alpha if end_alpha is None else end_alpha
+        self.texture_index = texture_index
+
+
+_particle_vertex_shader = """
+#version 330
+layout(std140) uniform ProjectionBlock {
+    mat4 Projection;
+};
+// Two texels per texture: its size in pixels, then where it is in the atlas
+uniform samplerBuffer Textures;
+
+// per vertex
+in vec2 in_vert;
+in vec2 in_texture;
+
+// per particle
+in vec2 in_pos;
+in float in_angle;
+in float in_scale;
+in float in_alpha;
+in float in_texture_index;
+
+out vec2 v_texture;
+out float v_alpha;
+
+void main() {
+    int texture_index = int(in_texture_index) * 2;
+    vec2 size = texelFetch(Textures, texture_index).xy * in_scale;
+    vec4 sub_tex_coords = texelFetch(Textures, texture_index + 1);
+
+    float angle = radians(in_angle);
+    mat2 rotate = mat2(
+        cos(angle), sin(angle),
+        -sin(angle), cos(angle)
+    );
+    vec2 pos = in_pos + rotate * (in_vert * (size / 2));
+    gl_Position = Projection * vec4(pos, 0.0, 1.0);
+    v_texture = sub_tex_coords.xy + in_texture * sub_tex_coords.zw;
+    v_alpha = in_alpha / 255.0;
+}
+"""
+
+_particle_fragment_shader = """
+#version 330
+uniform sampler2D Texture;
+
+in vec2 v_texture;
+in float v_alpha;
+
+out vec4 f_color;
+
+void main() {
+    vec4 basecolor = texture(Texture, v_texture);
+    basecolor.a *= v_alpha;
+    if (basecolor.a == 0.0) {
+        discard;
+    }
+    f_color = basecolor;
+}
+"""
+
+# Corners of a particle, and where they are in its texture, drawn as a triangle strip
+_PARTICLE_QUAD = np.array([-1.0, -1.0, 0.0, 0.0,
+                           -1.0, 1.0, 0.0, 1.0,
+                           1.0, -1.0, 1.0, 0.0,
+                           1.0, 1.0, 1.0, 1.0], dtype=np.float32)
+
+_particle_program: Optional[shader.Program] = None
+
+
+def _get_particle_program() -> shader.Program:
+    global _particle_program
+    if _particle_program is None:
+        _particle_program = shader.program(
+            vertex_shader=_particle_vertex_shader,
+            fragment_shader=_particle_fragment_shader,
+        )
+    return _particle_program
+
+
+class _ParticleTextures:
+    """ Textures of batch particles, put side by side in one texture to draw them all with one call. """
+
+    def __init__(self):
+        self.textures: List[Texture] = []
+        self._indices: Dict[str, int] = {}
+        # Index of each file name given, to skip loading the texture again
+        self._file_indices: Dict[str, int] = {}
+        self._atlas: Optional[shader.Texture] = None
+        self._table: Optional[shader.BufferTexture] = None
+
+    def get_index(self, texture: FilenameOrTexture) -> int:
+        if not isinstance(texture, Texture):
+            try:
+                return self._file_indices[texture]
+            except KeyError:
+                pass
+            file_name = texture
+            texture = load_texture(file_name)
+            self._file_indices[file_name] = self.get_index(texture)
+            return self._file_indices[file_name]
+        try:
+            return self._indices[texture.name]
+        except KeyError:
+            pass
+        index = len(self.textures)
+        self.textures.append(texture)
+        self._indices[texture.name] = index
+        # The atlas is made again with the new texture in it
+        self._atlas = None
+        return index
+
+    def _make_atlas(self):
+        """ Put the textures side by side in one texture, with a pixel between them. """
+        images = [texture.image.convert("RGBA") for texture in self.textures]
+        width = sum(image.width + 1 for image in images) + 1
+        height = max(image.height for image in images) + 2
+        atlas = PIL.Image.new("RGBA", (width, height))
+        table = []
+        x = 1
+        for image in images:
+            atlas.paste(image, (x, 1))
+            table.append((image.width, image.height, 0, 0))
+            # The first row of the image is at the top, and the texture is drawn bottom up
+            table.append((x / width, (1 + image.height) / height, image.width / width, -image.height / height))
+            x += image.width + 1
+        self._atlas = shader.texture((width, height), 4, atlas.tobytes())
+        table_buffer = shader.buffer(np.array(table, dtype=np.float32).tobytes())
+        self._table = shader.BufferTexture(table_buffer)
+
+    def use(self, atlas_unit: int, table_unit: int):
+        """ Bind the atlas, and the table of where each texture is in it for the particle shader. """
+        if self._atlas is None:
+            self._make_atlas()
+        self._atlas.use(atlas_unit)
+        self._table.use(table_unit)
+
+
+def _get_batch_velocity(batch: ParticleBatch, count: int, rotation) -> np.ndarray:
+    """ Velocity of each particle in a batch, turned by rotation degrees, one for all or one each. """
+    velocity = np.broadcast_to(np.asarray(batch.change_xy, dtype=np.float32), (count, 2))
+    if isinstance(rotation, np.ndarray):
+        radians = np.radians(rotation, dtype=np.float32)
+        cosine, sine = np.cos(radians), np.sin(radians)
+    elif not rotation:
+        return velocity
+    else:
+        radians = math.radians(rotation)
+        cosine, sine = math.cos(radians), math.sin(radians)
+    turned = np.empty((count, 2), dtype=np.float32)
+    turned[:, 0] = velocity[:, 0] * cosine - velocity[:, 1] * sine
+    turned[:, 1] = velocity[:, 1] * cosine + velocity[:, 0] * sine
+    return turned
+
+
+def _is_one_value(value, shape: tuple) -> bool:
+    """ Whether a batch value is one value for every particle, rather than one per particle. """
+    if shape:
+        if isinstance(value, (tuple, list)) and len(value) == 2 and isinstance(value[0], (int, float)):
+            return True
+    elif isinstance(value, (int, float)):
+        return True
+    return np.shape(value) == shape
+
+
+def _merge_batches(batches: Sequence[ParticleBatch], counts: Sequence[int],
+                   textures: _ParticleTextures) -> ParticleBatch:
+    """
+    One batch with the particles of all the batches, to add them in one go.
+
+    Values that are the same for every particle of each batch are repeated
+    with one NumPy call for all the batches, and the textures are looked up
+    in the textures the batch is added with.
+    """
+    def merge(values, shape=(), dtype=np.float32):
+        if all(_is_one_value(value, shape) for value in values):
+            return np.repeat(np.array(values, dtype=dtype), counts, axis=0)
+        parts = [value if isinstance(value, np.ndarray) and value.shape == (count,) + shape
+                 else np.broadcast_to(np.asarray(value, dtype=dtype), (count,) + shape)
+                 for value, count in zip(values, counts)]
+        return np.concatenate(parts).astype(dtype, copy=False)
+
+    texture_indices = []
+    for batch in batches:
+        lookup = [textures.get_index(texture) for texture in batch.textures]
+        if isinstance(batch.texture_index, (int, np.integer)):
+            texture_indices.append(lookup[batch.texture_index])
+        else:
+            texture_indices.append(np.asarray(lookup)[batch.texture_index])
+
+    return ParticleBatch(
+        textures.textures,
+        change_xy=merge([batch.change_xy for batch in batches], (2,)),
+        lifetime=merge([batch.lifetime for batch in batches], dtype=np.float64),
+        center_xy=merge([batch.center_xy for batch in batches], (2,)),
+        angle=merge([batch.angle for batch in batches]),
+        change_angle=merge([batch.change_angle for batch in batches]),
+        scale=merge([batch.scale for batch in batches]),
+        start_alpha=merge([batch.start_alpha for batch in batches]),
+        end_alpha=merge([batch.end_alpha for batch in batches]),
+        texture_index=merge(texture_indices, dtype=np.intp),
+    )
+
+
+class ParticleArrays:
+    """
+    Particles kept as NumPy arrays, with an element per particle in each,
+    rather than as a Sprite each.
+
+    Updating moves, turns, ages and fades every particle with a few array
+    operations. Dead particles are dropped by packing the live ones
+    together, which is free when they are the oldest ones, as they usually
+    are. What is drawn, the position, angle, scale, alpha and texture of
+    each particle, is kept side by side in one block, which is streamed as
+    it is into one instanced buffer and drawn with one call.
+
+    ``position``, ``velocity``, ``angle``, ``change_angle``, ``scale``,
+    ``alpha``, ``start_alpha``, ``end_alpha``, ``age``, ``lifetime`` and
+    ``texture`` are arrays of the live particles, which can be changed in
+    place. ``texture`` indexes ``textures``. ``gravity`` is added to the
+    velocity of every particle each update.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.count = 0
+        self.capacity = capacity
+        # The live particles are rows start to start + count of each block
+        self._start = 0
+        # Streamed to the GPU: x, y, angle, scale, alpha, texture
+        self._render = np.zeros((capacity, 6), dtype=np.float32)
+        # Added to the render block each update: velocity x and y, change_angle, then zeros
+        self._motion = np.zeros((capacity, 6), dtype=np.float32)
+        # Start and end alpha
+        self._fade = np.zeros((capacity, 2), dtype=np.float32)
+        # Age and lifetime. They add up a step at a time, so they are kept in double precision.
+        self._ages = np.zeros((capacity, 2), dtype=np.float64)
+        # Which emitter of an EmitterGroup made each particle
+        self._owners = np.zeros(capacity, dtype=np.int32)
+        # Whether any particle has a different end alpha than start alpha
+        self._fading = False
+        self.gravity: Vector = (0.0, 0.0)
+
+        self._textures = _ParticleTextures()
+        self._instance_buffer: Optional[shader.Buffer] = None
+        self._quad_buffer: Optional[shader.Buffer] = None
+        self._vao = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def textures(self) -> List[Texture]:
+        return self._textures.textures
+
+    def _live(self) -> slice:
+        return slice(self._start, self._start + self.count)
+
+    @property
+    def position(self) -> np.ndarray:
+        return self._render[self._live(), 0:2]
+
+    @property
+    def angle(self) -> np.ndarray:
+        return self._render[self._live(), 2]
+
+    @property
+    def scale(self) -> np.ndarray:
+        return self._render[self._live(), 3]
+
+    @property
+    def alpha(self) -> np.ndarray:
+        return self._render[self._live(), 4]
+
+    @property
+    def texture(self) -> np.ndarray:
+        return self._render[self._live(), 5]
+
+    @property
+    def velocity(self) -> np.ndarray:
+        return self._motion[self._live(), 0:2]
+
+    @property
+    def change_angle(self) -> np.ndarray:
+        return self._motion[self._live(), 2]
+
+    @property
+    def start_alpha(self) -> np.ndarray:
+        return self._fade[self._live(), 0]
+
+    @property
+    def end_alpha(self) -> np.ndarray:
+        return self._fade[self._live(), 1]
+
+    @property
+    def age(self) -> np.ndarray:
+        return self._ages[self._live(), 0]
+
+    @property
+    def lifetime(self) -> np.ndarray:
+        return self._ages[self._live(), 1]
+
+    def _reserve(self, count: int):
+        """ Make room after the live particles for count more. """
+        if self._start + self.count + count <= self.capacity:
+            return
+        live = self._live()
+        capacity = self.capacity
+        if self.count + count > capacity:
+            capacity = max(self.count + count, capacity * 2)
+        for name in ("_render", "_motion", "_fade", "_ages", "_owners"):
+            old = getattr(self, name)
+            if capacity == self.capacity:
+                # Move the live particles to the front
+                old[:self.count] = old[live]
+            else:
+                array = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+                array[:self.count] = old[live]
+                setattr(self, name, array)
+        self._start = 0
+        self.capacity = capacity
+
+    def add(self, batch: ParticleBatch, count: int, offset: Point = (0.0, 0.0), rotation: float = 0.0,
+            owner: int = 0):
+        """
+        Add particles.
+
+        :param batch: Starting state of the particles.
+        :param count: Number of particles.
+        :param offset: Added to the position of every particle, shape (2,) or (count, 2).
+        :param rotation: Degrees to turn the velocity of every particle by, or an array of one per particle.
+        :param owner: Number counted by get_owner_counts, like the emitter that made the particles,
+                      or an array of one per particle.
+        """
+        if count <= 0:
+            return
+        self._reserve(count)
+        first = self._start + self.count
+        new = slice(first, first + count)
+        self.count += count
+
+        motion = self._motion[new]
+        motion[:, 0:2] = _get_batch_velocity(batch, count, rotation)
+        motion[:, 2] = batch.change_angle
+
+        render = self._render[new]
+        render[:, 0:2] = batch.center_xy
+        render[:, 0:2] += np.asarray(offset, dtype=np.float32)
+        render[:, 2] = batch.angle
+        render[:, 3] = batch.scale
+        render[:, 4] = batch.start_alpha
+        texture_lookup = np.array([self._textures.get_index(texture) for texture in batch.textures],
+                                  dtype=np.float32)
+        render[:, 5] = texture_lookup[batch.texture_index]
+
+        self._fade[new, 0] = batch.start_alpha
+        self._fade[new, 1] = batch.end_alpha
+        self._ages[new, 0] = 0.0
+        self._ages[new, 1] = batch.lifetime
+        self._owners[new] = owner
+        if np.any(np.asarray(batch.end_alpha) != np.asarray(batch.start_alpha)):
+            self._fading = True
+
+    def update(self, delta_time: float = 1 / 60):
+        """ Advance every particle by delta_time seconds, and drop the ones whose lifetime is over. """
+        if self.count == 0:
+            return
+        live = self._live()
+        updates = delta_time * _UPDATES_PER_SECOND
+        if self.gravity[0] or self.gravity[1]:
+            self._motion[live, 0:2] += np.asarray(self.gravity, dtype=np.float32) * np.float32(updates)
+        if updates == 1:
+            self._render[live] += self._motion[live]
+        else:
+            self._render[live] += self._motion[live] * np.float32(updates)
+        age = self._ages[live, 0]
+        age += delta_time
+        lifetime = self._ages[live, 1]
+
+        if self._fading:
+            start_alpha = self._fade[live, 0]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                alpha = start_alpha + (self._fade[live, 1] - start_alpha) * (age / lifetime)
+            np.clip(alpha, 0, 255, out=self._render[live, 4])
+
+        alive = age < lifetime
+        if not alive.all():
+            self._keep(np.flatnonzero(alive))
+
+    def _keep(self, indices: np.ndarray):
+        """ Keep the live particles at the indices, dropping the rest. """
+        kept = len(indices)
+        if kept == 0:
+            self.clear()
+            return
+        if indices[-1] - indices[0] == kept - 1:
+            # One run of particles, like when the oldest have died, stays where it is
+            self._start += int(indices[0])
+        else:
+            rows = indices + self._start
+            for block in (self._render, self._motion, self._fade, self._ages, self._owners):
+                block[self._start:self._start + kept] = block[rows]
+        self.count = kept
+
+    def get_owner_counts(self, length: int) -> np.ndarray:
+        """ How many live particles each owner has, for owners 0 to length - 1. """
+        return np.bincount(self._owners[self._live()], minlength=length)
+
+    def clear(self):
+        """ Drop every particle. """
+        self._start = 0
+        self.count = 0
+        self._fading = False
+
+    def draw(self):
+        """ Draw every particle, with one draw call. """
+        if self.count == 0:
+            return
+        data = self._render[self._live()].tobytes()
+
+        if self._instance_buffer is None or self._instance_buffer.size < len(data):
+            self._instance_buffer = shader.Buffer.create_with_size(self._render.nbytes, usage='stream')
+            # The VAO doesn't keep its buffers, so the quad is kept here
+            self._quad_buffer = shader.buffer(_PARTICLE_QUAD.tobytes())
+            self._vao = shader.vertex_array(_get_particle_program(), [
+                shader.BufferDescription(self._quad_buffer, '2f 2f', ('in_vert', 'in_texture')),
+                shader.BufferDescription(self._instance_buffer, '2f 1f 1f 1f 1f',
+                                         ('in_pos', 'in_angle', 'in_scale', 'in_alpha', 'in_texture_index'),
+                                         instanced=True),
+            ])
+        else:
+            self._instance_buffer.orphan()
+        self._instance_buffer.write(data)
+
+        self._textures.use(0, 1)
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+        with self._vao:
+            program = _get_particle_program()
+            program['Texture'] = 0
+            program['Textures'] = 1
+            self._vao.render(gl.GL_TRIANGLE_STRIP, instances=self.count)
+
+
+# State of a particle in GpuParticles, as it is in the GPU buffers
+_gpu_particle_type = np.dtype([
+    ('pos', np.float32, 2),
+    ('velocity', np.float32, 2),
+    ('angle', np.float32),
+    ('change_angle', np.float32),
+    ('scale', np.float32),
+    ('alpha', np.float32),
+    ('fade', np.float32, 2),
+    ('age', np.float32, 2),
+    ('texture', np.float32),
+])
+
+_GPU_PARTICLE_VARYINGS = ('out_pos', 'out_velocity', 'out_angle', 'out_change_angle', 'out_scale',
+                          'out_alpha', 'out_fade', 'out_age', 'out_texture_index')
+# What the update shader reads. Alpha is worked out from the age, so it isn't read.
+_GPU_PARTICLE_ATTRIBUTES = ('in_pos', 'in_velocity', 'in_angle', 'in_change_angle', 'in_scale',
+                            'in_fade', 'in_age', 'in_texture_index')
+
+_gpu_particle_update_shader = """
+#version 330
+uniform vec2 Gravity;
+// Seconds to advance by
+uniform float DeltaTime;
+
+in vec2 in_pos;
+in vec2 in_velocity;
+in float in_angle;
+in float in_change_angle;
+in float in_scale;
+// Start and end alpha
+in vec2 in_fade;
+// Age and lifetime in seconds
+in vec2 in_age;
+in float in_texture_index;
+
+out vec2 out_pos;
+out vec2 out_velocity;
+out float out_angle;
+out float out_change_angle;
+out float out_scale;
+out float out_alpha;
+out vec2 out_fade;
+out vec2 out_age;
+out float out_texture_index;
+
+void main() {
+    // Velocities are in pixels per 1/60 of a second
+    float updates = DeltaTime * 60.0;
+    out_velocity = in_velocity + Gravity * updates;
+    out_pos = in_pos + out_velocity * updates;
+    out_angle = in_angle + in_change_angle * updates;
+    out_change_angle = in_change_angle;
+    out_fade = in_fade;
+    out_age = vec2(in_age.x + DeltaTime, in_age.y);
+    out_texture_index = in_texture_index;
+    if (out_age.x < out_age.y) {
+        out_scale = in_scale;
+        out_alpha = clamp(mix(in_fade.x, in_fade.y, out_age.x / out_age.y), 0.0, 255.0);
+    } else {
+        // Dead particles have no size, so nothing is drawn for them until their slot is used again
+        out_scale = 0.0;
+        out_alpha = 0.0;
+    }
+}
+"""
+
+_gpu_particle_update_program: Optional[shader.Program] = None
+
+
+def _get_gpu_particle_update_program() -> shader.Program:
+    global _gpu_particle_update_program
+    if _gpu_particle_update_program is None:
+        _gpu_particle_update_program = shader.transform_program(
+            vertex_shader=_gpu_particle_update_shader,
+            varyings=_GPU_PARTICLE_VARYINGS,
+        )
+    return _gpu_particle_update_program
+
+
+class GpuParticles:
+    """
+    Particles kept and updated on the GPU.
+
+    The state of every particle is in a buffer on the GPU, and updating
+    runs a shader over it, with transform feedback writing the new state to
+    a second buffer. The two buffers swap places each update. Only new
+    particles are sent to the GPU, written over the slots of dead ones,
+    and drawing reads the state straight from the buffer. The particles
+    move, turn, fall with ``gravity``, fade and age like in
+    ParticleArrays, but as they never come back to the CPU, they can't be
+    changed once added.
+
+    When a particle dies is worked out on the CPU as well, from when it was
+    added and its lifetime, so ``len()`` doesn't have to wait for the GPU.
+
+    Needs an OpenGL context to add particles.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.count = 0
+        self.capacity = capacity
+        self.gravity: Vector = (0.0, 0.0)
+        # Seconds of updates so far
+        self._time = 0.0
+        # When each slot's particle dies, in the time of the updates
+        self._death_times = np.full(capacity, -math.inf)
+        # Which emitter of an EmitterGroup made the particle in each slot
+        self._owners = np.zeros(capacity, dtype=np.int32)
+        # Slots past this have never been used since the particles were last all dead
+        self._used = 0
+        # Slot the next particles go in
+        self._head = 0
+
+        self._textures = _ParticleTextures()
+        self._buffers: List[shader.Buffer] = []
+        self._quad_buffer: Optional[shader.Buffer] = None
+        # The buffer with the current state of the particles
+        self._current = 0
+        self._update_vaos: list = []
+        self._draw_vaos: list = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def textures(self) -> List[Texture]:
+        return self._textures.textures
+
+    def _make_buffers(self, capacity: int):
+        """ Make state buffers with room for capacity particles, keeping the used slots. """
+        stride = _gpu_particle_type.itemsize
+        buffers = [shader.Buffer.create_with_size(capacity * stride, usage='dynamic') for _ in range(2)]
+        if self._buffers and self._used:
+            buffers[0].copy(self._buffers[self._current], self._used * stride)
+        self._buffers = buffers
+        self._current = 0
+
+        # The VAOs don't keep their buffers, so the quad is kept here
+        self._quad_buffer = shader.buffer(_PARTICLE_QUAD.tobytes())
+        self._update_vaos = [
+            shader.vertex_array(_get_gpu_particle_update_program(), [
+                shader.BufferDescription(buffer, '2f 2f 1f 1f 1f 4x 2f 2f 1f', _GPU_PARTICLE_ATTRIBUTES)
+            ])
+            for buffer in buffers
+        ]
+        self._draw_vaos = [
+            shader.vertex_array(_get_particle_program(), [
+                shader.BufferDescription(self._quad_buffer, '2f 2f', ('in_vert', 'in_texture')),
+                # Position, then angle, scale, alpha, and the texture at the end
+                shader.BufferDescription(buffer, '2f 8x 1f 4x 1f 1f 16x 1f',
+                                         ('in_pos', 'in_angle', 'in_scale', 'in_alpha', 'in_texture_index'),
+                                         instanced=True),
+            ])
+            for buffer in buffers
+        ]
+
+    def _get_free_slots(self, count: int) -> int:
+        """ First of count slots in a row without live particles, growing the buffers if needed. """
+        for first in (self._head, 0, self._used):
+            last = first + count
+            if last <= self.capacity and (self._death_times[first:last] <= self._time).all():
+                return first
+
+        first = self._used
+        capacity = max(self.capacity * 2, self._used + count)
+        self._make_buffers(capacity)
+        death_times = np.full(capacity, -math.inf)
+        death_times[:self.capacity] = self._death_times
+        self._death_times = death_times
+        owners = np.zeros(capacity, dtype=np.int32)
+        owners[:self.capacity] = self._owners
+        self._owners = owners
+        self.capacity = capacity
+        return first
+
+    def add(self, batch: ParticleBatch, count: int, offset: Point = (0.0, 0.0), rotation: float = 0.0,
+            owner: int = 0):
+        """
+        Add particles, writing them over dead ones on the GPU.
+
+        :param batch: Starting state of the particles.
+        :param count: Number of particles.
+        :param offset: Added to the position of every particle, shape (2,) or (count, 2).
+        :param rotation: Degrees to turn the velocity of every particle by, or an array of one per particle.
+        :param owner: Number counted by get_owner_counts, like the emitter that made the particles,
+                      or an array of one per particle.
+        """
+        if count <= 0:
+            return
+        if not self._buffers:
+            self._make_buffers(self.capacity)
+
+        particles = np.empty(count, dtype=_gpu_particle_type)
+        particles['pos'] = batch.center_xy
+        particles['pos'] += np.asarray(offset, dtype=np.float32)
+        particles['velocity'] = _get_batch_velocity(batch, count, rotation)
+        particles['angle'] = batch.angle
+        particles['change_angle'] = batch.change_angle
+        particles['scale'] = batch.scale
+        particles['alpha'] = batch.start_alpha
+        particles['fade'][:, 0] = batch.start_alpha
+        particles['fade'][:, 1] = batch.end_alpha
+        particles['age'][:, 0] = 0.0
+        particles['age'][:, 1] = batch.lifetime
+        texture_lookup = np.array([self._textures.get_index(texture) for texture in batch.textures],
+                                  dtype=np.float32)
+        particles['texture'] = texture_lookup[batch.texture_index]
+
+        first = self._get_free_slots(count)
+        self._buffers[self._current].write(particles.tobytes(), first * _gpu_particle_type.itemsize)
+        self._death_times[first:first + count] = self._time + np.asarray(batch.lifetime, dtype=np.float64)
+        self._owners[first:first + count] = owner
+        self._head = first + count
+        self._used = max(self._used, self._head)
+        self.count += count
+
+    def update(self, delta_time: float = 1 / 60):
+        """ Advance every particle on the GPU by delta_time seconds. """
+        if self._used == 0:
+            return
+        program = _get_gpu_particle_update_program()
+        target = 1 - self._current
+        with self._update_vaos[self._current]:
+            program['Gravity'] = self.gravity
+            program['DeltaTime'] = delta_time
+            self._update_vaos[self._current].transform(self._buffers[target], gl.GL_POINTS, self._used)
+        self._current = target
+
+        self._time += delta_time
+        self.count = int(np.count_nonzero(self._death_times[:self._used] > self._time))
+        if self.count == 0:
+            self.clear()
+
+    def get_owner_counts(self, length: int) -> np.ndarray:
+        """ How many live particles each owner has, for owners 0 to length - 1. """
+        alive = self._death_times[:self._used] > self._time
+        return np.bincount(self._owners[:self._used][alive], minlength=length)
+
+    def clear(self):
+        """ Drop every particle. """
+        self.count = 0
+        self._used = 0
+        self._head = 0
+        self._death_times[:] = -math.inf
+
+    def read(self) -> np.ndarray:
+        """
+        Copy the state of the particles back from the GPU, in the order of
+        their slots, dead ones included. This waits for the GPU, so it is
+        for testing and debugging.
+        """
+        if self._used == 0:
+            return np.empty(0, dtype=_gpu_particle_type)
+        data = self._buffers[self._current].read(self._used * _gpu_particle_type.itemsize)
+        return np.frombuffer(data, dtype=_gpu_particle_type)
+
+    def draw(self):
+        """ Draw every particle, with one draw call. """
+        if self.count == 0:
+            return
+        self._textures.use(0, 1)
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+        vao = self._draw_vaos[self._current]
+        with vao:
+            program = _get_particle_program()
+            program['Texture'] = 0
+            program['Textures'] = 1
+            vao.render(gl.GL_TRIANGLE_STRIP, instances=self._used)
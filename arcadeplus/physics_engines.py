@@ -3,10 +3,19 @@
 """
 # pylint: disable=too-many-arguments, too-many-locals, too-few-public-methods
 
+from typing import List, Tuple, Union
+
 from arcadeplus import check_for_collision_with_list
 from arcadeplus import check_for_collision
 from arcadeplus import Sprite
 from arcadeplus import SpriteList
+from arcadeplus.tilemap import TileCollisionMap
+
+
+def _collides_with_walls(sprite: Sprite, walls: Union[SpriteList, TileCollisionMap]) -> bool:
+    if isinstance(walls, TileCollisionMap):
+        return walls.collides_with_sprite(sprite)
+    return len(check_for_collision_with_list(sprite, walls)) > 0
 
 
 def _circular_check(player, walls):
@@ -34,10 +43,8 @@ def _circular_check(player, walls):
             x, y = my_item
             player.center_x = x
             player.center_y = y
-            check_hit_list = check_for_collision_with_list(player, walls)
-            # print(f"Vary {vary} ({self.player_sprite.center_x} {self.player_sprite.center_y}) "
-            #       f"= {len(check_hit_list)}")
-            if len(check_hit_list) == 0:
+            # print(f"Vary {vary} ({self.player_sprite.center_x} {self.player_sprite.center_y})")
+            if not _collides_with_walls(player, walls):
                 return
         vary *= 2
 
@@ -157,6 +164,56 @@ def _move_sprite(moving_sprite: Sprite, walls: SpriteList, ramp_up: bool):
     return complete_hit_list
 
 
+def _move_sprite_on_tiles(moving_sprite: Sprite, walls: TileCollisionMap, ramp_up: bool) -> List[Tuple[int, int]]:
+    """
+    Same as _move_sprite, for tile walls. As the walls are boxes that don't
+    move, the sprite is put right against them rather than backed off a
+    pixel at a time.
+    """
+    # Rotate
+    moving_sprite.angle += moving_sprite.change_angle
+
+    if walls.collides_with_sprite(moving_sprite):
+        _circular_check(moving_sprite, walls)
+
+    # --- Move in the y direction
+    moving_sprite.center_y += moving_sprite.change_y
+    hits = walls.get_sprite_hits(moving_sprite)
+    complete_hit_list = [(row, column) for row, column, _ in hits]
+    if len(hits) > 0:
+        if moving_sprite.change_y > 0:
+            moving_sprite.top = min(box[1] for _, _, box in hits)
+        elif moving_sprite.change_y < 0:
+            moving_sprite.bottom = max(box[3] for _, _, box in hits)
+        moving_sprite.change_y = 0.0
+
+    # --- Move in the x direction
+    change_x = moving_sprite.change_x
+    moving_sprite.center_x += change_x
+    hits = walls.get_sprite_hits(moving_sprite)
+    for row, column, _ in hits:
+        if (row, column) not in complete_hit_list:
+            complete_hit_list.append((row, column))
+    if len(hits) > 0:
+        # See if we can "run up" a step
+        if ramp_up and change_x != 0:
+            moving_sprite.center_y += abs(change_x)
+            if not walls.collides_with_sprite(moving_sprite):
+                return complete_hit_list
+            moving_sprite.center_y -= abs(change_x)
+
+        if change_x > 0:
+            moving_sprite.right = min(box[0] for _, _, box in hits)
+        elif change_x < 0:
+            moving_sprite.left = max(box[2] for _, _, box in hits)
+        else:
+            print("Error, x collision while player wasn't moving.\n"
+                  "Make sure you aren't calling multiple updates, like "
+                  "a physics engine update and an all sprites list update.")
+
+    return complete_hit_list
+
+
 class PhysicsEngineSimple:
     """
     Simplistic physics engine for use in games without gravity, such as top-down
@@ -165,15 +222,16 @@ class PhysicsEngineSimple:
     does not currently handle rotation.
     """
 
-    def __init__(self, player_sprite: Sprite, walls: SpriteList):
+    def __init__(self, player_sprite: Sprite, walls: Union[SpriteList, TileCollisionMap]):
         """
         Create a simple physics engine.
 
         :param Sprite player_sprite: The moving sprite
-        :param SpriteList walls: The sprites it can't move through
+        :param walls: The sprites it can't move through, or a TileCollisionMap
+                      of the tiles it can't move through
         """
         assert(isinstance(player_sprite, Sprite))
-        assert(isinstance(walls, SpriteList))
+        assert(isinstance(walls, (SpriteList, TileCollisionMap)))
         self.player_sprite = player_sprite
         self.walls = walls
 
@@ -182,7 +240,10 @@ def update(self):
         Move everything and resolve collisions.
 
         :Returns: SpriteList with all sprites contacted. Empty list if no sprites.
+                  With a TileCollisionMap, a list of the ``(row, column)`` cells contacted.
         """
+        if isinstance(self.walls, TileCollisionMap):
+            return _move_sprite_on_tiles(self.player_sprite, self.walls, ramp_up=False)
 
         complete_hit_list = _move_sprite(self.player_sprite, self.walls, ramp_up=False)
         return complete_hit_list
@@ -197,20 +258,21 @@ class PhysicsEnginePlatformer:
 
     def __init__(self,
                  player_sprite: Sprite,
-                 platforms: SpriteList,
+                 platforms: Union[SpriteList, TileCollisionMap],
                  gravity_constant: float = 0.5,
-                 ladders: SpriteList = None,
+                 ladders: Union[SpriteList, TileCollisionMap] = None,
                  ):
         """
         Create a physics engine for a platformer.
 
         :param Sprite player_sprite: The moving sprite
-        :param SpriteList platforms: The sprites it can't move through
+        :param platforms: The sprites it can't move through, or a
+                          TileCollisionMap of the tiles it can't move through
         :param float gravity_constant: Downward acceleration per frame
-        :param SpriteList ladders: Ladders the user can climb on
+        :param ladders: Ladders the user can climb on, as a SpriteList or a TileCollisionMap
         """
-        if ladders is not None and not isinstance(ladders, SpriteList):
-            raise TypeError("Fourth parameter should be a SpriteList of ladders")
+        if ladders is not None and not isinstance(ladders, (SpriteList, TileCollisionMap)):
+            raise TypeError("Fourth parameter should be a SpriteList or TileCollisionMap of ladders")
 
         self.player_sprite = player_sprite
         self.platforms = platforms
@@ -222,6 +284,8 @@ def __init__(self,
 
     def is_on_ladder(self):
         # Check for touching a ladder
+        if isinstance(self.ladders, TileCollisionMap):
+            return self.ladders.collides_with_sprite(self.player_sprite)
         if self.ladders:
             hit_list = check_for_collision_with_list(self.player_sprite, self.ladders)
             if len(hit_list) > 0:
@@ -242,14 +306,14 @@ def can_jump(self, y_distance=5) -> bool:
         self.player_sprite.center_y -= y_distance
 
         # Check for wall hit
-        hit_list = check_for_collision_with_list(self.player_sprite, self.platforms)
+        on_ground = _collides_with_walls(self.player_sprite, self.platforms)
 
         self.player_sprite.center_y += y_distance
 
-        if len(hit_list) > 0:
+        if on_ground:
             self.jumps_since_ground = 0
 
-        if len(hit_list) > 0 or self.allow_multi_jump and self.jumps_since_ground < self.allowed_jumps:
+        if on_ground or self.allow_multi_jump and self.jumps_since_ground < self.allowed_jumps:
             return True
         else:
             return False
@@ -295,6 +359,7 @@ def update(self):
         Move everything and resolve collisions.
 
         :Returns: SpriteList with all sprites contacted. Empty list if no sprites.
+                  With a TileCollisionMap, a list of the ``(row, column)`` cells contacted.
         """
         # print(f"Spot A ({self.player_sprite.center_x}, {self.player_sprite.center_y})")
 
@@ -307,6 +372,9 @@ def update(self):
 
         # print(f"Spot B ({self.player_sprite.center_x}, {self.player_sprite.center_y})")
 
+        if isinstance(self.platforms, TileCollisionMap):
+            return _move_sprite_on_tiles(self.player_sprite, self.platforms, ramp_up=True)
+
         complete_hit_list = _move_sprite(self.player_sprite, self.platforms, ramp_up=True)
 
         for platform in self.platforms:
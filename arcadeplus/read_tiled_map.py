@@ -6,11 +6,14 @@
 import base64
 import zlib
 import gzip
+import io
 
 import typing
 
 from pathlib import Path
 
+import numpy as np
+
 from arcadeplus.isometric import isometric_grid_to_screen
 from arcadeplus import Sprite
 from arcadeplus import SpriteList
@@ -20,6 +23,7 @@ class TiledMap:
     """ This class holds a tiled map, and tile set from the map. """
     def __init__(self):
         self.global_tile_set = {}
+        # GIDs of each layer, as a NumPy uint32 array of rows
         self.layers_int_data = {}
         self.layers = {}
         self.version = None
@@ -52,22 +56,21 @@ def __init__(self):
         self.center_y = 0
 
 
-def _process_csv_encoding(data_text):
-    layer_grid_ints = []
-    lines = data_text.split("\n")
-    for line in lines:
-        line_list = line.split(",")
-        while '' in line_list:
-            line_list.remove('')
-        line_list_int = [int(item) for item in line_list]
-        layer_grid_ints.append(line_list_int)
-
-    return layer_grid_ints
-
+def _process_csv_encoding(data_text: str, layer_width: int) -> np.ndarray:
+    """ Parse CSV layer data into a grid of GIDs, one row per row of the layer. """
+    try:
+        # Each line is a row, with a comma after all but the last one. Blank lines are skipped.
+        return np.loadtxt(io.StringIO(data_text), dtype=np.uint32, delimiter=",",
+                          usecols=range(layer_width), ndmin=2)
+    except ValueError:
+        pass
+    # int() skips the line breaks around each field. Blank fields, as in "1,,2", are left out.
+    gids = map(int, filter(str.strip, data_text.split(",")))
+    return np.array(list(gids), dtype=np.uint32).reshape(-1, layer_width)
 
-def _process_base64_encoding(data_text, compression, layer_width):
-    layer_grid_ints = [[]]
 
+def _process_base64_encoding(data_text: str, compression: typing.Optional[str], layer_width: int) -> np.ndarray:
+    """ Decode base64 layer data, which may be compressed, into a grid of GIDs. """
     unencoded_data = base64.b64decode(data_text)
     if compression == "zlib":
         unzipped_data = zlib.decompress(unencoded_data)
@@ -78,25 +81,8 @@ def _process_base64_encoding(data_text, compression, layer_width):
     else:
         raise ValueError(f"Unsupported compression type '{compression}'.")
 
-    # Turn bytes into 4-byte integers
-    byte_count = 0
-    int_count = 0
-    int_value = 0
-    row_count = 0
-    for byte in unzipped_data:
-        int_value += byte << (byte_count * 8)
-        byte_count += 1
-        if byte_count % 4 == 0:
-            byte_count = 0
-            int_count += 1
-            layer_grid_ints[row_count].append(int_value)
-            int_value = 0
-            if int_count % layer_width == 0:
-                row_count += 1
-                layer_grid_ints.append([])
-
-    layer_grid_ints.pop()
-    return layer_grid_ints
+    # GIDs are little-endian 4-byte integers. Copy them, so the grid can be changed.
+    return np.frombuffer(unzipped_data, dtype="<u4").astype(np.uint32).reshape(-1, layer_width)
 
 
 def _parse_points(point_text: str):
@@ -272,7 +258,7 @@ def read_tiled_map(tmx_file: str, scaling: float = 1, tsx_file: str = None) -> T
             compression = None
 
         if encoding == "csv":
-            layer_grid_ints = _process_csv_encoding(data_text)
+            layer_grid_ints = _process_csv_encoding(data_text, layer_width)
         elif encoding == "base64":
             layer_grid_ints = _process_base64_encoding(data_text, compression, layer_width)
         else:
@@ -284,12 +270,12 @@ def read_tiled_map(tmx_file: str, scaling: float = 1, tsx_file: str = None) -> T
 
         # Now create grid objects for each tile
         layer_grid_objs = []
-        for row_index, row in enumerate(layer_grid_ints):
+        for row_index, row in enumerate(layer_grid_ints.tolist()):
             layer_grid_objs.append([])
             for column_index, column in enumerate(row):
                 grid_loc = GridLocation()
-                if layer_grid_ints[row_index][column_index] != 0:
-                    key = str(layer_grid_ints[row_index][column_index])
+                if column != 0:
+                    key = str(column)
 
                     if key not in my_map.global_tile_set:
                         print(f"Warning, tried to load '{key}' and it is not in the tileset.")
@@ -338,7 +324,7 @@ def generate_sprites(map_object: TiledMap, layer_name: str, scaling: float, base
         print(f"Warning, no layer named '{layer_name}'.")
         return sprite_list
 
-    map_array = map_object.layers_int_data[layer_name]
+    map_array = np.asarray(map_object.layers_int_data[layer_name]).tolist()
 
     # Loop through the layer and add in the wall list
     for row_index, row in enumerate(map_array):
@@ -4,7 +4,7 @@
 from ctypes import *
 from collections import namedtuple
 import weakref
-from typing import List, Tuple, Iterable, Dict
+from typing import List, Tuple, Iterable, Dict, Sequence
 
 from pyglet import gl
 
@@ -34,6 +34,7 @@ class ShaderException(Exception):
     gl.GL_FLOAT_VEC4: (gl.GLfloat, gl.glUniform4fv, 4, 1),
 
     gl.GL_SAMPLER_2D: (gl.GLint, gl.glUniform1iv, 1, 1),
+    gl.GL_SAMPLER_BUFFER: (gl.GLint, gl.glUniform1iv, 1, 1),
 
     gl.GL_FLOAT_MAT2: (gl.GLfloat, gl.glUniformMatrix2fv, 4, 1),
     gl.GL_FLOAT_MAT3: (gl.GLfloat, gl.glUniformMatrix3fv, 9, 1),
@@ -66,18 +67,34 @@ def getter_func():
 
 
 def _create_setter_func(location, gl_setter, c_array, length, count, ptr, is_matrix):
+    # The last value sent to OpenGL. Setting the same value again is skipped.
+    last_value = None
 
     if is_matrix:
         def setter_func(value):  # type: ignore #conditional function variants must have identical signature
+            nonlocal last_value
+            key = _uniform_value_key(value)
+            if key == last_value:
+                return
+            last_value = key
             c_array[:] = value
             gl_setter(location, count, gl.GL_FALSE, ptr)
 
     elif length == 1 and count == 1:
         def setter_func(value):  # type: ignore #conditional function variants must have identical signature
+            nonlocal last_value
+            if value == last_value:
+                return
+            last_value = value
             c_array[0] = value
             gl_setter(location, count, ptr)
     elif length > 1 and count == 1:
         def setter_func(values):  # type: ignore #conditional function variants must have identical signature
+            nonlocal last_value
+            key = _uniform_value_key(values)
+            if key == last_value:
+                return
+            last_value = key
             c_array[:] = values
             gl_setter(location, count, ptr)
 
@@ -87,6 +104,26 @@ def setter_func(values):  # type: ignore #conditional function variants must hav
     return setter_func
 
 
+def _uniform_value_key(value):
+    """ Hashable copy of a uniform value, used to skip uploading the same value twice. """
+    if hasattr(value, 'tobytes'):
+        return value.tobytes()
+    return tuple(value)
+
+
+# Binding points of uniform blocks, by block name. Every program using a block
+# with the same name reads it from the same UniformBuffer.
+_uniform_block_bindings: Dict[str, int] = {}
+
+
+def _get_uniform_block_binding(name: str) -> int:
+    try:
+        return _uniform_block_bindings[name]
+    except KeyError:
+        binding = _uniform_block_bindings[name] = len(_uniform_block_bindings)
+        return binding
+
+
 Uniform = namedtuple('Uniform', 'getter, setter')
 ShaderCode = str
 Shader = Tuple[ShaderCode, gl.GLuint]
@@ -103,7 +140,7 @@ class Program:
         matrix = np.array([[...]])
         program['MyMatrix'] = matrix.flatten()
     """
-    def __init__(self, *shaders: Shader):
+    def __init__(self, *shaders: Shader, varyings: Sequence[str] = None):
         self.prog_id = prog_id = gl.glCreateProgram()
         shaders_id = []
         for shader_code, shader_type in shaders:
@@ -111,7 +148,20 @@ def __init__(self, *shaders: Shader):
             gl.glAttachShader(self.prog_id, shader)
             shaders_id.append(shader)
 
+        if varyings:
+            # Outputs captured by transform feedback, written one after the other for each vertex
+            names = [create_string_buffer(name.encode('utf-8')) for name in varyings]
+            c_names = (POINTER(gl.GLchar) * len(names))(*[cast(name, POINTER(gl.GLchar)) for name in names])
+            gl.glTransformFeedbackVaryings(self.prog_id, len(names), c_names, gl.GL_INTERLEAVED_ATTRIBS)
+
         gl.glLinkProgram(self.prog_id)
+        result = c_int()
+        gl.glGetProgramiv(self.prog_id, gl.GL_LINK_STATUS, byref(result))
+        if result.value == gl.GL_FALSE:
+            msg = create_string_buffer(512)
+            length = c_int()
+            gl.glGetProgramInfoLog(self.prog_id, 512, byref(length), msg)
+            raise ShaderException(f"Program link failure: {msg.value.decode('utf-8')}")
 
         for shader in shaders_id:
             # Flag shaders for deletion. Will only be deleted once detached from program.
@@ -119,6 +169,8 @@ def __init__(self, *shaders: Shader):
 
         self._uniforms: Dict[str, Uniform] = {}
         self._introspect_uniforms()
+        self._uniform_blocks: Dict[str, int] = {}
+        self._introspect_uniform_blocks()
         weakref.finalize(self, Program._delete, shaders_id, prog_id)
 
     @staticmethod
@@ -199,6 +251,17 @@ def _introspect_uniforms(self):
 
             self._uniforms[uniform_name] = Uniform(getter, setter)
 
+    def _introspect_uniform_blocks(self):
+        """Connect each uniform block to the binding point shared by all blocks with its name."""
+        for index in range(self.get_num_active(gl.GL_ACTIVE_UNIFORM_BLOCKS)):
+            buf_size = 192
+            block_name = create_string_buffer(buf_size)
+            gl.glGetActiveUniformBlockName(self.prog_id, index, buf_size, None, block_name)
+            name = block_name.value.decode()
+            binding = _get_uniform_block_binding(name)
+            gl.glUniformBlockBinding(self.prog_id, index, binding)
+            self._uniform_blocks[name] = binding
+
     def query_uniform(self, index: int) -> Tuple[str, int, int]:
         """Retrieve Uniform information at given location.
 
@@ -223,6 +286,17 @@ def program(vertex_shader: str, fragment_shader: str) -> Program:
     )
 
 
+def transform_program(vertex_shader: str, varyings: Sequence[str]) -> Program:
+    """Create a new program that only runs the vertex_shader, for VertexArray.transform.
+
+    The outputs named in `varyings` are written to the buffer, in that order.
+    """
+    return Program(
+        (vertex_shader, gl.GL_VERTEX_SHADER),
+        varyings=varyings
+    )
+
+
 def compile_shader(source: str, shader_type: gl.GLenum) -> gl.GLuint:
     """Compile the shader code of the given type.
 
@@ -309,10 +383,24 @@ def write(self, data: bytes, offset: int = 0):
         # print(f"Reading back from buffer:\n{string_at(ptr, size=60)}")
         # glUnmapBuffer(gl.GL_ARRAY_BUFFER)
 
+    def copy(self, source: "Buffer", size: int, source_offset: int = 0, offset: int = 0):
+        """Copy size bytes of the source Buffer into this one, without going through the CPU."""
+        gl.glBindBuffer(gl.GL_COPY_READ_BUFFER, source.buffer_id)
+        gl.glBindBuffer(gl.GL_COPY_WRITE_BUFFER, self.buffer_id)
+        gl.glCopyBufferSubData(gl.GL_COPY_READ_BUFFER, gl.GL_COPY_WRITE_BUFFER,
+                               gl.GLintptr(source_offset), gl.GLintptr(offset), size)
+
     def orphan(self):
         gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.buffer_id)
         gl.glBufferData(gl.GL_ARRAY_BUFFER, self.size, None, self.usage)
 
+    def read(self, size: int, offset: int = 0) -> bytes:
+        """Read size bytes of the buffer back from the GPU. This waits for the GPU to finish with it."""
+        data = create_string_buffer(size)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.buffer_id)
+        gl.glGetBufferSubData(gl.GL_ARRAY_BUFFER, gl.GLintptr(offset), size, data)
+        return data.raw
+
     def _read(self, size):
         """ Debug method to read data from the buffer. """
 
@@ -328,6 +416,31 @@ def buffer(data: bytes, usage: str = 'static') -> Buffer:
     return Buffer(data, usage)
 
 
+class UniformBuffer(Buffer):
+    """Buffer holding the values of a uniform block.
+
+    Every program with a uniform block called `name` reads from this buffer,
+    so its values are uploaded once instead of once per program. The data
+    must follow the std140 layout, so declare the block with
+    `layout(std140) uniform name { ... };`
+    """
+    def __init__(self, name: str, size: int):
+        super().__init__(bytes(size), usage='dynamic')
+        self.name = name
+        self.binding = _get_uniform_block_binding(name)
+        self.bind()
+
+    def bind(self):
+        """Make this the buffer programs read the uniform block from."""
+        gl.glBindBufferBase(gl.GL_UNIFORM_BUFFER, self.binding, self.buffer_id)
+
+
+def uniform_buffer(name: str, size: int) -> UniformBuffer:
+    """Create a new Buffer for the uniform block `name`.
+    """
+    return UniformBuffer(name, size)
+
+
 class BufferDescription:
     """Vertex Buffer Object description, allowing easy use with VAOs.
 
@@ -336,7 +449,8 @@ class BufferDescription:
     vertex Buffer object.
 
     The formats is a string providing the number and type of each attribute. Currently
-    we only support f (float), i (integer) and B (unsigned byte).
+    we only support f (float), i (integer) and B (unsigned byte). A number of bytes
+    followed by x, like `8x`, skips that many bytes, and has no attribute.
 
     `normalized` enumerates the attributes which must have their values normalized.
     This is useful for instance for colors attributes given as unsigned byte and
@@ -372,15 +486,22 @@ def __init__(self,
             raise ShaderException("Normalized attribute not found in attributes.")
 
         formats_list = formats.split(" ")
+        attribute_count = sum(1 for fmt in formats_list if not fmt.endswith('x'))
 
-        if len(formats_list) != len(self.attributes):
+        if attribute_count != len(self.attributes):
             raise ShaderException(
-                f"Different lengths of formats ({len(formats_list)}) and "
+                f"Different lengths of formats ({attribute_count}) and "
                 f"attributes ({len(self.attributes)})"
             )
 
+        # Padding is kept as a size of 0 with its number of bytes
         self.formats: List[Tuple[int, int, int]] = []
         for i, fmt in enumerate(formats_list):
+            if fmt.endswith('x'):
+                if not fmt[:-1].isdigit():
+                    raise ShaderException(f"Wrong format {fmt}.")
+                self.formats.append((0, int(fmt[:-1]), 0))
+                continue
             sizechar, type_ = fmt
             if sizechar not in '1234' or type_ not in 'fiB':
                 raise ShaderException("Wrong format {fmt}.")
@@ -471,7 +592,12 @@ def _enable_attrib(self, buf_desc: BufferDescription):
 
         gl.glBindBuffer(gl.GL_ARRAY_BUFFER, buff.buffer_id)
         offset = 0
-        for (size, attribsize, gl_type_enum), attrib in zip(buf_desc.formats, buf_desc.attributes):
+        attributes = iter(buf_desc.attributes)
+        for size, attribsize, gl_type_enum in buf_desc.formats:
+            if size == 0:
+                offset += attribsize
+                continue
+            attrib = next(attributes)
             loc = gl.glGetAttribLocation(self.program, attrib.encode('utf-8'))
             if loc == -1:
                 raise ShaderException(f"Attribute {attrib} not found in shader program")
@@ -493,6 +619,19 @@ def render(self, mode: gl.GLuint, instances: int = 1):
         else:
             gl.glDrawArraysInstanced(mode, 0, self.num_vertices, instances)
 
+    def transform(self, buff: Buffer, mode: gl.GLuint, vertices: int, first: int = 0):
+        """Run the vertex shader of a transform_program over vertices, writing its outputs to buff.
+
+        Nothing is drawn. Use the VAO as a context manager around this, like for render.
+        """
+        gl.glEnable(gl.GL_RASTERIZER_DISCARD)
+        gl.glBindBufferBase(gl.GL_TRANSFORM_FEEDBACK_BUFFER, 0, buff.buffer_id)
+        gl.glBeginTransformFeedback(mode)
+        gl.glDrawArrays(mode, first, vertices)
+        gl.glEndTransformFeedback()
+        gl.glBindBufferBase(gl.GL_TRANSFORM_FEEDBACK_BUFFER, 0, 0)
+        gl.glDisable(gl.GL_RASTERIZER_DISCARD)
+
 
 def vertex_array(prog: gl.GLuint, content, index_buffer=None):
     """Create a new Vertex Array.
@@ -504,7 +643,7 @@ class Texture:
     def __init__(self, size: Tuple[int, int], component: int, data):
         self.width, self.height = size
         sized_format = (gl.GL_R8, gl.GL_RG8, gl.GL_RGB8, gl.GL_RGBA8)[component - 1]
-        self.format = (gl.GL_R, gl.GL_RG, gl.GL_RGB, gl.GL_RGBA)[component - 1]
+        self.format = (gl.GL_RED, gl.GL_RG, gl.GL_RGB, gl.GL_RGBA)[component - 1]
         gl.glActiveTexture(gl.GL_TEXTURE0 + 0)  # If we need other texture unit...
         self.texture_id = texture_id = gl.GLuint()
         gl.glGenTextures(1, byref(self.texture_id))
@@ -540,6 +679,44 @@ def use(self, texture_unit: int = 0):
         gl.glActiveTexture(gl.GL_TEXTURE0 + texture_unit)
         gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture_id)
 
+    def write(self, data, x: int, y: int, width: int, height: int):
+        """Replace a region of the texture. `data` is unsigned bytes, rows of `width` pixels."""
+        gl.glActiveTexture(gl.GL_TEXTURE0)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture_id)
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+        gl.glTexSubImage2D(
+            gl.GL_TEXTURE_2D, 0, x, y, width, height,
+            self.format, gl.GL_UNSIGNED_BYTE, data
+        )
+
 
 def texture(size: Tuple[int, int], component: int, data) -> Texture:
     return Texture(size, component, data)
+
+
+class BufferTexture:
+    """Buffer texture, giving shaders random access to the contents of a Buffer.
+
+    Read it in the shader with a `samplerBuffer` uniform and `texelFetch`.
+    The default format makes each texel four floats.
+    """
+    def __init__(self, buff: Buffer, internal_format: gl.GLenum = gl.GL_RGBA32F):
+        self.buffer = buff
+        self.texture_id = texture_id = gl.GLuint()
+        gl.glGenTextures(1, byref(self.texture_id))
+
+        if self.texture_id.value == 0:
+            raise ShaderException("Cannot create BufferTexture.")
+
+        gl.glBindTexture(gl.GL_TEXTURE_BUFFER, self.texture_id)
+        gl.glTexBuffer(gl.GL_TEXTURE_BUFFER, internal_format, buff.buffer_id)
+        self._finalizer = weakref.finalize(self, Texture.release, texture_id)
+
+    def release(self):
+        """ Delete the texture and its buffer now, instead of when they are garbage collected. """
+        self._finalizer()
+        Buffer.release(self.buffer.buffer_id)
+
+    def use(self, texture_unit: int = 0):
+        gl.glActiveTexture(gl.GL_TEXTURE0 + texture_unit)
+        gl.glBindTexture(gl.GL_TEXTURE_BUFFER, self.texture_id)
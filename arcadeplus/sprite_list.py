@@ -25,13 +25,14 @@
 from arcadeplus import is_point_in_polygon
 
 from arcadeplus import rotate_point
-from arcadeplus import get_projection
 from arcadeplus import shader
 from arcadeplus import Point
 
 _VERTEX_SHADER = """
 #version 330
-uniform mat4 Projection;
+layout(std140) uniform ProjectionBlock {
+    mat4 Projection;
+};
 uniform mat3 TextureTransform;
 
 // per vertex
@@ -329,6 +330,8 @@ def __init__(self, use_spatial_hash=False, spatial_hash_cell_size=128, is_static
         self._sprite_sub_tex_buf = None
         self._sprite_sub_tex_desc = None
         self._sprite_sub_tex_changed = False
+        # Coordinates of each image in the atlas, in the order of array_of_texture_names
+        self._atlas_tex_coords = None
 
         self.texture_id = None
         self._texture = None
@@ -679,6 +682,8 @@ def _calculate_sub_tex_coords():
                 index = self.array_of_texture_names.index(sprite.texture.name)
                 for coord in tex_coords[index]:
                     array_of_sub_tex_coords.append(coord)
+            self._sprite_sub_tex_data = array_of_sub_tex_coords
+            self._atlas_tex_coords = tex_coords
 
             self._sprite_sub_tex_buf = shader.buffer(
                 array_of_sub_tex_coords.tobytes(),
@@ -761,13 +766,29 @@ def _update_positions(self):
             self._sprite_size_data[i * 2 + 1] = sprite.height
             self._sprite_size_changed = True
 
-    def update_texture(self, _sprite):
+    def update_texture(self, sprite):
         """ Make sure we update the texture for this sprite for the next batch
         drawing"""
         if self._vao1 is None:
             return
 
-        self._calculate_sprite_buffer()
+        # If the image is already in the atlas, like the frames of an animation
+        # usually are, only this sprite's texture coordinates and size change.
+        name = sprite.texture.name
+        if self.is_static or self.array_of_images is None or name not in self.array_of_texture_names:
+            self._calculate_sprite_buffer()
+            return
+        index = self.array_of_texture_names.index(name)
+        if index >= len(self._atlas_tex_coords):
+            self._calculate_sprite_buffer()
+            return
+
+        i = self.sprite_idx[sprite]
+        self._sprite_sub_tex_data[i * 4:i * 4 + 4] = array.array('f', self._atlas_tex_coords[index])
+        self._sprite_sub_tex_changed = True
+        self._sprite_size_data[i * 2] = sprite.width
+        self._sprite_size_data[i * 2 + 1] = sprite.height
+        self._sprite_size_changed = True
 
     def update_position(self, sprite: Sprite):
         """
@@ -890,6 +911,18 @@ def update_angle(self, sprite: Sprite):
         self._sprite_angle_data[i] = math.radians(sprite.angle)
         self._sprite_angle_changed = True
 
+    def _prepare_draw(self):
+        """ Create the program, texture atlas and buffers, if they aren't made yet. """
+        if self.program is None:
+            # Used in drawing optimization via OpenGL
+            self.program = shader.program(
+                vertex_shader=_VERTEX_SHADER,
+                fragment_shader=_FRAGMENT_SHADER
+            )
+
+        if len(self.sprite_list) > 0 and self._vao1 is None:
+            self._calculate_sprite_buffer()
+
     def draw(self, **kwargs):
         """
         Draw this list of sprites.
@@ -897,19 +930,11 @@ def draw(self, **kwargs):
         :param filter: Optional parameter to set OpenGL filter, such as
                        `gl.GL_NEAREST` to avoid smoothing.
         """
-        if self.program is None:
-            # Used in drawing optimization via OpenGL
-            self.program = shader.program(
-                vertex_shader=_VERTEX_SHADER,
-                fragment_shader=_FRAGMENT_SHADER
-            )
+        self._prepare_draw()
 
         if len(self.sprite_list) == 0:
             return
 
-        if self._vao1 is None:
-            self._calculate_sprite_buffer()
-
         self._texture.use(0)
 
         gl.glEnable(gl.GL_BLEND)
@@ -923,7 +948,6 @@ def draw(self, **kwargs):
 
         with self._vao1:
             self.program['Texture'] = self.texture_id
-            self.program['Projection'] = get_projection().flatten()
             texture_transform = None
             if len(self.sprite_list) > 0:
                 # always wrap texture transformations with translations
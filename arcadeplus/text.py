@@ -1,16 +1,23 @@
 # --- BEGIN TEXT FUNCTIONS # # #
 
+import os
+import threading
+from collections import namedtuple
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from itertools import chain
-from typing import Dict, Tuple, Union, cast
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
+import numpy as np
 import PIL.Image
 import PIL.ImageDraw
 import PIL.ImageFont
 import pyglet
+import pyglet.gl as gl
 
-from arcadeplus.arcade_types import RGBA, Color
-from arcadeplus.draw_commands import Texture, get_four_byte_color
-from arcadeplus.sprite import Sprite
+from arcadeplus.arcade_types import Color
+from arcadeplus.draw_commands import get_four_byte_color
+from arcadeplus import shader
 
 DEFAULT_FONT_NAMES = (
     "arial.ttf",
@@ -21,7 +28,21 @@
     "/Library/Fonts/Arial.ttf"
 )
 
-draw_text_cache: Dict[str, 'Text'] = dict()
+
+# Where a glyph is in the atlas, and how to place it. x and y are the top-left
+# pixel of the glyph in the atlas. offset_x and offset_y go from the pen position
+# on the baseline to the top-left corner of the glyph, with y going up.
+_Glyph = namedtuple('_Glyph', 'x, y, width, height, offset_x, offset_y, advance')
+
+# Per glyph data sent to the graphics card. rect is the glyph's position and size,
+# relative to the center of its text. tex is the glyph's rectangle in the atlas,
+# in pixels. transform is the center of the text, and its angle.
+_glyph_instance_type = np.dtype([
+    ('rect', '4f4'),
+    ('tex', '4f4'),
+    ('color', '4u1'),
+    ('transform', '3f4'),
+])
 
 
 class Text:
@@ -29,7 +50,605 @@ class Text:
 
     def __init__(self):
         self.size = (0, 0)
-        self.text_sprite_list = None
+        # One row per glyph: x, y, width, height of the glyph relative to the
+        # bottom-left of the text, then its rectangle in the atlas.
+        self.glyph_data = np.zeros((0, 8), dtype=np.float32)
+        # Atlas generation the glyph_data was laid out with
+        self.generation = -1
+        # Some glyphs are still being rasterized, and are missing
+        self.pending = False
+
+    @property
+    def width(self) -> float:
+        return self.size[0]
+
+    @property
+    def height(self) -> float:
+        return self.size[1]
+
+    @property
+    def byte_count(self) -> int:
+        """ Memory used by the glyph data, for the cache limits. """
+        return self.glyph_data.nbytes
+
+
+class TextCache:
+    """
+    Least recently used cache of laid out text, used by ``draw_text``.
+
+    The cache is limited both in number of entries and in bytes of glyph data.
+    When either limit is passed, the entries used longest ago are evicted one at
+    a time. Eviction only drops the cache's reference, text already handed out
+    keeps its glyphs. The hit and miss counts help tune the limits, see
+    ``stats``.
+    """
+
+    def __init__(self, max_entries: int = 5000, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, Text]" = OrderedDict()
+        self.byte_count = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def get(self, key) -> Optional['Text']:
+        """ Get an entry, marking it as the most recently used. None if it isn't cached. """
+        label = self._entries.get(key)
+        if label is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return label
+
+    def __setitem__(self, key, label: 'Text'):
+        old_label = self._entries.pop(key, None)
+        if old_label is not None:
+            self.byte_count -= old_label.byte_count
+        self._entries[key] = label
+        self.byte_count += label.byte_count
+
+        while len(self._entries) > 1 and \
+                (len(self._entries) > self.max_entries or self.byte_count > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self.byte_count -= evicted.byte_count
+            self.evictions += 1
+
+    def clear(self):
+        """ Remove every entry. The statistics are kept. """
+        self._entries.clear()
+        self.byte_count = 0
+
+    def stats(self) -> Dict[str, float]:
+        """ Get the cache statistics: entries, bytes, hits, misses, evictions and hit_rate. """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.byte_count,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+draw_text_cache: TextCache = TextCache()
+
+# Fonts found by _get_font, by (font names, size, bold, italic)
+_font_cache: Dict[tuple, PIL.ImageFont.FreeTypeFont] = dict()
+
+
+class _GlyphAtlas:
+    """
+    Single-channel texture holding every glyph drawn so far.
+
+    Glyphs are packed in rows. The pixels are kept in a NumPy array as well, and
+    only the rows changed since the last draw are uploaded. When the atlas is full
+    it doubles in height, and once it can't grow any more it is cleared and
+    ``generation`` is bumped so laid out text knows to look its glyphs up again.
+    """
+
+    def __init__(self, width: int = 1024, height: int = 256, max_height: int = 4096):
+        self.max_height = max_height
+        self.padding = 1
+        self.image = np.zeros((height, width), dtype=np.uint8)
+        self.glyphs: Dict[tuple, _Glyph] = {}
+        self.generation = 0
+        self.texture = None
+        self._row_x = self.padding
+        self._row_y = self.padding
+        self._row_height = 0
+        # Range of rows changed since the last upload
+        self._dirty_top = None
+        self._dirty_bottom = None
+        # Set by set_async_text to rasterize glyphs in the background
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[tuple, Future] = {}
+
+    @property
+    def width(self) -> int:
+        return self.image.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.image.shape[0]
+
+    def get_glyph(self, font, char: str) -> _Glyph:
+        """ Get a glyph, rasterizing it into the atlas if this is the first time it is used. """
+        key = (font.path, font.size, char)
+        try:
+            return self.glyphs[key]
+        except KeyError:
+            pass
+
+        if self.executor is not None and isinstance(font.path, str):
+            # Rasterize on a worker thread, the glyph is added by collect()
+            if key not in self._pending:
+                self._pending[key] = self.executor.submit(_rasterize_glyph_from_file, font.path, font.size, char)
+            return None
+
+        bitmap, offset_x, offset_y = _rasterize_glyph(font, char)
+        return self._add_glyph(key, bitmap, offset_x, offset_y, _get_advance(font, char))
+
+    def _add_glyph(self, key: tuple, bitmap: np.ndarray, offset_x: int, offset_y: int, advance: float) -> _Glyph:
+        height, width = bitmap.shape
+        x, y = self._allocate(width, height)
+        if width and height:
+            self.image[y:y + height, x:x + width] = bitmap
+            self._mark_dirty(y, y + height)
+
+        glyph = _Glyph(x, y, width, height, offset_x, offset_y, advance)
+        self.glyphs[key] = glyph
+        return glyph
+
+    @property
+    def pending_count(self) -> int:
+        """ Number of glyphs being rasterized on worker threads. """
+        return len(self._pending)
+
+    def collect(self) -> int:
+        """
+        Add the glyphs the worker threads have finished to the atlas.
+
+        :returns: Number of glyphs added.
+        """
+        if not self._pending:
+            return 0
+        done = [key for key, future in self._pending.items() if future.done()]
+        for key in done:
+            self._add_glyph(key, *self._pending.pop(key).result())
+        return len(done)
+
+    def wait(self):
+        """ Wait for the worker threads to finish every glyph, and add them. """
+        for future in list(self._pending.values()):
+            future.result()
+        self.collect()
+
+    def _allocate(self, width: int, height: int) -> Tuple[int, int]:
+        if width > self.width - 2 * self.padding:
+            raise ValueError(f"Glyph of width {width} is too wide for the text atlas.")
+
+        if self._row_x + width + self.padding > self.width:
+            # Start a new row
+            self._row_y += self._row_height + self.padding
+            self._row_x = self.padding
+            self._row_height = 0
+
+        while self._row_y + height + self.padding > self.height:
+            if self.height * 2 <= self.max_height:
+                image = np.zeros((self.height * 2, self.width), dtype=np.uint8)
+                image[:self.height] = self.image
+                self.image = image
+                # The texture is recreated with the new size on the next upload
+                self.texture = None
+            else:
+                self.clear()
+
+        x, y = self._row_x, self._row_y
+        self._row_x += width + self.padding
+        self._row_height = max(self._row_height, height)
+        return x, y
+
+    def clear(self):
+        """ Remove every glyph from the atlas. """
+        self.image[:] = 0
+        self.glyphs.clear()
+        self.generation += 1
+        self._row_x = self.padding
+        self._row_y = self.padding
+        self._row_height = 0
+        self._mark_dirty(0, self.height)
+
+    def _mark_dirty(self, top: int, bottom: int):
+        self._dirty_top = top if self._dirty_top is None else min(self._dirty_top, top)
+        self._dirty_bottom = bottom if self._dirty_bottom is None else max(self._dirty_bottom, bottom)
+
+    def use(self, texture_unit: int = 0):
+        """ Upload any new glyphs, and bind the atlas texture. """
+        if self.texture is None:
+            self.texture = shader.Texture((self.width, self.height), 1, self.image.tobytes())
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_NEAREST)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
+        elif self._dirty_top is not None:
+            rows = self.image[self._dirty_top:self._dirty_bottom]
+            self.texture.write(rows.tobytes(), 0, self._dirty_top, self.width, len(rows))
+        self._dirty_top = None
+        self._dirty_bottom = None
+        self.texture.use(texture_unit)
+
+
+def _rasterize_glyph(font, char: str):
+    """
+    Draw one character.
+
+    :returns: Tuple of the anti-aliased bitmap as a NumPy array, and the offset
+        from the pen position to the bitmap's top-left corner, with y going up.
+    """
+    mask, (offset_x, offset_y) = font.getmask2(char, mode="L")
+    width, height = mask.size
+    if width == 0 or height == 0:
+        return np.zeros((0, 0), dtype=np.uint8), 0, 0
+
+    image = PIL.Image.new("L", (width, height))
+    draw = PIL.ImageDraw.Draw(image)
+    draw.text((-offset_x, -offset_y), char, fill=255, font=font)
+    ascent, _ = font.getmetrics()
+    return np.asarray(image, dtype=np.uint8), offset_x, ascent - offset_y
+
+
+# Each worker thread opens its own copy of the fonts it uses
+_thread_fonts = threading.local()
+
+
+def _rasterize_glyph_from_file(font_path: str, font_size: int, char: str):
+    """ Rasterize a glyph on a worker thread. """
+    fonts = getattr(_thread_fonts, "fonts", None)
+    if fonts is None:
+        fonts = _thread_fonts.fonts = {}
+    font = fonts.get((font_path, font_size))
+    if font is None:
+        font = fonts[(font_path, font_size)] = PIL.ImageFont.truetype(font_path, font_size)
+    bitmap, offset_x, offset_y = _rasterize_glyph(font, char)
+    return bitmap, offset_x, offset_y, _get_advance(font, char)
+
+
+def _get_advance(font, char: str) -> float:
+    """ How far to move the pen after drawing a character. """
+    if hasattr(font, "getlength"):
+        return font.getlength(char)
+    return font.getsize(char)[0]
+
+
+_glyph_atlas: Optional[_GlyphAtlas] = None
+
+
+def _get_glyph_atlas() -> _GlyphAtlas:
+    global _glyph_atlas
+    if _glyph_atlas is None:
+        _glyph_atlas = _GlyphAtlas()
+    return _glyph_atlas
+
+
+def _get_font_names(font_name: Union[str, Iterable[str]]) -> Tuple[str, ...]:
+    """ A font name, or a sequence of them to try in turn, as a tuple. """
+    # Font was specified with a string
+    if isinstance(font_name, str):
+        return font_name,
+    return tuple(font_name)
+
+
+def _get_font(font_name: Union[str, Tuple[str, ...]], font_size: int,
+              bold: bool = False, italic: bool = False):
+    """
+    Find the first font in font_name, then in DEFAULT_FONT_NAMES, that can be loaded.
+    For bold or italic text, the bold or italic file of each font is tried
+    before its regular one.
+
+    Searching means trying to open font files until one works, so the font
+    found is cached.
+    """
+    font_name = _get_font_names(font_name)
+
+    key = (font_name, font_size, bold, italic)
+    try:
+        return _font_cache[key]
+    except KeyError:
+        pass
+
+    font = _find_font(font_name, font_size, bold, italic)
+    _font_cache[key] = font
+    return font
+
+
+# How the file names of bold and italic fonts end, as in DejaVuSans-Bold.ttf or arialbd.ttf
+_FONT_STYLE_SUFFIXES = {
+    (True, False): ("-Bold", "bd"),
+    (False, True): ("-Italic", "-Oblique", "i"),
+    (True, True): ("-BoldItalic", "-BoldOblique", "bi"),
+}
+
+
+def _get_styled_font_names(font_string_name: str, bold: bool, italic: bool) -> List[str]:
+    """ File names the bold or italic version of a font could have. """
+    suffixes = _FONT_STYLE_SUFFIXES.get((bold, italic), ())
+    if not suffixes:
+        return []
+    base, extension = os.path.splitext(font_string_name)
+    if extension.lower() not in (".ttf", ".otf", ".ttc"):
+        base, extension = font_string_name, ".ttf"
+    if base.endswith("-Regular"):
+        base = base[:-len("-Regular")]
+    return [f"{base}{suffix}{extension}" for suffix in suffixes]
+
+
+def _find_font(font_name: Tuple[str, ...], font_size: int, bold: bool = False, italic: bool = False):
+    font_names = chain(*[
+        _get_styled_font_names(font_string_name, bold, italic) + [font_string_name, f"{font_string_name}.ttf"]
+        for font_string_name in font_name
+    ], *[
+        _get_styled_font_names(font_string_name, bold, italic) + [font_string_name]
+        for font_string_name in DEFAULT_FONT_NAMES
+    ])
+
+    for font_string_name in font_names:
+        try:
+            return PIL.ImageFont.truetype(font_string_name, font_size)
+        except OSError:
+            continue
+
+    raise RuntimeError("Unable to find a default font on this system. Please specify an available font.")
+
+
+def _layout_text(text: str, font, atlas: _GlyphAtlas, width: float = 0, align: str = "left") -> Text:
+    """ Work out where each glyph of the text goes, relative to the bottom-left of the text. """
+    generation = atlas.generation
+    label = _layout_text_once(text, font, atlas, width, align)
+    if atlas.generation != generation:
+        # The atlas was cleared part way through, so the first glyphs are gone
+        label = _layout_text_once(text, font, atlas, width, align)
+    return label
+
+
+def _layout_text_once(text: str, font, atlas: _GlyphAtlas, width: float, align: str) -> Text:
+    ascent, descent = font.getmetrics()
+    line_height = ascent + descent
+    lines = text.split("\n")
+
+    line_glyphs = []
+    line_widths = []
+    pending = False
+    for line in lines:
+        glyphs = []
+        pen_x = 0.0
+        for char in line:
+            glyph = atlas.get_glyph(font, char)
+            if glyph is None:
+                # Still being rasterized, leave a gap for now
+                pending = True
+                pen_x += _get_advance(font, char)
+                continue
+            if glyph.width and glyph.height:
+                glyphs.append((pen_x, glyph))
+            pen_x += glyph.advance
+        line_glyphs.append(glyphs)
+        line_widths.append(pen_x)
+
+    text_width = max(width, max(line_widths))
+    text_height = line_height * len(lines)
+
+    rows = []
+    for line_number, (glyphs, line_width) in enumerate(zip(line_glyphs, line_widths)):
+        if align == "center":
+            start_x = (text_width - line_width) / 2
+        elif align == "right":
+            start_x = text_width - line_width
+        else:
+            start_x = 0
+        baseline = text_height - ascent - line_number * line_height
+        for pen_x, glyph in glyphs:
+            rows.append((
+                start_x + pen_x + glyph.offset_x,
+                baseline + glyph.offset_y - glyph.height,
+                glyph.width,
+                glyph.height,
+                glyph.x, glyph.y, glyph.width, glyph.height,
+            ))
+
+    label = Text()
+    label.size = (text_width, text_height)
+    if rows:
+        label.glyph_data = np.array(rows, dtype=np.float32)
+    label.generation = atlas.generation
+    label.pending = pending
+    return label
+
+
+def _get_glyph_instances(label: Text,
+                         start_x: float, start_y: float,
+                         color: Color,
+                         anchor_x: str = "left",
+                         anchor_y: str = "baseline",
+                         rotation: float = 0) -> np.ndarray:
+    """ Build the per glyph data to draw a laid out text at a position. """
+    text_width, text_height = label.size
+
+    if anchor_x == "left":
+        center_x = start_x + text_width / 2
+    elif anchor_x == "center":
+        center_x = start_x
+    elif anchor_x == "right":
+        center_x = start_x - text_width / 2
+    else:
+        raise ValueError(f"anchor_x should be 'left', 'center', or 'right'. Not '{anchor_x}'")
+
+    if anchor_y == "top":
+        center_y = start_y - text_height / 2
+    elif anchor_y == "center":
+        center_y = start_y
+    elif anchor_y == "bottom" or anchor_y == "baseline":
+        center_y = start_y + text_height / 2
+    else:
+        raise ValueError(f"anchor_y should be 'top', 'center', 'bottom', or 'baseline'. Not '{anchor_y}'")
+
+    instances = np.zeros(len(label.glyph_data), dtype=_glyph_instance_type)
+    instances['rect'] = label.glyph_data[:, :4]
+    instances['rect'][:, 0] -= text_width / 2
+    instances['rect'][:, 1] -= text_height / 2
+    instances['tex'] = label.glyph_data[:, 4:]
+    instances['color'] = get_four_byte_color(color)
+    instances['transform'] = center_x, center_y, rotation
+    return instances
+
+
+_text_vertex_shader = '''
+    #version 330
+    layout(std140) uniform ProjectionBlock {
+        mat4 Projection;
+    };
+    uniform vec2 AtlasSize;
+
+    // per vertex, corner of the quad from (0, 0) to (1, 1)
+    in vec2 in_vert;
+
+    // per instance
+    in vec4 in_rect;
+    in vec4 in_tex;
+    in vec4 in_color;
+    in vec3 in_transform;
+
+    out vec2 v_texture;
+    out vec4 v_color;
+
+    void main() {
+        float angle = radians(in_transform.z);
+        mat2 rotate = mat2(
+            cos(angle), sin(angle),
+            -sin(angle), cos(angle)
+        );
+        vec2 pos = in_transform.xy + rotate * (in_rect.xy + in_vert * in_rect.zw);
+        gl_Position = Projection * vec4(pos, 0.0, 1.0);
+
+        // The atlas has its first row at the top
+        v_texture = (in_tex.xy + vec2(in_vert.x, 1.0 - in_vert.y) * in_tex.zw) / AtlasSize;
+        v_color = in_color;
+    }
+'''
+
+_text_fragment_shader = '''
+    #version 330
+    uniform sampler2D Atlas;
+
+    in vec2 v_texture;
+    in vec4 v_color;
+
+    out vec4 f_color;
+
+    void main() {
+        float coverage = texture(Atlas, v_texture).r;
+        if (coverage == 0.0) {
+            discard;
+        }
+        f_color = vec4(v_color.rgb, v_color.a * coverage);
+    }
+'''
+
+
+class _TextRenderer:
+    """
+    Draws glyphs from the atlas as instanced quads.
+
+    Any number of texts can be drawn in one call by passing all of their glyph
+    instances together. Like the polyline renderer, the instance buffers are
+    used in turn so a new draw doesn't have to wait for the previous one.
+    """
+
+    ring_size = 3
+
+    def __init__(self):
+        self.program = shader.program(
+            vertex_shader=_text_vertex_shader,
+            fragment_shader=_text_fragment_shader,
+        )
+        quad = np.array([0, 0, 1, 0, 0, 1, 1, 1], dtype=np.float32)
+        self.quad_vbo = shader.buffer(quad.tobytes())
+        self.slots = []
+        self.slot_index = 0
+
+    def create_vertex_array(self, instance_buf: shader.Buffer) -> shader.VertexArray:
+        """ Create a VAO drawing the glyph instances held in a buffer. """
+        vao_content = [
+            shader.BufferDescription(
+                self.quad_vbo,
+                '2f',
+                ('in_vert',)
+            ),
+            shader.BufferDescription(
+                instance_buf,
+                '4f 4f 4B 3f',
+                ('in_rect', 'in_tex', 'in_color', 'in_transform'),
+                normalized=['in_color'],
+                instanced=True
+            )
+        ]
+        return shader.vertex_array(self.program, vao_content)
+
+    def _get_slot(self, size: int):
+        if len(self.slots) < self.ring_size:
+            self.slots.append(None)
+        self.slot_index = (self.slot_index + 1) % len(self.slots)
+        slot = self.slots[self.slot_index]
+
+        if slot is None or slot[0].size < size:
+            capacity = 1024 * _glyph_instance_type.itemsize
+            while capacity < size:
+                capacity *= 2
+            instance_buf = shader.Buffer.create_with_size(capacity, usage='stream')
+            slot = instance_buf, self.create_vertex_array(instance_buf)
+            self.slots[self.slot_index] = slot
+        else:
+            slot[0].orphan()
+        return slot
+
+    def draw(self, instances: np.ndarray):
+        """ Draw glyph instances, of any number of texts, in one call. """
+        if len(instances) == 0:
+            return
+
+        data = instances.tobytes()
+        instance_buf, vao = self._get_slot(len(data))
+        instance_buf.write(data)
+        self.render(vao, len(instances))
+
+    def render(self, vao: shader.VertexArray, instance_count: int):
+        """ Draw the first instance_count glyph instances of a VAO from create_vertex_array. """
+        atlas = _get_glyph_atlas()
+        atlas.use(0)
+
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+
+        with vao:
+            self.program['Atlas'] = 0
+            self.program['AtlasSize'] = [atlas.width, atlas.height]
+            vao.render(gl.GL_TRIANGLE_STRIP, instances=instance_count)
+
+
+_text_renderer: Optional[_TextRenderer] = None
+
+
+def _get_text_renderer() -> _TextRenderer:
+    global _text_renderer
+    if _text_renderer is None:
+        _text_renderer = _TextRenderer()
+    return _text_renderer
 
 
 class CreateText:
@@ -100,6 +719,81 @@ def render_text(text: CreateText, start_x: float, start_y: float):
               rotation=text.rotation)
 
 
+def _get_text(text: str,
+              font_size: float = 12,
+              width: int = 0,
+              align: str = "left",
+              font_name: Union[str, Tuple[str, ...]] = ('calibri', 'arial'),
+              bold: bool = False,
+              italic: bool = False) -> Text:
+    """ Get the laid out text from draw_text_cache, laying it out on a miss. """
+    # Scale the font up, so it matches with the sizes of the old code back
+    # when Pyglet drew the text.
+    font_size *= 1.25
+
+    atlas = _get_glyph_atlas()
+    atlas.collect()
+    key = (text, font_size, width, align, _get_font_names(font_name), bold, italic)
+    label = draw_text_cache.get(key)
+    if label is None or label.generation != atlas.generation or label.pending:
+        font = _get_font(font_name, int(font_size), bold, italic)
+        label = _layout_text(text, font, atlas, width, align)
+        draw_text_cache[key] = label
+    return label
+
+
+def set_async_text(enabled: bool, max_workers: int = 2):
+    """
+    Turn background rasterization of text on or off.
+
+    When on, characters that haven't been drawn before are rasterized on
+    worker threads instead of in the draw call. Text is drawn with gaps where
+    its glyphs aren't ready yet, and a ``BatchedText`` keeps showing its
+    previous text until the new one is complete.
+
+    :param bool enabled: Rasterize in the background
+    :param int max_workers: Number of worker threads
+    """
+    atlas = _get_glyph_atlas()
+    if enabled and atlas.executor is None:
+        atlas.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="arcadeplus-text")
+    elif not enabled and atlas.executor is not None:
+        atlas.wait()
+        atlas.executor.shutdown()
+        atlas.executor = None
+
+
+def prewarm_text(texts: Iterable[str],
+                 font_size: float = 12,
+                 width: int = 0,
+                 align: str = "left",
+                 font_name: Union[str, Tuple[str, ...]] = ('calibri', 'arial'),
+                 bold: bool = False,
+                 italic: bool = False,
+                 wait: bool = True):
+    """
+    Rasterize and lay out texts ahead of time, for example during a loading
+    screen, so drawing them later doesn't cause a hitch.
+
+    :param Iterable[str] texts: Texts to get ready
+    :param bool wait: With background rasterization on, wait until the
+        worker threads are done. Otherwise return right away, and the texts
+        will be ready in a few frames. Check ``get_pending_glyph_count``.
+    """
+    texts = list(texts)
+    for text in texts:
+        _get_text(text, font_size, width, align, font_name, bold, italic)
+    if wait and _get_glyph_atlas().pending_count:
+        _get_glyph_atlas().wait()
+        for text in texts:
+            _get_text(text, font_size, width, align, font_name, bold, italic)
+
+
+def get_pending_glyph_count() -> int:
+    """ Number of characters still being rasterized in the background. """
+    return _get_glyph_atlas().pending_count
+
+
 def draw_text(text: str,
               start_x: float,
               start_y: float,
@@ -113,8 +807,10 @@ def draw_text(text: str,
               anchor_x: str = "left",
               anchor_y: str = "baseline",
               rotation: float = 0
-              ) -> Sprite:
+              ) -> Text:
     """
+    Draw text. Each character is drawn from a shared glyph atlas, so new text
+    only needs the glyphs it hasn't used before to be rasterized.
 
     :param str text: Text to draw
     :param float start_x: x coordinate of the lower-left point to start drawing text
@@ -129,139 +825,296 @@ def draw_text(text: str,
     :param str anchor_x: Anchor the font location, defaults to 'left'
     :param str anchor_y: Anchor the font location, defaults to 'baseline'
     :param float rotation: Rotate the text
+
+    :Returns Text: The laid out text, with its ``width`` and ``height``.
     """
-    global draw_text_cache
+    label = _get_text(text, font_size, width, align, font_name, bold, italic)
+    instances = _get_glyph_instances(label, start_x, start_y, color, anchor_x, anchor_y, rotation)
+    _get_text_renderer().draw(instances)
+    return label
 
-    # Scale the font up, so it matches with the sizes of the old code back
-    # when Pyglet drew the text.
-    font_size *= 1.25
 
-    # Text isn't anti-aliased, so we'll draw big, and then shrink
-    scale_up = 2
-    scale_down = 2
+class BatchedText:
+    """
+    A text in a TextBatch, returned by ``TextBatch.add``.
+
+    Its text, position, color, rotation and visibility can be changed, which
+    only rewrites this text's glyphs in the batch.
+    """
 
-    font_size *= scale_up
+    def __init__(self, batch: 'TextBatch', text: str,
+                 start_x: float, start_y: float, color: Color,
+                 font_size: float, width: int, align: str,
+                 font_name: Union[str, Tuple[str, ...]], bold: bool, italic: bool,
+                 anchor_x: str, anchor_y: str, rotation: float):
+        self._batch = batch
+        self._text = text
+        self._start_x = start_x
+        self._start_y = start_y
+        self._color = color
+        self._rotation = rotation
+        self._visible = True
+        self.font_size = font_size
+        self.width = width
+        self.align = align
+        self.font_name = font_name
+        self.bold = bold
+        self.italic = italic
+        self.anchor_x = anchor_x
+        self.anchor_y = anchor_y
+        self._layout: Optional[Text] = None
+        # Range of the batch this text's glyphs are in
+        self._start = 0
+        self._capacity = 0
+        # Whether the range holds a complete text
+        self._complete = False
 
-    # If the cache gets too large, dump it and start over.
-    if len(draw_text_cache) > 5000:
-        draw_text_cache = {}
+    def _get_layout(self) -> Text:
+        if self._layout is None or self._layout.pending or \
+                self._layout.generation != _get_glyph_atlas().generation:
+            self._layout = _get_text(self._text, self.font_size, self.width, self.align,
+                                     self.font_name, self.bold, self.italic)
+        return self._layout
 
-    r, g, b, alpha = get_four_byte_color(color)
-    cache_color = f"{r}{g}{b}"
+    def _get_instances(self) -> np.ndarray:
+        return _get_glyph_instances(self._get_layout(), self._start_x, self._start_y, self._color,
+                                    self.anchor_x, self.anchor_y, self._rotation)
 
-    key = f"{text}{cache_color}{font_size}{width}{align}{font_name}{bold}{italic}"
-    try:
-        label = draw_text_cache[key]
-    except KeyError:  # doesn't exist, create it
-        label = Text()
-
-        # Figure out the font to use
-        font = None
-
-        # Font was specified with a string
-        if isinstance(font_name, str):
-            font_name = font_name,
-
-        font_names = chain(*[
-            [font_string_name, f"{font_string_name}.ttf"]
-            for font_string_name in font_name
-        ], DEFAULT_FONT_NAMES)
-
-        font_found = False
-        for font_string_name in font_names:
-            try:
-                font = PIL.ImageFont.truetype(font_string_name, int(font_size))
-            except OSError:
-                continue
+    @property
+    def size(self) -> Tuple[float, float]:
+        """ Width and height of the laid out text. """
+        return self._get_layout().size
+
+    def _get_text_value(self) -> str:
+        return self._text
+
+    def _set_text_value(self, value: str):
+        if value != self._text:
+            self._text = value
+            self._layout = None
+            self._batch._update(self)
+
+    text = property(_get_text_value, _set_text_value)
+
+    def set_position(self, start_x: float, start_y: float):
+        """ Move the text. """
+        self._start_x = start_x
+        self._start_y = start_y
+        self._batch._update(self)
+
+    def _get_color(self) -> Color:
+        return self._color
+
+    def _set_color(self, value: Color):
+        self._color = value
+        self._batch._update(self)
+
+    color = property(_get_color, _set_color)
+
+    def _get_rotation(self) -> float:
+        return self._rotation
+
+    def _set_rotation(self, value: float):
+        self._rotation = value
+        self._batch._update(self)
+
+    rotation = property(_get_rotation, _set_rotation)
+
+    def _get_visible(self) -> bool:
+        return self._visible
+
+    def _set_visible(self, value: bool):
+        self._visible = value
+        self._batch._update(self)
+
+    visible = property(_get_visible, _set_visible)
+
+
+class TextBatch:
+    """
+    Retained text. Texts are added once, can then be changed, and the whole
+    batch is drawn with a single draw call.
+
+    Each text owns a range of glyph instances in one buffer, with room to
+    grow. Changing a text only rewrites its range, and only the changed part of
+    the buffer is uploaded on the next draw.
+
+    Example:
+        batch = arcadeplus.TextBatch()
+        score = batch.add("Score: 0", 10, 10, arcadeplus.color.WHITE)
+        ...
+        score.text = f"Score: {points}"
+        batch.draw()
+    """
+
+    def __init__(self):
+        self.texts: List[BatchedText] = []
+        self._instances = np.zeros(256, dtype=_glyph_instance_type)
+        # Instances in use, including holes left by moved or removed texts
+        self._used = 0
+        self._wasted = 0
+        self._dirty_start: Optional[int] = None
+        self._dirty_end = 0
+        atlas = _get_glyph_atlas()
+        self._generation = atlas.generation
+        self._instance_buf: Optional[shader.Buffer] = None
+        self._vao = None
+        # Texts waiting for glyphs from the worker threads
+        self._pending = set()
+        # Glyphs in the atlas when the pending texts were last looked at
+        self._glyph_count = len(atlas.glyphs)
+
+    def add(self, text: str,
+            start_x: float,
+            start_y: float,
+            color: Color,
+            font_size: float = 12,
+            width: int = 0,
+            align: str = "left",
+            font_name: Union[str, Tuple[str, ...]] = ('calibri', 'arial'),
+            bold: bool = False,
+            italic: bool = False,
+            anchor_x: str = "left",
+            anchor_y: str = "baseline",
+            rotation: float = 0) -> BatchedText:
+        """
+        Add a text to the batch. Takes the same parameters as ``draw_text``.
+
+        :Returns BatchedText: The text, which can be changed later.
+        """
+        label = BatchedText(self, text, start_x, start_y, color, font_size, width, align,
+                            font_name, bold, italic, anchor_x, anchor_y, rotation)
+        self.texts.append(label)
+        self._update(label)
+        return label
+
+    def remove(self, label: BatchedText):
+        """ Remove a text from the batch. """
+        self.texts.remove(label)
+        self._pending.discard(label)
+        self._clear_range(label._start, label._capacity)
+        self._wasted += label._capacity
+        label._capacity = 0
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __iter__(self) -> Iterable[BatchedText]:
+        return iter(self.texts)
+
+    def _update(self, label: BatchedText):
+        """ Rewrite the glyphs of one text. """
+        if label._visible:
+            instances = label._get_instances()
+            if label._layout.pending:
+                self._pending.add(label)
+                if label._complete:
+                    # Keep showing the previous text until the new glyphs are ready
+                    return
             else:
-                font_found = True
-                break
-
-        if not font_found:
-            raise RuntimeError("Unable to find a default font on this system. Please specify an available font.")
-
-        # This is stupid. We have to have an image to figure out what size
-        # the text will be when we draw it. Of course, we don't know how big
-        # to make the image. Catch-22. So we just make a small image we'll trash
-        text_image_size = (10, 10)
-        image = PIL.Image.new("RGBA", text_image_size)
-        draw = PIL.ImageDraw.Draw(image)
-
-        # Get size the text will be
-        text_image_size = draw.multiline_textsize(text, font=font)
-        # Add some extra pixels at the bottom to account for letters that drop below the baseline.
-        text_image_size = text_image_size[0], text_image_size[1] + int(font_size * 0.25)
-
-        # Create image of proper size
-        text_height = text_image_size[1]
-        text_width = text_image_size[0]
-
-        image_start_x = 0
-        if width == 0:
-            width = text_image_size[0]
+                self._pending.discard(label)
         else:
-            # Wait! We were given a field width.
-            if align == "center":
-                # Center text on given field width
-                field_width = width * scale_up
-                text_image_size = field_width, text_height
-                image_start_x = (field_width - text_width) // 2
-                width = field_width
-            else:
-                image_start_x = 0
+            self._pending.discard(label)
+            instances = np.zeros(0, dtype=_glyph_instance_type)
+        label._complete = label._visible and not label._layout.pending
 
-        # Find y of top-left corner
-        image_start_y = 0
+        if len(instances) > label._capacity:
+            if label._capacity:
+                self._clear_range(label._start, label._capacity)
+                self._wasted += label._capacity
+                # Has no range while a new one is allocated, in case of compaction
+                label._capacity = 0
+            capacity = 8
+            while capacity < len(instances):
+                capacity *= 2
+            label._start = self._allocate(capacity)
+            label._capacity = capacity
 
-        # Create image
-        image = PIL.Image.new("RGBA", text_image_size)
-        draw = PIL.ImageDraw.Draw(image)
+        start = label._start
+        self._instances[start:start + len(instances)] = instances
+        self._clear_range(start + len(instances), label._capacity - len(instances))
+        self._mark_dirty(start, start + label._capacity)
 
-        # Convert to tuple if needed, because the multiline_text does not take a
-        # list for a color
-        if isinstance(color, list):
-            color = cast(RGBA, tuple(color))
-        draw.multiline_text((image_start_x, image_start_y), text, color, align=align, font=font)
-        image = image.resize((max(1, width // scale_down), text_height // scale_down), resample=PIL.Image.LANCZOS)
+    def _clear_range(self, start: int, count: int):
+        # Zero sized glyphs draw nothing
+        self._instances[start:start + count] = np.zeros(count, dtype=_glyph_instance_type)
+        self._mark_dirty(start, start + count)
 
-        text_sprite = Sprite()
-        text_sprite._texture = Texture(key)
-        text_sprite.texture.image = image
+    def _allocate(self, count: int) -> int:
+        if self._used + count > len(self._instances):
+            if self._wasted * 2 > self._used:
+                self._compact()
+            capacity = len(self._instances)
+            while self._used + count > capacity:
+                capacity *= 2
+            if capacity != len(self._instances):
+                instances = np.zeros(capacity, dtype=_glyph_instance_type)
+                instances[:self._used] = self._instances[:self._used]
+                self._instances = instances
+                # A new buffer will be created on the next draw
+                self._instance_buf = None
 
-        text_sprite.width = image.width
-        text_sprite.height = image.height
+        start = self._used
+        self._used += count
+        return start
 
-        from arcadeplus.sprite_list import SpriteList
-        label.text_sprite_list = SpriteList()
-        label.text_sprite_list.append(text_sprite)
+    def _compact(self):
+        """ Move every text's range to the front, dropping the holes. """
+        instances = np.zeros(len(self._instances), dtype=_glyph_instance_type)
+        used = 0
+        for label in self.texts:
+            instances[used:used + label._capacity] = \
+                self._instances[label._start:label._start + label._capacity]
+            label._start = used
+            used += label._capacity
+        self._instances = instances
+        self._used = used
+        self._wasted = 0
+        self._mark_dirty(0, len(self._instances))
 
-        draw_text_cache[key] = label
+    def _mark_dirty(self, start: int, end: int):
+        if start >= end:
+            return
+        if self._dirty_start is None:
+            self._dirty_start = start
+            self._dirty_end = end
+        else:
+            self._dirty_start = min(self._dirty_start, start)
+            self._dirty_end = max(self._dirty_end, end)
 
-    text_sprite = label.text_sprite_list[0]
+    def _refresh(self):
+        """ Lay out again the texts whose glyphs have been added to the atlas, or moved. """
+        atlas = _get_glyph_atlas()
+        atlas.collect()
+        if self._generation != atlas.generation:
+            # The atlas was cleared, so the glyphs have moved
+            self._generation = atlas.generation
+            for label in self.texts:
+                label._complete = False
+                self._update(label)
+        elif self._pending and len(atlas.glyphs) != self._glyph_count:
+            # Whoever collected the glyphs, they may be the ones these texts wait for
+            for label in list(self._pending):
+                self._update(label)
+        self._glyph_count = len(atlas.glyphs)
 
-    if anchor_x == "left":
-        text_sprite.center_x = start_x + text_sprite.width / 2
-    elif anchor_x == "center":
-        text_sprite.center_x = start_x
-    elif anchor_x == "right":
-        text_sprite.right = start_x
-    else:
-        raise ValueError(f"anchor_x should be 'left', 'center', or 'right'. Not '{anchor_x}'")
-
-    if anchor_y == "top":
-        text_sprite.center_y = start_y - text_sprite.height / 2
-    elif anchor_y == "center":
-        text_sprite.center_y = start_y
-    elif anchor_y == "bottom" or anchor_y == "baseline":
-        text_sprite.bottom = start_y
-    else:
-        raise ValueError(f"anchor_y should be 'top', 'center', 'bottom', or 'baseline'. Not '{anchor_y}'")
+    def draw(self):
+        """ Draw every text in the batch. """
+        self._refresh()
+        if self._used == 0:
+            return
 
-    text_sprite.angle = rotation
-    text_sprite.alpha = alpha
+        renderer = _get_text_renderer()
+        if self._instance_buf is None:
+            self._instance_buf = shader.Buffer(self._instances.tobytes(), usage='dynamic')
+            self._vao = renderer.create_vertex_array(self._instance_buf)
+        elif self._dirty_start is not None:
+            item_size = _glyph_instance_type.itemsize
+            data = self._instances[self._dirty_start:self._dirty_end].tobytes()
+            self._instance_buf.write(data, self._dirty_start * item_size)
+        self._dirty_start = None
 
-    label.text_sprite_list.draw()
-    return text_sprite
+        renderer.render(self._vao, self._used)
 
 
 def draw_text_2(text: str,
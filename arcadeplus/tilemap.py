@@ -11,13 +11,32 @@
 
 """
 
-from typing import Optional, List, cast
+from collections import deque, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, List, Tuple, Union, cast
+from xml.etree import ElementTree
+import hashlib
+import importlib.metadata
+import io
+import json
 import math
+import mmap
 import copy
+import pickle
+import struct
+import time
+import types
+import zipfile
 import pytiled_parser
+import pytiled_parser.xml_parser
 import os
 from pathlib import Path
 
+import numpy as np
+import pyglet.gl as gl
+
+from arcadeplus import get_viewport
+from arcadeplus import shader
 from arcadeplus import Sprite
 from arcadeplus import AnimatedTimeBasedSprite
 from arcadeplus import AnimationKeyframe
@@ -25,13 +44,243 @@
 from arcadeplus import load_texture
 from arcadeplus import Texture
 from arcadeplus.arcade_types import Point
+from arcadeplus.read_tiled_map import _process_base64_encoding
+from arcadeplus.read_tiled_map import _process_csv_encoding
 
 _FLIPPED_HORIZONTALLY_FLAG = 0x80000000
 _FLIPPED_VERTICALLY_FLAG = 0x40000000
 _FLIPPED_DIAGONALLY_FLAG = 0x20000000
+_FLIPPED_FLAGS = _FLIPPED_HORIZONTALLY_FLAG | _FLIPPED_VERTICALLY_FLAG | _FLIPPED_DIAGONALLY_FLAG
+
+
+def _decode_data(element: ElementTree.Element,
+                 layer_width: int,
+                 encoding: str,
+                 compression: Optional[str] = None) -> Union[np.ndarray, List[List[int]]]:
+    """
+    Layer data decoder for the parser read_tmx uses. pytiled_parser's own goes
+    through the data a byte or a string at a time, this decodes it with NumPy.
+    """
+    if element.text is not None and encoding in ("csv", "base64") \
+            and compression in ((None, ) if encoding == "csv" else (None, "zlib", "gzip")):
+        # Chunks of infinite maps have their own width
+        width = int(element.attrib.get("width", layer_width))
+        try:
+            if encoding == "csv":
+                return _process_csv_encoding(element.text, width)
+            return _process_base64_encoding(element.text.strip(), compression, width)
+        except ValueError:
+            pass
+    # Let pytiled_parser raise its errors, or decompress zstd
+    return pytiled_parser.xml_parser._decode_data(element, layer_width, encoding, compression)
 
 
-def read_tmx(tmx_file: str) -> pytiled_parser.objects.TileMap:
+_tile_map_parser: Optional[Callable[[str], pytiled_parser.objects.TileMap]] = None
+
+
+def _get_tile_map_parser() -> Callable[[str], pytiled_parser.objects.TileMap]:
+    """
+    pytiled_parser.parse_tile_map, calling _decode_data for layer data.
+
+    The functions of pytiled_parser.xml_parser are copied with globals of
+    their own, so the module itself, and anyone else using it, keep
+    pytiled_parser's decoder.
+    """
+    global _tile_map_parser
+    if _tile_map_parser is None:
+        namespace = dict(vars(pytiled_parser.xml_parser))
+        for name, value in list(namespace.items()):
+            if isinstance(value, types.FunctionType) and value.__module__ == pytiled_parser.xml_parser.__name__:
+                function = types.FunctionType(value.__code__, namespace, value.__name__,
+                                              value.__defaults__, value.__closure__)
+                function.__kwdefaults__ = value.__kwdefaults__
+                namespace[name] = function
+        namespace["_decode_data"] = _decode_data
+        _tile_map_parser = namespace["parse_tile_map"]
+    return _tile_map_parser
+
+
+def _layer_data_to_arrays(layers: List[pytiled_parser.objects.Layer]):
+    """
+    Make the GIDs of each tile layer, and each chunk of an infinite one, NumPy
+    uint32 arrays. Only data pytiled_parser decoded needs copying. Goes into
+    layer groups.
+    """
+    for layer in layers:
+        if isinstance(layer, pytiled_parser.objects.LayerGroup):
+            _layer_data_to_arrays(layer.layers or [])
+        elif isinstance(layer, pytiled_parser.objects.TileLayer) and layer.data is not None:
+            if len(layer.data) and isinstance(layer.data[0], pytiled_parser.objects.Chunk):
+                for chunk in layer.data:
+                    chunk.chunk_data = np.asarray(chunk.chunk_data, dtype=np.uint32)
+            else:
+                layer.data = np.asarray(layer.data, dtype=np.uint32)
+
+
+# Bump when the cache layout, or what is in the cached maps, changes
+_MAP_CACHE_VERSION = 3
+
+# pytiled_parser doesn't set __version__, so ask the installed package
+try:
+    _PYTILED_PARSER_VERSION: Optional[str] = importlib.metadata.version("pytiled_parser")
+except importlib.metadata.PackageNotFoundError:
+    _PYTILED_PARSER_VERSION = None
+
+
+class _MapCachePickler(pickle.Pickler):
+    """ Pickles a map, setting its arrays aside to be stored as plain .npy members. """
+
+    def __init__(self, file, arrays: Dict[str, np.ndarray]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.arrays = arrays
+
+    def persistent_id(self, obj):
+        if isinstance(obj, np.ndarray):
+            name = f"array_{len(self.arrays)}"
+            self.arrays[name] = obj
+            return name
+        return None
+
+
+class _MapCacheUnpickler(pickle.Unpickler):
+    def __init__(self, file, arrays: Dict[str, np.ndarray]):
+        super().__init__(file)
+        self.arrays = arrays
+
+    def persistent_load(self, pid):
+        return self.arrays[pid]
+
+
+def _get_map_cache_file(cache_directory: str, tmx_file: str) -> str:
+    """ Cache file for a map, named after its path so maps with the same name don't clash. """
+    path = os.path.abspath(tmx_file)
+    digest = hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_directory, f"{name}-{digest}.npz")
+
+
+def _get_map_dependencies(tmx_file: str) -> List[str]:
+    """ The TMX file, and the external tilesets and templates it uses. """
+    map_directory = os.path.dirname(os.path.abspath(tmx_file))
+    dependencies = [os.path.abspath(tmx_file)]
+    root = ElementTree.parse(tmx_file).getroot()
+    sources = [element.attrib["source"] for element in root.iter("tileset") if "source" in element.attrib]
+    sources += [element.attrib["template"] for element in root.iter("object") if "template" in element.attrib]
+    for source in sources:
+        path = os.path.normpath(os.path.join(map_directory, source))
+        if path not in dependencies:
+            dependencies.append(path)
+    return dependencies
+
+
+def _get_file_stamps(paths: List[str]) -> Optional[List[List[Any]]]:
+    """ Modification time and size of files, or None if one is missing. """
+    stamps = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        stamps.append([path, stat.st_mtime_ns, stat.st_size])
+    return stamps
+
+
+def _get_map_cache_header() -> Dict[str, Any]:
+    return {"version": _MAP_CACHE_VERSION, "pytiled_parser": _PYTILED_PARSER_VERSION}
+
+
+def _write_map_cache(cache_file: str, tile_map: pytiled_parser.objects.TileMap):
+    """ Save a map read in by pytiled_parser, along with the paths its images resolved to. """
+    tmx_file = str(tile_map.tmx_file)
+    image_files = sorted({path for path in tile_map.image_paths.paths.values() if path is not None})
+    header = _get_map_cache_header()
+    header["files"] = _get_file_stamps(_get_map_dependencies(tmx_file) + image_files)
+
+    arrays: Dict[str, np.ndarray] = {}
+    metadata = io.BytesIO()
+    _MapCachePickler(metadata, arrays).dump(tile_map)
+    arrays["header"] = np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8)
+    arrays["metadata"] = np.frombuffer(metadata.getvalue(), dtype=np.uint8)
+
+    # Write next to the cache file and move it into place, so a reader never sees half a file
+    os.makedirs(os.path.dirname(os.path.abspath(cache_file)), exist_ok=True)
+    temporary_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_file, "wb") as file:
+            np.savez(file, **arrays)
+        os.replace(temporary_file, cache_file)
+    except OSError as error:
+        print(f"Warning, couldn't write map cache '{cache_file}': {error}")
+        if os.path.exists(temporary_file):
+            os.remove(temporary_file)
+
+
+def _map_npz_members(cache_file: str) -> Dict[str, np.ndarray]:
+    """
+    Memory map the arrays in an uncompressed .npz file. Pages are copy on
+    write, so the arrays can be changed without touching the file.
+    """
+    arrays = {}
+    with open(cache_file, "rb") as file, zipfile.ZipFile(file) as archive:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{info.filename} is compressed")
+            # Skip the member's local header to get to the .npy data
+            name_length, extra_length = struct.unpack("<HH", mapped[info.header_offset + 26:info.header_offset + 30])
+            file.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+            count = int(np.prod(shape))
+            array = np.frombuffer(mapped, dtype=dtype, count=count, offset=file.tell())
+            arrays[info.filename[:-4]] = array.reshape(shape, order="F" if fortran_order else "C")
+    return arrays
+
+
+def _read_map_cache(cache_file: str) -> Optional[pytiled_parser.objects.TileMap]:
+    """ Load a cached map, or return None if there is no usable cache for it. """
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        arrays = _map_npz_members(cache_file)
+        header = json.loads(arrays.pop("header").tobytes().decode("utf-8"))
+        files = header.pop("files")
+        if header != _get_map_cache_header() or _get_file_stamps([path for path, _, _ in files]) != files:
+            return None
+        metadata = arrays.pop("metadata").tobytes()
+        tile_map = _MapCacheUnpickler(io.BytesIO(metadata), arrays).load()
+        # The images were looked for when the cache was written, not in this load
+        tile_map.image_paths.resolve_time = 0.0
+        return tile_map
+    except (OSError, ValueError, KeyError, EOFError, AttributeError, ImportError, TypeError,
+            pickle.UnpicklingError, zipfile.BadZipFile) as error:
+        # Unpickling a map saved with other versions of its classes raises the likes of AttributeError
+        print(f"Warning, ignoring unreadable map cache '{cache_file}': {error}")
+        return None
+
+
+def _resolve_image_paths(tile_map: pytiled_parser.objects.TileMap) -> "_ImagePathTable":
+    """
+    Where the images of a map's tiles are, when they aren't given a base
+    directory. The paths are made absolute, so they still work from another
+    working directory when the map is read from the cache, and images that
+    can't be found are left to be looked for again then.
+    """
+    image_paths = _get_image_paths(tile_map)
+    image_paths.map_directory = os.path.abspath(image_paths.map_directory)
+    for tileset in tile_map.tile_sets.values():
+        images = [tileset.image] + [tile.image for tile in (tileset.tiles or {}).values()]
+        for image in images:
+            if image is not None and image.source:
+                image_paths.find(image.source, None)
+    image_paths.paths = {key: os.path.abspath(path) for key, path in image_paths.paths.items() if path is not None}
+    return image_paths
+
+
+def read_tmx(tmx_file: str, cache_directory: Optional[str] = None) -> pytiled_parser.objects.TileMap:
     """
     Given a .tmx, this will read in a tiled map, and return
     a TiledMap object.
@@ -46,7 +295,20 @@ def read_tmx(tmx_file: str) -> pytiled_parser.objects.TileMap:
     but only polygons are supported.
     (This is a great area for PR's to improve things.)
 
+    The data of each tile layer, ``layer.data``, is a NumPy uint32 array of
+    GIDs, with a row per row of the layer.
+
+    Where each image of the map is gets looked up once, the first time a
+    tile uses it, and kept in ``image_paths``. The seconds spent looking
+    are in ``image_paths.resolve_time``.
+
+    With a ``cache_directory``, the map is saved there in a binary form the
+    first time it is read, along with where its images are. Later reads
+    memory map that instead of parsing the XML, until the .tmx file, a
+    tileset or template it uses, or one of its images changes.
+
     :param str tmx_file: String with name of our TMX file
+    :param str cache_directory: Directory to keep compiled maps in. No cache if None.
 
     :returns: Map
     :rtype: TiledMap
@@ -58,7 +320,19 @@ def read_tmx(tmx_file: str) -> pytiled_parser.objects.TileMap:
         path = os.path.dirname(os.path.abspath(__file__))
         tmx_file = f"{path}/resources/{tmx_file[11:]}"
 
-    tile_map = pytiled_parser.parse_tile_map(tmx_file)
+    tile_map = None
+    if cache_directory is not None:
+        cache_file = _get_map_cache_file(cache_directory, tmx_file)
+        tile_map = _read_map_cache(cache_file)
+
+    if tile_map is None:
+        tile_map = _get_tile_map_parser()(tmx_file)
+        _layer_data_to_arrays(tile_map.layers)
+        if cache_directory is not None:
+            _resolve_image_paths(tile_map)
+            _write_map_cache(cache_file, tile_map)
+
+    tile_map.gid_lookup = _GidLookup(tile_map)
 
     return tile_map
 
@@ -85,60 +359,102 @@ def get_tilemap_layer(map_object: pytiled_parser.objects.TileMap,
     return None
 
 
-def _get_tile_by_gid(map_object: pytiled_parser.objects.TileMap,
-                     tile_gid: int) -> Optional[pytiled_parser.objects.Tile]:
+class _GidLookup:
+    """
+    Lookup table from GIDs to tiles, built once per map by ``read_tmx``.
 
-    flipped_diagonally = False
-    flipped_horizontally = False
-    flipped_vertically = False
+    Every cell with the same GID, flip flags included, shares one Tile, so a
+    layer costs one search of the tile sets per distinct GID rather than per
+    cell. The tiles are shared, so they must not be changed.
+    """
 
-    if tile_gid & _FLIPPED_HORIZONTALLY_FLAG:
-        flipped_horizontally = True
-        tile_gid -= _FLIPPED_HORIZONTALLY_FLAG
+    def __init__(self, map_object: pytiled_parser.objects.TileMap):
+        self.tile_sets = list(map_object.tile_sets.items())
+        self.tiles: Dict[int, Optional[pytiled_parser.objects.Tile]] = {}
+        # Tiles of each tile set by id, keyed by the id() of the tile set
+        self.tiles_by_id: Dict[int, Dict[int, pytiled_parser.objects.Tile]] = {
+            id(tileset): {tile.id_: tile for tile in tileset.tiles.values()}
+            for tileset in map_object.tile_sets.values()
+        }
+
+    def get_tile(self, tile_gid: int) -> Optional[pytiled_parser.objects.Tile]:
+        try:
+            return self.tiles[tile_gid]
+        except KeyError:
+            pass
+        tile = self._find_tile(tile_gid)
+        self.tiles[tile_gid] = tile
+        return tile
+
+    def get_tile_by_id(self, tileset: pytiled_parser.objects.TileSet,
+                       tile_id: int) -> Optional[pytiled_parser.objects.Tile]:
+        tiles = self.tiles_by_id.get(id(tileset))
+        if tiles is None:
+            return None
+        return tiles.get(tile_id)
+
+    def _find_tile(self, tile_gid: int) -> Optional[pytiled_parser.objects.Tile]:
+        flipped_diagonally = False
+        flipped_horizontally = False
+        flipped_vertically = False
+
+        if tile_gid & _FLIPPED_HORIZONTALLY_FLAG:
+            flipped_horizontally = True
+            tile_gid -= _FLIPPED_HORIZONTALLY_FLAG
+
+        if tile_gid & _FLIPPED_DIAGONALLY_FLAG:
+            flipped_diagonally = True
+            tile_gid -= _FLIPPED_DIAGONALLY_FLAG
+
+        if tile_gid & _FLIPPED_VERTICALLY_FLAG:
+            flipped_vertically = True
+            tile_gid -= _FLIPPED_VERTICALLY_FLAG
+
+        for tileset_key, tileset in self.tile_sets:
+
+            if tile_gid < tileset_key:
+                continue
 
-    if tile_gid & _FLIPPED_DIAGONALLY_FLAG:
-        flipped_diagonally = True
-        tile_gid -= _FLIPPED_DIAGONALLY_FLAG
+            tile_ref = tileset.tiles.get(tile_gid - tileset_key)
 
-    if tile_gid & _FLIPPED_VERTICALLY_FLAG:
-        flipped_vertically = True
-        tile_gid -= _FLIPPED_VERTICALLY_FLAG
+            # No specific tile info, but there is a tile sheet
+            if tile_ref is None \
+                    and tileset.image is not None \
+                    and tileset_key <= tile_gid < tileset_key + tileset.tile_count:
+                image = pytiled_parser.objects.Image(source=tileset.image.source)
+                tile_ref = pytiled_parser.objects.Tile(id_=(tile_gid - tileset_key),
+                                                       image=image)
 
-    for tileset_key, tileset in map_object.tile_sets.items():
+            if tile_ref is None:
+                continue
+            my_tile = copy.copy(tile_ref)
+            my_tile.tileset = tileset
+            my_tile.flipped_vertically = flipped_vertically
+            my_tile.flipped_diagonally = flipped_diagonally
+            my_tile.flipped_horizontally = flipped_horizontally
+            return my_tile
+        return None
 
-        if tile_gid < tileset_key:
-            continue
 
-        tile_ref = tileset.tiles.get(tile_gid - tileset_key)
+def _get_gid_lookup(map_object: pytiled_parser.objects.TileMap) -> _GidLookup:
+    """ Get the GID lookup table of a map, building it if the map wasn't read by read_tmx. """
+    gid_lookup = getattr(map_object, 'gid_lookup', None)
+    if gid_lookup is None:
+        gid_lookup = _GidLookup(map_object)
+        map_object.gid_lookup = gid_lookup
+    return gid_lookup
 
-        # No specific tile info, but there is a tile sheet
-        if tile_ref is None \
-                and tileset.image is not None \
-                and tileset_key <= tile_gid < tileset_key + tileset.tile_count:
-            image = pytiled_parser.objects.Image(source=tileset.image.source)
-            tile_ref = pytiled_parser.objects.Tile(id_=(tile_gid - tileset_key),
-                                                   image=image)
 
-        if tile_ref is None:
-            continue
-        my_tile = copy.copy(tile_ref)
-        my_tile.tileset = tileset
-        my_tile.flipped_vertically = flipped_vertically
-        my_tile.flipped_diagonally = flipped_diagonally
-        my_tile.flipped_horizontally = flipped_horizontally
-        return my_tile
-    return None
+def _get_tile_by_gid(map_object: pytiled_parser.objects.TileMap,
+                     tile_gid: int) -> Optional[pytiled_parser.objects.Tile]:
+    return _get_gid_lookup(map_object).get_tile(tile_gid)
 
 
 def _get_tile_by_id(map_object: pytiled_parser.objects.TileMap,
                     tileset: pytiled_parser.objects.TileSet,
                     tile_id: int) -> Optional[pytiled_parser.objects.Tile]:
-    for tileset_key, cur_tileset in map_object.tile_sets.items():
-        if cur_tileset is tileset:
-            for tile_key, tile in cur_tileset.tiles.items():
-                if tile_id == tile.id_:
-                    return tile
-    return None
+    return _get_gid_lookup(map_object).get_tile_by_id(tileset, tile_id)
+
 
 def _get_image_info_from_tileset(tile):
     image_x = 0
@@ -160,19 +476,10 @@ def _get_image_info_from_tileset(tile):
 
     return image_x, image_y, width, height
 
-def _get_image_source(tile: pytiled_parser.objects.Tile,
-                      base_directory: Optional[str],
-                      map_directory: Optional[str]):
-    image_file = None
-    if tile.image:
-        image_file = tile.image.source
-    elif tile.tileset.image:
-        image_file = tile.tileset.image.source
-
-    if not image_file:
-        print(f"Warning for tile {tile.id_}, no image source listed either for individual tile, or as a tileset.")
-        return None
-
+def _find_image_file(image_file: str,
+                     base_directory: Optional[str],
+                     map_directory: Optional[str]):
+    """ Look for an image as given, then in the base directory, then next to the map. """
     if os.path.exists(image_file):
         return image_file
 
@@ -186,10 +493,66 @@ def _get_image_source(tile: pytiled_parser.objects.Tile,
         if os.path.exists(try3):
             return try3
 
-    print(f"Warning, can't file image {image_file} for tile {tile.id_} - {base_directory}")
     return None
 
 
+class _ImagePathTable:
+    """
+    Where the images of a map are, looked for once per image and base directory.
+
+    Looking for an image checks up to three places on disk, which adds up
+    fast on network file systems when done for every tile.
+    """
+
+    def __init__(self, map_directory: str):
+        self.map_directory = map_directory
+        # Found path of each image, by base directory and image source
+        self.paths: Dict[Tuple[str, str], Optional[str]] = {}
+        #: Seconds spent looking for images
+        self.resolve_time = 0.0
+
+    def find(self, image_file: str, base_directory: Optional[str]):
+        """ Path of an image, or None if it can't be found. """
+        key = (base_directory or "", image_file)
+        try:
+            return self.paths[key]
+        except KeyError:
+            pass
+        start_time = time.perf_counter()
+        found = _find_image_file(image_file, base_directory, self.map_directory)
+        self.resolve_time += time.perf_counter() - start_time
+        self.paths[key] = found
+        return found
+
+
+def _get_image_paths(map_object: pytiled_parser.objects.TileMap) -> _ImagePathTable:
+    """ Get the image path table of a map, making it if the map wasn't read by read_tmx. """
+    image_paths = getattr(map_object, 'image_paths', None)
+    if image_paths is None:
+        image_paths = _ImagePathTable(os.path.dirname(str(map_object.tmx_file)))
+        map_object.image_paths = image_paths
+    return image_paths
+
+
+def _get_image_source(tile: pytiled_parser.objects.Tile,
+                      base_directory: Optional[str],
+                      image_paths: _ImagePathTable):
+    image_file = None
+    if tile.image:
+        image_file = tile.image.source
+    elif tile.tileset.image:
+        image_file = tile.tileset.image.source
+
+    if not image_file:
+        print(f"Warning for tile {tile.id_}, no image source listed either for individual tile, or as a tileset.")
+        return None
+
+    found = image_paths.find(image_file, base_directory)
+    if found is None:
+        print(f"Warning, can't file image {image_file} for tile {tile.id_} - {base_directory}")
+    return found
+
+
 def _create_sprite_from_tile(map_object: pytiled_parser.objects.TileMap,
                              tile: pytiled_parser.objects.Tile,
                              scaling: float = 1.0,
@@ -199,9 +562,8 @@ def _create_sprite_from_tile(map_object: pytiled_parser.objects.TileMap,
     """
 
     # --- Step 1, find a reference to an image this is going to be based off of
-    map_source = map_object.tmx_file
-    map_directory = os.path.dirname(map_source)
-    image_file = _get_image_source(tile, base_directory, map_directory)
+    image_paths = _get_image_paths(map_object)
+    image_file = _get_image_source(tile, base_directory, image_paths)
 
     # print(f"Creating tile: {tmx_file}")
     if tile.animation:
@@ -309,7 +671,7 @@ def _create_sprite_from_tile(map_object: pytiled_parser.objects.TileMap,
             frame_tile = _get_tile_by_id(map_object, tile.tileset, frame.tile_id)
             if frame_tile:
 
-                image_file = _get_image_source(frame_tile, base_directory, map_directory)
+                image_file = _get_image_source(frame_tile, base_directory, image_paths)
 
                 # Does the tile have an image?
                 if frame_tile.image:
@@ -341,13 +703,14 @@ def _process_object_layer(map_object: pytiled_parser.objects.TileMap,
                           scaling: float = 1,
                           base_directory: str = "") -> SpriteList:
     sprite_list: SpriteList = SpriteList()
+    gid_lookup = _get_gid_lookup(map_object)
 
     for cur_object in layer.tiled_objects:
         if cur_object.gid is None:
             print("Warning: Currently only tiles (not objects) are supported in object layers.")
             continue
 
-        tile = _get_tile_by_gid(map_object, cur_object.gid)
+        tile = gid_lookup.get_tile(cur_object.gid)
         my_sprite = _create_sprite_from_tile(map_object, tile, scaling=scaling,
                                              base_directory=base_directory)
 
@@ -384,7 +747,8 @@ def _process_tile_layer(map_object: pytiled_parser.objects.TileMap,
                         scaling: float = 1,
                         base_directory: str = "") -> SpriteList:
     sprite_list: SpriteList = SpriteList()
-    map_array = layer.data
+    map_array = np.asarray(layer.data).tolist()
+    gid_lookup = _get_gid_lookup(map_object)
 
     # Loop through the layer and add in the wall list
     for row_index, row in enumerate(map_array):
@@ -393,7 +757,7 @@ def _process_tile_layer(map_object: pytiled_parser.objects.TileMap,
             if item == 0:
                 continue
 
-            tile = _get_tile_by_gid(map_object, item)
+            tile = gid_lookup.get_tile(item)
             if tile is None:
                 print(f"Warning, couldn't find tile for item {item} in layer "
                       f"'{layer.name}' in file '{map_object.tmx_file}'.")
@@ -448,3 +812,1166 @@ def process_layer(map_object: pytiled_parser.objects.TileMap,
 
     print(f"Warning, layer '{layer_name}' has unexpected type. '{type(layer)}'")
     return SpriteList()
+
+
+class _TileAtlas:
+    """
+    RGBA texture holding the image of every tile a TileLayer draws.
+
+    Images are packed in rows, and the atlas doubles in height when it is full.
+    The pixels are kept in a NumPy array, with its first row at the top, and
+    only the rows changed since the last draw are uploaded.
+    """
+
+    def __init__(self, width: int = 1024, height: int = 256):
+        self.padding = 1
+        self.image = np.zeros((height, width, 4), dtype=np.uint8)
+        self.texture = None
+        self._row_x = self.padding
+        self._row_y = self.padding
+        self._row_height = 0
+        # Range of rows changed since the last upload
+        self._dirty_top: Optional[int] = None
+        self._dirty_bottom = 0
+
+    @property
+    def width(self) -> int:
+        return self.image.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.image.shape[0]
+
+    def add(self, pixels: np.ndarray) -> Tuple[int, int]:
+        """ Add an image, as a (height, width, 4) array. Returns where it was put. """
+        height, width = pixels.shape[:2]
+        if self._row_x + width + self.padding > self.width:
+            if self._row_x == self.padding:
+                self._grow_width(width + 2 * self.padding)
+            else:
+                # Start a new row
+                self._row_y += self._row_height + self.padding
+                self._row_x = self.padding
+                self._row_height = 0
+
+        while self._row_y + height + self.padding > self.height:
+            image = np.zeros((self.height * 2, self.width, 4), dtype=np.uint8)
+            image[:self.height] = self.image
+            self.image = image
+            # The texture is recreated with the new size on the next upload
+            self.texture = None
+
+        x, y = self._row_x, self._row_y
+        self.image[y:y + height, x:x + width] = pixels
+        self._row_x += width + self.padding
+        self._row_height = max(self._row_height, height)
+        self._dirty_top = y if self._dirty_top is None else min(self._dirty_top, y)
+        self._dirty_bottom = max(self._dirty_bottom, y + height)
+        return x, y
+
+    def _grow_width(self, width: int):
+        image = np.zeros((self.height, width, 4), dtype=np.uint8)
+        image[:, :self.width] = self.image
+        self.image = image
+        self.texture = None
+
+    def upload(self):
+        """ Create the atlas texture, or upload the images added since the last upload. """
+        if self.texture is None:
+            self.texture = shader.Texture((self.width, self.height), 4, self.image.tobytes())
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_NEAREST)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
+        elif self._dirty_top is not None:
+            rows = self.image[self._dirty_top:self._dirty_bottom]
+            self.texture.write(rows.tobytes(), 0, self._dirty_top, self.width, len(rows))
+        self._dirty_top = None
+        self._dirty_bottom = 0
+
+    def use(self, texture_unit: int = 0):
+        """ Upload any new images, and bind the atlas texture. """
+        self.upload()
+        self.texture.use(texture_unit)
+
+
+# Corners of the two triangles a tile is drawn with, y up
+_TILE_CORNERS = np.array([[0, 0], [1, 0], [1, 1], [0, 0], [1, 1], [0, 1]], dtype=np.float32)
+
+_tile_vertex_type = np.dtype([('vert', np.float32, 2), ('tex', np.float32, 2), ('frames', np.float32, 2)])
+
+# Animations whose frames add up to a longer cycle than this, in milliseconds,
+# don't get their clock wrapped around
+_MAX_ANIMATION_PERIOD = 3_600_000
+
+_tile_vertex_shader = '''
+    #version 330
+    layout(std140) uniform ProjectionBlock {
+        mat4 Projection;
+    };
+    uniform vec2 AtlasSize;
+    // Animation frames: offset from the first frame in the atlas, time the frame ends
+    // and length of the whole animation, in milliseconds
+    uniform samplerBuffer Frames;
+    uniform float Time;
+
+    in vec2 in_vert;
+    // Position in the atlas, in pixels
+    in vec2 in_tex;
+    // First frame in Frames and number of frames, or no frames if the tile isn't animated
+    in vec2 in_frames;
+
+    out vec2 v_texture;
+
+    void main() {
+        gl_Position = Projection * vec4(in_vert, 0.0, 1.0);
+        vec2 tex = in_tex;
+        int frame_count = int(in_frames.y);
+        if (frame_count > 0) {
+            int frame = int(in_frames.x);
+            int last_frame = frame + frame_count - 1;
+            float time = mod(Time, texelFetch(Frames, frame).w);
+            while (frame < last_frame && time >= texelFetch(Frames, frame).z) {
+                frame++;
+            }
+            tex += texelFetch(Frames, frame).xy;
+        }
+        v_texture = tex / AtlasSize;
+    }
+'''
+
+_tile_fragment_shader = '''
+    #version 330
+    uniform sampler2D Atlas;
+
+    in vec2 v_texture;
+
+    out vec4 f_color;
+
+    void main() {
+        f_color = texture(Atlas, v_texture);
+        if (f_color.a == 0.0) {
+            discard;
+        }
+    }
+'''
+
+_tile_program: Optional[shader.Program] = None
+
+
+def _get_tile_program() -> shader.Program:
+    global _tile_program
+    if _tile_program is None:
+        _tile_program = shader.program(
+            vertex_shader=_tile_vertex_shader,
+            fragment_shader=_tile_fragment_shader,
+        )
+    return _tile_program
+
+
+def _get_tile_texture_coordinates(x: int, y: int, width: int, height: int, tile_gid: int) -> np.ndarray:
+    """
+    Atlas position of each corner in _TILE_CORNERS, for an image at (x, y)
+    in the atlas. Tiled flips diagonally first, then horizontally and vertically.
+    """
+    image_x = _TILE_CORNERS[:, 0].copy()
+    # The atlas has its first row at the top
+    image_y = 1 - _TILE_CORNERS[:, 1]
+    if tile_gid & _FLIPPED_HORIZONTALLY_FLAG:
+        image_x = 1 - image_x
+    if tile_gid & _FLIPPED_VERTICALLY_FLAG:
+        image_y = 1 - image_y
+    if tile_gid & _FLIPPED_DIAGONALLY_FLAG:
+        image_x, image_y = image_y, image_x
+    return np.stack([x + image_x * width, y + image_y * height], axis=1)
+
+
+class _TileChunk:
+    """ The tiles of a square of a TileLayer, in one static vertex buffer. """
+
+    def __init__(self, row: int, column: int):
+        # Position of the chunk in the grid of chunks
+        self.row = row
+        self.column = column
+        self.vertices: Optional[np.ndarray] = None
+        self.buffer: Optional[shader.Buffer] = None
+        self.vao = None
+        self.dirty = True
+        # Bumped whenever a tile in the chunk changes, so out of date builds can be spotted
+        self.version = 0
+
+    def upload(self):
+        """ Put the chunk's vertices in its buffer. """
+        self.dirty = False
+        if len(self.vertices) == 0:
+            self.buffer = None
+            self.vao = None
+            return
+        data = self.vertices.tobytes()
+        if self.buffer is not None and self.buffer.size == len(data):
+            self.buffer.write(data)
+            return
+        self.buffer = shader.Buffer(data, usage='static')
+        self.vao = shader.vertex_array(_get_tile_program(), [
+            shader.BufferDescription(self.buffer, '2f 2f 2f', ('in_vert', 'in_tex', 'in_frames'))
+        ])
+
+    def release(self):
+        """ Drop the vertices and buffer. The chunk is built again the next time it is needed. """
+        self.vertices = None
+        self.buffer = None
+        self.vao = None
+        self.dirty = True
+
+
+def _build_chunk_vertices(indices: np.ndarray, top: int, left: int, row_count: int,
+                          tile_width: float, tile_height: float,
+                          tables: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+    """
+    Vertices of the tiles of a chunk.
+
+    :param indices: Tile table index of each cell of the chunk.
+    :param top: Row of the map the chunk starts at.
+    :param left: Column of the map the chunk starts at.
+    """
+    texture_coordinates, sizes, drawn, frames = tables
+    rows, columns = np.nonzero(drawn[indices])
+    tile_indices = indices[rows, columns]
+    x = (columns + left) * tile_width
+    y = (row_count - (rows + top) - 1) * tile_height
+    tile_sizes = sizes[tile_indices]
+
+    vertices = np.empty(len(tile_indices) * 6, dtype=_tile_vertex_type)
+    positions = vertices['vert'].reshape(-1, 6, 2)
+    positions[:, :, 0] = x[:, None] + _TILE_CORNERS[:, 0] * tile_sizes[:, 0:1]
+    positions[:, :, 1] = y[:, None] + _TILE_CORNERS[:, 1] * tile_sizes[:, 1:2]
+    vertices['tex'].reshape(-1, 6, 2)[:] = texture_coordinates[tile_indices]
+    vertices['frames'].reshape(-1, 6, 2)[:] = frames[tile_indices, None]
+    return vertices
+
+
+class TileLayer:
+    """
+    A tile layer of a map, kept as a NumPy grid of GIDs rather than one
+    Sprite per tile.
+
+    The layer is split into square chunks of tiles. Each chunk is drawn from
+    one static vertex buffer, with the tile images packed into one texture,
+    so a whole layer takes one draw call per chunk. Only the tiles
+    ``sprite_filter`` picks get a Sprite, in ``sprite_list``.
+
+    Animated tiles are drawn from the chunks too. Every frame of an
+    animation is put in the atlas, and the shader picks the frame from
+    ``animation_time``, which ``update_animation`` moves on. Every tile of
+    an animation shares its clock, like in Tiled, so animating a layer takes
+    no work per tile. Frames are drawn at the size of the first one.
+
+    The grid can be queried for collisions with plain index math, and
+    changed with ``set_gid``, which only rebuilds the chunk the tile is in.
+
+    Example:
+        my_map = arcadeplus.tilemap.read_tmx("level_1.tmx")
+        ground = arcadeplus.TileLayer(my_map, "Ground")
+        ...
+        ground.update_animation(delta_time)
+        ground.draw()
+        if ground.collides_with_sprite(player):
+            ...
+
+    :param map_object: The TileMap read in by read_tmx.
+    :param layer_name: The name of the tile layer.
+    :param scaling: Scaling the layer up or down.
+    :param base_directory: Base directory of the file, that we start from to
+                           load images.
+    :param chunk_size: Width and height of a chunk, in tiles.
+    :param sprite_filter: Function given each kind of tile in the layer,
+                          returning True if it should be a Sprite.
+    """
+
+    def __init__(self,
+                 map_object: pytiled_parser.objects.TileMap,
+                 layer_name: str,
+                 scaling: float = 1,
+                 base_directory: str = "",
+                 chunk_size: int = 32,
+                 sprite_filter: Optional[Callable[[pytiled_parser.objects.Tile], bool]] = None):
+        layer = get_tilemap_layer(map_object, layer_name)
+        if not isinstance(layer, pytiled_parser.objects.TileLayer):
+            raise ValueError(f"No tile layer named '{layer_name}'.")
+
+        if len(base_directory) > 0 and not base_directory.endswith("/"):
+            base_directory += "/"
+
+        self.map_object = map_object
+        self.layer = layer
+        self.scaling = scaling
+        self.base_directory = base_directory
+        self.chunk_size = chunk_size
+        self.sprite_filter = sprite_filter
+        self.tile_width = map_object.tile_size[0] * scaling
+        self.tile_height = map_object.tile_size[1] * scaling
+
+        #: GID of every cell. Row 0 is the top row of the map, like in Tiled.
+        self.gids = np.array(layer.data, dtype=np.uint32)
+        self.row_count, self.column_count = self.gids.shape
+        #: Sprites for tiles that aren't drawn from the chunks
+        self.sprite_list: SpriteList = SpriteList()
+
+        self._gid_lookup = _get_gid_lookup(map_object)
+        self._atlas = _TileAtlas()
+        # Atlas position of each image, by GID without flip flags
+        self._atlas_images: Dict[int, Tuple[int, int, int, int]] = {}
+        # Every GID in the layer has an index into these tables. Index 0 is the empty cell.
+        self._gid_indices: Dict[int, int] = {0: 0}
+        self._tile_texture_coordinates = [np.zeros((6, 2), dtype=np.float32)]
+        self._tile_sizes = [(0.0, 0.0)]
+        self._tile_drawn = [False]
+        self._tile_is_sprite = [False]
+        # First animation frame and frame count of each tile
+        self._tile_frames = [(0.0, 0.0)]
+        self._tables: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+        # Frames of every animation: offset from the first frame in the atlas, end time, animation length
+        self._frames: List[Tuple[float, float, float, float]] = []
+        # First frame, frame count and GID of the first frame found of each animation, by GID without flip flags
+        self._animations: Dict[int, Tuple[int, int, int]] = {}
+        self._frame_texture: Optional[shader.BufferTexture] = None
+        self._frames_dirty = True
+        self._animation_period: Optional[int] = None
+        #: Seconds the layer's animations have been running
+        self.animation_time = 0.0
+        self._sprites: Dict[Tuple[int, int], Sprite] = {}
+
+        gids, inverse = np.unique(self.gids, return_inverse=True)
+        indices = np.array([self._get_gid_index(int(gid)) for gid in gids], dtype=np.int32)
+        #: Index of every cell's GID into the tile tables
+        self._cell_indices = indices[inverse].reshape(self.gids.shape)
+
+        for row, column in zip(*np.nonzero(np.array(self._tile_is_sprite)[self._cell_indices])):
+            self._create_sprite(int(row), int(column))
+
+        chunk_rows = -(-self.row_count // chunk_size)
+        chunk_columns = -(-self.column_count // chunk_size)
+        self._chunks = [_TileChunk(row, column) for row in range(chunk_rows) for column in range(chunk_columns)]
+        self._chunk_columns = chunk_columns
+
+    @property
+    def width(self) -> float:
+        """ Width of the layer, in pixels. """
+        return self.column_count * self.tile_width
+
+    @property
+    def height(self) -> float:
+        """ Height of the layer, in pixels. """
+        return self.row_count * self.tile_height
+
+    def _get_gid_index(self, tile_gid: int) -> int:
+        """ Get the index of a GID into the tile tables, adding it if it is new. """
+        try:
+            return self._gid_indices[tile_gid]
+        except KeyError:
+            pass
+
+        drawn = False
+        is_sprite = False
+        texture_coordinates = np.zeros((6, 2), dtype=np.float32)
+        size = (0.0, 0.0)
+        frames = (0.0, 0.0)
+
+        tile = self._gid_lookup.get_tile(tile_gid)
+        if tile is None:
+            print(f"Warning, couldn't find tile for item {tile_gid} in layer "
+                  f"'{self.layer.name}' in file '{self.map_object.tmx_file}'.")
+        elif self.sprite_filter is not None and self.sprite_filter(tile):
+            is_sprite = True
+        else:
+            base_gid = tile_gid & ~_FLIPPED_FLAGS
+            if tile.animation:
+                animation = self._get_animation(tile, base_gid)
+                if animation is not None:
+                    first_frame, frame_count, base_gid = animation
+                    frames = (float(first_frame), float(frame_count))
+                    # The first frame's image, to draw the others offset from
+                    tile = self._gid_lookup.get_tile(base_gid)
+            image = self._get_atlas_image(tile, base_gid)
+            if image is not None:
+                x, y, width, height = image
+                texture_coordinates = _get_tile_texture_coordinates(x, y, width, height, tile_gid)
+                size = (width * self.scaling, height * self.scaling)
+                drawn = True
+
+        index = len(self._tile_drawn)
+        self._gid_indices[tile_gid] = index
+        self._tile_texture_coordinates.append(texture_coordinates)
+        self._tile_sizes.append(size)
+        self._tile_drawn.append(drawn)
+        self._tile_is_sprite.append(is_sprite)
+        self._tile_frames.append(frames)
+        self._tables = None
+        return index
+
+    def _get_animation(self, tile: pytiled_parser.objects.Tile,
+                       base_gid: int) -> Optional[Tuple[int, int, int]]:
+        """
+        Put the frames of an animated tile in the atlas and frame table. Returns its frame range, and
+        the GID of its first frame. Frames that can't be found are left out.
+        """
+        try:
+            return self._animations[base_gid]
+        except KeyError:
+            pass
+
+        # GIDs of a tile set follow its tile IDs
+        first_gid = base_gid - tile.id_
+        positions = []
+        end_times = []
+        end_time = 0
+        first_frame_gid = 0
+        for frame in tile.animation:
+            frame_tile = self._gid_lookup.get_tile(first_gid + frame.tile_id)
+            image = None if frame_tile is None else self._get_atlas_image(frame_tile, first_gid + frame.tile_id)
+            if image is None:
+                print(f"Warning, couldn't find frame {frame.tile_id} of animated tile {tile.id_} in layer "
+                      f"'{self.layer.name}' in file '{self.map_object.tmx_file}'.")
+                continue
+            if not positions:
+                first_frame_gid = first_gid + frame.tile_id
+            end_time += frame.duration
+            positions.append(image[:2])
+            end_times.append(end_time)
+
+        animation = None
+        if end_time > 0:
+            animation = len(self._frames), len(positions), first_frame_gid
+            first_x, first_y = positions[0]
+            self._frames.extend((x - first_x, y - first_y, frame_end_time, end_time)
+                                for (x, y), frame_end_time in zip(positions, end_times))
+            self._frames_dirty = True
+        self._animations[base_gid] = animation
+        return animation
+
+    def _get_animation_period(self) -> Optional[int]:
+        """ Milliseconds after which every animation is back at its start. """
+        if not self._frames:
+            return None
+        lengths = np.unique(np.array(self._frames, dtype=np.int64)[:, 3])
+        period = 1
+        for length in lengths.tolist():
+            period = period * length // math.gcd(period, length)
+            if period > _MAX_ANIMATION_PERIOD:
+                return None
+        return period
+
+    def update_animation(self, delta_time: float = 1 / 60):
+        """ Move the animated tiles on. This is one addition, however many tiles there are. """
+        self.animation_time += delta_time
+
+    def _upload_frames(self):
+        """ Put the frame table in a buffer texture for the shader. """
+        # Shaders can't read an empty buffer, so there is always at least one frame
+        frames = np.array(self._frames or [(0, 0, 0, 1)], dtype=np.float32)
+        if self._frame_texture is not None:
+            self._frame_texture.release()
+        self._frame_texture = shader.BufferTexture(shader.Buffer(frames.tobytes(), usage='static'))
+        self._frames_dirty = False
+        self._animation_period = self._get_animation_period()
+
+    def _get_atlas_image(self, tile: pytiled_parser.objects.Tile,
+                         base_gid: int) -> Optional[Tuple[int, int, int, int]]:
+        try:
+            return self._atlas_images[base_gid]
+        except KeyError:
+            pass
+
+        image_file = _get_image_source(tile, self.base_directory, _get_image_paths(self.map_object))
+        if image_file is None:
+            image = None
+        else:
+            image_x, image_y, width, height = _get_image_info_from_tileset(tile)
+            texture = load_texture(image_file, image_x, image_y, width, height)
+            pixels = np.asarray(texture.image.convert("RGBA"))
+            height, width = pixels.shape[:2]
+            x, y = self._atlas.add(pixels)
+            image = x, y, width, height
+        self._atlas_images[base_gid] = image
+        return image
+
+    def _get_tables(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        if self._tables is None:
+            self._tables = (np.array(self._tile_texture_coordinates, dtype=np.float32),
+                            np.array(self._tile_sizes, dtype=np.float32),
+                            np.array(self._tile_drawn, dtype=bool),
+                            np.array(self._tile_frames, dtype=np.float32))
+        return self._tables
+
+    def _get_cell_position(self, row: int, column: int) -> Tuple[float, float]:
+        """ Bottom left of a cell. """
+        return column * self.tile_width, (self.row_count - row - 1) * self.tile_height
+
+    def _create_sprite(self, row: int, column: int):
+        tile = self._gid_lookup.get_tile(int(self.gids[row, column]))
+        my_sprite = _create_sprite_from_tile(self.map_object, tile, scaling=self.scaling,
+                                             base_directory=self.base_directory)
+        left, bottom = self._get_cell_position(row, column)
+        my_sprite.center_x = left + my_sprite.width / 2
+        my_sprite.center_y = bottom + my_sprite.height / 2
+        self._sprites[row, column] = my_sprite
+        self.sprite_list.append(my_sprite)
+
+    def get_sprite(self, row: int, column: int) -> Optional[Sprite]:
+        """ Get the Sprite of a cell, if its tile is one of the tiles that are sprites. """
+        return self._sprites.get((row, column))
+
+    def _get_chunk_indices(self, chunk: _TileChunk) -> np.ndarray:
+        top = chunk.row * self.chunk_size
+        left = chunk.column * self.chunk_size
+        return self._cell_indices[top:top + self.chunk_size, left:left + self.chunk_size]
+
+    def _build_chunk(self, chunk: _TileChunk):
+        chunk.vertices = _build_chunk_vertices(self._get_chunk_indices(chunk),
+                                               chunk.row * self.chunk_size, chunk.column * self.chunk_size,
+                                               self.row_count, self.tile_width, self.tile_height,
+                                               self._get_tables())
+
+    def _get_chunk(self, row: int, column: int) -> _TileChunk:
+        """ Chunk a cell is in. """
+        return self._chunks[(row // self.chunk_size) * self._chunk_columns + column // self.chunk_size]
+
+    def set_gid(self, row: int, column: int, tile_gid: int):
+        """
+        Change the tile of a cell. Only the chunk the cell is in is rebuilt.
+
+        :param int row: Row of the cell, with row 0 at the top like in Tiled.
+        :param int column: Column of the cell.
+        :param int tile_gid: GID of the new tile, including flip flags. 0 empties the cell.
+        """
+        my_sprite = self._sprites.pop((row, column), None)
+        if my_sprite is not None:
+            self.sprite_list.remove(my_sprite)
+
+        self.gids[row, column] = tile_gid
+        index = self._get_gid_index(tile_gid)
+        self._cell_indices[row, column] = index
+        if self._tile_is_sprite[index]:
+            self._create_sprite(row, column)
+        chunk = self._get_chunk(row, column)
+        chunk.dirty = True
+        chunk.version += 1
+
+    def get_cell(self, x: float, y: float) -> Tuple[int, int]:
+        """
+        Get the row and column of the cell a point is in. They can be outside
+        the layer.
+        """
+        return self.row_count - 1 - int(math.floor(y / self.tile_height)), int(math.floor(x / self.tile_width))
+
+    def get_gid(self, row: int, column: int) -> int:
+        """ GID of a cell, or 0 for cells outside the layer. """
+        if 0 <= row < self.row_count and 0 <= column < self.column_count:
+            return int(self.gids[row, column])
+        return 0
+
+    def get_tile_at(self, x: float, y: float) -> Optional[pytiled_parser.objects.Tile]:
+        """ Get the tile at a point, or None if that cell is empty. """
+        tile_gid = self.get_gid(*self.get_cell(x, y))
+        if tile_gid == 0:
+            return None
+        return self._gid_lookup.get_tile(tile_gid)
+
+    def _get_cell_range(self, left: float, bottom: float, right: float, top: float):
+        """ Rows and columns of the cells a box overlaps, clipped to the layer. """
+        first_column = max(int(math.floor(left / self.tile_width)), 0)
+        last_column = min(int(math.ceil(right / self.tile_width)), self.column_count)
+        first_row = max(self.row_count - int(math.ceil(top / self.tile_height)), 0)
+        last_row = min(self.row_count - int(math.floor(bottom / self.tile_height)), self.row_count)
+        return first_row, last_row, first_column, last_column
+
+    def get_cells_in_rect(self, left: float, bottom: float, right: float, top: float) -> np.ndarray:
+        """
+        Get the non-empty cells a box overlaps. Cells that only touch the box don't count.
+
+        :returns: Array of ``(row, column)`` pairs.
+        """
+        first_row, last_row, first_column, last_column = self._get_cell_range(left, bottom, right, top)
+        if first_row >= last_row or first_column >= last_column:
+            return np.zeros((0, 2), dtype=np.int64)
+        rows, columns = np.nonzero(self.gids[first_row:last_row, first_column:last_column])
+        return np.stack([rows + first_row, columns + first_column], axis=1)
+
+    def collides_with_rect(self, left: float, bottom: float, right: float, top: float) -> bool:
+        """ Whether a box overlaps any non-empty cell. """
+        first_row, last_row, first_column, last_column = self._get_cell_range(left, bottom, right, top)
+        if first_row >= last_row or first_column >= last_column:
+            return False
+        return bool(self.gids[first_row:last_row, first_column:last_column].any())
+
+    def collides_with_sprite(self, sprite: Sprite) -> bool:
+        """ Whether the bounding box of a sprite overlaps any non-empty cell. """
+        return self.collides_with_rect(sprite.left, sprite.bottom, sprite.right, sprite.top)
+
+    def _get_chunks_in_rect(self, left: float, bottom: float, right: float, top: float) -> List[_TileChunk]:
+        """ Chunks with tiles that may be in a box. """
+        # Tiles can be bigger than a cell, and stick out of it up and to the right
+        sizes = self._get_tables()[1]
+        left -= max(float(sizes[:, 0].max()) - self.tile_width, 0)
+        bottom -= max(float(sizes[:, 1].max()) - self.tile_height, 0)
+
+        first_row, last_row, first_column, last_column = self._get_cell_range(left, bottom, right, top)
+        if first_row >= last_row or first_column >= last_column:
+            return []
+        size = self.chunk_size
+        return [self._chunks[chunk_row * self._chunk_columns + chunk_column]
+                for chunk_row in range(first_row // size, (last_row - 1) // size + 1)
+                for chunk_column in range(first_column // size, (last_column - 1) // size + 1)]
+
+    def _get_chunks_to_draw(self) -> List[_TileChunk]:
+        """ Build the chunks on screen that need it, and return them. """
+        left, right, bottom, top = get_viewport()
+        chunks = self._get_chunks_in_rect(left, bottom, right, top)
+        for chunk in chunks:
+            if chunk.dirty:
+                self._build_chunk(chunk)
+                chunk.upload()
+        return chunks
+
+    def draw(self):
+        """ Draw the layer. Only chunks on screen are drawn, and built if they need it. """
+        program = _get_tile_program()
+        chunks = self._get_chunks_to_draw()
+
+        self._atlas.use(0)
+        if self._frames_dirty:
+            self._upload_frames()
+        self._frame_texture.use(1)
+        animation_time = self.animation_time * 1000
+        if self._animation_period is not None:
+            # Keep the time small, for the precision of the shader's floats
+            animation_time %= self._animation_period
+
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+        for chunk in chunks:
+            if chunk.vao is None:
+                continue
+            with chunk.vao:
+                program['Atlas'] = 0
+                program['AtlasSize'] = [self._atlas.width, self._atlas.height]
+                program['Frames'] = 1
+                program['Time'] = animation_time
+                gl.glDrawArrays(gl.GL_TRIANGLES, 0, len(chunk.vertices))
+
+        if len(self.sprite_list):
+            self.sprite_list.draw()
+
+
+_chunk_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_chunk_executor() -> ThreadPoolExecutor:
+    global _chunk_executor
+    if _chunk_executor is None:
+        _chunk_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="arcadeplus-chunks")
+    return _chunk_executor
+
+
+class StreamingTileLayer(TileLayer):
+    """
+    A TileLayer for huge maps, which keeps only the chunks around the camera
+    built.
+
+    Chunks within ``margin`` pixels of the viewport are built on a
+    background thread before they come on screen, and uploaded when they
+    are ready. At most ``max_chunks`` chunks keep their vertices and
+    buffers. Past that, the chunks that were on screen least recently are
+    dropped, and built again if the camera comes back.
+
+    A chunk that comes on screen before its background build has finished
+    is waited for, so tiles never pop in.
+
+    Takes the same parameters as TileLayer, plus:
+
+    :param margin: How far around the viewport, in pixels, to build chunks ahead of time.
+    :param max_chunks: How many chunks can be built at once.
+    """
+
+    def __init__(self,
+                 map_object: pytiled_parser.objects.TileMap,
+                 layer_name: str,
+                 scaling: float = 1,
+                 base_directory: str = "",
+                 chunk_size: int = 32,
+                 sprite_filter: Optional[Callable[[pytiled_parser.objects.Tile], bool]] = None,
+                 margin: float = 512,
+                 max_chunks: int = 256):
+        super().__init__(map_object, layer_name, scaling, base_directory, chunk_size, sprite_filter)
+        self.margin = margin
+        self.max_chunks = max_chunks
+        # Built chunks, least recently on screen first
+        self._resident: "OrderedDict[_TileChunk, None]" = OrderedDict()
+        # Background builds, with the chunk version they were started for
+        self._building: Dict[_TileChunk, Tuple[Future, int]] = {}
+
+    @property
+    def resident_chunk_count(self) -> int:
+        """ Number of chunks holding their vertices. """
+        return len(self._resident)
+
+    @property
+    def building_chunk_count(self) -> int:
+        """ Number of chunks being built on the background thread. """
+        return len(self._building)
+
+    def _start_build(self, chunk: _TileChunk):
+        # The worker gets copies, so changing tiles meanwhile is safe
+        future = _get_chunk_executor().submit(
+            _build_chunk_vertices, self._get_chunk_indices(chunk).copy(),
+            chunk.row * self.chunk_size, chunk.column * self.chunk_size,
+            self.row_count, self.tile_width, self.tile_height, self._get_tables()
+        )
+        self._building[chunk] = future, chunk.version
+
+    def _finish_build(self, chunk: _TileChunk, wait: bool = False) -> bool:
+        """ Take the result of a chunk's background build, if it is done. """
+        future, version = self._building[chunk]
+        if not wait and not future.done():
+            return False
+        del self._building[chunk]
+        if version != chunk.version:
+            # A tile changed while it was being built
+            return False
+        chunk.vertices = future.result()
+        chunk.upload()
+        self._resident[chunk] = None
+        return True
+
+    def _get_chunks_to_draw(self) -> List[_TileChunk]:
+        left, right, bottom, top = get_viewport()
+        visible = self._get_chunks_in_rect(left, bottom, right, top)
+        nearby = self._get_chunks_in_rect(left - self.margin, bottom - self.margin,
+                                          right + self.margin, top + self.margin)
+
+        for chunk in list(self._building):
+            self._finish_build(chunk)
+
+        for chunk in nearby:
+            if chunk.dirty and chunk not in self._building:
+                self._start_build(chunk)
+
+        for chunk in visible:
+            if chunk.dirty:
+                if chunk not in self._building or not self._finish_build(chunk, wait=True):
+                    self._build_chunk(chunk)
+                    chunk.upload()
+            self._resident[chunk] = None
+            self._resident.move_to_end(chunk)
+
+        self._evict(set(nearby))
+        return visible
+
+    def _evict(self, keep: set):
+        """ Drop the least recently drawn chunks, down to max_chunks. """
+        for chunk in list(self._resident):
+            if len(self._resident) <= self.max_chunks:
+                break
+            if chunk in keep:
+                continue
+            del self._resident[chunk]
+            chunk.release()
+
+    def prefetch(self, left: float, bottom: float, right: float, top: float):
+        """ Start building the chunks in a box in the background, e.g. where the camera is about to go. """
+        for chunk in self._get_chunks_in_rect(left, bottom, right, top):
+            if chunk.dirty and chunk not in self._building:
+                self._start_build(chunk)
+
+
+_level_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_level_executor() -> ThreadPoolExecutor:
+    global _level_executor
+    if _level_executor is None:
+        _level_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="arcadeplus-levels")
+    return _level_executor
+
+
+def _load_level(tmx_file: str,
+                layer_names: List[str],
+                tile_layer_names: List[str],
+                scaling: float,
+                base_directory: str,
+                cache_directory: Optional[str]):
+    """ Everything in loading a level that doesn't need OpenGL. Runs on a worker thread. """
+    map_object = read_tmx(tmx_file, cache_directory)
+    layers: Dict[str, Union[SpriteList, TileLayer]] = {}
+    for layer_name in layer_names:
+        layers[layer_name] = process_layer(map_object, layer_name, scaling, base_directory)
+    for layer_name in tile_layer_names:
+        tile_layer = TileLayer(map_object, layer_name, scaling, base_directory)
+        for chunk in tile_layer._chunks:
+            tile_layer._build_chunk(chunk)
+        layers[layer_name] = tile_layer
+    return map_object, layers
+
+
+def _get_upload_steps(layers: Dict[str, Union[SpriteList, TileLayer]]) -> List[Callable[[], None]]:
+    """ The OpenGL work left for loaded layers, in steps small enough to spread over frames. """
+    steps = []
+    for layer in layers.values():
+        if isinstance(layer, TileLayer):
+            steps.append(layer._atlas.upload)
+            steps.append(layer._upload_frames)
+            steps.extend(chunk.upload for chunk in layer._chunks)
+            sprite_list = layer.sprite_list
+        else:
+            sprite_list = layer
+        if len(sprite_list) > 0:
+            steps.append(sprite_list._prepare_draw)
+    return steps
+
+
+class LevelPreloader:
+    """
+    Loads a level in the background, while the current one keeps running.
+
+    Reading the map, looking up its tiles, loading their images and making
+    the sprites all happen on a worker thread. What is left needs OpenGL, so
+    it has to happen on the main thread: building each SpriteList's texture
+    atlas and buffers, and uploading a TileLayer's atlas and chunks. Call
+    ``update`` every frame, and it does that work a step at a time, for at
+    most ``time_budget`` seconds per call. Once ``done`` is True, the layers
+    draw without the stall of a first draw.
+
+    A big tile layer is one large step as a SpriteList, so load it as a
+    TileLayer, through ``tile_layer_names``, to upload it a chunk at a time.
+
+    The work is done on threads rather than processes, because sprites and
+    textures would have to be copied back from a process. Decompressing the
+    layer data and decoding images let go of the GIL, so those run alongside
+    the game.
+
+    Example:
+        self.preloader = arcadeplus.LevelPreloader("level_2.tmx", ["Platforms", "Coins"])
+        ...
+        def on_update(self, delta_time):
+            self.preloader.update()
+            if self.player_sprite.right >= self.end_of_map and self.preloader.done:
+                self.wall_list = self.preloader.layers["Platforms"]
+
+    :param tmx_file: File to load the map from.
+    :param layer_names: Layers to load as SpriteLists, with process_layer.
+    :param scaling: Scaling the layers up or down.
+    :param base_directory: Base directory of the file, that we start from to
+                           load images.
+    :param cache_directory: Directory for read_tmx to keep the compiled map in.
+    :param tile_layer_names: Tile layers to load as TileLayers.
+    :param time_budget: Seconds of OpenGL work each call to ``update`` may do.
+    """
+
+    def __init__(self,
+                 tmx_file: str,
+                 layer_names: List[str],
+                 scaling: float = 1,
+                 base_directory: str = "",
+                 cache_directory: Optional[str] = None,
+                 tile_layer_names: Optional[List[str]] = None,
+                 time_budget: float = 0.004):
+        self.tmx_file = tmx_file
+        self.time_budget = time_budget
+        #: The map, once the level is done
+        self.map_object: Optional[pytiled_parser.objects.TileMap] = None
+        #: Layers by name, SpriteList or TileLayer, once the level is done
+        self.layers: Dict[str, Union[SpriteList, TileLayer]] = {}
+
+        self._future = _get_level_executor().submit(_load_level, tmx_file, list(layer_names),
+                                                    list(tile_layer_names or []), scaling,
+                                                    base_directory, cache_directory)
+        # OpenGL work left, once the worker is done
+        self._steps: Optional[Deque[Callable[[], None]]] = None
+        self._result = None
+
+    @property
+    def done(self) -> bool:
+        """ True when the level is loaded and uploaded. """
+        return self._steps is not None and len(self._steps) == 0
+
+    @property
+    def loaded(self) -> bool:
+        """ True when the worker thread is done, and only OpenGL work is left. """
+        return self._future.done()
+
+    def _start_uploads(self):
+        # Raises here, on the main thread, if loading failed
+        self._result = self._future.result()
+        self._steps = deque(_get_upload_steps(self._result[1]))
+
+    def _finish(self):
+        self.map_object, self.layers = self._result
+
+    def update(self, time_budget: Optional[float] = None) -> bool:
+        """
+        Do OpenGL work for the level, if the worker has finished with it.
+        Call once a frame.
+
+        :param time_budget: Seconds to spend, instead of ``self.time_budget``.
+                            At least one step is done, however long it takes.
+        :return: True if the level is done.
+        """
+        if self.done:
+            return True
+        if self._steps is None:
+            if not self._future.done():
+                return False
+            self._start_uploads()
+
+        if time_budget is None:
+            time_budget = self.time_budget
+        start_time = time.perf_counter()
+        while self._steps:
+            self._steps.popleft()()
+            if time.perf_counter() - start_time >= time_budget:
+                break
+
+        if not self._steps:
+            self._finish()
+        return self.done
+
+    def wait(self):
+        """ Finish loading the level right now, blocking until it is done. """
+        if self.done:
+            return
+        if self._steps is None:
+            self._start_uploads()
+        while self._steps:
+            self._steps.popleft()()
+        self._finish()
+
+
+# Boxes over more cells than this are searched with NumPy
+_SMALL_WINDOW_SIZE = 64
+
+
+def _get_tile_hit_box(tile: pytiled_parser.objects.Tile, tile_gid: int) -> Tuple[float, float, float, float]:
+    """
+    Bounding box of a tile's hit boxes, as ``(left, bottom, right, top)``
+    from the bottom left of its image, with the GID's flips applied.
+    """
+    width, height = _get_image_info_from_tileset(tile)[2:]
+
+    # In image coordinates, with y down, like Tiled
+    x0, y0, x1, y1 = 0.0, 0.0, float(width), float(height)
+    if tile.objectgroup:
+        xs: List[float] = []
+        ys: List[float] = []
+        for hitbox in tile.objectgroup:
+            location_x, location_y = hitbox.location[0], hitbox.location[1]
+            if isinstance(hitbox, (pytiled_parser.objects.PolygonObject, pytiled_parser.objects.PolylineObject)):
+                xs.extend(location_x + point[0] for point in hitbox.points)
+                ys.extend(location_y + point[1] for point in hitbox.points)
+            elif isinstance(hitbox, (pytiled_parser.objects.RectangleObject, pytiled_parser.objects.ElipseObject)) \
+                    and hitbox.size is not None and hitbox.size[0] is not None:
+                xs.extend((location_x, location_x + hitbox.size[0]))
+                ys.extend((location_y, location_y + hitbox.size[1]))
+            else:
+                print(f"Warning: Hitbox type {type(hitbox)} without a size not supported for tile {tile.id_}.")
+        if xs:
+            x0, y0, x1, y1 = min(xs), min(ys), max(xs), max(ys)
+
+    # Tiled flips diagonally first, then horizontally, then vertically
+    if tile_gid & _FLIPPED_DIAGONALLY_FLAG:
+        x0, y0, x1, y1 = y0, x0, y1, x1
+        width, height = height, width
+    if tile_gid & _FLIPPED_HORIZONTALLY_FLAG:
+        x0, x1 = width - x1, width - x0
+    if tile_gid & _FLIPPED_VERTICALLY_FLAG:
+        y0, y1 = height - y1, height - y0
+
+    return x0, height - y1, x1, height - y0
+
+
+class TileCollisionMap:
+    """
+    The solid cells of a tile layer, for collisions with plain index math
+    instead of a SpriteList.
+
+    Each kind of tile gets one axis-aligned hit box: the bounding box of the
+    hit boxes drawn on it in Tiled's tileset editor, or the whole tile if
+    there are none. Finding what a box hits only looks at the cells under
+    it, so it costs the same however big the map is.
+
+    It can be given to PhysicsEngineSimple as ``walls`` or to
+    PhysicsEnginePlatformer as ``platforms`` or ``ladders``, in place of a
+    SpriteList.
+
+    Example:
+        my_map = arcadeplus.tilemap.read_tmx("level_1.tmx")
+        walls = arcadeplus.TileCollisionMap(my_map, "Platforms")
+        physics_engine = arcadeplus.PhysicsEnginePlatformer(player, walls)
+
+    :param map_object: The TileMap read in by read_tmx.
+    :param layer_name: The name of the tile layer.
+    :param scaling: Scaling the layer up or down.
+    :param solid_filter: Function given each kind of tile in the layer,
+                         returning True if it is solid. By default every
+                         tile is.
+    """
+
+    def __init__(self,
+                 map_object: pytiled_parser.objects.TileMap,
+                 layer_name: str,
+                 scaling: float = 1,
+                 solid_filter: Optional[Callable[[pytiled_parser.objects.Tile], bool]] = None):
+        layer = get_tilemap_layer(map_object, layer_name)
+        if not isinstance(layer, pytiled_parser.objects.TileLayer):
+            raise ValueError(f"No tile layer named '{layer_name}'.")
+
+        self.map_object = map_object
+        self.layer = layer
+        self.scaling = scaling
+        self.solid_filter = solid_filter
+        self.tile_width = map_object.tile_size[0] * scaling
+        self.tile_height = map_object.tile_size[1] * scaling
+
+        #: GID of every cell. Row 0 is the top row of the map, like in Tiled.
+        self.gids = np.array(layer.data, dtype=np.uint32)
+        self.row_count, self.column_count = self.gids.shape
+
+        self._gid_lookup = _get_gid_lookup(map_object)
+        # Every GID in the layer has an index into these tables. Index 0 is the empty cell.
+        self._gid_indices: Dict[int, int] = {0: 0}
+        self._hit_boxes = [(0.0, 0.0, 0.0, 0.0)]
+        self._solid = [False]
+        self._solid_table: Optional[np.ndarray] = None
+        # How far hit boxes reach out of their cells, left, down, right and up
+        self._reach = [0.0, 0.0, 0.0, 0.0]
+
+        gids, inverse = np.unique(self.gids, return_inverse=True)
+        indices = np.array([self._get_gid_index(int(gid)) for gid in gids], dtype=np.int32)
+        self._cell_indices = indices[inverse].reshape(self.gids.shape)
+
+    def _get_gid_index(self, tile_gid: int) -> int:
+        """ Get the index of a GID into the hit box tables, adding it if it is new. """
+        try:
+            return self._gid_indices[tile_gid]
+        except KeyError:
+            pass
+
+        hit_box = (0.0, 0.0, 0.0, 0.0)
+        solid = False
+        tile = self._gid_lookup.get_tile(tile_gid)
+        if tile is None:
+            print(f"Warning, couldn't find tile for item {tile_gid} in layer "
+                  f"'{self.layer.name}' in file '{self.map_object.tmx_file}'.")
+        elif self.solid_filter is None or self.solid_filter(tile):
+            left, bottom, right, top = (value * self.scaling for value in _get_tile_hit_box(tile, tile_gid))
+            hit_box = (left, bottom, right, top)
+            solid = True
+            self._reach = [max(self._reach[0], -left), max(self._reach[1], -bottom),
+                           max(self._reach[2], right - self.tile_width), max(self._reach[3], top - self.tile_height)]
+
+        index = len(self._solid)
+        self._gid_indices[tile_gid] = index
+        self._hit_boxes.append(hit_box)
+        self._solid.append(solid)
+        self._solid_table = None
+        return index
+
+    def _get_solid_table(self) -> np.ndarray:
+        if self._solid_table is None:
+            self._solid_table = np.array(self._solid, dtype=bool)
+        return self._solid_table
+
+    def set_gid(self, row: int, column: int, tile_gid: int):
+        """
+        Change the tile of a cell.
+
+        :param int row: Row of the cell, with row 0 at the top like in Tiled.
+        :param int column: Column of the cell.
+        :param int tile_gid: GID of the new tile, including flip flags. 0 empties the cell.
+        """
+        self.gids[row, column] = tile_gid
+        self._cell_indices[row, column] = self._get_gid_index(tile_gid)
+
+    def get_cell(self, x: float, y: float) -> Tuple[int, int]:
+        """
+        Get the row and column of the cell a point is in. They can be outside
+        the layer.
+        """
+        return self.row_count - 1 - int(math.floor(y / self.tile_height)), int(math.floor(x / self.tile_width))
+
+    def is_solid(self, row: int, column: int) -> bool:
+        """ Whether a cell has a solid tile. Cells outside the layer aren't. """
+        if 0 <= row < self.row_count and 0 <= column < self.column_count:
+            return self._solid[int(self._cell_indices[row, column])]
+        return False
+
+    def _get_hits(self, left: float, bottom: float, right: float,
+                  top: float) -> List[Tuple[int, int, Tuple[float, float, float, float]]]:
+        """ Cells with hit boxes overlapping a box, with those hit boxes, in row order. """
+        reach_left, reach_bottom, reach_right, reach_top = self._reach
+        first_column = max(int(math.floor((left - reach_right) / self.tile_width)), 0)
+        last_column = min(int(math.ceil((right + reach_left) / self.tile_width)), self.column_count)
+        first_row = max(self.row_count - int(math.ceil((top + reach_bottom) / self.tile_height)), 0)
+        last_row = min(self.row_count - int(math.floor((bottom - reach_top) / self.tile_height)), self.row_count)
+        if first_row >= last_row or first_column >= last_column:
+            return []
+
+        window = self._cell_indices[first_row:last_row, first_column:last_column]
+        solid = self._solid
+        if window.size > _SMALL_WINDOW_SIZE:
+            rows, columns = np.nonzero(self._get_solid_table()[window])
+            cells = zip((rows + first_row).tolist(), (columns + first_column).tolist(),
+                        window[rows, columns].tolist())
+        else:
+            # For the few cells under a sprite, NumPy's overhead is more than the work
+            cells = ((first_row + row, first_column + column, index)
+                     for row, indices in enumerate(window.tolist())
+                     for column, index in enumerate(indices) if solid[index])
+
+        hits = []
+        for row, column, index in cells:
+            box_left, box_bottom, box_right, box_top = self._hit_boxes[index]
+            cell_x = column * self.tile_width
+            cell_y = (self.row_count - 1 - row) * self.tile_height
+            box = (cell_x + box_left, cell_y + box_bottom, cell_x + box_right, cell_y + box_top)
+            # Boxes that only touch don't count
+            if box[0] < right and box[2] > left and box[1] < top and box[3] > bottom:
+                hits.append((row, column, box))
+        return hits
+
+    def get_sprite_hits(self, sprite: Sprite) -> List[Tuple[int, int, Tuple[float, float, float, float]]]:
+        """
+        Get the solid cells overlapping the bounding box of a sprite's hit box.
+
+        :returns: ``(row, column, (left, bottom, right, top))`` for each
+                  cell, with the cell's hit box.
+        """
+        points = sprite.get_adjusted_hit_box()
+        xs = [point[0] for point in points]
+        ys = [point[1] for point in points]
+        return self._get_hits(min(xs), min(ys), max(xs), max(ys))
+
+    def get_cells_in_rect(self, left: float, bottom: float, right: float, top: float) -> np.ndarray:
+        """
+        Get the solid cells whose hit boxes overlap a box. Hit boxes that
+        only touch the box don't count.
+
+        :returns: Array of ``(row, column)`` pairs.
+        """
+        hits = self._get_hits(left, bottom, right, top)
+        return np.array([(row, column) for row, column, _ in hits], dtype=np.int64).reshape(-1, 2)
+
+    def get_hit_boxes_in_rect(self, left: float, bottom: float, right: float, top: float) -> np.ndarray:
+        """
+        Get the hit boxes overlapping a box, in the same order as
+        get_cells_in_rect.
+
+        :returns: Array of ``(left, bottom, right, top)`` rows.
+        """
+        hits = self._get_hits(left, bottom, right, top)
+        return np.array([box for _, _, box in hits], dtype=np.float64).reshape(-1, 4)
+
+    def collides_with_rect(self, left: float, bottom: float, right: float, top: float) -> bool:
+        """ Whether a box overlaps any solid tile's hit box. """
+        return len(self._get_hits(left, bottom, right, top)) > 0
+
+    def collides_with_sprite(self, sprite: Sprite) -> bool:
+        """ Whether the bounding box of a sprite's hit box overlaps any solid tile's hit box. """
+        return len(self.get_sprite_hits(sprite)) > 0
@@ -1,7 +1,14 @@
 import math
 import random
+from typing import Optional
+
+import numpy as np
+
 from arcadeplus.arcade_types import Point, Vector
 
+# Generator the *_array functions use when they aren't given one
+_rng = np.random.default_rng()
+
 
 def lerp(v1: float, v2: float, u: float) -> float:
     """linearly interpolate between two values"""
@@ -75,6 +82,57 @@ def rand_vec_magnitude(angle: float, lo_magnitude: float, hi_magnitude: float) -
     return vel.as_tuple()
 
 
+def _get_rng(rng: Optional[np.random.Generator]) -> np.random.Generator:
+    return _rng if rng is None else rng
+
+
+def _polar_array(angles: np.ndarray, lengths) -> np.ndarray:
+    """(n, 2) array of vectors from angles in radians and lengths"""
+    return np.stack([np.cos(angles), np.sin(angles)], axis=1) * np.reshape(lengths, (-1, 1))
+
+
+def rand_in_rect_array(n: int, bottom_left: Point, width: float, height: float,
+                       rng: np.random.Generator = None) -> np.ndarray:
+    """
+    n points like rand_in_rect, as an (n, 2) array.
+    Pass a seeded ``np.random.default_rng`` as ``rng`` for the same points every run.
+    """
+    return _get_rng(rng).uniform(0.0, 1.0, (n, 2)) * (width, height) + bottom_left
+
+
+def rand_in_circle_array(n: int, center: Point, radius: float, uniform_area: bool = False,
+                         rng: np.random.Generator = None) -> np.ndarray:
+    """
+    n points like rand_in_circle, as an (n, 2) array. Those are concentrated
+    around the center, with ``uniform_area`` they are spread evenly over the circle.
+    """
+    rng = _get_rng(rng)
+    angles = rng.uniform(0.0, 2 * math.pi, n)
+    radii = rng.uniform(0.0, 1.0, n)
+    if uniform_area:
+        radii = np.sqrt(radii)
+    return _polar_array(angles, radius * radii) + center
+
+
+def rand_on_circle_array(n: int, center: Point, radius: float, rng: np.random.Generator = None) -> np.ndarray:
+    """n points like rand_on_circle, as an (n, 2) array"""
+    return _polar_array(_get_rng(rng).uniform(0.0, 2 * math.pi, n), radius) + center
+
+
+def rand_vec_spread_deg_array(n: int, angle: float, half_angle_spread: float, length: float,
+                              rng: np.random.Generator = None) -> np.ndarray:
+    """n vectors like rand_vec_spread_deg, as an (n, 2) array"""
+    angles = _get_rng(rng).uniform(angle - half_angle_spread, angle + half_angle_spread, n)
+    return _polar_array(np.radians(angles), length)
+
+
+def rand_vec_magnitude_array(n: int, angle: float, lo_magnitude: float, hi_magnitude: float,
+                             rng: np.random.Generator = None) -> np.ndarray:
+    """n vectors like rand_vec_magnitude, as an (n, 2) array"""
+    magnitudes = _get_rng(rng).uniform(lo_magnitude, hi_magnitude, n)
+    return _polar_array(np.full(n, math.radians(angle)), magnitudes)
+
+
 class _Vec2:
     """
     2D vector used to do operate points and vectors
@@ -18,6 +18,7 @@
 from typing import Union
 from typing import cast
 from arcadeplus.arcade_types import Color
+from arcadeplus import shader
 
 _left = -1.0
 _right = 1.0
@@ -30,6 +31,10 @@
 _projection = None
 _opengl_context = None
 
+# Shared copy of the projection for shaders. Shaders read it with:
+#   layout(std140) uniform ProjectionBlock { mat4 Projection; };
+_projection_buffer = None
+
 
 def get_projection():
     """
@@ -212,6 +217,16 @@ def set_viewport(left: float, right: float, bottom: float, top: float):
     _projection = create_orthogonal_projection(left=_left, right=_right,
                                                bottom=_bottom, top=_top,
                                                near=-1000, far=100, dtype=np.float32)
+    _update_projection_buffer()
+
+
+def _update_projection_buffer():
+    """ Upload the projection to the uniform block shared by all the shaders. """
+    global _projection_buffer
+    if _projection_buffer is None:
+        _projection_buffer = shader.uniform_buffer("ProjectionBlock", 64)
+    _projection_buffer.bind()
+    _projection_buffer.write(_projection.tobytes())
 
 
 def get_viewport() -> Tuple[float, float, float, float]:
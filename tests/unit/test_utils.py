@@ -5,6 +5,10 @@
 python -m pytest tests/unit/test_utils.py
 """
 
+import math
+
+import numpy as np
+
 import arcadeplus
 from pytest import approx
 # noinspection PyProtectedMember
@@ -64,6 +68,49 @@ def test_rand_vec_magnitude():
     arcadeplus.rand_vec_magnitude(30.5, 3.3, 4.4)
 
 
+def test_rand_arrays_are_seedable():
+    for make_points in (lambda rng: arcadeplus.rand_in_rect_array(10, (10.0, 20.0), 30.5, 5.1, rng=rng),
+                        lambda rng: arcadeplus.rand_in_circle_array(10, (0, 0), 10.0, rng=rng),
+                        lambda rng: arcadeplus.rand_on_circle_array(10, (10.0, 20.0), 15.5, rng=rng),
+                        lambda rng: arcadeplus.rand_vec_spread_deg_array(10, -45.0, 5.0, 3.3, rng=rng),
+                        lambda rng: arcadeplus.rand_vec_magnitude_array(10, 30.5, 3.3, 4.4, rng=rng)):
+        points = make_points(np.random.default_rng(5))
+        assert points.shape == (10, 2)
+        assert (points == make_points(np.random.default_rng(5))).all()
+        assert (points != make_points(np.random.default_rng(6))).any()
+
+
+def test_rand_arrays():
+    points = arcadeplus.rand_in_rect_array(100, (10.0, 20.0), 30.5, 5.1)
+    assert (points >= (10.0, 20.0)).all() and (points <= (40.5, 25.1)).all()
+
+    points = arcadeplus.rand_on_circle_array(100, (10.0, 20.0), 15.5)
+    assert np.hypot(*(points - (10.0, 20.0)).T) == approx(np.full(100, 15.5))
+
+    vectors = arcadeplus.rand_vec_spread_deg_array(100, -45.0, 5.0, 3.3)
+    assert np.hypot(*vectors.T) == approx(np.full(100, 3.3))
+    angles = np.degrees(np.arctan2(vectors[:, 1], vectors[:, 0]))
+    assert (angles >= -50.0 - 1e-9).all() and (angles <= -40.0 + 1e-9).all()
+
+    vectors = arcadeplus.rand_vec_magnitude_array(100, 30.5, 3.3, 4.4)
+    lengths = np.hypot(*vectors.T)
+    assert (lengths >= 3.3).all() and (lengths <= 4.4).all()
+    assert vectors[:, 1] / vectors[:, 0] == approx(np.full(100, math.tan(math.radians(30.5))))
+
+    assert arcadeplus.rand_in_circle_array(0, (0, 0), 1.0).shape == (0, 2)
+
+
+def test_rand_in_circle_array_uniform_area():
+    rng = np.random.default_rng(1)
+    # Half the points are in the inner half of the radius, but only a quarter of the area is
+    radii = np.hypot(*arcadeplus.rand_in_circle_array(10000, (0, 0), 10.0, rng=rng).T)
+    assert (radii <= 10.0).all()
+    assert (radii < 5.0).mean() == approx(0.5, abs=0.02)
+    radii = np.hypot(*arcadeplus.rand_in_circle_array(10000, (0, 0), 10.0, uniform_area=True, rng=rng).T)
+    assert (radii <= 10.0).all()
+    assert (radii < 5.0).mean() == approx(0.25, abs=0.02)
+
+
 def test_vec():
     # 2 floats
     v = _Vec2(3.3, 5.5)
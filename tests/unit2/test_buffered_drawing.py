@@ -1,6 +1,10 @@
 import arcadeplus
 import os
+import numpy as np
 import pyglet.gl as gl
+import pytest
+
+from arcadeplus import buffered_draw_commands
 
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
@@ -120,3 +124,134 @@ def test_main():
     window = MyGame(SCREEN_WIDTH, SCREEN_HEIGHT)
     window.test()
     window.close()
+
+
+def test_remove_keeps_drawing_order():
+    window = arcadeplus.Window(SCREEN_WIDTH, SCREEN_HEIGHT)
+    shape_list = arcadeplus.ShapeElementList()
+    shapes = [arcadeplus.create_rectangle_filled(i, 0, 10, 10, arcadeplus.color.WHITE) for i in range(10)]
+    for shape in shapes:
+        shape_list.append(shape)
+    batch = next(iter(shape_list.batches.values()))
+    firsts = batch.firsts
+
+    # Removed shapes leave holes, without moving the others or reallocating
+    shape_list.remove(shapes[2])
+    shape_list.remove(shapes[5])
+    assert batch.firsts is firsts
+    assert batch.items == shapes[:2] + [None] + shapes[3:5] + [None] + shapes[6:]
+    assert batch.counts[:10].tolist() == [4, 4, 0, 4, 4, 0, 4, 4, 4, 4]
+    shape_list.draw()
+
+    # Once half the list is holes, it is compacted in order
+    for shape in shapes[6:]:
+        shape_list.remove(shape)
+    assert batch.items == shapes[:2] + shapes[3:5]
+    assert batch.firsts[:4].tolist() == [0, 4, 8, 12]
+    assert batch.used == 16
+    shape_list.draw()
+    window.close()
+
+
+class FakeBuffer:
+    """ Stands in for a shader.Buffer, so lists can be filled without OpenGL. """
+    def __init__(self, size: int):
+        self.size = size
+
+    def write(self, data: bytes, offset: int = 0):
+        pass
+
+
+@pytest.fixture
+def no_gl(monkeypatch):
+    monkeypatch.setattr(arcadeplus.shader, "program", lambda **kwargs: None)
+    monkeypatch.setattr(arcadeplus.shader, "vertex_array", lambda program, content: None)
+    monkeypatch.setattr(arcadeplus.shader.Buffer, "create_with_size",
+                        staticmethod(lambda size, usage='static': FakeBuffer(size)))
+    monkeypatch.setattr(buffered_draw_commands, "_copy_buffer", lambda *args: None)
+
+
+def make_shape(vertex_count, mode=gl.GL_TRIANGLES):
+    shape = buffered_draw_commands.Shape()
+    shape.vbo = FakeBuffer(vertex_count * buffered_draw_commands._Batch.vertex_size)
+    shape.mode = mode
+    return shape
+
+
+def test_shape_transforms(no_gl):
+    shape_list = arcadeplus.ShapeElementList()
+    shapes = [make_shape(3) for _ in range(3)]
+    for shape in shapes:
+        shape_list.append(shape)
+    # Each shape starts out where it was made
+    assert shape_list._transforms[:3].tolist() == [[0, 0, 0, 1]] * 3
+
+    shape_list.set_shape_transform(shapes[1], 10, 20, 90, 2)
+    assert shape_list.get_shape_transform(shapes[1]) == (10, 20, 90, 2)
+    assert shape_list._transforms[:3].tolist() == [[0, 0, 0, 1], [10, 20, 90, 2], [0, 0, 0, 1]]
+    assert shape_list._transforms_dirty
+
+    shape_list.set_shape_transforms([shapes[2], shapes[0]], np.array([[1, 2, 3, 4], [5, 6, 7, 8]]))
+    assert shape_list._transforms[:3].tolist() == [[5, 6, 7, 8], [10, 20, 90, 2], [1, 2, 3, 4]]
+
+    # A removed shape's slot is reused, starting from the identity transform
+    shape_list.remove(shapes[1])
+    new_shape = make_shape(3)
+    shape_list.append(new_shape)
+    assert shape_list._shape_slots[new_shape] == 1
+    assert shape_list.get_shape_transform(new_shape) == (0, 0, 0, 1)
+
+
+def test_shape_visibility(no_gl):
+    shape_list = arcadeplus.ShapeElementList()
+    shapes = [make_shape(3), make_shape(6), make_shape(4, gl.GL_LINE_STRIP), make_shape(9)]
+    for shape in shapes:
+        shape_list.append(shape)
+    triangles = shape_list.batches[(gl.GL_TRIANGLES, 1)]
+    lines = shape_list.batches[(gl.GL_LINE_STRIP, 1)]
+    assert triangles.firsts[:3].tolist() == [0, 3, 9]
+    assert triangles.counts[:3].tolist() == [3, 6, 9]
+    assert lines.counts[:1].tolist() == [4]
+
+    shape_list.set_shape_visible(shapes[1], False)
+    shape_list.set_shape_visible(shapes[2], False)
+    assert triangles.counts[:3].tolist() == [3, 0, 9]
+    assert lines.counts[:1].tolist() == [0]
+    # Hiding leaves the vertices where they are
+    assert triangles.firsts[:3].tolist() == [0, 3, 9]
+
+    shape_list.set_shape_visible(shapes[1], True)
+    assert triangles.counts[:3].tolist() == [3, 6, 9]
+
+    # Shapes are found by the batch's index, which follows compaction
+    shape_list.remove(shapes[0])
+    shape_list.remove(shapes[3])
+    assert triangles.items == [shapes[1]]
+    assert triangles.indices == {shapes[1]: [0]}
+    shape_list.set_shape_visible(shapes[1], False)
+    assert triangles.counts[:1].tolist() == [0]
+
+
+def test_shape_transforms_draw():
+    window = arcadeplus.Window(200, 100)
+    shape_list = arcadeplus.ShapeElementList()
+    red = arcadeplus.create_rectangle_filled(0, 0, 10, 10, arcadeplus.color.RED)
+    blue = arcadeplus.create_rectangle_filled(150, 50, 10, 10, arcadeplus.color.BLUE)
+    shape_list.append(red)
+    shape_list.append(blue)
+
+    # The transforms reach the shader through a buffer texture
+    shape_list.set_shape_transform(red, 50, 50, 45, 2)
+    shape_list.set_shape_visible(blue, False)
+    arcadeplus.start_render()
+    shape_list.draw()
+    assert arcadeplus.get_pixel(50, 50) == (255, 0, 0)
+    # Rotated and scaled, the corners reach further out
+    assert arcadeplus.get_pixel(50, 62) == (255, 0, 0)
+    assert arcadeplus.get_pixel(150, 50) != (0, 0, 255)
+
+    shape_list.set_shape_visible(blue, True)
+    arcadeplus.start_render()
+    shape_list.draw()
+    assert arcadeplus.get_pixel(150, 50) == (0, 0, 255)
+    window.close()
@@ -0,0 +1,112 @@
+import math
+import random
+
+import arcadeplus
+
+
+def _polygon_area(points):
+    area = 0
+    for i in range(len(points)):
+        x1, y1 = points[i]
+        x2, y2 = points[(i + 1) % len(points)]
+        area += x1 * y2 - x2 * y1
+    return abs(area) / 2
+
+
+def _triangles_area(triangles):
+    return sum(_polygon_area(triangle) for triangle in triangles)
+
+
+def _star(point_count, seed):
+    rng = random.Random(seed)
+    points = []
+    for i in range(point_count):
+        angle = 2 * math.pi * i / point_count
+        radius = rng.uniform(30, 100)
+        points.append((radius * math.cos(angle), radius * math.sin(angle)))
+    return points
+
+
+def test_earclip_convex():
+    square = [(0, 0), (10, 0), (10, 10), (0, 10)]
+    triangles = arcadeplus.earclip(square)
+    assert len(triangles) == 2
+    assert _triangles_area(triangles) == 100
+
+
+def test_earclip_concave():
+    # An "L" shape, with the reflex corner at (5, 5)
+    shape = [(0, 0), (10, 0), (10, 5), (5, 5), (5, 10), (0, 10)]
+    triangles = arcadeplus.earclip(shape)
+    assert len(triangles) == 4
+    assert _triangles_area(triangles) == 75
+
+    # Winding order shouldn't matter
+    triangles = arcadeplus.earclip(list(reversed(shape)))
+    assert _triangles_area(triangles) == 75
+
+
+def test_earclip_collinear():
+    # Collinear points shouldn't produce zero-area triangles
+    shape = [(0, 0), (5, 0), (10, 0), (10, 10), (5, 10), (0, 10)]
+    triangles = arcadeplus.earclip(shape)
+    assert all(_polygon_area(triangle) > 0 for triangle in triangles)
+    assert _triangles_area(triangles) == 100
+
+
+def test_earclip_random_stars():
+    for point_count in (5, 50, 500):
+        for seed in range(5):
+            points = _star(point_count, seed)
+            triangles = arcadeplus.earclip(points)
+            assert len(triangles) == point_count - 2
+            assert math.isclose(_triangles_area(triangles), _polygon_area(points))
+
+
+def test_earclip_too_few_points():
+    assert arcadeplus.earclip([(0, 0), (1, 1)]) == []
+
+
+def test_triangulate_polygon():
+    shape = [(0, 0), (10, 0), (10, 5), (5, 5), (5, 10), (0, 10)]
+    point_list = arcadeplus.triangulate_polygon(shape)
+    assert len(point_list) == 12
+    # Callers can't change the cached triangulation
+    assert isinstance(point_list, tuple)
+
+    # Second call comes from the cache
+    assert arcadeplus.triangulate_polygon(shape) is point_list
+    assert arcadeplus.triangulate_polygon(tuple(shape)) is point_list
+
+
+def test_draw_polygon_filled_cache(monkeypatch):
+    import numpy as np
+    from arcadeplus import draw_commands
+
+    class FakeShape:
+        def __init__(self, points):
+            self.points = points
+
+        def draw(self):
+            pass
+
+    monkeypatch.setattr(draw_commands, "buffered_shapes", {})
+    monkeypatch.setattr(draw_commands, "_create_line_generic",
+                        lambda points, color, mode, line_width: FakeShape(points))
+
+    # Long enough for NumPy to print them summarized, and only different in the middle
+    angles = np.linspace(0, 2 * np.pi, 2000, endpoint=False)
+    polygon = np.stack([np.cos(angles), np.sin(angles)], axis=1) * 100
+    other_polygon = polygon.copy()
+    other_polygon[1000] *= 0.5
+    assert str(polygon) == str(other_polygon)
+
+    arcadeplus.draw_polygon_filled(polygon, arcadeplus.color.RED)
+    arcadeplus.draw_polygon_filled(other_polygon, arcadeplus.color.RED)
+    assert len(draw_commands.buffered_shapes) == 2
+    shapes = list(draw_commands.buffered_shapes.values())
+    assert shapes[0].points != shapes[1].points
+
+    # The same points as a list are the same polygon
+    arcadeplus.draw_polygon_filled(polygon.tolist(), list(arcadeplus.color.RED))
+    assert len(draw_commands.buffered_shapes) == 2
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+import arcadeplus
+
+TEXTURE = ":resources:images/pinball/pool_cue_ball.png"
+
+
+@pytest.fixture(scope="module")
+def window():
+    try:
+        window = arcadeplus.Window(200, 200, "GPU particles", update_rate=None, antialiasing=False)
+    except Exception as exception:
+        pytest.skip(f"Needs an OpenGL context: {exception}")
+    yield window
+    window.close()
+
+
+def make_batch(count):
+    rng = np.random.default_rng(1)
+    return arcadeplus.ParticleBatch(
+        TEXTURE,
+        change_xy=rng.uniform(-3, 3, (count, 2)),
+        lifetime=rng.uniform(0.1, 0.5, count),
+        change_angle=2.0,
+        scale=0.5,
+        start_alpha=200,
+        end_alpha=0
+    )
+
+
+def test_matches_particle_arrays(window):
+    gpu_particles = arcadeplus.GpuParticles(capacity=16)
+    particles = arcadeplus.ParticleArrays()
+    for container in (gpu_particles, particles):
+        container.gravity = (0.0, -0.1)
+        container.add(make_batch(50), 50, offset=(100, 100), rotation=30)
+
+    # Grown to fit
+    assert gpu_particles.capacity >= 50
+    for _ in range(10):
+        gpu_particles.update(1 / 45)
+        particles.update(1 / 45)
+    assert len(gpu_particles) == len(particles) > 0
+
+    state = gpu_particles.read()
+    alive = state['age'][:, 0] < state['age'][:, 1]
+    assert alive.sum() == len(particles)
+    assert state['pos'][alive] == pytest.approx(particles.position, abs=1e-3)
+    assert state['velocity'][alive] == pytest.approx(particles.velocity, abs=1e-4)
+    assert state['angle'][alive] == pytest.approx(particles.angle)
+    assert state['alpha'][alive] == pytest.approx(particles.alpha, abs=1e-2)
+    # Dead particles aren't drawn
+    assert (state['scale'][~alive] == 0).all()
+
+    gpu_particles.draw()
+
+
+def test_reuses_dead_slots(window):
+    particles = arcadeplus.GpuParticles(capacity=8)
+    batch = arcadeplus.ParticleBatch(TEXTURE, change_xy=(1.0, 0.0), lifetime=0.05)
+    particles.add(batch, 8)
+    for _ in range(3):
+        particles.update()
+    assert len(particles) == 0
+
+    particles.add(arcadeplus.ParticleBatch(TEXTURE, change_xy=(0.0, 1.0), lifetime=1.0), 4)
+    particles.update()
+    assert particles.capacity == 8
+    assert len(particles) == 4
+    assert particles.read()['pos'].tolist() == [[0.0, 1.0]] * 4
+
+
+def test_gpu_emitter(window):
+    emitter = arcadeplus.Emitter(
+        center_xy=(100, 100),
+        emit_controller=arcadeplus.EmitMaintainCount(20),
+        batch_factory=lambda emitter, count: arcadeplus.ParticleBatch(TEXTURE, change_xy=(1.0, 0.0)),
+        gpu=True,
+        gravity=(0.0, -1.0)
+    )
+    for _ in range(5):
+        emitter.update()
+    assert emitter.get_count() == 20
+    state = emitter._particles.read()
+    assert state['pos'].tolist() == [[105.0, 85.0]] * 20
+    emitter.draw()
+
+    with pytest.raises(ValueError):
+        arcadeplus.Emitter((0, 0), arcadeplus.EmitBurst(1), lambda emitter: None, gpu=True)
+
+
+def test_draws_like_particle_arrays(window):
+    images = []
+    for container in (arcadeplus.GpuParticles(), arcadeplus.ParticleArrays()):
+        container.add(make_batch(20), 20, offset=(100, 100))
+        for _ in range(5):
+            container.update()
+        arcadeplus.start_render()
+        container.draw()
+        images.append(np.asarray(arcadeplus.get_image(0, 0, 200, 200)))
+    assert images[0].any()
+    assert (images[0] == images[1]).all()
+
+
+def test_gpu_emitter_group(window):
+    group = arcadeplus.EmitterGroup(gpu=True)
+    emitters = [arcadeplus.Emitter((x, 0), arcadeplus.EmitMaintainCount(5 + x),
+                                   batch_factory=lambda emitter, count: arcadeplus.ParticleBatch(TEXTURE, (1.0, 0.0)))
+                for x in range(3)]
+    for emitter in emitters:
+        group.append(emitter)
+    for _ in range(20):
+        group.update()
+    assert [emitter.get_count() for emitter in emitters] == [5, 6, 7]
+    assert group._particles.read()['pos'][:, 0].tolist() == [20] * 5 + [21] * 6 + [22] * 7
+    group.draw()
@@ -0,0 +1,165 @@
+import pytest
+
+import arcadeplus
+# noinspection PyProtectedMember
+from arcadeplus.application import _get_gui_widgets
+from arcadeplus.gui import GuiRenderer
+
+FONT = ("DejaVuSans", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")
+
+
+@pytest.fixture(autouse=True)
+def font():
+    try:
+        arcadeplus.text._get_font(FONT, 18)
+    except RuntimeError:
+        pytest.skip("No font available")
+
+
+def make_button(x, y, text="OK"):
+    return arcadeplus.TextButton(x, y, 100, 40, text, font_face=FONT)
+
+
+def test_only_changed_widgets_are_encoded():
+    buttons = [make_button(100, 100 + i * 50) for i in range(3)]
+    renderer = GuiRenderer()
+    renderer.update(buttons)
+    assert renderer.encode_count == 3
+    # A face and four bevel lines, two triangles each
+    assert renderer._used == 3 * 5 * 6
+    assert len(renderer._runs[0].text_batch) == 3
+
+    renderer.update(buttons)
+    assert renderer.encode_count == 3
+
+    buttons[1].pressed = True
+    before = renderer._vertices.copy()
+    renderer.update(buttons)
+    assert renderer.encode_count == 4
+    changed = (renderer._vertices != before).nonzero()[0]
+    # Only the second button's range was rewritten
+    assert changed.min() >= 30 and changed.max() < 60
+
+
+def test_removed_widgets_are_released():
+    buttons = [make_button(100, 100), make_button(100, 200)]
+    renderer = GuiRenderer()
+    renderer.update(buttons)
+    renderer.update(buttons[1:])
+    assert len(renderer) == 1
+    assert len(renderer._runs[0].text_batch) == 1
+    assert renderer._used == 5 * 6
+    assert renderer._vertices['vert'][0][1] == pytest.approx(180)
+
+
+def test_text_edit_keeps_range():
+    label = arcadeplus.TextLabel("Score: 0", 10, 10, font_name=FONT)
+    renderer = GuiRenderer()
+    renderer.update([label])
+    batched = renderer._runs[0].text_batch.texts[0]
+    label.text = "Score: 10"
+    renderer.update([label])
+    assert renderer._runs[0].text_batch.texts == [batched]
+    assert batched.text == "Score: 10"
+
+
+def test_dialogue_box_children():
+    dialogue_box = arcadeplus.DialogueBox(200, 200, 300, 200, arcadeplus.color.BLUE)
+    dialogue_box.button_list.append(make_button(200, 150))
+    renderer = GuiRenderer()
+    renderer.update([dialogue_box])
+    assert renderer._used == 0
+
+    dialogue_box.active = True
+    renderer.update([dialogue_box])
+    assert renderer._used == 6 + 5 * 6
+    # The box is drawn under its button
+    assert tuple(renderer._vertices['color'][0]) == arcadeplus.get_four_byte_color(arcadeplus.color.BLUE)
+
+
+def test_overridden_draw_is_drawn_immediately():
+    class CustomButton(arcadeplus.TextButton):
+        def draw(self):
+            pass
+
+    renderer = GuiRenderer()
+    custom = CustomButton(100, 100, 100, 40, "Custom")
+    renderer.update([make_button(100, 200), custom, make_button(300, 200)])
+    assert renderer._immediate == [custom]
+    assert len(renderer) == 2
+    # Drawn between the buttons
+    assert [run.widget for run in renderer._runs] == [None, custom, None]
+
+
+def test_nested_widgets_keep_drawing_order():
+    theme = arcadeplus.Theme()
+    buttons = ":resources:gui_themes/Fantasy/Buttons/"
+    theme.add_button_textures(buttons + "Normal.png", buttons + "Hover.png", buttons + "Clicked.png",
+                              buttons + "Locked.png")
+    theme.set_font(18, arcadeplus.color.BLACK, FONT)
+    dialogue_box = arcadeplus.DialogueBox(200, 200, 300, 200, arcadeplus.color.BLUE)
+    dialogue_box.active = True
+    themed_button = arcadeplus.TextButton(200, 150, 100, 40, "OK", theme=theme)
+    dialogue_box.button_list.append(themed_button)
+    label = arcadeplus.TextLabel("Title", 200, 250, font_name=FONT)
+    dialogue_box.text_list.append(label)
+    far_button = make_button(600, 500)
+
+    renderer = GuiRenderer()
+    renderer.update([far_button, dialogue_box])
+    runs = renderer._runs
+    assert len(runs) == 2
+    # The box is away from the button before it, so it joins that run
+    assert runs[0].count == 5 * 6 + 6 and len(runs[0].sprite_list) == 0
+    assert len(runs[0].text_batch) == 1
+    # The button's texture would be drawn under the box's quad in the same run
+    assert len(runs[1].sprite_list) == 1
+    assert len(runs[1].text_batch) == 2
+
+    # A widget after text that doesn't know its bounds starts a new run
+    renderer.update([far_button, dialogue_box, make_button(200, 250)])
+    assert len(renderer._runs) == 3
+    assert renderer.encode_count == 5
+
+    # Moving a widget lays the runs out again, the box now covers the button's text
+    far_button.center_x = 200
+    far_button.center_y = 200
+    renderer.update([far_button, dialogue_box])
+    assert len(renderer._runs) == 3
+    assert renderer._runs[0].count == 5 * 6
+    assert renderer._runs[1].count == 6
+
+
+def test_view_draws_inactive_widgets():
+    class Owner:
+        button_list = [make_button(100, 100)]
+        text_list = [arcadeplus.TextLabel("Label", 10, 10, font_name=FONT)]
+        dialogue_box_list = []
+        textbox_list = []
+
+    Owner.button_list[0].active = False
+    Owner.text_list[0].active = False
+    assert _get_gui_widgets(Owner, active_only=True) == []
+    assert _get_gui_widgets(Owner, active_only=False) == Owner.button_list + Owner.text_list
+    renderer = GuiRenderer()
+    renderer.update(_get_gui_widgets(Owner, active_only=False))
+    assert renderer._used == 5 * 6
+    assert len(renderer._runs[0].text_batch) == 2
+
+
+def test_gui_errors_are_not_hidden(monkeypatch):
+    # Only a missing widget list is skipped
+    class Owner:
+        button_list = [make_button(100, 100)]
+
+    assert _get_gui_widgets(Owner, active_only=True) == Owner.button_list
+
+    class BrokenRenderer:
+        def draw(self, widgets):
+            raise AttributeError("broken encoder")
+
+    monkeypatch.setattr(arcadeplus.application, "GuiRenderer", BrokenRenderer)
+    view = arcadeplus.View()
+    view.button_list.append(make_button(100, 100))
+    with pytest.raises(AttributeError):
+        view.on_draw()
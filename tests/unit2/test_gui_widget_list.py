@@ -0,0 +1,122 @@
+import arcadeplus
+from arcadeplus.gui import WidgetList
+
+
+class RecordingButton(arcadeplus.TextButton):
+    def __init__(self, x, y):
+        super().__init__(x, y, 20, 20, "")
+        self.press_count = 0
+        self.release_count = 0
+
+    def on_press(self):
+        self.pressed = True
+        self.press_count += 1
+
+    def on_release(self):
+        self.pressed = False
+        self.release_count += 1
+
+
+def make_grid(size=10):
+    return [RecordingButton(10 + 20 * i, 10 + 20 * j) for i in range(size) for j in range(size)]
+
+
+def test_hit_test():
+    buttons = make_grid()
+    widgets = WidgetList(buttons, cell_size=64)
+    assert widgets.get_widgets_at_point(35, 55) == [buttons[1 * 10 + 2]]
+    # Shared edge
+    assert len(widgets.get_widgets_at_point(20, 20)) == 4
+    assert widgets.get_widgets_at_point(-5, 50) == []
+
+
+def test_hit_test_after_move_and_remove():
+    buttons = make_grid()
+    widgets = WidgetList(buttons)
+    button = buttons[0]
+    button.center_x = 1000
+    assert button not in widgets.get_widgets_at_point(10, 10)
+    assert widgets.get_widgets_at_point(1000, 10) == [button]
+
+    button.width = 200
+    assert widgets.get_widgets_at_point(1090, 10) == [button]
+
+    widgets.remove(button)
+    assert widgets.get_widgets_at_point(1000, 10) == []
+    assert button._bounds_watchers == []
+    # No longer in a list, so moving doesn't touch it
+    button.center_x = 10
+
+    del widgets[:10]
+    assert widgets.get_widgets_at_point(10, 30) == []
+    assert len(widgets) == 89
+
+
+def test_press_and_release():
+    buttons = make_grid()
+    widgets = WidgetList(buttons)
+    widgets.mouse_press(15, 15)
+    assert buttons[0].press_count == 1
+    assert sum(button.press_count for button in buttons) == 1
+
+    # Released away from the button, which still hears about it
+    widgets.mouse_release(150, 150)
+    assert buttons[0].release_count == 1
+
+    # Only a Window leaves out inactive buttons
+    buttons[1].active = False
+    widgets.mouse_press(15, 35, active_only=True)
+    assert buttons[1].press_count == 0
+    widgets.mouse_press(15, 35)
+    assert buttons[1].press_count == 1
+
+
+def test_view_presses_inactive_buttons():
+    from arcadeplus.application import _send_mouse_press
+
+    view = arcadeplus.View()
+    button = RecordingButton(10, 10)
+    button.active = False
+    view.button_list.append(button)
+    view.on_mouse_press(10, 10, arcadeplus.MOUSE_BUTTON_LEFT, 0)
+    assert button.press_count == 1
+    view.on_mouse_release(10, 10, arcadeplus.MOUSE_BUTTON_LEFT, 0)
+    assert button.release_count == 1
+
+    # What Window does with its buttons
+    _send_mouse_press(WidgetList([button]), 10, 10, active_only=True)
+    _send_mouse_press([button], 10, 10, active_only=True)
+    assert button.press_count == 1
+
+
+def test_text_box_loses_highlight():
+    text_box = arcadeplus.TextBox(100, 100, 100, 40)
+    widgets = WidgetList([text_box])
+    widgets.mouse_press(100, 100)
+    assert text_box.text_display.highlighted
+    widgets.mouse_press(500, 500)
+    assert not text_box.text_display.highlighted
+
+    text_box.text_display.x = 500
+    widgets.mouse_press(500, 100)
+    assert text_box.text_display.highlighted
+
+
+def test_other_widgets_get_every_event():
+    class OldButton:
+        def __init__(self):
+            self.presses = []
+
+        def check_mouse_press(self, x, y):
+            self.presses.append((x, y))
+
+        def check_mouse_release(self, x, y):
+            pass
+
+    old_button = OldButton()
+    widgets = WidgetList([old_button, RecordingButton(10, 10)])
+    widgets.mouse_press(500, 500)
+    assert old_button.presses == [(500, 500)]
+    assert widgets.get_widgets_at_point(500, 500) == []
+    widgets.remove(old_button)
+    assert len(widgets) == 1
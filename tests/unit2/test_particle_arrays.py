@@ -0,0 +1,191 @@
+import numpy as np
+import pytest
+
+import arcadeplus
+
+TEXTURE = ":resources:images/pinball/pool_cue_ball.png"
+TEXTURE_2 = ":resources:images/items/coinGold.png"
+
+
+def test_matches_fade_particle():
+    particle = arcadeplus.FadeParticle(TEXTURE, (2.0, -1.0), lifetime=0.5, center_xy=(10, 20),
+                                       change_angle=3, scale=0.5, start_alpha=200, end_alpha=0)
+    particles = arcadeplus.ParticleArrays()
+    particles.add(arcadeplus.ParticleBatch(TEXTURE, (2.0, -1.0), lifetime=0.5, center_xy=(10, 20),
+                                           change_angle=3, scale=0.5, start_alpha=200, end_alpha=0), 1)
+
+    for _ in range(20):
+        particle.update()
+        particles.update()
+        assert particles.position[0].tolist() == pytest.approx([particle.center_x, particle.center_y])
+        assert particles.angle[0] == pytest.approx(particle.angle)
+        assert particles.alpha[0] == pytest.approx(particle.alpha, abs=1)
+
+    for _ in range(20):
+        particle.update()
+        particles.update()
+        assert len(particles) == (0 if particle.can_reap() else 1)
+    assert len(particles) == 0
+
+
+def test_reaping_keeps_order():
+    particles = arcadeplus.ParticleArrays(capacity=2)
+    lifetimes = np.array([0.1, 1.0, 0.1, 1.0, np.inf])
+    particles.add(arcadeplus.ParticleBatch([TEXTURE, TEXTURE_2], np.arange(10).reshape(5, 2),
+                                           lifetime=lifetimes, texture_index=[0, 1, 0, 1, 1]), 5)
+    assert particles.capacity >= 5
+    assert particles.textures[0] is not particles.textures[1]
+
+    for _ in range(10):
+        particles.update()
+    assert len(particles) == 3
+    assert particles.velocity[:3].tolist() == [[2, 3], [6, 7], [8, 9]]
+    assert particles.texture[:3].tolist() == [1, 1, 1]
+    # Lasting forever means no fading either
+    assert particles.alpha[:3].tolist() == [255, 255, 255]
+
+
+def test_batch_emitter():
+    def batch_factory(emitter, count):
+        return arcadeplus.ParticleBatch(TEXTURE, (1.0, 0.0), lifetime=1.0)
+
+    emitter = arcadeplus.Emitter((100, 50), arcadeplus.EmitBurst(1000), batch_factory=batch_factory)
+    emitter.angle = 90
+    emitter.update()
+    assert emitter.get_count() == 1000
+    particles = emitter._particles
+    # Velocity turned by the emitter's angle, position relative to it
+    assert particles.velocity[0] == pytest.approx([0, 1], abs=1e-6)
+    assert particles.position[0] == pytest.approx([100, 51])
+
+    for _ in range(60):
+        emitter.update()
+    assert emitter.get_count() == 0
+    assert emitter.can_reap()
+
+    emitter = arcadeplus.Emitter((0, 0), arcadeplus.EmitMaintainCount(50),
+                                 batch_factory=lambda emitter, count: arcadeplus.ParticleBatch(TEXTURE, (1.0, 0.0)))
+    for _ in range(100):
+        emitter.update()
+        assert emitter.get_count() == 50
+
+    with pytest.raises(ValueError):
+        arcadeplus.Emitter((0, 0), arcadeplus.EmitBurst(1))
+
+
+def test_delta_time():
+    particle = arcadeplus.FadeParticle(TEXTURE, (2.0, -1.0), lifetime=0.5, change_angle=3)
+    particles = arcadeplus.ParticleArrays()
+    particles.gravity = (0.0, -0.5)
+    particles.add(arcadeplus.ParticleBatch(TEXTURE, (2.0, -1.0), lifetime=0.5), 1)
+    stepped = arcadeplus.ParticleArrays()
+    stepped.gravity = (0.0, -0.5)
+    stepped.add(arcadeplus.ParticleBatch(TEXTURE, (2.0, -1.0), lifetime=0.5), 1)
+
+    # A 1/30 second update is worth two 1/60 second ones
+    particle.update(1 / 30)
+    assert (particle.center_x, particle.center_y, particle.angle) == pytest.approx((4, -2, 6))
+    assert particle.lifetime_elapsed == pytest.approx(1 / 30)
+    particles.update(1 / 30)
+    assert particles.age[0] == pytest.approx(1 / 30)
+    assert particles.velocity[0] == pytest.approx([2, -2])
+    stepped.update()
+    stepped.update()
+    assert stepped.velocity[0] == pytest.approx(particles.velocity[0])
+
+    particles.update(0.5)
+    assert len(particles) == 0
+
+
+def test_fixed_step():
+    def make_emitter(**kwargs):
+        return arcadeplus.Emitter((0, 0), arcadeplus.EmitBurst(1),
+                                  batch_factory=lambda emitter, count: arcadeplus.ParticleBatch(TEXTURE, (1.0, 0.0)),
+                                  **kwargs)
+
+    emitter = make_emitter(fixed_step=1 / 60, max_substeps=3)
+    emitter.update(1 / 120)
+    assert emitter.get_count() == 0
+    emitter.update(1 / 40)
+    # Two steps, with a 1/120 second left over
+    assert emitter._particles.position[0].tolist() == [2, 0]
+    # Only three steps of the second
+    emitter.update(1.0)
+    assert emitter._particles.position[0].tolist() == [5, 0]
+    emitter.update(1 / 60)
+    assert emitter._particles.position[0].tolist() == [6, 0]
+
+    emitter = make_emitter()
+    emitter.update(0.5)
+    assert emitter._particles.position[0].tolist() == [30, 0]
+
+
+def test_emitter_group():
+    group = arcadeplus.EmitterGroup(gravity=(0.0, -1.0))
+    maintained = [arcadeplus.Emitter((x, 0), arcadeplus.EmitMaintainCount(10 + x),
+                                     batch_factory=lambda emitter, count: arcadeplus.ParticleBatch(TEXTURE, (1.0, 0.0)))
+                  for x in range(3)]
+    burst = arcadeplus.Emitter((0, 100), arcadeplus.EmitBurst(5),
+                               batch_factory=lambda emitter, count: arcadeplus.ParticleBatch(
+                                   [TEXTURE, TEXTURE_2], np.zeros((count, 2)), lifetime=0.1, texture_index=1))
+    for emitter in maintained + [burst]:
+        group.append(emitter)
+
+    group.update()
+    assert [emitter.get_count() for emitter in maintained] == [10, 11, 12]
+    assert burst.get_count() == 5
+    assert group.get_count() == 38
+    # Every particle moved with gravity in one pass
+    particles = group._particles
+    assert particles.velocity[:, 1].tolist() == [-1] * 38
+    assert particles.position[:, 0].tolist() == [1] * 10 + [2] * 11 + [3] * 12 + [0] * 5
+    assert particles.texture.tolist() == [0] * 33 + [1] * 5
+
+    for _ in range(10):
+        group.update()
+    # The burst emitter's particles died, so it was taken out
+    assert list(group) == maintained
+    assert burst.get_count() == 0
+    assert [emitter.get_count() for emitter in maintained] == [10, 11, 12]
+
+    with pytest.raises(ValueError):
+        group.append(maintained[0])
+    with pytest.raises(ValueError):
+        group.append(arcadeplus.Emitter((0, 0), arcadeplus.EmitBurst(1), lambda emitter: None))
+
+
+def test_simple_batch_emitter():
+    def run(seed):
+        emitter = arcadeplus.make_burst_emitter((100, 100), [TEXTURE, TEXTURE_2], 50, 2.0, 0.5, 1.0,
+                                                batch=True, rng=np.random.default_rng(seed))
+        for _ in range(10):
+            emitter.update()
+        return emitter._particles
+
+    particles = run(1)
+    assert len(particles) == 50
+    assert (np.hypot(*(particles.position - (100, 100)).T) <= 20.0 + 1e-3).all()
+    assert set(particles.texture.tolist()) == {0, 1}
+    assert (particles.alpha < 255).all()
+    assert (particles.position == run(1).position).all()
+    assert (particles.position != run(2).position).any()
+
+    emitter = arcadeplus.make_interval_emitter((0, 0), [TEXTURE], 0.01, 1.0, 3.0, 1.0, 1.0, fade_particles=False,
+                                               batch=True)
+    emitter.update()
+    assert emitter.get_count() > 0
+    assert np.hypot(*emitter._particles.velocity.T) == pytest.approx(np.full(emitter.get_count(), 3.0))
+    assert (emitter._particles.alpha == 255).all()
+
+
+def test_particle_update_without_delta_time():
+    class OldParticle(arcadeplus.LifetimeParticle):
+        def update(self):
+            super().update()
+            self.scale *= 2
+
+    emitter = arcadeplus.Emitter((0, 0), arcadeplus.EmitBurst(2),
+                                 lambda emitter: OldParticle(TEXTURE, (1.0, 0.0), lifetime=1.0))
+    emitter.update(1 / 30)
+    emitter.update()
+    assert [(particle.center_x, particle.scale) for particle in emitter._particles] == [(2.0, 4.0)] * 2
@@ -0,0 +1,72 @@
+import gc
+
+import pytest
+
+import arcadeplus
+
+TEXTURE = ":resources:images/pinball/pool_cue_ball.png"
+TEXTURE_2 = ":resources:images/items/coinGold.png"
+
+
+def particle_state(particle):
+    return (particle.texture, particle.width, particle.height, particle.position, particle.change_x,
+            particle.change_y, particle.angle, particle.change_angle, particle.scale, particle.alpha,
+            particle.color, particle.lifetime_elapsed, particle.lifetime_original, particle.start_alpha,
+            particle.end_alpha, particle.get_hit_box())
+
+
+def test_reset_matches_new_particle():
+    arguments = dict(filename_or_texture=TEXTURE_2, change_xy=(1.0, 2.0), lifetime=0.5, center_xy=(10, 20),
+                     angle=45, change_angle=3, scale=0.5, start_alpha=200, end_alpha=10)
+    particle = arcadeplus.FadeParticle(TEXTURE, (5.0, 5.0), lifetime=2.0, scale=2.0)
+    for _ in range(10):
+        particle.update()
+    particle.color = (255, 0, 0)
+
+    particle.reset(**arguments)
+    new_particle = arcadeplus.FadeParticle(**arguments)
+    assert particle_state(particle) == particle_state(new_particle)
+    for _ in range(5):
+        particle.update()
+        new_particle.update()
+    assert particle_state(particle) == particle_state(new_particle)
+
+
+def test_emitter_reuses_pooled_particles():
+    pool = arcadeplus.ParticlePool(max_size=5)
+    emitter = arcadeplus.Emitter(
+        center_xy=(100, 100),
+        emit_controller=arcadeplus.EmitMaintainCount(4),
+        particle_factory=lambda emitter: pool.acquire(arcadeplus.LifetimeParticle, TEXTURE, (1.0, 0.0),
+                                                      lifetime=0.05)
+    )
+    emitter.update()
+    assert (pool.hits, pool.misses, pool.size) == (0, 4, 0)
+
+    # The particles die on the third update and go back to the pool, to be emitted again on the next
+    for _ in range(2):
+        emitter.update()
+    assert pool.size == 4
+    emitter.update()
+    assert (pool.hits, pool.misses, pool.size) == (4, 4, 0)
+    assert pool.hit_rate == 0.5
+    assert [tuple(particle.position) for particle in emitter._particles] == [(101.0, 100.0)] * 4
+
+    # Particles over max_size are left to the garbage collector
+    for _ in range(3):
+        pool.release(arcadeplus.LifetimeParticle(TEXTURE, (0.0, 0.0), lifetime=1.0))
+    assert pool.size == 3
+    pool.clear()
+    assert (pool.hits, pool.misses, pool.size, pool.hit_rate) == (0, 0, 0, 0.0)
+
+
+def test_gc_pause_monitor():
+    with arcadeplus.GcPauseMonitor() as monitor:
+        gc.collect()
+        gc.collect()
+    gc.collect()
+    assert monitor.count == 2
+    assert 0 < monitor.max_time <= monitor.total_time
+    assert monitor.average_time == pytest.approx(monitor.total_time / 2)
+    monitor.reset()
+    assert (monitor.count, monitor.total_time) == (0, 0.0)
@@ -0,0 +1,43 @@
+import numpy as np
+
+import arcadeplus
+# noinspection PyProtectedMember
+from arcadeplus.draw_commands import _get_polyline_segments, _get_line_segments
+
+
+def test_polyline_segments():
+    segments = _get_polyline_segments([(0, 0), (10, 0), (10, 10)])
+    assert segments.shape == (2, 8)
+    # First segment uses its own start as the previous point
+    assert list(segments[0]) == [0, 0, 0, 0, 10, 0, 10, 10]
+    # Last segment uses its own end as the next point
+    assert list(segments[1]) == [0, 0, 10, 0, 10, 10, 10, 10]
+
+
+def test_polyline_segments_closed():
+    points = np.array([(0, 0), (10, 0), (10, 10)], dtype=np.float32)
+    segments = _get_polyline_segments(points, closed=True)
+    assert segments.shape == (3, 8)
+    assert list(segments[0]) == [10, 10, 0, 0, 10, 0, 10, 10]
+    assert list(segments[2]) == [10, 0, 10, 10, 0, 0, 10, 0]
+
+
+def test_polyline_segments_too_short():
+    assert len(_get_polyline_segments([(5, 5)])) == 0
+    assert _get_polyline_segments([]).shape == (0, 8)
+    assert _get_polyline_segments([], closed=True).shape == (0, 8)
+    assert _get_line_segments([]).shape == (0, 8)
+
+
+def test_draw_nothing():
+    # Nothing to draw, so no OpenGL context is needed
+    arcadeplus.draw_line_strip([], arcadeplus.color.RED)
+    arcadeplus.draw_line_loop([], arcadeplus.color.RED)
+    arcadeplus.draw_lines([], arcadeplus.color.RED)
+    arcadeplus.draw_polygon_outline([], arcadeplus.color.RED)
+
+
+def test_line_segments():
+    segments = _get_line_segments([(0, 0), (10, 0), (5, 5), (5, 15)])
+    assert segments.shape == (2, 8)
+    assert list(segments[1]) == [5, 5, 5, 5, 5, 15, 5, 15]
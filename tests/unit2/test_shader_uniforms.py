@@ -0,0 +1,49 @@
+from ctypes import POINTER, cast
+
+import numpy as np
+import pyglet.gl as gl
+
+# noinspection PyProtectedMember
+from arcadeplus.shader import _create_setter_func
+
+
+def _make_setter(length, is_matrix=False):
+    calls = []
+    c_array = (gl.GLfloat * length)()
+    ptr = cast(c_array, POINTER(gl.GLfloat))
+
+    if is_matrix:
+        def gl_setter(location, count, transpose, pointer):
+            calls.append(c_array[:])
+    else:
+        def gl_setter(location, count, pointer):
+            calls.append(c_array[:])
+
+    return _create_setter_func(0, gl_setter, c_array, length, 1, ptr, is_matrix), calls
+
+
+def test_scalar_uniform_skips_same_value():
+    setter, calls = _make_setter(1)
+    setter(1.0)
+    setter(1.0)
+    setter(2.0)
+    assert calls == [[1.0], [2.0]]
+
+
+def test_vector_uniform_skips_same_value():
+    setter, calls = _make_setter(2)
+    setter([1, 2])
+    setter((1, 2))
+    setter([1, 3])
+    assert calls == [[1.0, 2.0], [1.0, 3.0]]
+
+
+def test_matrix_uniform_skips_same_value():
+    setter, calls = _make_setter(16, is_matrix=True)
+    matrix = np.identity(4, dtype=np.float32)
+    setter(matrix.flatten())
+    setter(matrix.flatten())
+    matrix[3, 0] = 5
+    setter(matrix.flatten())
+    assert len(calls) == 2
+    assert calls[1][12] == 5
@@ -0,0 +1,246 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import arcadeplus.text as text_module
+from arcadeplus.text import Text, TextBatch, TextCache
+# noinspection PyProtectedMember
+from arcadeplus.text import _GlyphAtlas, _layout_text, _get_font, _get_glyph_instances
+
+
+@pytest.fixture
+def font():
+    try:
+        return _get_font(("DejaVuSans", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"), 20)
+    except RuntimeError:
+        pytest.skip("No font available")
+
+
+def test_glyphs_are_rasterized_once(font):
+    atlas = _GlyphAtlas()
+    _layout_text("aaa", font, atlas)
+    assert len(atlas.glyphs) == 1
+    _layout_text("ab", font, atlas)
+    assert len(atlas.glyphs) == 2
+
+
+def test_layout(font):
+    atlas = _GlyphAtlas()
+    label = _layout_text("Hi\nthere", font, atlas)
+    ascent, descent = font.getmetrics()
+    assert label.height == 2 * (ascent + descent)
+    assert len(label.glyph_data) == 7
+    # Second line starts below the first
+    assert label.glyph_data[2][1] < label.glyph_data[0][1]
+
+    centered = _layout_text("Hi\nthere", font, atlas, align="center")
+    assert centered.glyph_data[0][0] > label.glyph_data[0][0]
+
+
+def test_atlas_grows(font):
+    atlas = _GlyphAtlas(width=64, height=16)
+    _layout_text("abcdefghijklmnopqrstuvwxyz", font, atlas)
+    assert atlas.height > 16
+    assert atlas.generation == 0
+
+
+def test_atlas_clears_when_full(font):
+    atlas = _GlyphAtlas(width=64, height=16, max_height=32)
+    _layout_text("abcdefghijklmnopqrstuvwxyz", font, atlas)
+    assert atlas.generation > 0
+
+
+def test_glyph_instances(font):
+    atlas = _GlyphAtlas()
+    label = _layout_text("Hi", font, atlas)
+    instances = _get_glyph_instances(label, 100, 50, (255, 0, 0), anchor_x="center", rotation=45)
+    assert len(instances) == 2
+    assert list(instances[0]['color']) == [255, 0, 0, 255]
+    assert list(instances[0]['transform']) == [100, 50 + label.height / 2, 45]
+
+    with pytest.raises(ValueError):
+        _get_glyph_instances(label, 0, 0, (0, 0, 0), anchor_x="middle")
+
+
+def test_font_cache(font):
+    font_name = ("DejaVuSans", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")
+    assert _get_font(font_name, 20) is _get_font(list(font_name), 20)
+    assert _get_font(font_name, 20) is not _get_font(font_name, 21)
+
+
+def test_bold_font(font):
+    font_name = ("DejaVuSans", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")
+    bold = _get_font(font_name, 20, bold=True)
+    assert bold.getname()[1] == "Bold"
+    assert font.getname()[1] == "Book"
+    # No italic file, so the regular font is used
+    assert _get_font(font_name, 20, italic=True).getname() == font.getname()
+
+
+def test_text_with_font_list(font):
+    font_name = ["DejaVuSans", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"]
+    label = text_module._get_text("Hi", 20, font_name=font_name)
+    assert text_module._get_text("Hi", 20, font_name=tuple(font_name)) is label
+    assert text_module._get_text("Hi", 20, font_name=font_name, bold=True).width > label.width
+
+
+def _make_text(byte_count):
+    label = Text()
+    label.glyph_data = np.zeros((byte_count // 32, 8), dtype=np.float32)
+    label.generation = 0
+    return label
+
+
+def test_text_cache_lru():
+    cache = TextCache(max_entries=2)
+    first, second, third = _make_text(32), _make_text(32), _make_text(32)
+    cache["a"] = first
+    cache["b"] = second
+    assert cache.get("a") is first
+    cache["c"] = third
+
+    # "b" was used longest ago
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    # Whoever holds the evicted text can still draw it
+    assert second.generation == 0
+    assert len(second.glyph_data) == 1
+    assert cache.get("b") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["bytes"] == 64
+
+
+def test_text_cache_byte_limit():
+    cache = TextCache(max_bytes=100)
+    cache["a"] = _make_text(64)
+    cache["b"] = _make_text(64)
+    assert len(cache) == 1
+    assert cache.byte_count == 64
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.byte_count == 0
+
+
+def _visible_glyphs(batch):
+    # noinspection PyProtectedMember
+    instances = batch._instances[:batch._used]
+    return int((instances['rect'][:, 2] > 0).sum())
+
+
+def test_text_batch(font):
+    batch = TextBatch()
+    font_name = font.path
+    score = batch.add("Score: 0", 10, 10, (255, 255, 255), font_name=font_name)
+    batch.add("Lives: 3", 10, 40, (255, 0, 0), font_name=font_name)
+    assert len(batch) == 2
+    assert _visible_glyphs(batch) == 14
+
+    # Fits in the text's range, so nothing moves
+    start = score._start
+    score.text = "Score: 10"
+    assert score._start == start
+    assert _visible_glyphs(batch) == 15
+
+    # Too long for the range, so the text gets a new one
+    score.text = "Score: 1000000000000"
+    assert score._start != start
+    assert _visible_glyphs(batch) == 26
+
+    score.color = (0, 255, 0)
+    # noinspection PyProtectedMember
+    assert list(batch._instances[score._start]['color']) == [0, 255, 0, 255]
+
+    score.visible = False
+    assert _visible_glyphs(batch) == 7
+
+    batch.remove(score)
+    assert len(batch) == 1
+    assert _visible_glyphs(batch) == 7
+
+
+def test_text_batch_compacts(font):
+    batch = TextBatch()
+    labels = [batch.add("x" * 20, 0, 0, (0, 0, 0), font_name=font.path) for _ in range(20)]
+    for label in labels[:-1]:
+        batch.remove(label)
+    for _ in range(20):
+        batch.add("y" * 20, 0, 0, (0, 0, 0), font_name=font.path)
+    assert len(batch) == 21
+    assert _visible_glyphs(batch) == 21 * 20
+    # noinspection PyProtectedMember
+    assert batch._used <= 21 * 32 + 19 * 32
+
+
+def test_async_rasterization(font):
+    atlas = _GlyphAtlas()
+    atlas.executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        label = _layout_text("async", font, atlas)
+        assert label.pending
+        assert len(label.glyph_data) == 0
+        # The gaps are the right size already
+        assert label.width > 0
+
+        atlas.wait()
+        assert atlas.pending_count == 0
+        assert len(atlas.glyphs) == 5
+
+        label = _layout_text("async", font, atlas)
+        assert not label.pending
+        assert len(label.glyph_data) == 5
+    finally:
+        atlas.executor.shutdown()
+
+
+def test_text_batch_keeps_previous_text(font, monkeypatch):
+    atlas = _GlyphAtlas()
+    monkeypatch.setattr(text_module, "_glyph_atlas", atlas)
+    batch = TextBatch()
+    label = batch.add("abc", 0, 0, (0, 0, 0), font_name=font.path)
+    assert _visible_glyphs(batch) == 3
+
+    atlas.executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        label.text = "xyz!"
+        # Still showing the old text
+        assert _visible_glyphs(batch) == 3
+        atlas.wait()
+        # noinspection PyProtectedMember
+        batch._refresh()
+        assert _visible_glyphs(batch) == 4
+    finally:
+        atlas.executor.shutdown()
+
+
+def test_text_batch_glyphs_collected_elsewhere(font, monkeypatch):
+    atlas = _GlyphAtlas()
+    monkeypatch.setattr(text_module, "_glyph_atlas", atlas)
+    atlas.executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        batch = TextBatch()
+        other_batch = TextBatch()
+        label = batch.add("abcd", 0, 0, (0, 0, 0), font_name=font.path)
+        other_batch.add("bcde", 0, 0, (0, 0, 0), font_name=font.path)
+        # noinspection PyProtectedMember
+        assert batch._pending == {label}
+        for future in list(atlas._pending.values()):
+            future.result()
+
+        # The other batch collects the glyphs first
+        # noinspection PyProtectedMember
+        other_batch._refresh()
+        assert atlas.pending_count == 0
+        # noinspection PyProtectedMember
+        batch._refresh()
+        # noinspection PyProtectedMember
+        assert not batch._pending
+        assert _visible_glyphs(batch) == 4
+    finally:
+        atlas.executor.shutdown()
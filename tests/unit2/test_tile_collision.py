@@ -0,0 +1,92 @@
+import pytest
+
+import arcadeplus
+
+PLAYER_IMAGE = ":resources:images/animated_characters/female_person/femalePerson_idle.png"
+
+
+def read_map():
+    return arcadeplus.tilemap.read_tmx(":resources:tmx_maps/map_with_custom_hitboxes.tmx")
+
+
+def test_hit_boxes():
+    walls = arcadeplus.TileCollisionMap(read_map(), "Obstructions", scaling=0.5)
+    assert walls.gids.shape == (9, 50)
+
+    cells = walls.get_cells_in_rect(0, 0, walls.column_count * 64, walls.row_count * 64)
+    boxes = walls.get_hit_boxes_in_rect(0, 0, walls.column_count * 64, walls.row_count * 64)
+    assert len(cells) == len(boxes) == (walls.gids != 0).sum()
+
+    # Tiles without hit boxes fill their cell
+    assert boxes[cells.tolist().index([3, 0])].tolist() == [0, 64 * 5, 64, 64 * 6]
+    # The stone half tile at row 2, column 8 has a polygon drawn on its 73 pixel high image
+    stone_half = boxes[cells.tolist().index([2, 8])]
+    assert stone_half == pytest.approx([512 + 0.3636 / 2, 384 + 0.5455 / 2, 512 + 127.5455 / 2, 384 + 72.6364 / 2],
+                                       abs=1e-3)
+
+
+def test_queries():
+    walls = arcadeplus.TileCollisionMap(read_map(), "Obstructions", scaling=0.5)
+    # The bottom row is all ground, the left column is a wall
+    assert walls.get_cell(10, 10) == (8, 0)
+    assert walls.is_solid(8, 0)
+    assert not walls.is_solid(0, 0)
+    assert not walls.is_solid(-1, 0)
+
+    assert walls.collides_with_rect(100, 60, 110, 70)
+    # Only touching the top of the ground
+    assert not walls.collides_with_rect(100, 64, 110, 70)
+    assert walls.get_cells_in_rect(60, 60, 70, 70).tolist() == [[7, 0], [8, 0], [8, 1]]
+
+    # The stone half tile's hit box is only the bottom of its cell
+    row, column = 2, 32
+    walls.set_gid(row, column, 5)
+    bottom = (walls.row_count - 1 - row) * 64
+    assert walls.collides_with_rect(column * 64 + 10, bottom + 30, column * 64 + 20, bottom + 35)
+    assert not walls.collides_with_rect(column * 64 + 10, bottom + 40, column * 64 + 20, bottom + 60)
+    walls.set_gid(row, column, 0)
+    assert not walls.collides_with_rect(column * 64 + 10, bottom + 30, column * 64 + 20, bottom + 35)
+
+    with pytest.raises(ValueError):
+        arcadeplus.TileCollisionMap(read_map(), "No such layer")
+
+
+def test_flipped_hit_box():
+    walls = arcadeplus.TileCollisionMap(read_map(), "Obstructions")
+    walls.set_gid(0, 0, 5 | 0x40000000)
+    # Flipped upside down, the gap under the stone half's hit box is at the top of its image
+    box = walls.get_hit_boxes_in_rect(0, 0, 128, walls.row_count * 128)[0]
+    assert box[1] == pytest.approx(1024 + 0.3636, abs=1e-3)
+    assert box[3] == pytest.approx(1024 + 72.4545, abs=1e-3)
+    walls.set_gid(0, 0, 5 | 0x80000000)
+    box = walls.get_hit_boxes_in_rect(0, 0, 128, walls.row_count * 128)[0]
+    assert box[0] == pytest.approx(128 - 127.5455, abs=1e-3)
+
+
+def test_platformer_on_tiles():
+    walls = arcadeplus.TileCollisionMap(read_map(), "Obstructions", scaling=0.5)
+    player = arcadeplus.Sprite(PLAYER_IMAGE, 0.5)
+    player.center_x = 200
+    player.center_y = 300
+    physics_engine = arcadeplus.PhysicsEnginePlatformer(player, walls)
+
+    for _ in range(60):
+        hit_list = physics_engine.update()
+    # Standing right on the ground
+    assert player.bottom == 64
+    assert player.change_y == 0
+    assert hit_list == [(8, 2), (8, 3)]
+    assert physics_engine.can_jump()
+
+    player.change_x = 5
+    for _ in range(100):
+        physics_engine.update()
+    # Stopped by the wall at column 10
+    assert player.right == 640
+    assert player.bottom == 64
+
+    physics_engine = arcadeplus.PhysicsEngineSimple(player, walls)
+    player.change_x = -7
+    for _ in range(100):
+        physics_engine.update()
+    assert player.left == 64
@@ -0,0 +1,174 @@
+import numpy as np
+import pytest
+
+import arcadeplus
+# noinspection PyProtectedMember
+from arcadeplus.tilemap import _get_tile_texture_coordinates
+
+
+def built_vertices(layer):
+    for chunk in layer._chunks:
+        layer._build_chunk(chunk)
+    return np.concatenate([chunk.vertices for chunk in layer._chunks])
+
+
+def test_tile_layer_matches_sprites():
+    tmx_map = arcadeplus.tilemap.read_tmx(":resources:tmx_maps/test_map_6.tmx")
+    layer = arcadeplus.TileLayer(tmx_map, "Tile Layer 1", chunk_size=3)
+    sprite_list = arcadeplus.tilemap.process_layer(tmx_map, "Tile Layer 1")
+
+    assert layer.gids.shape == (4, 4)
+    assert len(layer._chunks) == 4
+    vertices = built_vertices(layer)
+    assert len(vertices) == len(sprite_list) * 6
+
+    corners = vertices['vert'].reshape(-1, 6, 2)
+    tile_boxes = sorted(tuple(box) for box in np.concatenate([corners.min(axis=1), corners.max(axis=1)],
+                                                             axis=1).tolist())
+    sprite_boxes = sorted((sprite.center_x - sprite.width / 2, sprite.center_y - sprite.height / 2,
+                           sprite.center_x + sprite.width / 2, sprite.center_y + sprite.height / 2)
+                          for sprite in sprite_list)
+    assert tile_boxes == sprite_boxes
+
+
+def test_animated_tiles():
+    tmx_map = arcadeplus.tilemap.read_tmx(":resources:tmx_maps/map_with_ladders.tmx")
+    coins = arcadeplus.TileLayer(tmx_map, "Coins", base_directory="test_data")
+    coin_count = int((coins.gids == 42).sum())
+    assert coin_count > 0
+    # Animated tiles are drawn from the chunks, with both frames of the coin in the atlas
+    assert len(coins.sprite_list) == 0
+    vertices = built_vertices(coins)
+    assert len(vertices) == np.count_nonzero(coins.gids) * 6
+    assert (vertices['frames'] == [0, 2]).all(axis=1).sum() == coin_count * 6
+    assert [frame[2:] for frame in coins._frames] == [(500, 1000), (1000, 1000)]
+    assert coins._get_animation_period() == 1000
+
+    coins.update_animation(0.25)
+    assert coins.animation_time == 0.25
+
+
+def test_animation_missing_first_frame():
+    import pytiled_parser
+
+    tmx_map = arcadeplus.tilemap.read_tmx(":resources:tmx_maps/map_with_ladders.tmx")
+    coin = tmx_map.gid_lookup.get_tile(42)
+    # GIDs 42 and 43 are the two frames of the coin. The first one here doesn't exist.
+    coin.animation = [pytiled_parser.objects.Frame(tile_id=999, duration=250)] + coin.animation
+    coins = arcadeplus.TileLayer(tmx_map, "Coins", base_directory="test_data")
+
+    # Offsets and texture coordinates are both from the first frame found
+    assert coins._animations[42] == (0, 2, 42)
+    assert coins._frames[0] == (0, 0, 500, 1000)
+    x, y, width, height = coins._atlas_images[42]
+    assert (coins._tile_texture_coordinates[coins._gid_indices[42]] ==
+            _get_tile_texture_coordinates(x, y, width, height, 42)).all()
+
+    coin.animation = coin.animation[2:]
+    coins = arcadeplus.TileLayer(tmx_map, "Coins", base_directory="test_data")
+    assert coins._animations[42] == (0, 1, 43)
+    assert coins._frames == [(0, 0, 500, 500)]
+    x, y, width, height = coins._atlas_images[43]
+    assert (coins._tile_texture_coordinates[coins._gid_indices[42]] ==
+            _get_tile_texture_coordinates(x, y, width, height, 42)).all()
+
+
+def test_sprite_filter():
+    tmx_map = arcadeplus.tilemap.read_tmx(":resources:tmx_maps/map_with_ladders.tmx")
+    coins = arcadeplus.TileLayer(tmx_map, "Coins", base_directory="test_data",
+                                 sprite_filter=lambda tile: tile.animation is not None)
+    coin_count = int((coins.gids == 42).sum())
+    assert len(coins.sprite_list) == coin_count
+    assert len(built_vertices(coins)) == (np.count_nonzero(coins.gids) - coin_count) * 6
+
+    row, column = np.argwhere(coins.gids == 42)[0]
+    coins.set_gid(row, column, 0)
+    assert len(coins.sprite_list) == coin_count - 1
+    assert coins.get_sprite(row, column) is None
+    assert coins._get_chunk(row, column).dirty
+
+    ladders = arcadeplus.TileLayer(tmx_map, "Ladders", base_directory="test_data",
+                                   sprite_filter=lambda tile: True)
+    assert len(ladders.sprite_list) == np.count_nonzero(ladders.gids)
+    assert len(built_vertices(ladders)) == 0
+
+    with pytest.raises(ValueError):
+        arcadeplus.TileLayer(tmx_map, "No such layer")
+
+
+def test_grid_queries():
+    tmx_map = arcadeplus.tilemap.read_tmx(":resources:tmx_maps/test_map_6.tmx")
+    layer = arcadeplus.TileLayer(tmx_map, "Tile Layer 1")
+    # Bottom left cell is empty, the one to its right has GID 8
+    assert layer.get_cell(5, 5) == (3, 0)
+    assert layer.get_tile_at(5, 5) is None
+    assert layer.get_tile_at(20, 5).id_ == 4
+    assert layer.get_gid(-1, 0) == 0
+
+    assert not layer.collides_with_rect(0, 0, 16, 16)
+    # Only touching the tile to the right
+    assert not layer.collides_with_rect(0, 0, 16, 10)
+    assert layer.collides_with_rect(0, 0, 16.5, 10)
+    assert layer.get_cells_in_rect(0, 0, 40, 20).tolist() == [[2, 0], [2, 1], [2, 2], [3, 1], [3, 2]]
+    assert layer.get_cells_in_rect(-100, -100, -10, -10).shape == (0, 2)
+
+
+def test_flipped_texture_coordinates():
+    plain = _get_tile_texture_coordinates(10, 20, 16, 8, 1)
+    # Bottom left corner of the tile shows the bottom left of the image
+    assert plain[0].tolist() == [10, 28]
+    flipped = _get_tile_texture_coordinates(10, 20, 16, 8, 1 | 0x80000000)
+    assert flipped[0].tolist() == [26, 28]
+    flipped = _get_tile_texture_coordinates(10, 20, 16, 8, 1 | 0x40000000)
+    assert flipped[0].tolist() == [10, 20]
+
+
+def make_big_map(size):
+    tmx_map = arcadeplus.tilemap.read_tmx(":resources:tmx_maps/test_map_6.tmx")
+    layer = arcadeplus.tilemap.get_tilemap_layer(tmx_map, "Tile Layer 1")
+    layer.data = np.resize(np.array(layer.data), (size, size)).tolist()
+    return tmx_map
+
+
+def test_chunks_in_rect():
+    layer = arcadeplus.TileLayer(make_big_map(64), "Tile Layer 1", chunk_size=16)
+    # Tiles are 16 pixels, so a chunk is 256 pixels
+    assert len(layer._get_chunks_in_rect(0, 0, 1024, 1024)) == 16
+    chunks = layer._get_chunks_in_rect(300, 0, 400, 10)
+    assert [(chunk.row, chunk.column) for chunk in chunks] == [(3, 1)]
+    assert layer._get_chunks_in_rect(2000, 0, 3000, 10) == []
+
+
+def test_streaming(monkeypatch):
+    monkeypatch.setattr(arcadeplus.tilemap._TileChunk, "upload", lambda chunk: setattr(chunk, "dirty", False))
+    viewport = [0, 256, 0, 256]
+    monkeypatch.setattr(arcadeplus.tilemap, "get_viewport", lambda: tuple(viewport))
+
+    layer = arcadeplus.StreamingTileLayer(make_big_map(256), "Tile Layer 1", chunk_size=16,
+                                          margin=256, max_chunks=20)
+    visible = layer._get_chunks_to_draw()
+    assert len(visible) == 1
+    assert visible[0].vertices is not None
+    # The chunks around the screen are built in the background
+    assert layer.building_chunk_count == 3
+
+    viewport[:] = [256, 512, 256, 512]
+    visible = layer._get_chunks_to_draw()
+    assert all(chunk.vertices is not None for chunk in visible)
+
+    # Moving far away drops the old chunks
+    for x in range(0, 4096, 256):
+        viewport[:] = [x, x + 256, 2048, 2304]
+        layer._get_chunks_to_draw()
+    assert layer.resident_chunk_count <= 20
+    assert layer._chunks[0].vertices is None
+
+    # A changed tile that is on screen is rebuilt right away
+    chunk = visible[0]
+    viewport[:] = [256, 512, 256, 512]
+    layer._get_chunks_to_draw()
+    row, column = chunk.row * 16, chunk.column * 16
+    layer.set_gid(row, column, 0)
+    assert chunk.dirty
+    layer._get_chunks_to_draw()
+    assert not chunk.dirty
@@ -116,3 +116,259 @@ def test_sprite_sheet():
     assert first_sprite.height == 16
     assert first_sprite.width == 16
 
+
+
+def test_gid_lookup():
+    tmx_map = arcadeplus.tilemap.read_tmx(":resources:tmx_maps/test_map_6.tmx")
+    get_tile = arcadeplus.tilemap._get_tile_by_gid
+
+    # Tiles are shared between cells with the same GID
+    tile = get_tile(tmx_map, 5)
+    assert tile is get_tile(tmx_map, 5)
+    assert tile.id_ == 1
+    assert tile.tileset.name == "Numbers"
+    assert not tile.flipped_horizontally
+
+    flipped = get_tile(tmx_map, 5 | 0x80000000)
+    assert flipped is not tile
+    assert flipped.id_ == 1
+    assert flipped.flipped_horizontally
+
+    rock = get_tile(tmx_map, 11)
+    assert rock.tileset.name == "Rocks"
+    assert arcadeplus.tilemap._get_tile_by_id(tmx_map, rock.tileset, 1).image.size.width == 29
+    assert get_tile(tmx_map, 100) is None
+
+
+def test_layer_decoding():
+    import base64
+    import gzip
+    import zlib
+
+    import numpy as np
+    from pytiled_parser import xml_parser
+    from arcadeplus.read_tiled_map import _process_base64_encoding, _process_csv_encoding
+
+    grid = np.random.RandomState(1).randint(0, 20, (30, 40)).astype(np.uint32)
+    grid[3, 4] = 7 | 0x80000000
+    grid[5, 6] = 2 | 0x40000000 | 0x20000000
+
+    csv_text = "\n" + ",\n".join(",".join(str(gid) for gid in row) for row in grid.tolist()) + "\n"
+    raw = grid.astype("<u4").tobytes()
+    encoded = {None: raw, "zlib": zlib.compress(raw), "gzip": gzip.compress(raw)}
+
+    decoded = _process_csv_encoding(csv_text, 40)
+    assert decoded.dtype == np.uint32
+    assert decoded.tolist() == xml_parser._decode_csv_data(csv_text) == grid.tolist()
+    # Blank fields are skipped
+    assert _process_csv_encoding("\n1,,2,\n3,4,\n", 2).tolist() == [[1, 2], [3, 4]]
+
+    for compression, data in encoded.items():
+        text = "\n   " + base64.b64encode(data).decode() + "\n  "
+        decoded = _process_base64_encoding(text.strip(), compression, 40)
+        assert decoded.tolist() == grid.tolist()
+        assert decoded.tolist() == xml_parser._decode_base64_data(text, 40, compression)
+
+    tmx_map = arcadeplus.tilemap.read_tmx(":resources:tmx_maps/level_1.tmx")
+    layer = arcadeplus.tilemap.get_tilemap_layer(tmx_map, "Platforms")
+    assert isinstance(layer.data, np.ndarray)
+    assert layer.data.dtype == np.uint32
+    assert layer.data.shape == (layer.size.height, layer.size.width)
+
+    # read_tmx hands the NumPy decoder to its own copy of the parser, pytiled_parser's stays as it was
+    assert xml_parser._decode_data.__module__ == xml_parser.__name__
+    assert arcadeplus.tilemap._get_tile_map_parser().__globals__["_decode_data"] is arcadeplus.tilemap._decode_data
+
+
+def test_layer_decoding_chunks(tmp_path):
+    import base64
+    import zlib
+
+    import numpy as np
+
+    chunk = np.arange(1, 17, dtype="<u4").reshape(4, 4)
+    zlib_text = base64.b64encode(zlib.compress(chunk.tobytes())).decode()
+    csv_text = "\n".join(",".join(str(gid) for gid in row) + "," for row in chunk.tolist())
+    layers = ""
+    for layer_id, (encoding, text) in enumerate((('encoding="base64" compression="zlib"', zlib_text),
+                                                  ('encoding="csv"', csv_text)), 1):
+        layers += f"""
+  <layer id="{layer_id}" name="Layer {layer_id}" width="2" height="2">
+   <data {encoding}>
+    <chunk x="0" y="0" width="4" height="4">
+{text}
+</chunk>
+   </data>
+  </layer>"""
+    tmx_file = tmp_path / "chunks.tmx"
+    tmx_file.write_text(f"""<?xml version="1.0" encoding="UTF-8"?>
+<map version="1.2" tiledversion="1.3.1" orientation="orthogonal" renderorder="right-down" width="2" height="2"
+     tilewidth="8" tileheight="8" infinite="1" nextlayerid="3" nextobjectid="1">
+ <group id="3" name="Group">{layers}
+ </group>
+</map>
+""")
+    tmx_map = arcadeplus.tilemap.read_tmx(str(tmx_file))
+    for layer in tmx_map.layers[0].layers:
+        chunk_data = layer.data[0].chunk_data
+        assert isinstance(chunk_data, np.ndarray)
+        # Rows as wide as the chunk, not the layer
+        assert chunk_data.tolist() == chunk.tolist()
+
+
+def test_map_cache(tmp_path, monkeypatch):
+    import os
+    import shutil
+
+    import numpy as np
+
+    map_directory = os.path.join(os.path.dirname(arcadeplus.__file__), "resources", "tmx_maps")
+    for name in ("level_1.tmx", "standard_tileset.tsx"):
+        shutil.copy(os.path.join(map_directory, name), tmp_path)
+    tmx_file = str(tmp_path / "level_1.tmx")
+    cache_directory = str(tmp_path / "cache")
+
+    tmx_map = arcadeplus.tilemap.read_tmx(tmx_file, cache_directory=cache_directory)
+    assert len(os.listdir(cache_directory)) == 1
+
+    parse_tile_map = arcadeplus.tilemap._get_tile_map_parser()
+
+    def fail(tmx_file):
+        raise AssertionError("The map should come from the cache")
+
+    monkeypatch.setattr(arcadeplus.tilemap, "_tile_map_parser", fail)
+    cached_map = arcadeplus.tilemap.read_tmx(tmx_file, cache_directory=cache_directory)
+    layer = arcadeplus.tilemap.get_tilemap_layer(tmx_map, "Platforms")
+    cached_layer = arcadeplus.tilemap.get_tilemap_layer(cached_map, "Platforms")
+    assert np.array_equal(layer.data, cached_layer.data)
+    # Cached grids can be changed without touching the cache
+    cached_layer.data[0, 0] = 99
+    assert cached_map.tile_sets.keys() == tmx_map.tile_sets.keys()
+    assert cached_map.gid_lookup.get_tile(1).image.source == tmx_map.gid_lookup.get_tile(1).image.source
+    assert cached_map.image_paths
+    reread_layer = arcadeplus.tilemap.get_tilemap_layer(
+        arcadeplus.tilemap.read_tmx(tmx_file, cache_directory=cache_directory), "Platforms")
+    assert reread_layer.data[0, 0] == layer.data[0, 0]
+
+    # Changing the map, or a tileset it uses, means reading it again
+    parse_count = []
+
+    def count_parse(tmx_file):
+        parse_count.append(tmx_file)
+        return parse_tile_map(tmx_file)
+
+    monkeypatch.setattr(arcadeplus.tilemap, "_tile_map_parser", count_parse)
+    for name in ("level_1.tmx", "standard_tileset.tsx"):
+        stat = os.stat(tmp_path / name)
+        os.utime(tmp_path / name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        arcadeplus.tilemap.read_tmx(tmx_file, cache_directory=cache_directory)
+        arcadeplus.tilemap.read_tmx(tmx_file, cache_directory=cache_directory)
+    assert len(parse_count) == 2
+
+
+def test_map_cache_images(tmp_path, monkeypatch):
+    import os
+    import shutil
+
+    resources = os.path.join(os.path.dirname(arcadeplus.__file__), "resources")
+    os.mkdir(tmp_path / "maps")
+    for name in ("level_1.tmx", "standard_tileset.tsx"):
+        shutil.copy(os.path.join(resources, "tmx_maps", name), tmp_path / "maps")
+    shutil.copytree(os.path.join(resources, "images", "tiles"), tmp_path / "images" / "tiles")
+    shutil.copytree(os.path.join(resources, "images", "items"), tmp_path / "images" / "items")
+    cache_directory = str(tmp_path / "cache")
+
+    # Written with a map path relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    arcadeplus.tilemap.read_tmx("maps/level_1.tmx", cache_directory=cache_directory)
+
+    monkeypatch.chdir(tmp_path / "images")
+    tmx_map = arcadeplus.tilemap.read_tmx(str(tmp_path / "maps" / "level_1.tmx"), cache_directory=cache_directory)
+    paths = [path for path in tmx_map.image_paths.paths.values()]
+    assert paths and all(os.path.isabs(path) and os.path.exists(path) for path in paths)
+    assert len(arcadeplus.tilemap.process_layer(tmx_map, "Platforms")) > 0
+
+    # Changing an image means reading the map again
+    image = tmp_path / "images" / "tiles" / "grassMid.png"
+    stat = os.stat(image)
+    os.utime(image, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert arcadeplus.tilemap._read_map_cache(
+        arcadeplus.tilemap._get_map_cache_file(cache_directory, str(tmp_path / "maps" / "level_1.tmx"))) is None
+
+
+def test_stale_map_cache(tmp_path, monkeypatch):
+    cache_directory = str(tmp_path / "cache")
+    tmx_file = arcadeplus.tilemap.read_tmx(":resources:tmx_maps/test_map_1.tmx").tmx_file
+    arcadeplus.tilemap.read_tmx(str(tmx_file), cache_directory=cache_directory)
+
+    # Unpickling classes that have moved or changed falls back to parsing the map
+    for error in (AttributeError("no attribute"), ModuleNotFoundError("no module"), TypeError("bad state")):
+        def load(unpickler):
+            raise error
+
+        monkeypatch.setattr(arcadeplus.tilemap._MapCacheUnpickler, "load", load)
+        tmx_map = arcadeplus.tilemap.read_tmx(str(tmx_file), cache_directory=cache_directory)
+        assert tmx_map.map_size.width == 10
+
+
+def test_level_preloader(monkeypatch):
+    import time
+
+    import pytest
+
+    # Record the OpenGL steps instead of running them
+    steps = []
+    monkeypatch.setattr(arcadeplus.SpriteList, "_prepare_draw", lambda sprite_list: steps.append(sprite_list))
+    monkeypatch.setattr(arcadeplus.tilemap._TileChunk, "upload", lambda chunk: steps.append(chunk))
+    monkeypatch.setattr(arcadeplus.tilemap._TileAtlas, "upload", lambda atlas: steps.append(atlas))
+    monkeypatch.setattr(arcadeplus.TileLayer, "_upload_frames", lambda layer: steps.append(layer))
+
+    preloader = arcadeplus.LevelPreloader(":resources:tmx_maps/map_with_ladders.tmx", ["Platforms", "Coins"],
+                                          tile_layer_names=["Background"], time_budget=0)
+    assert preloader.layers == {}
+    while not preloader.loaded:
+        time.sleep(0.001)
+    assert not preloader.done
+
+    # With no time to spare, each update does one step
+    update_count = 0
+    while not preloader.update():
+        update_count += 1
+        assert len(steps) == update_count
+    assert len(steps) == update_count + 1
+
+    platforms = preloader.layers["Platforms"]
+    background = preloader.layers["Background"]
+    assert isinstance(platforms, arcadeplus.SpriteList)
+    assert isinstance(background, arcadeplus.TileLayer)
+    assert platforms in steps
+    assert background._atlas in steps
+    assert all(chunk in steps and chunk.vertices is not None for chunk in background._chunks)
+    assert preloader.map_object.layers
+
+    preloader = arcadeplus.LevelPreloader(":resources:tmx_maps/no_such_map.tmx", ["Platforms"])
+    with pytest.raises(FileNotFoundError):
+        preloader.wait()
+
+
+def test_image_paths(monkeypatch):
+    find_image_file = arcadeplus.tilemap._find_image_file
+    looked_for = []
+
+    def count_find(image_file, base_directory, map_directory):
+        looked_for.append(image_file)
+        return find_image_file(image_file, base_directory, map_directory)
+
+    monkeypatch.setattr(arcadeplus.tilemap, "_find_image_file", count_find)
+    tmx_map = arcadeplus.tilemap.read_tmx(":resources:tmx_maps/map_with_ladders.tmx")
+    platforms = arcadeplus.tilemap.process_layer(tmx_map, "Platforms", base_directory="test_data")
+    # Each image is only looked for once, however many tiles use it
+    assert len(looked_for) == len(set(looked_for)) < len(platforms)
+    assert tmx_map.image_paths.resolve_time > 0
+
+    arcadeplus.tilemap.process_layer(tmx_map, "Platforms", base_directory="test_data")
+    count = len(looked_for)
+    assert count == len(set(looked_for))
+    # A different base directory can find different images
+    arcadeplus.tilemap.process_layer(tmx_map, "Platforms")
+    assert len(looked_for) == 2 * count